@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+from .exceptions import MetadataDiscoveryException, TrustChainDiscoveryTimeout
+from .http_client import http_get_async
+from .statement_store import FederationStatementStore
+from .statements import (
+    EntityStatement,
+    get_entity_configuration_url,
+    get_fetch_statement_url,
+)
+
+if TYPE_CHECKING:
+    from .trust_chain_builder import TrustChainBuilder
+
+logger = logging.getLogger(__name__)
+
+TRUST_CHAIN_DISCOVERY_TIMEOUT = float(
+    os.getenv("PYEUDIW_TRUST_CHAIN_DISCOVERY_TIMEOUT", 10)
+)
+TRUST_CHAIN_DISCOVERY_LIMIT_PER_HOST = int(
+    os.getenv("PYEUDIW_TRUST_CHAIN_DISCOVERY_LIMIT_PER_HOST", 4)
+)
+
+Fetcher = Callable[[str], Awaitable[str]]
+
+
+class ParallelDiscovery:
+    """
+    Breadth first trust chain discovery, fetching concurrently at each level
+    the entity configurations of all the superiors and then all the
+    statements they issued about their subordinates.
+
+    The statements are validated exactly as the sequential discovery of
+    TrustChainBuilder does, so the resulting tree of trust is the same;
+    an unreachable entity is treated as a missing one.
+
+    When a federation statement store is given the statements found in it
+    are not fetched, the fetched ones are added to it.
+    """
+
+    def __init__(
+        self,
+        httpc_params: dict,
+        timeout: float = TRUST_CHAIN_DISCOVERY_TIMEOUT,
+        limit_per_host: int = TRUST_CHAIN_DISCOVERY_LIMIT_PER_HOST,
+        fetcher: Optional[Fetcher] = None,
+        statement_store: Optional[FederationStatementStore] = None,
+    ) -> None:
+        """
+        Creates an instance of ParallelDiscovery.
+
+        :param httpc_params: parameters to perform http requests
+        :type httpc_params: dict
+        :param timeout: seconds the whole discovery can last
+        :type timeout: float
+        :param limit_per_host: maximum number of concurrent requests to the same host
+        :type limit_per_host: int
+        :param fetcher: coroutine function returning the content of an url,
+            by default a GET on the shared http client
+        :type fetcher: Optional[Fetcher]
+        :param statement_store: the federation statement store, if any
+        :type statement_store: Optional[FederationStatementStore]
+        """
+        self.httpc_params = httpc_params
+        self.timeout = timeout
+        self.limit_per_host = limit_per_host
+        self.fetcher = fetcher or self._http_fetch
+        self.statement_store = statement_store
+
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def _http_fetch(self, url: str) -> str:
+        responses = await http_get_async([url], self.httpc_params)
+        content = responses[0].content
+        return content.decode() if isinstance(content, bytes) else content
+
+    async def _fetch(self, url: str) -> Optional[str]:
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.limit_per_host)
+        )
+        async with semaphore:
+            try:
+                return await self.fetcher(url)
+            except Exception as e:
+                logger.warning(f"Trust chain discovery cannot fetch {url}: {e}")
+                return None
+
+    async def _fetch_all(
+        self, urls: dict[str, tuple[str, str]]
+    ) -> dict[str, Optional[str]]:
+        """
+        Returns the statements at the given urls, from the federation
+        statement store if any or fetching concurrently the missing ones.
+
+        :param urls: the (iss, sub) of the statement published at each url
+        :type urls: dict[str, tuple[str, str]]
+
+        :returns: the statement at each url, None if unreachable
+        :rtype: dict[str, Optional[str]]
+        """
+        store = self.statement_store
+
+        contents = {}
+        if store is not None:
+            for url, (iss, sub) in urls.items():
+                statement = store.get(iss, sub)
+                # the statements to revalidate are fetched again with the others
+                if statement is not None and not store.needs_revalidation(statement):
+                    contents[url] = statement.jwt
+
+        missing = [url for url in urls if url not in contents]
+        fetched = await asyncio.gather(*(self._fetch(url) for url in missing))
+        for url, content in zip(missing, fetched):
+            if content and store is not None:
+                iss, sub = urls[url]
+                try:
+                    store.put(content, iss, sub, url)
+                except ValueError as e:
+                    logger.debug(f"{url} not stored as federation statement: {e}")
+            contents[url] = content
+
+        return contents
+
+    async def _expand_level(
+        self, builder: TrustChainBuilder, last_ecs: list[EntityStatement]
+    ) -> list[EntityStatement]:
+        # the entity configurations of the superiors of the whole level
+        hints = {}
+        for last_ec in last_ecs:
+            try:
+                hints[id(last_ec)] = last_ec.get_authority_hints(
+                    max_authority_hints=builder.max_authority_hints,
+                    superiors_hints=[builder.trust_anchor_configuration],
+                )
+            except MetadataDiscoveryException as e:
+                logger.exception(f"Metadata discovery exception for {last_ec.sub}: {e}")
+
+        configurations = await self._fetch_all(
+            {
+                get_entity_configuration_url(hint): (hint, hint)
+                for authority_hints in hints.values()
+                for hint in authority_hints
+            }
+        )
+
+        superiors = {}
+        for last_ec in last_ecs:
+            if (authority_hints := hints.get(id(last_ec))) is None:
+                continue
+            jwts = [
+                jwt
+                for hint in authority_hints
+                if (jwt := configurations[get_entity_configuration_url(hint)])
+            ]
+            try:
+                superiors[id(last_ec)] = last_ec.add_superiors(jwts, authority_hints)
+            except MetadataDiscoveryException as e:
+                logger.exception(f"Metadata discovery exception for {last_ec.sub}: {e}")
+
+        # the statements issued by the superiors about the entities of the level
+        statements = await self._fetch_all(
+            {
+                url: (sup_ec.sub, last_ec.sub)
+                for last_ec in last_ecs
+                for sup_ec in superiors.get(id(last_ec), {}).values()
+                if (url := get_fetch_statement_url(sup_ec, last_ec.sub))
+            }
+        )
+
+        sup_ecs = []
+        for last_ec in last_ecs:
+            if id(last_ec) not in superiors:
+                continue
+            try:
+                validated_by = last_ec.validate_by_superiors(
+                    superiors_entity_configurations=superiors[id(last_ec)].values(),
+                    entity_statements=statements,
+                )
+                sup_ecs.extend(validated_by.values())
+            except MetadataDiscoveryException as e:
+                logger.exception(f"Metadata discovery exception for {last_ec.sub}: {e}")
+
+        return sup_ecs
+
+    async def _discover(self, builder: TrustChainBuilder) -> None:
+        ecs_history = []
+        while (len(builder.tree_of_trust) - 2) < builder.max_path_len:
+            last_path_n = list(builder.tree_of_trust.keys())[-1]
+
+            last_ecs = []
+            for last_ec in builder.tree_of_trust[last_path_n]:
+                # Metadata discovery loop prevention
+                if last_ec.sub in ecs_history:
+                    logger.warning(
+                        f"Metadata discovery loop detection for {last_ec.sub}. "
+                        f"Already present in {ecs_history}. "
+                        "Discovery blocked for this path."
+                    )
+                    continue
+                last_ecs.append(last_ec)
+
+            sup_ecs = await self._expand_level(builder, last_ecs)
+            ecs_history.extend(last_ec.sub for last_ec in last_ecs)
+
+            if sup_ecs:
+                builder.tree_of_trust[last_path_n + 1] = sup_ecs
+            else:
+                break
+
+    async def discover(self, builder: TrustChainBuilder) -> None:
+        """
+        Walks the federation from the subject configuration of the builder
+        up to the trust anchor, filling the builder tree of trust.
+
+        :param builder: the trust chain builder, with the subject configuration in its tree of trust
+        :type builder: TrustChainBuilder
+
+        :raises TrustChainDiscoveryTimeout: if the discovery lasts more than the timeout
+        """
+        self._semaphores = {}
+        try:
+            await asyncio.wait_for(self._discover(builder), self.timeout)
+        except asyncio.TimeoutError:
+            raise TrustChainDiscoveryTimeout(
+                f"Trust chain discovery for {builder.subject} "
+                f"exceeded {self.timeout} seconds"
+            )
+
+    def run(self, builder: TrustChainBuilder) -> None:
+        """
+        Synchronous version of discover.
+
+        :param builder: the trust chain builder, with the subject configuration in its tree of trust
+        :type builder: TrustChainBuilder
+
+        :raises TrustChainDiscoveryTimeout: if the discovery lasts more than the timeout
+        """
+        asyncio.run(self.discover(builder))
@@ -84,3 +84,7 @@ class InvalidEntityStatementPayload(Exception):
 
 class PolicyError(Exception):
     pass
+
+
+class TrustChainDiscoveryTimeout(MetadataDiscoveryException):
+    pass
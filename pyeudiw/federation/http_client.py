@@ -1,32 +1,80 @@
 import asyncio
+import atexit
+import logging
+import os
+import threading
+from typing import Optional
 
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from pyeudiw.tools.cache import ProcessWide
 
 from .exceptions import HttpError
 
+logger = logging.getLogger(__name__)
+
+HTTPC_POOL_LIMIT = int(os.getenv("PYEUDIW_HTTPC_POOL_LIMIT", 100))
+HTTPC_POOL_LIMIT_PER_HOST = int(os.getenv("PYEUDIW_HTTPC_POOL_LIMIT_PER_HOST", 10))
+HTTPC_KEEPALIVE_TIMEOUT = float(os.getenv("PYEUDIW_HTTPC_KEEPALIVE_TIMEOUT", 30))
+
+
+def _get_timeout(httpc_params: dict) -> aiohttp.ClientTimeout:
+    """
+    Builds the aiohttp timeout from the httpc parameters.
+
+    :param httpc_params: parameters to perform http requests.
+    :type httpc_params: dict
+
+    :returns: the request timeout
+    :rtype: aiohttp.ClientTimeout
+    """
+    timeout = httpc_params.get("session", {}).get("timeout")
+    if isinstance(timeout, aiohttp.ClientTimeout):
+        return timeout
+    if timeout is None:
+        return aiohttp.ClientTimeout()
+    return aiohttp.ClientTimeout(total=float(timeout))
+
 
 async def fetch(
-    session: aiohttp.ClientSession, url: str, httpc_params: dict
+    session: aiohttp.ClientSession,
+    url: str,
+    httpc_params: dict,
+    headers: Optional[dict] = None,
 ) -> requests.Response:
     """
     Fetches the content of a URL.
 
-    :param session: a dict representing the current session
-    :type session: dict
+    :param session: the aiohttp session used to perform the request
+    :type session: aiohttp.ClientSession
     :param url: the url where fetch the content
     :type url: str
     :param httpc_params: parameters to perform http requests.
     :type httpc_params: dict
+    :param headers: optional request headers
+    :type headers: Optional[dict]
 
-    :returns: the response in string format
-    :rtype: str
+    :returns: the response, with the body already read
+    :rtype: requests.Response
     """
 
-    async with session.get(url, **httpc_params.get("connection", {})) as response:
-        if response.status != 200:  # pragma: no cover
-            response.raise_for_status()
-        return await response
+    async with session.get(
+        url,
+        headers=headers,
+        timeout=_get_timeout(httpc_params),
+        **httpc_params.get("connection", {}),
+    ) as response:
+        res = requests.Response()
+        res.status_code = response.status
+        res.reason = response.reason
+        res.url = str(response.url)
+        res.headers = CaseInsensitiveDict(response.headers)
+        res.encoding = response.charset
+        res._content = await response.read()
+        return res
 
 
 async def fetch_all(
@@ -35,8 +83,8 @@ async def fetch_all(
     """
     Fetches the content of a list of URL.
 
-    :param session: a dict representing the current session
-    :type session: dict
+    :param session: the aiohttp session used to perform the requests
+    :type session: aiohttp.ClientSession
     :param urls: the url list where fetch the content
     :type urls: list[str]
     :param httpc_params: parameters to perform http requests.
@@ -44,8 +92,8 @@ async def fetch_all(
 
     :raises HttpError: if the response status code is not 200 or a connection error occurs
 
-    :returns: the list of responses in string format
-    :rtype: list[str]
+    :returns: the list of responses
+    :rtype: list[requests.Response]
     """
 
     tasks = []
@@ -55,7 +103,7 @@ async def fetch_all(
 
     try:
         results: list[requests.Response] = await asyncio.gather(*tasks)
-    except aiohttp.ClientConnectorError as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         raise HttpError(f"Connection error: {e}")
 
     for r in results:
@@ -65,6 +113,254 @@ async def fetch_all(
     return results
 
 
+class HttpClient:
+    """
+    Long lived HTTP client shared by the whole process.
+
+    Connections are pooled and kept alive between calls, both for the
+    sync transport (a requests Session) and for the async transport
+    (an aiohttp ClientSession bound to an event loop running in a
+    dedicated background thread).
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTPC_POOL_LIMIT,
+        limit_per_host: int = HTTPC_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = HTTPC_KEEPALIVE_TIMEOUT,
+    ) -> None:
+        """
+        Creates an instance of HttpClient.
+
+        :param limit: the maximum number of open connections
+        :type limit: int
+        :param limit_per_host: the maximum number of open connections to the same host
+        :type limit_per_host: int
+        :param keepalive_timeout: seconds an idle connection is kept open
+        :type keepalive_timeout: float
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=limit, pool_maxsize=limit_per_host)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the background event loop, starting it on first use.
+
+        :returns: the event loop
+        :rtype: asyncio.AbstractEventLoop
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="pyeudiw-http-client",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    async def _get_aio_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the aiohttp session, creating it inside the background loop.
+
+        :returns: the shared aiohttp session
+        :rtype: aiohttp.ClientSession
+        """
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._aio_session = aiohttp.ClientSession(connector=connector)
+        return self._aio_session
+
+    async def _fetch_all(
+        self, urls: list[str], httpc_params: dict
+    ) -> list[requests.Response]:
+        session = await self._get_aio_session()
+        return await fetch_all(session, urls, httpc_params)
+
+    async def _fetch_one(
+        self, url: str, httpc_params: dict, headers: Optional[dict]
+    ) -> requests.Response:
+        session = await self._get_aio_session()
+        try:
+            return await fetch(session, url, httpc_params, headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HttpError(f"Connection error: {e}")
+
+    def get_one(
+        self,
+        url: str,
+        httpc_params: dict,
+        headers: Optional[dict] = None,
+        http_async: bool = True,
+    ) -> requests.Response:
+        """
+        Performs a single GET http call, returning the response whatever its status code.
+        This is meant for callers that handle conditional requests (304) on their own.
+
+        :param url: the url where fetch the content
+        :type url: str
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+        :param headers: optional request headers
+        :type headers: Optional[dict]
+        :param http_async: if True the call is performed on the background loop
+        :type http_async: bool
+
+        :raises HttpError: if a connection error occurs
+
+        :returns: the response
+        :rtype: requests.Response
+        """
+        if http_async:
+            future = asyncio.run_coroutine_threadsafe(
+                self._fetch_one(url, httpc_params, headers), self._get_loop()
+            )
+            return future.result()
+
+        try:
+            return self._session.get(
+                url, headers=headers, **self._requests_conf(httpc_params)
+            )  # nosec - B113
+        except requests.exceptions.RequestException as e:
+            raise HttpError(f"Connection error: {e}")
+
+    def _requests_conf(self, httpc_params: dict) -> dict:
+        _conf = {
+            "verify": httpc_params["connection"]["ssl"],
+            "timeout": httpc_params["session"]["timeout"],
+        }
+        if isinstance(_conf["timeout"], aiohttp.ClientTimeout):
+            _conf["timeout"] = _conf["timeout"].total
+        return _conf
+
+    def get(
+        self, urls: list[str], httpc_params: dict, http_async: bool = True
+    ) -> list[requests.Response]:
+        """
+        Performs GET http calls using the pooled connections.
+
+        :param urls: the url list where fetch the content
+        :type urls: list[str]
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+        :param http_async: if True the calls are performed concurrently on the background loop
+        :type http_async: bool
+
+        :raises HttpError: if the response status code is not 200 or a connection error occurs
+
+        :returns: the list of responses
+        :rtype: list[requests.Response]
+        """
+        if not http_async:
+            return self.get_sync(urls, httpc_params)
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_all(urls, httpc_params), self._get_loop()
+        )
+        return future.result()
+
+    async def get_async(
+        self, urls: list[str], httpc_params: dict
+    ) -> list[requests.Response]:
+        """
+        Awaitable version of get, usable from any running event loop.
+
+        :param urls: the url list where fetch the content
+        :type urls: list[str]
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+
+        :raises HttpError: if the response status code is not 200 or a connection error occurs
+
+        :returns: the list of responses
+        :rtype: list[requests.Response]
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_all(urls, httpc_params), self._get_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    def get_sync(self, urls: list[str], httpc_params: dict) -> list[requests.Response]:
+        """
+        Performs GET http calls sequentially on the pooled requests session.
+
+        :param urls: the url list where fetch the content
+        :type urls: list[str]
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+
+        :raises HttpError: if the response status code is not 200 or a connection error occurs
+
+        :returns: the list of responses
+        :rtype: list[requests.Response]
+        """
+        _conf = self._requests_conf(httpc_params)
+        try:
+            res = [self._session.get(url, **_conf) for url in urls]  # nosec - B113
+        except requests.exceptions.RequestException as e:
+            raise HttpError(f"Connection error: {e}")
+
+        for r in res:
+            if r.status_code != 200:
+                raise HttpError(f"HTTP error: {r.status_code} -- {r.reason}")
+
+        return res
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections and stops the background loop.
+        """
+        self._session.close()
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+        if self._aio_session is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(
+                self._aio_session.close(), loop
+            ).result()
+        self._aio_session = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def _new_http_client() -> HttpClient:
+    http_client = HttpClient()
+    atexit.register(http_client.close)
+    return http_client
+
+
+_http_client = ProcessWide(_new_http_client)
+
+
+def get_http_client() -> HttpClient:
+    """
+    Returns the process wide HttpClient, creating it on first use.
+
+    :returns: the shared http client
+    :rtype: HttpClient
+    """
+    return _http_client.get()
+
+
 def http_get_sync(urls: list[str], httpc_params: dict) -> list[requests.Response]:
     """
     Perform a GET http call sync.
@@ -79,28 +375,13 @@ def http_get_sync(urls: list[str], httpc_params: dict) -> list[requests.Response
     :returns: the list of responses
     :rtype: list[requests.Response]
     """
-    _conf = {
-        "verify": httpc_params["connection"]["ssl"],
-        "timeout": httpc_params["session"]["timeout"],
-    }
-    try:
-        res = [requests.get(url, **_conf) for url in urls]  # nosec - B113
-    except requests.exceptions.ConnectionError as e:
-        raise HttpError(f"Connection error: {e}")
-
-    for r in res:
-        if r.status_code != 200:
-            raise HttpError(f"HTTP error: {r.status_code} -- {r.reason}")
-
-    return res
+    return get_http_client().get_sync(urls, httpc_params)
 
 
 async def http_get_async(urls, httpc_params: dict) -> list[requests.Response]:
     """
     Perform a GET http call async.
 
-    :param session: a dict representing the current session
-    :type session: dict
     :param urls: the url list where fetch the content
     :type urls: list[str]
     :param httpc_params: parameters to perform http requests.
@@ -111,14 +392,7 @@ async def http_get_async(urls, httpc_params: dict) -> list[requests.Response]:
     :returns: the list of responses
     :rtype: list[requests.Response]
     """
-    if not isinstance(httpc_params["session"]["timeout"], aiohttp.ClientTimeout):
-        httpc_params["session"]["timeout"] = aiohttp.ClientTimeout(
-            total=httpc_params["session"]["timeout"]
-        )
-
-    async with aiohttp.ClientSession(**httpc_params.get("session", {})) as session:
-        text = await fetch_all(session, urls, httpc_params)
-        return text
+    return await get_http_client().get_async(urls, httpc_params)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,5 +1,11 @@
+import hashlib
 import logging
-from typing import Optional
+import os
+from copy import deepcopy
+from typing import Optional, Sequence
+
+from pyeudiw.jwt.utils import decode_jwt_payload
+from pyeudiw.tools.cache import CacheInfo, LRUCache, ProcessWide
 
 from .exceptions import PolicyError
 
@@ -9,6 +15,12 @@ __version__ = ""
 
 logger = logging.getLogger(__name__)
 
+METADATA_POLICY_CACHE_MAXSIZE = int(
+    os.getenv("PYEUDIW_METADATA_POLICY_CACHE_MAXSIZE", 256)
+)
+
+PolicyPlanCacheInfo = CacheInfo
+
 
 def combine_subset_of(s1, s2):
     return list(set(s1).intersection(set(s2)))
@@ -281,6 +293,154 @@ def union(val1, val2):
     return base.union(ext)
 
 
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+class _ClaimPlan:
+    """
+    The operators of the combined policy of a claim, with their value sets built once.
+    """
+
+    __slots__ = (
+        "claim",
+        "has_value",
+        "value",
+        "one_of",
+        "add",
+        "subset_of",
+        "superset_of",
+        "default",
+        "has_default",
+        "essential",
+    )
+
+    def __init__(self, claim: str, policy: dict) -> None:
+        self.claim = claim
+        self.has_value = "value" in policy
+        self.value = policy.get("value")
+        self.one_of = frozenset(policy["one_of"]) if "one_of" in policy else None
+        self.add = (
+            list(dict.fromkeys(_as_list(policy["add"]))) if "add" in policy else None
+        )
+        self.subset_of = (
+            frozenset(policy["subset_of"]) if "subset_of" in policy else None
+        )
+        self.superset_of = (
+            frozenset(policy["superset_of"]) if "superset_of" in policy else None
+        )
+        self.has_default = "default" in policy
+        self.default = policy.get("default")
+        self.essential = bool(policy.get("essential"))
+
+    def apply(self, value):
+        """
+        Applies the operators to the value of a claim present in the metadata.
+        The order is value, one_of, add and then subset_of and superset_of.
+        """
+        if self.has_value:
+            return self.value
+
+        if self.one_of is not None:
+            # The is for claims that can have only one value
+            if isinstance(value, list):
+                for item in value:
+                    if item in self.one_of:
+                        return item
+                raise PolicyError(
+                    f"{self.claim}: None of {value} among {list(self.one_of)}"
+                )
+            if value not in self.one_of:
+                raise PolicyError(f"{value} not among {list(self.one_of)}")
+            return value
+
+        # The following is for claims that can have lists of values
+        if self.add is not None:
+            value = list(dict.fromkeys([*_as_list(value), *self.add]))
+
+        if self.subset_of is not None:
+            _val = [
+                item for item in dict.fromkeys(_as_list(value)) if item in self.subset_of
+            ]
+            if not _val:
+                raise PolicyError(f"{value} not subset of {list(self.subset_of)}")
+            value = _val
+
+        if self.superset_of is not None and not self.superset_of.issubset(
+            _as_list(value)
+        ):
+            raise PolicyError(f"{value} not superset of {list(self.superset_of)}")
+
+        return value
+
+    def apply_missing(self, metadata: dict) -> None:
+        """
+        Sets the claim absent from the metadata, if the operators provide a value.
+        """
+        if self.has_value:
+            metadata[self.claim] = self.value
+        elif self.add is not None:
+            metadata[self.claim] = list(self.add)
+        elif self.has_default:
+            metadata[self.claim] = self.default
+        elif self.essential:
+            raise PolicyError(f"Essential claim '{self.claim}' missing")
+
+
+class MetadataPolicyPlan:
+    """
+    A combined metadata policy compiled once, to be applied to any metadata
+    of the same entity type with a single pass over the policy claims.
+
+    The plan is immutable and can be shared: applying it never modifies
+    the given metadata, nor the policy it was compiled from. The values set
+    by the policy are shared by the results and must not be modified.
+    """
+
+    def __init__(self, policy: dict) -> None:
+        """
+        Compiles a combined policy.
+
+        :param policy: A dictionary with metadata and metadata_policy as keys,
+            as returned by TrustChainPolicy.gather_policies
+        :type policy: dict
+        """
+        policy = deepcopy(policy)
+        self.claims: tuple[_ClaimPlan, ...] = tuple(
+            _ClaimPlan(claim, claim_policy)
+            for claim, claim_policy in (policy.get("metadata_policy") or {}).items()
+        )
+        self.metadata: dict = policy.get("metadata") or {}
+
+    def apply(self, metadata: dict) -> dict:
+        """
+        Applies the policy to a metadata statement.
+
+        :param metadata: the metadata of an entity type
+        :type metadata: dict
+
+        :raises PolicyError: if the metadata does not adhere to the policy
+
+        :returns: a metadata statement that adheres to the metadata policy,
+            the given one if the plan is empty
+        :rtype: dict
+        """
+        if not self.claims and not self.metadata:
+            return metadata
+
+        result = dict(metadata)
+
+        for plan in self.claims:
+            if plan.claim in result:
+                result[plan.claim] = plan.apply(result[plan.claim])
+            else:
+                plan.apply_missing(result)
+
+        # All that are in metadata but not in policy should just remain
+        result.update(self.metadata)
+        return result
+
+
 class TrustChainPolicy(object):
     def gather_policies(self, chain, entity_type):
         """
@@ -318,96 +478,6 @@ class TrustChainPolicy(object):
 
         return _rule
 
-    def _apply_metadata_policy(self, metadata, metadata_policy):
-        """
-        Apply a metadata policy to a metadata statement.
-        The order is value, add, default and then check subset_of/superset_of and one_of
-        """
-
-        policy_set = set(metadata_policy.keys())
-        metadata_set = set(metadata.keys())
-
-        # Metadata claims that there exists a policy for
-        for claim in metadata_set.intersection(policy_set):
-            if "value" in metadata_policy[claim]:  # value overrides everything
-                metadata[claim] = metadata_policy[claim]["value"]
-            else:
-                if "one_of" in metadata_policy[claim]:
-                    # The is for claims that can have only one value
-                    # Should not be but ...
-                    if isinstance(metadata[claim], list):
-                        _claim = [
-                            c
-                            for c in metadata[claim]
-                            if c in metadata_policy[claim]["one_of"]
-                        ]
-                        if _claim:
-                            metadata[claim] = _claim[0]
-                        else:
-                            raise PolicyError(
-                                "{}: None of {} among {}".format(
-                                    claim,
-                                    metadata[claim],
-                                    metadata_policy[claim]["one_of"],
-                                )
-                            )
-                    else:
-                        if metadata[claim] in metadata_policy[claim]["one_of"]:
-                            pass
-                        else:
-                            raise PolicyError(
-                                f"{metadata[claim]} not among {metadata_policy[claim]['one_of']}"
-                            )
-                else:
-                    # The following is for claims that can have lists of values
-                    if "add" in metadata_policy[claim]:
-                        metadata[claim] = list(
-                            union(metadata[claim], metadata_policy[claim]["add"])
-                        )
-
-                    if "subset_of" in metadata_policy[claim]:
-                        _val = set(metadata_policy[claim]["subset_of"]).intersection(
-                            set(metadata[claim])
-                        )
-                        if _val:
-                            metadata[claim] = list(_val)
-                        else:
-                            raise PolicyError(
-                                "{} not subset of {}".format(
-                                    metadata[claim], metadata_policy[claim]["subset_of"]
-                                )
-                            )
-                    if "superset_of" in metadata_policy[claim]:
-                        if set(metadata_policy[claim]["superset_of"]).difference(
-                            set(metadata[claim])
-                        ):
-                            raise PolicyError(
-                                "{} not superset of {}".format(
-                                    metadata[claim],
-                                    metadata_policy[claim]["superset_of"],
-                                )
-                            )
-                        else:
-                            pass
-
-        # In policy but not in metadata
-        for claim in policy_set.difference(metadata_set):
-            if "value" in metadata_policy[claim]:
-                metadata[claim] = metadata_policy[claim]["value"]
-            elif "add" in metadata_policy[claim]:
-                metadata[claim] = metadata_policy[claim]["add"]
-            elif "default" in metadata_policy[claim]:
-                metadata[claim] = metadata_policy[claim]["default"]
-
-            if claim not in metadata:
-                if (
-                    "essential" in metadata_policy[claim]
-                    and metadata_policy[claim]["essential"]
-                ):
-                    raise PolicyError(f"Essential claim '{claim}' missing")
-
-        return metadata
-
     def apply_policy(self, metadata: dict, policy: dict) -> dict:
         """
         Apply a metadata policy on metadata.
@@ -416,14 +486,7 @@ class TrustChainPolicy(object):
         :param policy: A dictionary with metadata and metadata_policy as keys
         :return: A metadata statement that adheres to a metadata policy
         """
-
-        if policy["metadata_policy"]:
-            metadata = self._apply_metadata_policy(metadata, policy["metadata_policy"])
-
-        # All that are in metadata but not in policy should just remain
-        metadata.update(policy["metadata"])
-
-        return metadata
+        return MetadataPolicyPlan(policy).apply(metadata)
 
     def _policy(self, trust_chain, entity_type: str):
 
@@ -460,3 +523,89 @@ class TrustChainPolicy(object):
             ]
             trust_chain.combined_policy[entity_type] = {}
 
+
+class MetadataPolicyPlanCache:
+    """
+    Bounded cache of the metadata policy plans of the trust chains, keyed by
+    the SHA-256 digests of the subordinate statements and by entity type.
+
+    The policy combined along a chain does not change until one of its
+    statements does, so it is gathered and compiled once and kept until
+    the first statement of the chain expires; statements without exp are
+    never cached. The least recently used plans are evicted, a maxsize of
+    0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int = METADATA_POLICY_CACHE_MAXSIZE) -> None:
+        """
+        Creates an instance of MetadataPolicyPlanCache.
+
+        :param maxsize: the maximum number of cached plans
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+
+        self._entries: LRUCache[tuple, MetadataPolicyPlan] = LRUCache(maxsize)
+
+    def get_plan(self, statements: Sequence[str], entity_type: str) -> MetadataPolicyPlan:
+        """
+        Returns the plan of the policy combined along the given statements.
+
+        :param statements: the subordinate statements of the chain in compact
+            serialization, from the one issued by the trust anchor down to the
+            one about the leaf
+        :type statements: Sequence[str]
+        :param entity_type: the entity type of the metadata
+        :type entity_type: str
+
+        :raises PolicyError: if the policies of the chain cannot be combined
+
+        :returns: the compiled policy
+        :rtype: MetadataPolicyPlan
+        """
+        key = (
+            tuple(hashlib.sha256(jws.encode()).digest() for jws in statements),
+            entity_type,
+        )
+
+        if (plan := self._entries.get(key)) is not None:
+            return plan
+
+        payloads = [decode_jwt_payload(jws) for jws in statements]
+        plan = MetadataPolicyPlan(
+            TrustChainPolicy().gather_policies(payloads, entity_type)
+        )
+
+        exps = [payload.get("exp") for payload in payloads]
+        if exps and all(isinstance(exp, int) for exp in exps):
+            self._entries.put(key, plan, min(exps))
+
+        return plan
+
+    def cache_info(self) -> PolicyPlanCacheInfo:
+        """
+        Returns the cache statistics.
+
+        :returns: the statistics
+        :rtype: PolicyPlanCacheInfo
+        """
+        return self._entries.cache_info()
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the plans and resets the statistics.
+        """
+        self._entries.cache_clear()
+
+
+_metadata_policy_plan_cache = ProcessWide(MetadataPolicyPlanCache)
+
+
+def get_metadata_policy_plan_cache() -> MetadataPolicyPlanCache:
+    """
+    Returns the process wide MetadataPolicyPlanCache, creating it on first use.
+
+    :returns: the shared metadata policy plan cache
+    :rtype: MetadataPolicyPlanCache
+    """
+    return _metadata_policy_plan_cache.get()
@@ -0,0 +1,150 @@
+import hashlib
+import os
+from typing import Optional, Sequence
+
+from pyeudiw.jwk.jwks import get_key_set
+from pyeudiw.jwt.verification import JWSVerificationResult, verify_jws_batch
+from pyeudiw.tools.cache import CacheInfo, LRUCache, ProcessWide
+
+VERIFIED_STATEMENT_CACHE_MAXSIZE = int(
+    os.getenv("PYEUDIW_VERIFIED_STATEMENT_CACHE_MAXSIZE", 1024)
+)
+
+StatementCacheInfo = CacheInfo
+
+
+class VerifiedStatementCache:
+    """
+    Bounded cache of the payloads of entity statements whose signature was
+    verified, keyed by the SHA-256 digest of the compact JWS and by the
+    SHA-256 thumbprint of the verifying key.
+
+    An entry expires together with the statement exp claim; statements
+    without exp are never cached. The least recently used entries are
+    evicted, a maxsize of 0 disables the cache.
+
+    The cached payloads are shared and must not be modified by the callers.
+    """
+
+    def __init__(self, maxsize: int = VERIFIED_STATEMENT_CACHE_MAXSIZE) -> None:
+        """
+        Creates an instance of VerifiedStatementCache.
+
+        :param maxsize: the maximum number of cached statements
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+
+        self._entries: LRUCache[tuple[bytes, bytes], dict] = LRUCache(maxsize)
+
+    @staticmethod
+    def _key(jws: str, thumbprint: bytes) -> tuple[bytes, bytes]:
+        return hashlib.sha256(jws.encode()).digest(), thumbprint
+
+    def get(self, jws: str, thumbprint: bytes) -> Optional[dict]:
+        """
+        Returns the payload of a statement verified with the given key,
+        if present and not expired.
+
+        :param jws: the statement in compact serialization
+        :type jws: str
+        :param thumbprint: the SHA-256 thumbprint of the verifying key
+        :type thumbprint: bytes
+
+        :returns: the statement payload or None
+        :rtype: Optional[dict]
+        """
+        return self._entries.get(self._key(jws, thumbprint))
+
+    def put(self, jws: str, thumbprint: bytes, payload: dict) -> None:
+        """
+        Stores the payload of a statement verified with the given key.
+
+        :param jws: the statement in compact serialization
+        :type jws: str
+        :param thumbprint: the SHA-256 thumbprint of the verifying key
+        :type thumbprint: bytes
+        :param payload: the verified statement payload
+        :type payload: dict
+        """
+        if not isinstance(payload.get("exp"), int):
+            return
+
+        self._entries.put(self._key(jws, thumbprint), payload, payload["exp"])
+
+    def verify(self, jws: str, jwk: dict) -> dict:
+        """
+        Verifies the signature of a statement with the given key,
+        the signature is checked only if the statement is not cached.
+
+        :param jws: the statement in compact serialization
+        :type jws: str
+        :param jwk: the verifying key
+        :type jwk: dict
+
+        :raises JWSVerificationError: if the signature or the claims are not valid
+
+        :returns: the statement payload
+        :rtype: dict
+        """
+        return self.verify_many([(jws, jwk)])[0].unwrap()
+
+    def verify_many(
+        self, items: Sequence[tuple[str, dict]]
+    ) -> list[JWSVerificationResult]:
+        """
+        Verifies the signatures of many statements, each with its key, in a
+        single batch; the statements already cached are not checked again.
+
+        :param items: the statements in compact serialization with their verifying key
+        :type items: Sequence[tuple[str, dict]]
+
+        :returns: a result for each statement, in the same order
+        :rtype: list[JWSVerificationResult]
+        """
+        results: list[Optional[JWSVerificationResult]] = []
+        misses = []
+        for jws, jwk in items:
+            key_set = get_key_set(jwk)
+            payload = self.get(jws, key_set.thumbprints[0])
+            if payload is not None:
+                results.append(JWSVerificationResult(jws, payload=payload, key_index=0))
+            else:
+                results.append(None)
+                misses.append((len(results) - 1, jws, key_set))
+
+        verified = verify_jws_batch([(jws, key_set) for _, jws, key_set in misses])
+        for (i, jws, key_set), result in zip(misses, verified):
+            if result.is_valid:
+                self.put(jws, key_set.thumbprints[0], result.payload)
+            results[i] = result
+
+        return results
+
+    def cache_info(self) -> StatementCacheInfo:
+        """
+        Returns the cache statistics.
+
+        :returns: the statistics
+        :rtype: StatementCacheInfo
+        """
+        return self._entries.cache_info()
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the entries and resets the statistics.
+        """
+        self._entries.cache_clear()
+
+
+_verified_statement_cache = ProcessWide(VerifiedStatementCache)
+
+
+def get_verified_statement_cache() -> VerifiedStatementCache:
+    """
+    Returns the process wide VerifiedStatementCache, creating it on first use.
+
+    :returns: the shared verified statement cache
+    :rtype: VerifiedStatementCache
+    """
+    return _verified_statement_cache.get()
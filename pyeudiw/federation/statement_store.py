@@ -0,0 +1,449 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple, Optional, Union
+
+from pyeudiw.federation.http_client import get_http_client
+from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload
+from pyeudiw.tools.cache import LRUCache
+from pyeudiw.tools.utils import iat_now
+
+if TYPE_CHECKING:
+    import requests
+
+    from pyeudiw.storage.db_engine import DBEngine
+
+logger = logging.getLogger(__name__)
+
+FEDERATION_STATEMENT_STORE_MAXSIZE = int(
+    os.getenv("PYEUDIW_FEDERATION_STATEMENT_STORE_MAXSIZE", 1024)
+)
+FEDERATION_STATEMENT_REFRESH_TTL = int(
+    os.getenv("PYEUDIW_FEDERATION_STATEMENT_REFRESH_TTL", 3600)
+)
+
+FederationStatementStoreInfo = NamedTuple(
+    "FederationStatementStoreInfo",
+    [
+        ("hits", int),
+        ("storage_hits", int),
+        ("misses", int),
+        ("revalidations", int),
+        ("evictions", int),
+        ("currsize", int),
+        ("maxsize", int),
+    ],
+)
+
+
+@dataclass
+class FederationStatement:
+    """
+    An entity configuration or a subordinate statement, with its decoded
+    header and payload.
+
+    :param jwt: the statement in compact serialization
+    :param header: the decoded header
+    :param payload: the decoded payload
+    :param url: the url the statement was fetched from, if any
+    :param etag: the ETag of the response the statement was fetched with, if any
+    :param checked_at: the unix timestamp of the last fetch or revalidation
+    """
+
+    jwt: str
+    header: dict
+    payload: dict
+    url: Optional[str] = None
+    etag: Optional[str] = None
+    checked_at: float = field(default_factory=time.time)
+
+    @property
+    def iss(self) -> str:
+        return self.payload["iss"]
+
+    @property
+    def sub(self) -> str:
+        return self.payload["sub"]
+
+    @property
+    def exp(self) -> int:
+        return self.payload["exp"]
+
+    def is_expired(self) -> bool:
+        return self.exp <= iat_now()
+
+    @classmethod
+    def from_jwt(
+        cls,
+        jwt: Union[str, bytes],
+        url: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> "FederationStatement":
+        """
+        Decodes a statement, without verifying it.
+
+        :param jwt: the statement in compact serialization
+        :type jwt: Union[str, bytes]
+        :param url: the url the statement was fetched from
+        :type url: Optional[str]
+        :param etag: the ETag of the response the statement was fetched with
+        :type etag: Optional[str]
+
+        :raises ValueError: if the statement is not a JWT with iss, sub and an integer exp
+
+        :returns: the statement
+        :rtype: FederationStatement
+        """
+        if isinstance(jwt, bytes):
+            jwt = jwt.decode()
+
+        try:
+            header = decode_jwt_header(jwt)
+            payload = decode_jwt_payload(jwt)
+        except Exception as e:
+            raise ValueError(f"Not a federation statement: {e}")
+
+        if not isinstance(payload.get("exp"), int) or not (
+            payload.get("iss") and payload.get("sub")
+        ):
+            raise ValueError("A federation statement needs iss, sub and exp claims")
+
+        return cls(jwt, header, payload, url, etag)
+
+    def serialize(self) -> dict:
+        """
+        Returns the statement in the form kept by the storage.
+
+        :returns: the statement as dict
+        :rtype: dict
+        """
+        return {
+            "iss": self.iss,
+            "sub": self.sub,
+            "exp": self.exp,
+            "jwt": self.jwt,
+            "url": self.url,
+            "etag": self.etag,
+            "checked_at": self.checked_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FederationStatement":
+        """
+        Loads a statement from the form kept by the storage.
+
+        :param data: the statement as dict
+        :type data: dict
+
+        :returns: the statement
+        :rtype: FederationStatement
+        """
+        statement = cls.from_jwt(data["jwt"], data.get("url"), data.get("etag"))
+        statement.checked_at = data.get("checked_at", statement.checked_at)
+        return statement
+
+
+class FederationStatementStore:
+    """
+    Store of the federation entity configurations and subordinate statements,
+    keyed by (iss, sub); an entity configuration is keyed by (entity_id, entity_id).
+
+    The statements are kept in memory, bounded by maxsize and evicted least
+    recently used first, and in the storage backend when a DBEngine is set,
+    so that they are shared by the processes. A statement is served until
+    its exp; once older than refresh_ttl it is revalidated with a conditional
+    request on the url it was fetched from, when the revalidation fails the
+    statement is still served until it expires.
+
+    A statement is stored only under the (iss, sub) it was fetched for, so that
+    an entity cannot publish statements in place of another one; their
+    signatures are verified by the callers.
+    """
+
+    def __init__(
+        self,
+        db_engine: Optional["DBEngine"] = None,
+        maxsize: int = FEDERATION_STATEMENT_STORE_MAXSIZE,
+        refresh_ttl: int = FEDERATION_STATEMENT_REFRESH_TTL,
+    ) -> None:
+        """
+        Creates an instance of FederationStatementStore.
+
+        :param db_engine: the storage backend used as second tier, if any
+        :type db_engine: Optional[DBEngine]
+        :param maxsize: the maximum number of statements kept in memory
+        :type maxsize: int
+        :param refresh_ttl: seconds after which a statement is revalidated
+        :type refresh_ttl: int
+        """
+        self.db_engine = db_engine
+        self.maxsize = maxsize
+        self.refresh_ttl = refresh_ttl
+
+        self._lock = threading.Lock()
+        self._entries: LRUCache[tuple[str, str], FederationStatement] = LRUCache(maxsize)
+        self._invalidated: set[tuple[str, str]] = set()
+
+        self.storage_hits = 0
+        self.revalidations = 0
+
+    def _remember(self, statement: FederationStatement) -> None:
+        self._entries.put((statement.iss, statement.sub), statement, statement.exp)
+
+    def _load(self, iss: str, sub: str) -> Optional[FederationStatement]:
+        if self.db_engine is None:
+            return None
+
+        try:
+            data = self.db_engine.get_federation_statement(iss, sub)
+            return FederationStatement.from_dict(data)
+        except Exception as e:
+            logger.debug(f"Federation statement {iss} about {sub} not in storage: {e}")
+            return None
+
+    def _save(self, statement: FederationStatement) -> None:
+        if self.db_engine is None:
+            return
+
+        try:
+            self.db_engine.add_federation_statement(statement.serialize())
+        except Exception as e:
+            logger.warning(
+                f"Cannot store the federation statement {statement.iss} "
+                f"about {statement.sub}: {e}"
+            )
+
+    def get(self, iss: str, sub: str) -> Optional[FederationStatement]:
+        """
+        Returns a statement not yet expired, from memory or from the storage.
+
+        :param iss: the issuer of the statement
+        :type iss: str
+        :param sub: the subject of the statement
+        :type sub: str
+
+        :returns: the statement or None
+        :rtype: Optional[FederationStatement]
+        """
+        key = (iss, sub)
+
+        statement = self._entries.get(key)
+        if statement is not None:
+            return statement
+
+        with self._lock:
+            invalidated = key in self._invalidated
+
+        statement = None if invalidated else self._load(iss, sub)
+        if statement is None or statement.is_expired():
+            return None
+
+        with self._lock:
+            self.storage_hits += 1
+        self._remember(statement)
+        return statement
+
+    def put(
+        self,
+        jwt: Union[str, bytes],
+        iss: str,
+        sub: str,
+        url: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> FederationStatement:
+        """
+        Stores a statement, replacing the one with the same iss and sub.
+
+        :param jwt: the statement in compact serialization
+        :type jwt: Union[str, bytes]
+        :param iss: the issuer the statement is expected from
+        :type iss: str
+        :param sub: the subject the statement is expected about
+        :type sub: str
+        :param url: the url the statement was fetched from
+        :type url: Optional[str]
+        :param etag: the ETag of the response the statement was fetched with
+        :type etag: Optional[str]
+
+        :raises ValueError: if jwt is not a federation statement of iss about sub
+
+        :returns: the stored statement
+        :rtype: FederationStatement
+        """
+        statement = FederationStatement.from_jwt(jwt, url, etag)
+        if (statement.iss, statement.sub) != (iss, sub):
+            raise ValueError(
+                f"Expected a statement of {iss} about {sub}, "
+                f"got one of {statement.iss} about {statement.sub}"
+            )
+
+        if statement.is_expired():
+            return statement
+
+        with self._lock:
+            self._invalidated.discard((statement.iss, statement.sub))
+        self._remember(statement)
+        self._save(statement)
+        return statement
+
+    def put_response(
+        self, url: str, response: "requests.Response", iss: str, sub: str
+    ) -> Union[str, bytes]:
+        """
+        Stores the statement fetched with a response, if any.
+
+        :param url: the url the response was fetched from
+        :type url: str
+        :param response: the response
+        :type response: requests.Response
+        :param iss: the issuer the statement is expected from
+        :type iss: str
+        :param sub: the subject the statement is expected about
+        :type sub: str
+
+        :returns: the content of the response
+        :rtype: Union[str, bytes]
+        """
+        content = response.content
+        try:
+            headers = getattr(response, "headers", None) or {}
+            self.put(content, iss, sub, url, headers.get("ETag"))
+        except Exception as e:
+            logger.debug(f"Response of {url} not stored as federation statement: {e}")
+        return content
+
+    def invalidate(self, iss: str, sub: str) -> None:
+        """
+        Discards a statement, so that the next lookup fetches it again.
+        The copy in the storage is ignored until it is replaced by the next put.
+
+        :param iss: the issuer of the statement
+        :type iss: str
+        :param sub: the subject of the statement
+        :type sub: str
+        """
+        self._entries.pop((iss, sub))
+        with self._lock:
+            self._invalidated.add((iss, sub))
+
+    def needs_revalidation(self, statement: FederationStatement) -> bool:
+        """
+        Tells if a statement is older than refresh_ttl.
+
+        :param statement: the statement
+        :type statement: FederationStatement
+
+        :returns: True if the statement has to be revalidated
+        :rtype: bool
+        """
+        return bool(statement.url) and (
+            statement.checked_at + self.refresh_ttl <= time.time()
+        )
+
+    def revalidate(
+        self, statement: FederationStatement, httpc_params: dict
+    ) -> FederationStatement:
+        """
+        Fetches a statement again from its url, conditionally on its ETag.
+        When the statement did not change or cannot be fetched the
+        stored one is returned.
+
+        :param statement: the statement
+        :type statement: FederationStatement
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+
+        :returns: the current statement
+        :rtype: FederationStatement
+        """
+        headers = {"If-None-Match": statement.etag} if statement.etag else None
+
+        try:
+            response = get_http_client().get_one(
+                statement.url, httpc_params, headers, http_async=False
+            )
+        except Exception as e:
+            logger.warning(f"Cannot revalidate {statement.url}: {e}")
+            return statement
+
+        with self._lock:
+            self.revalidations += 1
+
+        if response.status_code == 304:
+            statement.checked_at = time.time()
+            self._save(statement)
+            return statement
+
+        if response.status_code != 200:
+            logger.warning(
+                f"Cannot revalidate {statement.url}: status code {response.status_code}"
+            )
+            return statement
+
+        try:
+            return self.put(
+                response.content,
+                statement.iss,
+                statement.sub,
+                statement.url,
+                response.headers.get("ETag"),
+            )
+        except ValueError as e:
+            logger.warning(f"Cannot revalidate {statement.url}: {e}")
+            return statement
+
+    def lookup(
+        self, iss: str, sub: str, httpc_params: dict
+    ) -> Optional[FederationStatement]:
+        """
+        Returns a statement not yet expired, revalidating it if older than refresh_ttl.
+
+        :param iss: the issuer of the statement
+        :type iss: str
+        :param sub: the subject of the statement
+        :type sub: str
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+
+        :returns: the statement or None
+        :rtype: Optional[FederationStatement]
+        """
+        statement = self.get(iss, sub)
+        if statement is not None and self.needs_revalidation(statement):
+            statement = self.revalidate(statement, httpc_params)
+        return statement
+
+    def cache_info(self) -> FederationStatementStoreInfo:
+        """
+        Returns the store statistics.
+
+        :returns: the statistics
+        :rtype: FederationStatementStoreInfo
+        """
+        with self._lock:
+            storage_hits, revalidations = self.storage_hits, self.revalidations
+        info = self._entries.cache_info()
+
+        return FederationStatementStoreInfo(
+            info.hits,
+            storage_hits,
+            # the lookups missed in memory and found in the storage are storage hits
+            info.misses - storage_hits,
+            revalidations,
+            info.evictions,
+            info.currsize,
+            info.maxsize,
+        )
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the statements kept in memory and resets the statistics.
+        """
+        self._entries.cache_clear()
+        with self._lock:
+            self._invalidated.clear()
+            self.storage_hits = 0
+            self.revalidations = 0
+
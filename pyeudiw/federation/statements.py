@@ -17,9 +17,10 @@ from pyeudiw.federation.schemas.entity_configuration import (
     EntityConfigurationHeader,
     EntityStatementPayload,
 )
+from pyeudiw.federation.statement_store import FederationStatementStore
 from pyeudiw.jwk.jwks import find_jwk_by_kid
-from pyeudiw.jwt.jws_helper import JWSHelper
 from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload
+from pyeudiw.jwt.verification import JWSVerificationResult, verify_jws_batch
 from pyeudiw.tools.utils import get_http_url
 
 OIDCFED_FEDERATION_WELLKNOWN_URL = ".well-known/openid-federation"
@@ -43,7 +44,11 @@ def get_federation_jwks(jwt_payload: dict) -> list[dict]:
 
 
 def get_entity_statements(
-    urls: list[str] | str, httpc_params: dict, http_async: bool = True
+    urls: list[str] | str,
+    httpc_params: dict,
+    http_async: bool = True,
+    statement_store: FederationStatementStore | None = None,
+    statements: list[tuple[str, str]] | None = None,
 ) -> list[bytes]:
     """
     Fetches an entity statement from the specified urls.
@@ -54,6 +59,11 @@ def get_entity_statements(
     :type httpc_params: dict
     :param http_async: if is set to True the operation will be performed in async (deafault True)
     :type http_async: bool
+    :param statement_store: the federation statement store the fetched statements are added to, if any
+    :type statement_store: FederationStatementStore | None
+    :param statements: the (iss, sub) of the statement expected at each url,
+        the fetched statements are added to the store only if given
+    :type statements: list[tuple[str, str]] | None
 
     :returns: A list of entity statements.
     :rtype: list[Response]
@@ -63,11 +73,96 @@ def get_entity_statements(
     for url in urls:
         logger.debug(f"Starting Entity Statement Request to {url}")
 
-    return [i.content for i in get_http_url(urls, httpc_params, http_async)]
+    responses = get_http_url(urls, httpc_params, http_async)
+    if statement_store is None or statements is None:
+        return [i.content for i in responses]
+
+    return [
+        statement_store.put_response(url, response, iss, sub)
+        for url, response, (iss, sub) in zip(urls, responses, statements)
+    ]
+
+
+def get_entity_statement(
+    superior: str,
+    sub: str,
+    url: str,
+    httpc_params: dict,
+    http_async: bool = False,
+    statement_store: FederationStatementStore | None = None,
+) -> str | bytes:
+    """
+    Returns the entity statement issued by a superior about a subject,
+    from the federation statement store or fetching it from the specified url.
+
+    :param superior: the entity id of the superior
+    :type superior: str
+    :param sub: the subject of the statement
+    :type sub: str
+    :param url: the fetch endpoint url of the statement
+    :type url: str
+    :param httpc_params: parameters to perform http requests.
+    :type httpc_params: dict
+    :param http_async: if is set to True the operation will be performed in async (deafault False)
+    :type http_async: bool
+    :param statement_store: the federation statement store, if any
+    :type statement_store: FederationStatementStore | None
+
+    :returns: the entity statement.
+    :rtype: str | bytes
+    """
+    if statement_store is not None and (
+        statement := statement_store.lookup(superior, sub, httpc_params)
+    ):
+        logger.debug(f"Entity Statement of {superior} about {sub} found in the store")
+        return statement.jwt
+
+    return get_entity_statements(
+        [url], httpc_params, http_async, statement_store, [(superior, sub)]
+    )[0]
+
+
+def get_entity_configuration_url(subject: str) -> str:
+    """
+    Returns the url of the entity configuration of a subject.
+
+    :param subject: the entity id
+    :type subject: str
+
+    :returns: the well known url of the entity configuration
+    :rtype: str
+    """
+    if subject[-1] != "/":
+        subject = f"{subject}/"
+    return f"{subject}{OIDCFED_FEDERATION_WELLKNOWN_URL}"
+
+
+def get_fetch_statement_url(superior: "EntityStatement", sub: str) -> str | None:
+    """
+    Returns the url where a superior publishes the entity statement about a subject.
+
+    :param superior: the entity configuration of the superior
+    :type superior: EntityStatement
+    :param sub: the subject of the statement
+    :type sub: str
+
+    :returns: the fetch endpoint url, None if the superior has no fetch endpoint
+    :rtype: str | None
+    """
+    try:
+        fetch_api_url = superior.payload["metadata"]["federation_entity"][
+            "federation_fetch_endpoint"
+        ]
+    except KeyError:
+        return None
+    return f"{fetch_api_url}?sub={sub}"
 
 
 def get_entity_configurations(
-    subjects: list[str] | str, httpc_params: dict, http_async: bool = False
+    subjects: list[str] | str,
+    httpc_params: dict,
+    http_async: bool = False,
+    statement_store: FederationStatementStore | None = None,
 ) -> list[bytes]:
     """
     Fetches an entity configuration from the specified subjects.
@@ -78,6 +173,8 @@ def get_entity_configurations(
     :type httpc_params: dict
     :param http_async: if is set to True the operation will be performed in async (deafault True)
     :type http_async: bool
+    :param statement_store: the federation statement store, if any
+    :type statement_store: FederationStatementStore | None
 
     :returns: A list of entity statements.
     :rtype: list[Response]
@@ -85,21 +182,41 @@ def get_entity_configurations(
 
     subjects = subjects if isinstance(subjects, list) else [subjects]
 
+    jwts = {}
     urls = []
     for subject in subjects:
-        if subject[-1] != "/":
-            subject = f"{subject}/"
-        url = f"{subject}{OIDCFED_FEDERATION_WELLKNOWN_URL}"
+        if statement_store is not None and (
+            statement := statement_store.lookup(subject, subject, httpc_params)
+        ):
+            logger.debug(f"Entity Configuration of {subject} found in the store")
+            jwts[subject] = statement.jwt
+            continue
+        url = get_entity_configuration_url(subject)
         urls.append(url)
         logger.info(f"Starting Entity Configuration Request for {url}")
 
-    return [i.content for i in get_http_url(urls, httpc_params, http_async)]
+    if urls:
+        responses = get_http_url(urls, httpc_params, http_async)
+        missing = [subject for subject in subjects if subject not in jwts]
+        for subject, url, response in zip(missing, urls, responses):
+            jwts[subject] = (
+                response.content
+                if statement_store is None
+                else statement_store.put_response(url, response, subject, subject)
+            )
+
+    return [jwts[subject] for subject in subjects]
 
 
 class TrustMark:
     """The class representing a Trust Mark"""
 
-    def __init__(self, jwt: str, httpc_params: dict):
+    def __init__(
+        self,
+        jwt: str,
+        httpc_params: dict,
+        statement_store: FederationStatementStore | None = None,
+    ):
         """
         Create an instance of Trust Mark
 
@@ -107,6 +224,8 @@ class TrustMark:
         :type jwt: str
         :param httpc_params: parameters to perform http requests.
         :type httpc_params: dict
+        :param statement_store: the federation statement store, if any
+        :type statement_store: FederationStatementStore | None
         """
 
         self.jwt = jwt
@@ -121,16 +240,12 @@ class TrustMark:
 
         self.issuer_entity_configuration: list[bytes] = None
         self.httpc_params = httpc_params
+        self.statement_store = statement_store
 
-    def validate_by(self, ec: dict) -> bool:
+    def _verification_item(self, ec: "EntityStatement") -> tuple[str, dict]:
         """
-        Validates Trust Marks by an Entity Configuration
-
-        :param ec: the entity configuration to validate by
-        :type ec: dict
-
-        :returns: True if is valid otherwise False
-        :rtype: bool
+        checks the header of the trust mark and returns it with the key
+        of the entity configuration that must verify it
         """
         try:
             EntityConfigurationHeader(**self.header)
@@ -149,11 +264,20 @@ class TrustMark:
                 f"{self.header.get('kid')} not found in {ec.jwks}"
             )
 
-        _jwk = find_jwk_by_kid(ec.jwks, _kid)
+        return self.jwt, find_jwk_by_kid(ec.jwks, _kid)
 
+    def validate_by(self, ec: dict) -> bool:
+        """
+        Validates Trust Marks by an Entity Configuration
+
+        :param ec: the entity configuration to validate by
+        :type ec: dict
+
+        :returns: True if is valid otherwise False
+        :rtype: bool
+        """
         # verify signature
-        jwsh = JWSHelper(_jwk)
-        payload = jwsh.verify(self.jwt)
+        payload = verify_jws_batch([self._verification_item(ec)])[0].unwrap()
         self.is_valid = True
         return payload
 
@@ -165,10 +289,9 @@ class TrustMark:
         :rtype: bool
         """
         if not self.issuer_entity_configuration:
-            self.issuer_entity_configuration = [
-                i.content
-                for i in get_entity_configurations(self.iss, self.httpc_params, False)
-            ]
+            self.issuer_entity_configuration = get_entity_configurations(
+                self.iss, self.httpc_params, False, self.statement_store
+            )
 
         _kid = self.header.get("kid")
         try:
@@ -188,8 +311,7 @@ class TrustMark:
 
         # verify signature
         _jwk = find_jwk_by_kid(ec.jwks, _kid)
-        jwsh = JWSHelper(_jwk)
-        payload = jwsh.verify(self.jwt)
+        payload = verify_jws_batch([(self.jwt, _jwk)])[0].unwrap()
         self.is_valid = True
         return payload
 
@@ -209,6 +331,7 @@ class EntityStatement:
         filter_by_allowed_trust_marks: list[str] = [],
         trust_anchor_entity_conf: EntityStatement | None = None,
         trust_mark_issuers_entity_confs: list[EntityStatement] = [],
+        statement_store: FederationStatementStore | None = None,
     ):
         """
         Creates EntityStatement istance
@@ -222,6 +345,8 @@ class EntityStatement:
         :param trust_anchor_entity_conf: the trust anchor entity conf or None
         :type trust_anchor_entity_conf: EntityStatement | None
         :param trust_mark_issuers_entity_confs: the list containig the trust mark's entiity confs
+        :param statement_store: the federation statement store, if any
+        :type statement_store: FederationStatementStore | None
         """
         self.jwt = jwt
         self.header = decode_jwt_header(jwt)
@@ -237,6 +362,7 @@ class EntityStatement:
 
         self.kids = [i.get("kid") for i in self.jwks]
         self.httpc_params = httpc_params
+        self.statement_store = statement_store
 
         self.filter_by_allowed_trust_marks = filter_by_allowed_trust_marks
         self.trust_anchor_entity_conf = trust_anchor_entity_conf
@@ -271,9 +397,10 @@ class EntityStatement:
         """
         self.trust_anchor_entity_conf = trust_anchor_entity_conf
 
-    def validate_by_itself(self) -> bool:
+    def _self_verification_item(self) -> tuple[str, dict]:
         """
-        validates the entity configuration by it self
+        checks the header of the entity configuration and returns it
+        with the key that must verify it
         """
         try:
             EntityConfigurationHeader(**self.header)
@@ -289,13 +416,46 @@ class EntityStatement:
         if _kid not in self.kids:
             raise UnknownKid(f"{_kid} not found in {self.jwks}")  # pragma: no cover
 
+        return self.jwt, find_jwk_by_kid(self.jwks, _kid)
+
+    def validate_by_itself(self) -> bool:
+        """
+        validates the entity configuration by it self
+        """
         # verify signature
-        _jwk = find_jwk_by_kid(self.jwks, _kid)
-        jwsh = JWSHelper(_jwk)
-        jwsh.verify(self.jwt)
+        verify_jws_batch([self._self_verification_item()])[0].unwrap()
         self.is_valid = True
         return True
 
+    @staticmethod
+    def validate_all_by_themselves(
+        ecs: list["EntityStatement"],
+    ) -> list[Exception | None]:
+        """
+        validates many entity configurations by themselves,
+        verifying their signatures in a single batch
+
+        :param ecs: the entity configurations
+        :type ecs: list[EntityStatement]
+
+        :returns: for each entity configuration, None if valid or the reason of the failure
+        :rtype: list[Exception | None]
+        """
+        errors: list[Exception | None] = [None] * len(ecs)
+        items = []
+        for i, ec in enumerate(ecs):
+            try:
+                items.append((i, ec._self_verification_item()))
+            except Exception as e:
+                errors[i] = e
+
+        results = verify_jws_batch([item for _, item in items])
+        for (i, _), result in zip(items, results):
+            errors[i] = result.error
+            ecs[i].is_valid = result.is_valid
+
+        return errors
+
     def validate_by_allowed_trust_marks(self) -> bool:
         """
         validate the entity configuration ony if marked by a well known
@@ -327,7 +487,9 @@ class EntityStatement:
                 continue
 
             try:
-                trust_mark = TrustMark(tm["trust_mark"])
+                trust_mark = TrustMark(
+                    tm["trust_mark"], self.httpc_params, self.statement_store
+                )
             except KeyError:
                 logger.warning(
                     f"Trust Mark decoding failed on [{tm}]. "
@@ -348,41 +510,99 @@ class EntityStatement:
             "trust_marks_issuers", {}
         )
 
-        # TODO : cache of issuers -> it would be better to have a proxy function
-        #
-        # required_issuer_ecs = []
-        # for trust_mark in trust_marks:
-        # if trust_mark.iss not in [
-        # i.payload.get('iss', None)
-        # for i in self.trust_mark_issuers_entity_confs
-        # ]:
-        # required_issuer_ecs.append(trust_mark.iss)
-        # TODO: snippet for CACHE
-        # if required_issuer_ec:
-        # ## fetch the issuer entity configuration and validate it
-        # iecs = get_entity_configurations(
-        # [required_issuer_ecs], self.httpc_params
-        # )
-        # for jwt in iecs:
-        # try:
-        # ec = self.__class__(jwt, httpc_params=self.httpc_params)
-        # ec.validate_by_itself()
-        # except Exception as e:
-        # logger.warning(
-        # "Trust Marks issuer Entity Configuration "
-        # f"failed for {jwt}: {e}"
-        # )
-        # continue
-        # self.trust_mark_issuers_entity_confs.append(ec)
+        # the entity configurations of the trust mark issuers are fetched once,
+        # from the federation statement store when available
+        issuers_ecs = {ec.sub: ec for ec in self.trust_mark_issuers_entity_confs}
+        required_issuers = list(
+            dict.fromkeys(
+                trust_mark.iss
+                for trust_mark in trust_marks
+                if trust_mark.iss in trust_mark_issuers_by_id.get(trust_mark.id, [])
+                and trust_mark.iss not in issuers_ecs
+            )
+        )
+        fetched = [ec for ec in issuers_ecs.values() if not ec.is_valid]
+        if required_issuers:
+            try:
+                jwts = get_entity_configurations(
+                    required_issuers,
+                    self.httpc_params,
+                    statement_store=self.statement_store,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Cannot fetch the Trust Marks issuers {required_issuers}: {e}"
+                )
+                jwts = []
+
+            for jwt in jwts:
+                try:
+                    fetched.append(
+                        self.__class__(
+                            jwt,
+                            httpc_params=self.httpc_params,
+                            statement_store=self.statement_store,
+                        )
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Trust Marks issuer Entity Configuration "
+                        f"failed for {jwt}: {e}"
+                    )
+
+        # the issuers signatures are verified in a single batch
+        for ec, error in zip(fetched, self.validate_all_by_themselves(fetched)):
+            if error is not None:
+                logger.warning(
+                    "Trust Marks issuer Entity Configuration "
+                    f"failed for {ec.jwt}: {error}"
+                )
+                issuers_ecs.pop(ec.sub, None)
+                continue
+            issuers_ecs[ec.sub] = ec
+
+        for trust_mark in trust_marks:
+            if trust_mark.iss in issuers_ecs:
+                trust_mark.issuer_entity_configuration = [
+                    issuers_ecs[trust_mark.iss].jwt
+                ]
 
+        # the trust marks signed by a known key are verified in a single batch,
+        # the errors are then raised in the order of the trust marks
+        items = []
+        prepared: list[tuple[int, Exception] | None] = []
         for trust_mark in trust_marks:
+            id_issuers = trust_mark_issuers_by_id.get(trust_mark.id, None)
+            if id_issuers and trust_mark.iss not in id_issuers:
+                prepared.append(None)
+                continue
+            elif id_issuers and trust_mark.iss not in issuers_ecs:
+                # the issuer is fetched and validated on its own
+                prepared.append(None)
+                continue
+
+            ec = issuers_ecs[trust_mark.iss] if id_issuers else self.trust_anchor_entity_conf
+            try:
+                items.append(trust_mark._verification_item(ec))
+            except Exception as e:
+                prepared.append((-1, e))
+            else:
+                prepared.append((len(items) - 1, None))
+
+        results = verify_jws_batch(items)
+
+        for trust_mark, position in zip(trust_marks, prepared):
             id_issuers = trust_mark_issuers_by_id.get(trust_mark.id, None)
             if id_issuers and trust_mark.iss not in id_issuers:
                 is_valid = False
-            elif id_issuers and trust_mark.iss in id_issuers:
+            elif position is None:
                 is_valid = trust_mark.validate_by_its_issuer()
-            elif not id_issuers:
-                is_valid = trust_mark.validate_by(self.trust_anchor_entity_conf)
+            else:
+                index, error = position
+                if error is not None:
+                    raise error
+                results[index].unwrap()
+                trust_mark.is_valid = is_valid = True
 
             if not trust_mark.is_valid:
                 is_valid = False
@@ -414,6 +634,44 @@ class EntityStatement:
         :returns: a dict with the superior's entity configurations
         :rtype: dict
         """
+        authority_hints = self.get_authority_hints(
+            authority_hints, max_authority_hints, superiors_hints
+        )
+
+        jwts = []
+
+        if self.trust_anchor_entity_conf:
+            ta_id = self.trust_anchor_entity_conf.payload.get("sub", {})
+            if ta_id in authority_hints:
+                jwts = [self.trust_anchor_configuration]
+
+        if not jwts:
+            jwts = get_entity_configurations(
+                authority_hints, self.httpc_params, False, self.statement_store
+            )
+
+        return self.add_superiors(jwts, authority_hints)
+
+    def get_authority_hints(
+        self,
+        authority_hints: list[str] = [],
+        max_authority_hints: int = 0,
+        superiors_hints: list[dict] = [],
+    ) -> list[str]:
+        """
+        get the authority hints whose entity configurations must be fetched,
+        the superiors found among the hints are registered as verified superiors
+
+        :param authority_hints: the authority hint list
+        :type authority_hints: list[str]
+        :param max_authority_hints: the number of max authority hint
+        :type max_authority_hints: int
+        :param superiors_hints: the list of superior hints
+        :type superiors_hints: list[dict]
+
+        :returns: the authority hints to fetch
+        :rtype: list[str]
+        """
         # apply limits if defined
         authority_hints = authority_hints or deepcopy(
             self.payload.get("authority_hints", [])
@@ -440,31 +698,39 @@ class EntityStatement:
                 self.verified_superiors[sup.sub] = sup
 
         logger.debug(f"Getting Entity Configurations for {authority_hints}")
+        return authority_hints
 
-        jwts = []
-
-        if self.trust_anchor_entity_conf:
-            ta_id = self.trust_anchor_entity_conf.payload.get("sub", {})
-            if ta_id in authority_hints:
-                jwts = [self.trust_anchor_configuration]
+    def add_superiors(self, jwts: list[str], authority_hints: list[str]) -> dict:
+        """
+        validates the fetched superiors entity configurations
 
-        if not jwts:
-            jwts = get_entity_configurations(authority_hints, self.httpc_params, False)
+        :param jwts: the entity configurations of the superiors
+        :type jwts: list[str]
+        :param authority_hints: the authority hints the configurations were fetched for
+        :type authority_hints: list[str]
 
+        :returns: a dict with the superior's entity configurations
+        :rtype: dict
+        """
+        ecs = []
         for jwt in jwts:
             try:
                 ec = self.__class__(
                     jwt,
                     httpc_params=self.httpc_params,
                     trust_anchor_entity_conf=self.trust_anchor_entity_conf,
+                    statement_store=self.statement_store,
                 )
             except Exception as e:
                 logger.warning(f"Get Entity Configuration for {jwt}: {e}")
                 continue
+            ecs.append(ec)
 
-            if ec.validate_by_itself():
+        for ec, error in zip(ecs, self.validate_all_by_themselves(ecs)):
+            if error is None:
                 target = self.verified_superiors
             else:
+                logger.warning(f"Entity Configuration of {ec.sub} is not valid: {error}")
                 target = self.failed_superiors
 
             target[ec.payload["sub"]] = ec
@@ -478,15 +744,10 @@ class EntityStatement:
 
         return self.verified_superiors
 
-    def validate_descendant_statement(self, jwt: str) -> bool:
+    def _descendant_statement_item(self, jwt: str) -> tuple[str, dict]:
         """
-        jwt is a descendant entity statement issued by self
-
-        :param jwt: the JWT to validate by
-        :type jwt: str
-
-        :returns: True if is valid or False otherwise
-        :rtype: bool
+        checks the header and the payload of a descendant statement
+        and returns it with the key that must verify it
         """
         header = decode_jwt_header(jwt)
         payload = decode_jwt_payload(jwt)
@@ -510,15 +771,27 @@ class EntityStatement:
         if _kid not in self.kids:
             raise UnknownKid(f"{_kid} not found in {self.jwks}")
 
-        # verify signature
-        _jwk = find_jwk_by_kid(self.jwks, _kid)
-        jwsh = JWSHelper(_jwk)
-        payload = jwsh.verify(jwt)
+        return jwt, find_jwk_by_kid(self.jwks, _kid)
 
+    def _add_descendant_statement(self, jwt: str, payload: dict) -> dict:
         self.verified_descendant_statements[payload["sub"]] = payload
         self.verified_descendant_statements_as_jwt[payload["sub"]] = jwt
         return self.verified_descendant_statements
 
+    def validate_descendant_statement(self, jwt: str) -> bool:
+        """
+        jwt is a descendant entity statement issued by self
+
+        :param jwt: the JWT to validate by
+        :type jwt: str
+
+        :returns: True if is valid or False otherwise
+        :rtype: bool
+        """
+        # verify signature
+        payload = verify_jws_batch([self._descendant_statement_item(jwt)])[0].unwrap()
+        return self._add_descendant_statement(jwt, payload)
+
     def validate_by_superior_statement(self, jwt: str, ec: "EntityStatement") -> str:
         """
         validates self with the jwks contained in statement of the superior
@@ -530,42 +803,74 @@ class EntityStatement:
         :returns: the entity configuration subject if is valid
         :rtype: str
         """
-        is_valid = None
-        payload = {}
-        try:
-            payload = decode_jwt_payload(jwt)
-            ec.validate_by_itself()
-            ec.validate_descendant_statement(jwt)
-            _jwks = get_federation_jwks(payload)
-            _jwk = find_jwk_by_kid(_jwks, self.header["kid"])
+        self.validate_by_superior_statements([(jwt, ec)])
+        if self.is_valid:
+            return self.verified_by_superiors.get(ec.sub)
 
-            jwsh = JWSHelper(_jwk)
-            payload = jwsh.verify(self.jwt)
+    def validate_by_superior_statements(
+        self, statements: list[tuple[str, "EntityStatement"]]
+    ) -> None:
+        """
+        validates self with the statements of many superiors: the signatures of
+        the superiors entity configurations, of their statements and of self
+        with the jwks of each statement are all verified in a single batch
 
-            is_valid = True
-        except Exception as e:
-            logger.warning(
-                f"{self.sub} failed validation with "
-                f"{ec.sub}'s superior statement '{payload or jwt}'. "
-                f"Exception: {e}"
-            )
-            is_valid = False
+        :param statements: the statements issued by the superiors in form of JWT,
+            each with the superior entity configuration
+        :type statements: list[tuple[str, EntityStatement]]
+        """
+        # for each superior the signatures to verify, as positions in the batch
+        items = []
+        checks: list[tuple[str, "EntityStatement", dict, list[int]]] = []
+        for jwt, ec in statements:
+            payload = {}
+            try:
+                payload = decode_jwt_payload(jwt)
+                positions = []
+                if not ec.is_valid:
+                    items.append(ec._self_verification_item())
+                    positions.append(len(items) - 1)
+                items.append(ec._descendant_statement_item(jwt))
+                items.append(
+                    (self.jwt, find_jwk_by_kid(get_federation_jwks(payload), self.header["kid"]))
+                )
+                positions.extend((len(items) - 2, len(items) - 1))
+            except Exception as e:
+                self._fail_by_superior_statement(jwt, ec, payload, e)
+                continue
+            checks.append((jwt, ec, payload, positions))
+
+        results: list[JWSVerificationResult] = verify_jws_batch(items)
+
+        for jwt, ec, payload, positions in checks:
+            errors = [results[i].error for i in positions if not results[i].is_valid]
+            if errors:
+                self._fail_by_superior_statement(jwt, ec, payload, errors[0])
+                continue
 
-        if is_valid:
-            target = self.verified_by_superiors
-            ec.verified_descendant_statements[self.sub] = payload
-            ec.verified_descendant_statements_as_jwt[self.sub] = jwt
-            target[payload["iss"]] = ec
+            # the entity configuration of self, verified
+            self_payload = results[positions[-1]].payload
+            if not ec.is_valid:
+                ec.is_valid = True
+            ec._add_descendant_statement(jwt, results[positions[-2]].payload)
+            self.verified_by_superiors[self_payload["iss"]] = ec
             self.is_valid = True
-            return self.verified_by_superiors.get(ec.sub)
-        else:
-            target = self.failed_superiors
-            ec.failed_descendant_statements[self.sub] = payload
-            self.is_valid = False
+
+    def _fail_by_superior_statement(
+        self, jwt: str, ec: "EntityStatement", payload: dict, error: Exception
+    ) -> None:
+        logger.warning(
+            f"{self.sub} failed validation with "
+            f"{ec.sub}'s superior statement '{payload or jwt}'. "
+            f"Exception: {error}"
+        )
+        ec.failed_descendant_statements[self.sub] = payload
+        self.is_valid = False
 
     def validate_by_superiors(
         self,
         superiors_entity_configurations: dict = {},
+        entity_statements: dict[str, str] | None = None,
     ) -> dict:
         """
         validates the entity configuration with the entity statements issued by its superiors
@@ -573,21 +878,21 @@ class EntityStatement:
 
         :param superiors_entity_configurations: an object containing the entity configurations of superiors
         :type superiors_entity_configurations: dict
+        :param entity_statements: the statements already fetched, by fetch endpoint url;
+            if None the statements are fetched one by one
+        :type entity_statements: dict[str, str] | None
 
         :returns: an object containing the superior validations
         :rtype: dict
         """
+        statements = []
         for ec in superiors_entity_configurations:
             if ec.sub in ec.verified_by_superiors:
                 # already fetched and cached
                 continue
 
-            try:
-                # get superior fetch url
-                fetch_api_url = ec.payload["metadata"]["federation_entity"][
-                    "federation_fetch_endpoint"
-                ]
-            except KeyError:
+            _url = get_fetch_statement_url(ec, self.sub)
+            if not _url:
                 logger.warning(
                     "Missing federation_fetch_endpoint in  "
                     f"federation_entity metadata for {self.sub} by {ec.sub}."
@@ -596,17 +901,28 @@ class EntityStatement:
                 continue
 
             else:
-                _url = f"{fetch_api_url}?sub={self.sub}"
-                logger.info(f"Getting entity statements from {_url}")
-                jwts = get_entity_statements([_url], self.httpc_params, False)
+                if entity_statements is None:
+                    logger.info(f"Getting entity statements from {_url}")
+                    jwts = [
+                        get_entity_statement(
+                            ec.sub,
+                            self.sub,
+                            _url,
+                            self.httpc_params,
+                            statement_store=self.statement_store,
+                        )
+                    ]
+                else:
+                    jwts = [entity_statements.get(_url)]
                 if not jwts:
                     logger.error(f"Empty response for {_url}")
                 jwt = jwts[0]
                 if jwt:
-                    self.validate_by_superior_statement(jwt, ec)
+                    statements.append((jwt, ec))
                 else:
                     logger.error(f"JWT validation for {_url}")
 
+        self.validate_by_superior_statements(statements)
         return self.verified_by_superiors
 
     def __repr__(self) -> str:
@@ -1,21 +1,33 @@
 import datetime
 import json
 import logging
+import os
 from collections import OrderedDict
 from typing import Union
 
 from pyeudiw.tools.utils import datetime_from_timestamp
 
+from .discovery import (
+    TRUST_CHAIN_DISCOVERY_LIMIT_PER_HOST,
+    TRUST_CHAIN_DISCOVERY_TIMEOUT,
+    ParallelDiscovery,
+)
 from .exceptions import (
     InvalidEntityStatement,
     InvalidRequiredTrustMark,
     MetadataDiscoveryException,
 )
-from .policy import TrustChainPolicy
+from .policy import get_metadata_policy_plan_cache
+from .statement_store import FederationStatementStore
+from .trust_chain_store import ResolvedTrustChain, TrustChainStore
 from .statements import EntityStatement, get_entity_configurations
 
 logger = logging.getLogger(__name__)
 
+TRUST_CHAIN_PARALLEL_DISCOVERY = os.getenv(
+    "PYEUDIW_TRUST_CHAIN_PARALLEL_DISCOVERY", "false"
+).lower() in ("1", "true", "yes")
+
 
 class TrustChainBuilder:
     """
@@ -31,6 +43,11 @@ class TrustChainBuilder:
         max_authority_hints: int = 10,
         subject_configuration: EntityStatement | None = None,
         required_trust_marks: list[dict] = [],
+        parallel_discovery: bool = TRUST_CHAIN_PARALLEL_DISCOVERY,
+        discovery_timeout: float = TRUST_CHAIN_DISCOVERY_TIMEOUT,
+        discovery_limit_per_host: int = TRUST_CHAIN_DISCOVERY_LIMIT_PER_HOST,
+        statement_store: FederationStatementStore | None = None,
+        trust_chain_store: TrustChainStore | None = None,
         # TODO - prefetch cache?
         # pre_fetched_entity_configurations = {},
         # pre_fetched_statements = {},
@@ -58,21 +75,40 @@ class TrustChainBuilder:
         at least one of the required trust marks is needed to start a metadata discovery
         if this param if absent the filter won't be considered.
         :type required_trust_marks: list[dict]
+        :parameter parallel_discovery: if True the statements of each level of the
+        discovery are fetched concurrently
+        :type parallel_discovery: bool
+        :parameter discovery_timeout: seconds the parallel discovery can last
+        :type discovery_timeout: float
+        :parameter discovery_limit_per_host: maximum number of concurrent requests
+        to the same host during the parallel discovery
+        :type discovery_limit_per_host: int
+        :parameter statement_store: the federation statement store the statements
+        are looked up in and added to, if any
+        :type statement_store: FederationStatementStore | None
+        :parameter trust_chain_store: the store of the resolved trust chains, if any
+        :type trust_chain_store: TrustChainStore | None
 
         """
 
         self.subject = subject
         self.subject_configuration = subject_configuration
         self.httpc_params = httpc_params
+        self.statement_store = statement_store
+        self.trust_chain_store = trust_chain_store
 
         self.trust_anchor = trust_anchor
         if not trust_anchor_configuration:
             try:
                 jwts = get_entity_configurations(
-                    trust_anchor, httpc_params=self.httpc_params
+                    trust_anchor,
+                    httpc_params=self.httpc_params,
+                    statement_store=self.statement_store,
                 )
                 trust_anchor_configuration = EntityStatement(
-                    jwts[0], httpc_params=self.httpc_params
+                    jwts[0],
+                    httpc_params=self.httpc_params,
+                    statement_store=self.statement_store,
                 )
 
                 subject_configuration.update_trust_anchor_conf(
@@ -85,7 +121,9 @@ class TrustChainBuilder:
                 raise InvalidEntityStatement(_msg)
         elif isinstance(trust_anchor_configuration, str):
             trust_anchor_configuration = EntityStatement(
-                jwt=trust_anchor_configuration, httpc_params=self.httpc_params
+                jwt=trust_anchor_configuration,
+                httpc_params=self.httpc_params,
+                statement_store=self.statement_store,
             )
 
         self.trust_anchor_configuration = trust_anchor_configuration
@@ -103,8 +141,14 @@ class TrustChainBuilder:
 
         self.verified_trust_marks = []
         self.exp = 0
+        # set when the chain was already resolved and stored
+        self.resolved_trust_chain: ResolvedTrustChain | None = None
         self._set_max_path_len()
 
+        self.parallel_discovery = parallel_discovery
+        self.discovery_timeout = discovery_timeout
+        self.discovery_limit_per_host = discovery_limit_per_host
+
     def apply_metadata_policy(self) -> dict:
         """
         filters the trust path from subject to trust anchor
@@ -113,6 +157,9 @@ class TrustChainBuilder:
         :returns: the final metadata with policy applied
         :rtype: dict
         """
+        if self.resolved_trust_chain is not None:
+            return self.final_metadata
+
         # find the path of trust
         if not self.trust_path:
             self.trust_path = [self.subject_configuration]
@@ -155,17 +202,21 @@ class TrustChainBuilder:
                 )
                 return
 
-            for i in range(len(self.trust_path))[::-1]:
-                self.trust_path[i - 1].sub
-                _pol = self.trust_path[i].verified_descendant_statements.get(
-                    "metadata_policy", {}
-                )
-                for md_type, md in _pol.items():
-                    if not self.final_metadata.get(md_type):
-                        continue
-                    self.final_metadata[md_type] = TrustChainPolicy().apply_policy(
-                        self.final_metadata[md_type], _pol[md_type]
+            # the statements issued along the path, from the one of the trust anchor
+            statements = [
+                jwt
+                for i in range(len(self.trust_path) - 1, 0, -1)
+                if (
+                    jwt := self.trust_path[i].verified_descendant_statements_as_jwt.get(
+                        self.trust_path[i - 1].sub
                     )
+                )
+            ]
+            plans = get_metadata_policy_plan_cache()
+            self.final_metadata = {
+                md_type: plans.get_plan(statements, md_type).apply(md)
+                for md_type, md in self.final_metadata.items()
+            }
 
         # set exp
         self._set_exp()
@@ -192,6 +243,37 @@ class TrustChainBuilder:
         logger.info(f"Starting a Walk into Metadata Discovery for {self.subject}")
         self.tree_of_trust[0] = [self.subject_configuration]
 
+        if self.parallel_discovery:
+            ParallelDiscovery(
+                self.httpc_params,
+                timeout=self.discovery_timeout,
+                limit_per_host=self.discovery_limit_per_host,
+                statement_store=self.statement_store,
+            ).run(self)
+        else:
+            self._sequential_discovery()
+
+        last_path = list(self.tree_of_trust.keys())[-1]
+        if (
+            self.tree_of_trust[0][0].is_valid
+            and self.tree_of_trust[last_path][0].is_valid
+        ):
+            self.is_valid = True
+            self.apply_metadata_policy()
+
+            if (
+                self.trust_chain_store is not None
+                and self.trust_path
+                and self.trust_path[-1].sub == self.trust_anchor_configuration.sub
+            ):
+                self.trust_chain_store.put(self.get_resolved_trust_chain())
+
+        return self.is_valid
+
+    def _sequential_discovery(self) -> None:
+        """
+        walks the tree of trust fetching the statements one by one.
+        """
         ecs_history = []
         while (len(self.tree_of_trust) - 2) < self.max_path_len:
             last_path_n = list(self.tree_of_trust.keys())[-1]
@@ -218,7 +300,7 @@ class TrustChainBuilder:
                     )
                     vbv = list(validated_by.values())
                     sup_ecs.extend(vbv)
-                    ecs_history.append(last_ec)
+                    ecs_history.append(last_ec.sub)
                 except MetadataDiscoveryException as e:
                     logger.exception(
                         f"Metadata discovery exception for {last_ec.sub}: {e}"
@@ -229,16 +311,6 @@ class TrustChainBuilder:
             else:
                 break
 
-        last_path = list(self.tree_of_trust.keys())[-1]
-        if (
-            self.tree_of_trust[0][0].is_valid
-            and self.tree_of_trust[last_path][0].is_valid
-        ):
-            self.is_valid = True
-            self.apply_metadata_policy()
-
-        return self.is_valid
-
     def get_trust_anchor_configuration(self) -> None:
         """
         Download and updates the internal field trust_anchor_configuration
@@ -247,9 +319,15 @@ class TrustChainBuilder:
         if not isinstance(self.trust_anchor, EntityStatement):
             logger.info(f"Get Trust Anchor Entity Configuration for {self.subject}")
             ta_jwt = get_entity_configurations(
-                self.trust_anchor, httpc_params=self.httpc_params
+                self.trust_anchor,
+                httpc_params=self.httpc_params,
+                statement_store=self.statement_store,
             )[0]
-            self.trust_anchor_configuration = EntityStatement(ta_jwt)
+            self.trust_anchor_configuration = EntityStatement(
+                ta_jwt,
+                httpc_params=self.httpc_params,
+                statement_store=self.statement_store,
+            )
 
         try:
             self.trust_anchor_configuration.validate_by_itself()
@@ -287,12 +365,15 @@ class TrustChainBuilder:
         if not self.subject_configuration:
             try:
                 jwts = get_entity_configurations(
-                    self.subject, httpc_params=self.httpc_params
+                    self.subject,
+                    httpc_params=self.httpc_params,
+                    statement_store=self.statement_store,
                 )
                 self.subject_configuration = EntityStatement(
                     jwts[0],
                     trust_anchor_entity_conf=self.trust_anchor_configuration,
                     httpc_params=self.httpc_params,
+                    statement_store=self.statement_store,
                 )
                 self.subject_configuration.validate_by_itself()
             except Exception as e:
@@ -326,13 +407,40 @@ class TrustChainBuilder:
         """
         return json.dumps(self.get_trust_chain())
 
+    def get_resolved_trust_chain(self) -> ResolvedTrustChain:
+        """
+        Retrieves the trust path as a resolved trust chain: the subject
+        configuration, the statements issued along the path and the
+        trust anchor configuration, with the final metadata.
+
+        :returns: the resolved trust chain
+        :rtype: ResolvedTrustChain
+        """
+        if self.resolved_trust_chain is not None:
+            return self.resolved_trust_chain
+
+        chain = [self.trust_path[0].jwt]
+        for i in range(1, len(self.trust_path)):
+            jwt = self.trust_path[i].verified_descendant_statements_as_jwt.get(
+                self.trust_path[i - 1].sub
+            )
+            if jwt:
+                chain.append(jwt)
+        chain.append(self.trust_path[-1].jwt)
+
+        return ResolvedTrustChain.from_chain(chain, self.final_metadata)
+
     def get_trust_chain(self) -> list[str]:
         """
         Retrieves the leaf and the Trust Anchor entity configurations.
+        For a chain already resolved and stored, its statements are returned.
 
         :returns: the list containing the ECs
         :rtype: list[str]
         """
+        if self.resolved_trust_chain is not None:
+            return list(self.resolved_trust_chain.chain)
+
         res = []
         # we keep just the leaf's and TA's EC, all the intermediates EC will be dropped
         ta_ec: str = ""
@@ -354,11 +462,27 @@ class TrustChainBuilder:
     def start(self):
         """
         Retrieves the subject (leaf) configuration and starts
-        chain discovery.
+        chain discovery, unless the chain was already resolved and stored
+        and no trust marks are required.
 
         :returns: the list containing the ECs
         :rtype: list[str]
         """
+        # a chain already resolved is a single read from the storage, unless
+        # trust marks are required: the stored chain may have been resolved
+        # without checking them
+        resolved = None
+        if self.trust_chain_store is not None and not self.required_trust_marks:
+            resolved = self.trust_chain_store.get(
+                self.subject, self.trust_anchor_configuration.sub
+            )
+        if resolved is not None:
+            self.resolved_trust_chain = resolved
+            self.final_metadata = resolved.metadata
+            self.exp = resolved.exp
+            self.is_valid = True
+            return
+
         try:
             # self.get_trust_anchor_configuration()
             self.get_subject_configuration()
@@ -0,0 +1,216 @@
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from pyeudiw.jwt.utils import decode_jwt_payload
+from pyeudiw.tools.utils import iat_now
+
+if TYPE_CHECKING:
+    from pyeudiw.storage.db_engine import DBEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResolvedTrustChain:
+    """
+    A trust chain whose statements were verified up to the trust anchor,
+    with the metadata of the subject resolved by the metadata policies.
+
+    :param subject: the leaf of the trust chain
+    :param trust_anchor: the trust anchor of the trust chain
+    :param chain: the statements in compact serialization, from the subject
+        configuration up to the trust anchor
+    :param metadata: the metadata of the subject, for each entity type
+    :param exp: the nearest expiration of the statements
+    """
+
+    subject: str
+    trust_anchor: str
+    chain: list[str]
+    metadata: dict
+    exp: int
+
+    def is_expired(self) -> bool:
+        return self.exp <= iat_now()
+
+    @classmethod
+    def from_chain(
+        cls, chain: list[str], metadata: dict, exp: Optional[int] = None
+    ) -> "ResolvedTrustChain":
+        """
+        Describes a verified trust chain.
+
+        :param chain: the statements, from the subject configuration up to the trust anchor
+        :type chain: list[str]
+        :param metadata: the resolved metadata of the subject
+        :type metadata: dict
+        :param exp: the expiration of the chain, the nearest of the statements if not given
+        :type exp: Optional[int]
+
+        :returns: the resolved trust chain
+        :rtype: ResolvedTrustChain
+        """
+        payloads = [decode_jwt_payload(jwt) for jwt in chain]
+        return cls(
+            subject=payloads[0]["sub"],
+            trust_anchor=payloads[-1]["iss"],
+            chain=list(chain),
+            metadata=metadata,
+            exp=exp or min(payload["exp"] for payload in payloads),
+        )
+
+    def serialize(self) -> dict:
+        """
+        Returns the trust chain in the form kept by the storage.
+
+        :returns: the trust chain as dict
+        :rtype: dict
+        """
+        return {
+            "subject": self.subject,
+            "trust_anchor": self.trust_anchor,
+            "chain": self.chain,
+            "metadata": self.metadata,
+            "exp": self.exp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResolvedTrustChain":
+        """
+        Loads a trust chain from the form kept by the storage.
+
+        :param data: the trust chain as dict
+        :type data: dict
+
+        :returns: the trust chain
+        :rtype: ResolvedTrustChain
+        """
+        return cls(
+            subject=data["subject"],
+            trust_anchor=data["trust_anchor"],
+            chain=data["chain"],
+            metadata=data["metadata"],
+            exp=data["exp"],
+        )
+
+
+class TrustChainStore:
+    """
+    The resolved trust chains, kept in the storage indexed by subject and
+    by trust anchor until their expiration.
+
+    Resolving a trust chain already known is a single indexed read and an
+    expiry check, without walking the federation nor applying the metadata
+    policies again. Without a storage backend nothing is kept; the storage
+    errors are logged and treated as missing trust chains.
+    """
+
+    def __init__(self, db_engine: Optional["DBEngine"] = None) -> None:
+        """
+        Creates an instance of TrustChainStore.
+
+        :param db_engine: the storage backend, if any
+        :type db_engine: Optional[DBEngine]
+        """
+        self.db_engine = db_engine
+
+    def _to_trust_chains(self, documents: list[dict]) -> list[ResolvedTrustChain]:
+        trust_chains = []
+        for document in documents:
+            trust_chain = ResolvedTrustChain.from_dict(document)
+            if not trust_chain.is_expired():
+                trust_chains.append(trust_chain)
+        return trust_chains
+
+    def get(self, subject: str, trust_anchor: str) -> Optional[ResolvedTrustChain]:
+        """
+        Returns the trust chain of a subject to a trust anchor, if not expired.
+
+        :param subject: the leaf of the trust chain
+        :type subject: str
+        :param trust_anchor: the trust anchor of the trust chain
+        :type trust_anchor: str
+
+        :returns: the trust chain or None
+        :rtype: Optional[ResolvedTrustChain]
+        """
+        if self.db_engine is None:
+            return None
+
+        try:
+            document = self.db_engine.get_trust_chain(subject, trust_anchor)
+        except Exception as e:
+            logger.debug(
+                f"Trust chain of {subject} to {trust_anchor} not in storage: {e}"
+            )
+            return None
+
+        trust_chains = self._to_trust_chains([document] if document else [])
+        return trust_chains[0] if trust_chains else None
+
+    def get_by_subject(self, subject: str) -> list[ResolvedTrustChain]:
+        """
+        Returns the trust chains of a subject not yet expired.
+
+        :param subject: the leaf of the trust chains
+        :type subject: str
+
+        :returns: the trust chains, one for each trust anchor
+        :rtype: list[ResolvedTrustChain]
+        """
+        if self.db_engine is None:
+            return []
+
+        try:
+            return self._to_trust_chains(
+                self.db_engine.get_trust_chains_by_subject(subject)
+            )
+        except Exception as e:
+            logger.warning(f"Cannot read the trust chains of {subject}: {e}")
+            return []
+
+    def get_by_trust_anchor(self, trust_anchor: str) -> list[ResolvedTrustChain]:
+        """
+        Returns the trust chains ending in a trust anchor not yet expired.
+
+        :param trust_anchor: the trust anchor of the trust chains
+        :type trust_anchor: str
+
+        :returns: the trust chains, one for each subject
+        :rtype: list[ResolvedTrustChain]
+        """
+        if self.db_engine is None:
+            return []
+
+        try:
+            return self._to_trust_chains(
+                self.db_engine.get_trust_chains_by_trust_anchor(trust_anchor)
+            )
+        except Exception as e:
+            logger.warning(f"Cannot read the trust chains to {trust_anchor}: {e}")
+            return []
+
+    def put(self, trust_chain: ResolvedTrustChain) -> ResolvedTrustChain:
+        """
+        Stores a resolved trust chain, replacing the one of the same
+        subject and trust anchor.
+
+        :param trust_chain: the trust chain
+        :type trust_chain: ResolvedTrustChain
+
+        :returns: the trust chain
+        :rtype: ResolvedTrustChain
+        """
+        if self.db_engine is None or trust_chain.is_expired():
+            return trust_chain
+
+        try:
+            self.db_engine.add_trust_chain(trust_chain.serialize())
+        except Exception as e:
+            logger.warning(
+                f"Cannot store the trust chain of {trust_chain.subject} "
+                f"to {trust_chain.trust_anchor}: {e}"
+            )
+        return trust_chain
+
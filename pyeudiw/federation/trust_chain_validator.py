@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from pyeudiw.federation.exceptions import (
     InvalidEntityStatement,
@@ -6,7 +7,12 @@ from pyeudiw.federation.exceptions import (
     MissingTrustAnchorPublicKey,
     TimeValidationError,
 )
-from pyeudiw.federation.policy import TrustChainPolicy
+from pyeudiw.federation.policy import get_metadata_policy_plan_cache
+from pyeudiw.federation.statement_cache import (
+    VerifiedStatementCache,
+    get_verified_statement_cache,
+)
+from pyeudiw.federation.statement_store import FederationStatementStore
 from pyeudiw.federation.statements import (
     get_entity_configurations,
     get_entity_statements,
@@ -14,7 +20,6 @@ from pyeudiw.federation.statements import (
 from pyeudiw.federation.utils import is_es
 from pyeudiw.jwk.jwks import find_jwk_by_kid
 from pyeudiw.jwk.exceptions import InvalidKid, KidNotFoundError
-from pyeudiw.jwt.jws_helper import JWSHelper
 from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload
 from pyeudiw.tools.utils import iat_now
 
@@ -29,6 +34,8 @@ class StaticTrustChainValidator:
         static_trust_chain: list[str],
         trust_anchor_jwks: list[dict],
         httpc_params: dict,
+        statement_cache: Optional[VerifiedStatementCache] = None,
+        statement_store: Optional[FederationStatementStore] = None,
         **kwargs,
     ) -> None:
         """
@@ -40,12 +47,20 @@ class StaticTrustChainValidator:
         :type trust_anchor_jwks: list[dict]
         :param httpc_params: parameters to perform http requests
         :type httpc_params: dict
+        :param statement_cache: the cache of the verified statements, the process wide one if not given
+        :type statement_cache: Optional[VerifiedStatementCache]
+        :param statement_store: the federation statement store the renewed statements are fetched through, if any
+        :type statement_store: Optional[FederationStatementStore]
         """
 
         self.static_trust_chain = static_trust_chain
         self.updated_trust_chain = []
         self.exp = 0
         self.httpc_params = httpc_params
+        self.statement_cache = (
+            get_verified_statement_cache() if statement_cache is None else statement_cache
+        )
+        self.statement_store = statement_store
 
         if not trust_anchor_jwks:
             raise MissingTrustAnchorPublicKey(
@@ -109,6 +124,7 @@ class StaticTrustChainValidator:
     def validate(self) -> bool:
         """
         Validates the static chain checking the validity in all jwt inside the field trust_chain.
+        The signature of a statement already verified with the same key is not checked again.
 
         :returns: True if static chain is valid and False otherwise
         :rtype: bool
@@ -121,7 +137,6 @@ class StaticTrustChainValidator:
         # TA's public key to use for the validation
         last_element = rev_tc[0]
         es_header = decode_jwt_header(last_element)
-        es_payload = decode_jwt_payload(last_element)
 
         ta_jwk = find_jwk_by_kid(self.trust_anchor_jwks, es_header.get("kid", None))
 
@@ -129,32 +144,14 @@ class StaticTrustChainValidator:
             logger.error("Trust chain validation error: TA jwks not found.")
             return False
 
-        # Validate the last statement with ta_jwk
-        jwsh = JWSHelper(ta_jwk)
-
-        if not jwsh.verify(last_element):
-            logger.error(
-                f"Trust chain signature validation error: {last_element} using {ta_jwk}"
-            )
-            return False
-
-        # then go ahead with other checks
-        self.exp = es_payload["exp"]
-
-        if self._check_expired(self.exp):
-            logger.error(
-                f"Trust chain validation error, statement expired: {es_payload}"
-            )
-            return False
-
-        fed_jwks = es_payload["jwks"]["keys"]
-
-        # for st in rev_tc[1:]:
-        # validate the entire chain taking in cascade using fed_jwks
-        # if valid -> update fed_jwks with $st
-        for st in rev_tc[1:]:
+        # each statement is verified with the keys of the following one:
+        # the keys are taken from the payloads before their verification,
+        # so that all the signatures are checked in a single batch and the
+        # chain is valid only if all of them are
+        items = [(last_element, ta_jwk)]
+        for superior, st in zip(rev_tc, rev_tc[1:]):
             st_header = decode_jwt_header(st)
-            st_payload = decode_jwt_payload(st)
+            fed_jwks = decode_jwt_payload(superior).get("jwks", {}).get("keys", [])
 
             try:
                 jwk = find_jwk_by_kid(fed_jwks, st_header.get("kid", None))
@@ -163,17 +160,30 @@ class StaticTrustChainValidator:
                     f"Trust chain validation KidNotFoundError: {st_header} not in {fed_jwks}"
                 )
                 return False
+            items.append((st, jwk))
 
-            jwsh = JWSHelper(jwk)
-            if not jwsh.verify(st):
+        results = self.statement_cache.verify_many(items)
+        for (st, jwk), result in zip(items, results):
+            if not result.is_valid:
                 logger.error(
-                    f"Trust chain signature validation error: {st} using {jwk}"
+                    f"Trust chain signature validation error: {st} using {jwk}: "
+                    f"{result.error}"
                 )
-                return False
-            else:
-                fed_jwks = st_payload["jwks"]["keys"]
+                raise result.error
+
+        es_payload = results[0].payload
+
+        # then go ahead with other checks
+        self.exp = es_payload["exp"]
+
+        if self._check_expired(self.exp):
+            logger.error(
+                f"Trust chain validation error, statement expired: {es_payload}"
+            )
+            return False
 
-            self.set_exp(st_payload["exp"])
+        for result in results[1:]:
+            self.set_exp(result.payload["exp"])
 
         return True
 
@@ -187,10 +197,14 @@ class StaticTrustChainValidator:
         :returns: the entity configuration in form of JWT.
         :rtype: str
         """
-        jwt = get_entity_configurations(iss, self.httpc_params)
+        jwt = get_entity_configurations(
+            iss, self.httpc_params, statement_store=self.statement_store
+        )
         return jwt[0]
 
-    def _retrieve_es(self, download_url: str, iss: str) -> str:
+    def _retrieve_es(
+        self, download_url: str, iss: str, sub: Optional[str] = None
+    ) -> str:
         """
         Retrieves the Entity Statement from an on-line source.
 
@@ -198,11 +212,18 @@ class StaticTrustChainValidator:
         :type download_url: str
         :param iss: The issuer url.
         :type iss: str
+        :param sub: The subject of the statement, needed to add it to the statement store.
+        :type sub: Optional[str]
 
         :returns: the entity statement in form of JWT.
         :rtype: str
         """
-        jwt = get_entity_statements(download_url, self.httpc_params)
+        jwt = get_entity_statements(
+            download_url,
+            self.httpc_params,
+            statement_store=self.statement_store,
+            statements=[(iss, sub)] if sub else None,
+        )
         return jwt[0]
 
     def _update_st(self, st: str) -> str:
@@ -218,6 +239,10 @@ class StaticTrustChainValidator:
         payload = decode_jwt_payload(st)
         iss = payload["iss"]
 
+        # the statement is being renewed, its stored copy must not be served
+        if self.statement_store is not None:
+            self.statement_store.invalidate(iss, payload["sub"])
+
         try:
             is_es(payload)
             # It's an entity configuration
@@ -227,7 +252,9 @@ class StaticTrustChainValidator:
         # if it has the source_endpoint let's try a fast renewal
         download_url: str = payload.get("source_endpoint", "")
         if download_url:
-            jwt = self._retrieve_es(f"{download_url}?sub={payload['sub']}", iss)
+            jwt = self._retrieve_es(
+                f"{download_url}?sub={payload['sub']}", iss, payload["sub"]
+            )
         else:
             ec = self._retrieve_ec(iss)
             ec_data = decode_jwt_payload(ec)
@@ -244,7 +271,7 @@ class StaticTrustChainValidator:
                     f"federation_entity metadata for {ec_data['sub']}"
                 )
 
-            jwt = self._retrieve_es(fetch_api_url, iss)
+            jwt = self._retrieve_es(fetch_api_url, iss, payload["sub"])
 
         return jwt
 
@@ -300,13 +327,20 @@ class StaticTrustChainValidator:
 
     @property
     def final_metadata(self) -> dict:
-        """Apply the metadata and returns the final metadata."""
-        anchor = self.static_trust_chain[-1]
-        es_anchor_payload = decode_jwt_payload(anchor)
+        """
+        Apply the metadata policies of the chain and returns the final metadata.
 
-        policy = es_anchor_payload.get("metadata_policy", {})
+        The policies combined along the chain are compiled once per entity type
+        and reused until the first statement of the chain expires.
+        """
+        chain = self.trust_chain
+        es_leaf_payload = decode_jwt_payload(chain[0])
 
-        leaf = self.static_trust_chain[0]
-        es_leaf_payload = decode_jwt_payload(leaf)
+        # the subordinate statements, from the one issued by the trust anchor
+        statements = chain[-2:0:-1]
 
-        return TrustChainPolicy().apply_policy(es_leaf_payload["metadata"], policy)
+        plans = get_metadata_policy_plan_cache()
+        return {
+            md_type: plans.get_plan(statements, md_type).apply(md)
+            for md_type, md in es_leaf_payload["metadata"].items()
+        }
@@ -1,15 +1,170 @@
+import json
+import os
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, TypeAlias, Union
+
+from cryptojwt.jwk.ec import ECKey
+from cryptojwt.jwk.hmac import SYMKey
+from cryptojwt.jwk.jwk import key_from_jwk_dict
+from cryptojwt.jwk.okp import OKPKey
+from cryptojwt.jwk.rsa import RSAKey
+
 from pyeudiw.jwk import JWK
 from pyeudiw.jwk.exceptions import InvalidKid, KidNotFoundError
 
+KEY_SET_CACHE_MAXSIZE = int(os.getenv("PYEUDIW_KEY_SET_CACHE_MAXSIZE", 256))
+
+_KeyLike: TypeAlias = ECKey | RSAKey | OKPKey | SYMKey
+
+
+class KeySet:
+    """
+    Immutable set of keys, parsed once and indexed by kid and by SHA-256 thumbprint.
+
+    When more keys share the same kid or thumbprint, the first one is indexed,
+    consistently with a linear scan of the set.
+    """
+
+    __slots__ = ("keys", "dicts", "thumbprints", "_public_jwks", "_by_kid", "_by_thumbprint")
+
+    def __init__(self, jwks: Iterable[Union[_KeyLike, JWK, dict]]) -> None:
+        """
+        Creates a KeySet.
+
+        :param jwks: the keys, as dict, JWK or cryptojwt key
+        :type jwks: Iterable[Union[KeyLike, JWK, dict]]
+        """
+        keys = []
+        for jwk in jwks:
+            if isinstance(jwk, dict):
+                jwk = key_from_jwk_dict(jwk)
+            elif isinstance(jwk, JWK):
+                jwk = jwk.key
+            keys.append(jwk)
+
+        self.keys: tuple[_KeyLike, ...] = tuple(keys)
+        self.dicts: tuple[dict, ...] = tuple(key.to_dict() for key in keys)
+        self.thumbprints: tuple[bytes, ...] = tuple(
+            key.thumbprint("SHA-256") for key in keys
+        )
+        self._public_jwks: Optional[tuple[dict, ...]] = None
+
+        self._by_kid: dict[str, int] = {}
+        self._by_thumbprint: dict[bytes, int] = {}
+        for i, (key, thumbprint) in enumerate(zip(self.keys, self.thumbprints)):
+            if key.kid:
+                self._by_kid.setdefault(key.kid, i)
+            self._by_thumbprint.setdefault(thumbprint, i)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self) -> Iterator[_KeyLike]:
+        return iter(self.keys)
+
+    def __getitem__(self, index: int) -> _KeyLike:
+        return self.keys[index]
+
+    @property
+    def public_jwks(self) -> tuple[dict, ...]:
+        """
+        Returns the public part of the keys in dict form.
+        The dicts are shared, callers must copy them before any modification.
+
+        :returns: the public keys
+        :rtype: tuple[dict, ...]
+        """
+        if self._public_jwks is None:
+            self._public_jwks = tuple(key.serialize(private=False) for key in self.keys)
+        return self._public_jwks
+
+    def index_by_kid(self, kid: str) -> Optional[int]:
+        """
+        Returns the position of the key with the given kid.
+
+        :param kid: the key identifier
+        :type kid: str
+
+        :returns: the position of the key, None if not found
+        :rtype: Optional[int]
+        """
+        return self._by_kid.get(kid) if kid else None
 
-def find_jwk_by_kid(jwks: list[dict], kid: str, as_dict: bool = True) -> dict | JWK:
+    def index_by_thumbprint(self, thumbprint: bytes) -> Optional[int]:
+        """
+        Returns the position of the key with the given SHA-256 thumbprint.
+
+        :param thumbprint: the key thumbprint
+        :type thumbprint: bytes
+
+        :returns: the position of the key, None if not found
+        :rtype: Optional[int]
+        """
+        return self._by_thumbprint.get(thumbprint)
+
+    def get_by_kid(self, kid: str) -> Optional[_KeyLike]:
+        """
+        Returns the key with the given kid.
+
+        :param kid: the key identifier
+        :type kid: str
+
+        :returns: the key, None if not found
+        :rtype: Optional[KeyLike]
+        """
+        index = self.index_by_kid(kid)
+        return None if index is None else self.keys[index]
+
+    def get_by_thumbprint(self, thumbprint: bytes) -> Optional[_KeyLike]:
+        """
+        Returns the key with the given SHA-256 thumbprint.
+
+        :param thumbprint: the key thumbprint
+        :type thumbprint: bytes
+
+        :returns: the key, None if not found
+        :rtype: Optional[KeyLike]
+        """
+        index = self.index_by_thumbprint(thumbprint)
+        return None if index is None else self.keys[index]
+
+
+@lru_cache(maxsize=KEY_SET_CACHE_MAXSIZE)
+def _key_set_from_json(jwks: str) -> KeySet:
+    return KeySet(json.loads(jwks))
+
+
+def get_key_set(jwks: Union[KeySet, dict, list[dict]]) -> KeySet:
+    """
+    Returns the KeySet of the given keys.
+    Key sets built from dicts are memoized, so that the same keys
+    are parsed only once.
+
+    :param jwks: the keys
+    :type jwks: Union[KeySet, dict, list[dict]]
+
+    :returns: the key set
+    :rtype: KeySet
+    """
+    if isinstance(jwks, KeySet):
+        return jwks
+    if isinstance(jwks, dict):
+        jwks = [jwks]
+    try:
+        return _key_set_from_json(json.dumps(jwks, sort_keys=True))
+    except TypeError:
+        # not serializable, such as key objects
+        return KeySet(jwks)
+
+
+def find_jwk_by_kid(jwks: Union[list[dict], KeySet], kid: str, as_dict: bool = True) -> dict | JWK:
     """
     Find the JWK with the indicated kid in the jwks list.
 
     :param kid: the identifier of the jwk
     :type kid: str
     :param jwks: the list of jwks
-    :type jwks: list[dict]
+    :type jwks: Union[list[dict], KeySet]
     :param as_dict: if True the return type will be a dict, JWK otherwise.
     :type as_dict: bool
 
@@ -21,6 +176,13 @@ def find_jwk_by_kid(jwks: list[dict], kid: str, as_dict: bool = True) -> dict |
     """
     if not kid:
         raise InvalidKid("Kid cannot be empty")
+
+    if isinstance(jwks, KeySet):
+        index = jwks.index_by_kid(kid)
+        if index is not None:
+            return dict(jwks.dicts[index]) if as_dict else JWK(jwks.dicts[index])
+        raise KidNotFoundError(f"Key with Kid {kid} not found")
+
     for jwk in jwks:
         valid_jwk = jwk.get("kid", None)
         if valid_jwk and kid == valid_jwk:
@@ -28,14 +190,18 @@ def find_jwk_by_kid(jwks: list[dict], kid: str, as_dict: bool = True) -> dict |
 
     raise KidNotFoundError(f"Key with Kid {kid} not found")
 
-def find_jwk_by_thumbprint(jwks: list[dict], thumbprint: bytes) -> dict | None:
+def find_jwk_by_thumbprint(jwks: Union[list[dict], KeySet], thumbprint: bytes) -> dict | None:
     """Find if a jwk with the given thumbprint is part of the given JWKS.
     Function can be used to select if a public key without a kid (such as
     a key that is part of a certificate chain) is part of a jwk set.
 
     We assume that SHA-256 is the hash function used to produce the thumbprint.
     """
+    if isinstance(jwks, KeySet):
+        index = jwks.index_by_thumbprint(thumbprint)
+        return None if index is None else dict(jwks.dicts[index])
+
     for key in jwks:
-        if JWK(key).thumbprint == thumbprint:
+        if key_from_jwk_dict(key).thumbprint("SHA-256") == thumbprint:
             return key
     return None
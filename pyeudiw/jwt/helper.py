@@ -3,11 +3,11 @@ from typing import Literal, TypeAlias
 
 from cryptojwt.jwk.ec import ECKey
 from cryptojwt.jwk.hmac import SYMKey
-from cryptojwt.jwk.jwk import key_from_jwk_dict
 from cryptojwt.jwk.okp import OKPKey
 from cryptojwt.jwk.rsa import RSAKey
 
 from pyeudiw.jwk import JWK
+from pyeudiw.jwk.jwks import KeySet, get_key_set
 from pyeudiw.jwk.parse import parse_x5c_keys
 from pyeudiw.jwt.log import logger
 from pyeudiw.jwt.utils import decode_jwt_payload
@@ -20,29 +20,33 @@ SerializationFormat = Literal["compact", "json"]
 
 
 class JWHelperInterface:
-    def __init__(self, jwks: list[KeyLike | dict] | KeyLike | dict) -> None:
+    def __init__(self, jwks: list[KeyLike | dict] | KeyLike | dict | KeySet) -> None:
         """
         Creates an instance of JWEHelper.
+        The keys are parsed and indexed once: helpers created with the same
+        keys in dict form share the same KeySet.
 
-        :raises TypeError: If the input jwks is not a list, dict, or a key-like object.
+        :raises TypeError: If the input jwks is not a list, dict, KeySet or a key-like object.
 
         :param jwks: The list of JWK used to crypt and encrypt the content of JWE.
         """
-        self.jwks: list[KeyLike] = []
-        if isinstance(jwks, dict):
-            single_jwk = key_from_jwk_dict(jwks)
-            self.jwks = [single_jwk]
-        elif isinstance(jwks, list):
-            self.jwks = []
-            for j in jwks:
-                if isinstance(j, dict):
-                    j = key_from_jwk_dict(j)
-                self.jwks.append(j)
+        if isinstance(jwks, (KeySet, dict, list)):
+            self.key_set = get_key_set(jwks)
         elif isinstance(jwks, (ECKey, RSAKey, OKPKey, SYMKey)):
-            self.jwks = [jwks]
+            self.key_set = KeySet([jwks])
         else:
             raise TypeError(f"unable to handle input jwks with type {type(jwks)}")
 
+    @property
+    def jwks(self) -> tuple[KeyLike, ...]:
+        """
+        Returns the keys of the helper.
+
+        :returns: The keys
+        :rtype: tuple[KeyLike, ...]
+        """
+        return self.key_set.keys
+
     def get_jwk_by_kid(self, kid: str) -> KeyLike | None:
         """
         Returns the JWK with the given kid from the list of JWKs.
@@ -54,10 +58,7 @@ class JWHelperInterface:
         """
         if not kid:
             return None
-        for i in self.jwks:
-            if i.kid == kid:
-                return i
-        return None
+        return self.key_set.get_by_kid(kid)
 
 
 def serialize_payload(payload: dict | str | int | None) -> bytes | str | int:
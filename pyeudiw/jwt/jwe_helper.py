@@ -1,9 +1,11 @@
 import binascii
 import json
 import logging
-from typing import Union
+import threading
+from typing import Callable, Optional, Union
 
 import cryptojwt
+from cryptojwt.jwe.exception import DecryptionFailed
 from cryptojwt.jwe.jwe import factory
 from cryptojwt.jwe.jwe_ec import JWE_EC
 from cryptojwt.jwe.jwe_rsa import JWE_RSA
@@ -96,29 +98,113 @@ class JWEHelper(JWHelperInterface):
         :returns: A dict that represents the payload of decrypted JWE.
         :rtype: dict
         """
-        try:
-            jwe_header = decode_jwt_header(jwe)
-        except (binascii.Error, Exception) as e:
-            raise JWEDecryptionError(
-                f"Not a valid JWE format for the following reason: {e}"
-            )
+        jwe_header = _decode_jwe_header(jwe)
+        _jwk = self.get_jwk_by_kid(jwe_header.get("kid"))
+        return _decrypt_with_key(jwe, jwe_header, _jwk)
+
+
+def _decode_jwe_header(jwe: str) -> dict:
+    try:
+        return decode_jwt_header(jwe)
+    except (binascii.Error, Exception) as e:
+        raise JWEDecryptionError(
+            f"Not a valid JWE format for the following reason: {e}"
+        )
+
+
+def _decrypt_with_key(jwe: str, jwe_header: dict, _jwk) -> dict:
+    _alg = jwe_header.get("alg")
+    _enc = jwe_header.get("enc")
+
+    _decryptor = factory(jwe, alg=_alg, enc=_enc)
+
+    if isinstance(_jwk, cryptojwt.jwk.ec.ECKey):
+        jwdec = JWE_EC()
+        jwdec.dec_setup(_decryptor.jwt, key=_jwk.private_key())
+        msg = jwdec.decrypt(_decryptor.jwt)
+    else:
+        msg = _decryptor.decrypt(jwe, [_jwk])
+
+    try:
+        msg_dict = json.loads(msg)
+    except json.decoder.JSONDecodeError:
+        msg_dict = msg
+    return msg_dict
 
-        _alg = jwe_header.get("alg")
-        _enc = jwe_header.get("enc")
-        _kid = jwe_header.get("kid")
-        _jwk = self.get_jwk_by_kid(_kid)
 
-        _decryptor = factory(jwe, alg=_alg, enc=_enc)
+class JWEDecrypter:
+    """
+    Decrypts JWEs with a set of private keys parsed once and indexed by kid.
+
+    The decryption key is selected by the kid in the JWE header; only a JWE
+    without kid is tried with the private keys in turn. The keys are read
+    from the source at each decryption and parsed again only when the source
+    returns another list, as when the keys are rotated, or after reload().
+    """
+
+    def __init__(self, jwks_source: Union[Callable[[], list[dict]], list[dict]]) -> None:
+        """
+        Creates an instance of JWEDecrypter.
 
-        if isinstance(_jwk, cryptojwt.jwk.ec.ECKey):
-            jwdec = JWE_EC()
-            jwdec.dec_setup(_decryptor.jwt, key=_jwk.private_key())
-            msg = jwdec.decrypt(_decryptor.jwt)
+        :param jwks_source: the private keys, or a callable returning the current ones
+        :type jwks_source: Union[Callable[[], list[dict]], list[dict]]
+        """
+        if callable(jwks_source):
+            self._jwks_source = jwks_source
         else:
-            msg = _decryptor.decrypt(jwe, [_jwk])
+            self._jwks_source = lambda: jwks_source
+
+        self._lock = threading.Lock()
+        self._jwks: Optional[list[dict]] = None
+        self._helper: Optional[JWEHelper] = None
+
+    def reload(self) -> JWEHelper:
+        """
+        Parses the current keys again, such as after they are changed in place.
+
+        :returns: the helper with the current keys
+        :rtype: JWEHelper
+        """
+        jwks = self._jwks_source()
+        helper = JWEHelper(jwks)
+        with self._lock:
+            self._jwks, self._helper = jwks, helper
+        logger.debug(f"JWE decryption keys loaded: {[key.kid for key in helper.jwks]}")
+        return helper
+
+    def _get_helper(self) -> JWEHelper:
+        helper = self._helper
+        if helper is None or self._jwks_source() is not self._jwks:
+            helper = self.reload()
+        return helper
+
+    def decrypt(self, jwe: str) -> dict:
+        """
+        Generate a dict containing the content of decrypted JWE string.
+
+        :param jwe: A string representing the jwe.
+        :type jwe: str
+
+        :raises JWEDecryptionError: if jwe field is not in a JWE Format
+        :raises DecryptionFailed: if no key can decrypt the jwe
+
+        :returns: A dict that represents the payload of decrypted JWE.
+        :rtype: dict
+        """
+        helper = self._get_helper()
+        jwe_header = _decode_jwe_header(jwe)
+
+        if _kid := jwe_header.get("kid"):
+            if (_jwk := helper.get_jwk_by_kid(_kid)) is None:
+                raise DecryptionFailed(f"No decryption key with kid {_kid}")
+            return _decrypt_with_key(jwe, jwe_header, _jwk)
+
+        for _jwk in helper.jwks:
+            if _jwk.kty not in ("EC", "RSA") or not _jwk.has_private_key():
+                continue
+            try:
+                return _decrypt_with_key(jwe, jwe_header, _jwk)
+            except Exception as e:
+                logger.debug(f"JWE decryption failed with key {_jwk.kid}: {e}")
 
-        try:
-            msg_dict = json.loads(msg)
-        except json.decoder.JSONDecodeError:
-            msg_dict = msg
-        return msg_dict
+        raise DecryptionFailed("No key can decrypt the JWE")
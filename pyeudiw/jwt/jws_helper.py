@@ -7,9 +7,8 @@ from typing import Any, Literal, Union
 from cryptojwt import JWS
 from cryptojwt.jwk.jwk import key_from_jwk_dict
 
-from pyeudiw.jwk import JWK
-from pyeudiw.jwk.exceptions import KidError
-from pyeudiw.jwk.jwks import find_jwk_by_kid, find_jwk_by_thumbprint
+from pyeudiw.jwk.exceptions import KidError, KidNotFoundError
+from pyeudiw.jwk.jwks import KeySet, find_jwk_by_kid
 from pyeudiw.jwt.exceptions import (
     JWEEncryptionError,
     JWSSigningError,
@@ -43,6 +42,46 @@ DEFAULT_TOKEN_TIME_TOLERANCE = int(
 )
 
 
+def select_verifying_key_index(key_set: KeySet, header: dict) -> int | None:
+    """
+    Selects the key of the set that verifies a token with the given header.
+
+    :param key_set: the candidate keys
+    :type key_set: KeySet
+    :param header: the token header
+    :type header: dict
+
+    :raises KidNotFoundError: if the header kid is not in the key set
+
+    :returns: the position of the key, None if no key can be selected
+    :rtype: int | None
+    """
+    # case 1: can be found by header
+    if "kid" in header:
+        if (index := key_set.index_by_kid(header["kid"])) is not None:
+            return index
+        raise KidNotFoundError(f"Key with Kid {header['kid']} not found")
+
+    # case 2: the token is self contained, and the verification key matches one of the key in the whitelist
+    if self_contained_claims_key_pair := find_self_contained_key(header):
+        # check if the self contained key matches a trusted jwk
+        _, candidate_key = self_contained_claims_key_pair
+        if hasattr(candidate_key, "thumbprint"):
+            if (index := key_set.index_by_thumbprint(candidate_key.thumbprint)) is not None:
+                return index
+            else:
+                logger.error(
+                    f"Candidate key {candidate_key} does not have a thumbprint attribute."
+                )
+                raise ValueError("Invalid key: missing thumbprint.")
+
+    # case 3: if only one key and there is no header claim that can identitfy any key, than that MUST
+    # be the only valid CANDIDATE key for signature verification
+    if len(key_set) == 1:
+        return 0
+    return None
+
+
 class JWSHelper(JWHelperInterface):
     """
     Helper class for working with JWS, extended to support SD-JWT.
@@ -117,7 +156,7 @@ class JWSHelper(JWHelperInterface):
         payload = serialize_payload(plain_dict)
 
         # Select a trusted algorithm and override header
-        signing_alg: str = DEFAULT_SIG_KTY_MAP[JWK(signing_key).key.kty]
+        signing_alg: str = DEFAULT_SIG_KTY_MAP[signing_key["kty"]]
         protected["alg"] = signing_alg
 
         # Add "typ" header if not present
@@ -186,17 +225,16 @@ class JWSHelper(JWHelperInterface):
 
     def _select_signing_key_by_uniqueness(self) -> dict | None:
         if len(self.jwks) == 1:
-            return self.jwks[0].to_dict()
+            return dict(self.key_set.dicts[0])
         return None
 
     def _select_key_by_use(self, use: str) -> dict | None:
         candidate_signing_keys: list[dict] = []
-        for key in self.jwks:
-            key_d = key.to_dict()
+        for key_d in self.key_set.dicts:
             if use == key_d.get("use", ""):
                 candidate_signing_keys.append(key_d)
         if len(candidate_signing_keys) == 1:
-            return candidate_signing_keys[0]
+            return dict(candidate_signing_keys[0])
         return None
 
     def _select_key_by_kid(self, headers: tuple[dict, dict]) -> dict | None:
@@ -208,7 +246,7 @@ class JWSHelper(JWHelperInterface):
             kid = headers[1]["kid"]
         else:
             return None
-        return find_jwk_by_kid([key.to_dict() for key in self.jwks], kid)
+        return find_jwk_by_kid(self.key_set, kid)
 
     def verify(
         self, jwt: str, tolerance_s: int = DEFAULT_TOKEN_TIME_TOLERANCE
@@ -238,15 +276,16 @@ class JWSHelper(JWHelperInterface):
                 f"Not a valid JWS format for the following reason: {e}"
             )
 
-        verifying_key = self._select_verifying_key(header)
-        if not verifying_key:
+        verifying_index = self._select_verifying_key_index(header)
+        if verifying_index is None:
             raise JWSVerificationError(
                 f"Verification error: unable to find matching public key for header {header}"
             )
+        verifying_key = self.key_set.keys[verifying_index]
 
         # sanity check: kid must match if present
         if expected_kid := header.get("kid"):
-            obtained_kid = verifying_key.get("kid", None)
+            obtained_kid = verifying_key.kid
             if obtained_kid and (obtained_kid != expected_kid):
                 raise JWSVerificationError(
                     KidError(
@@ -260,7 +299,7 @@ class JWSHelper(JWHelperInterface):
 
         # Validate JWT claims
         try:
-            msg: dict = verifier.verify_compact(jwt, [key_from_jwk_dict(verifying_key)])
+            msg: dict = verifier.verify_compact(jwt, [verifying_key])
             validate_jwt_timestamps_claims(msg, tolerance_s)
         except LifetimeException as e:
             raise JWSVerificationError(f"Invalid JWT claims: {e}")
@@ -270,33 +309,11 @@ class JWSHelper(JWHelperInterface):
         return msg
 
     def _select_verifying_key(self, header: dict) -> dict | None:
-        available_keys = [key.to_dict() for key in self.jwks]
-
-        # case 1: can be found by header
-        if "kid" in header:
-            if verifying_key := find_jwk_by_kid(available_keys, header["kid"]):
-                return verifying_key
-
-        # case 2: the token is self contained, and the verification key matches one of the key in the whitelist
-        if self_contained_claims_key_pair := find_self_contained_key(header):
-            # check if the self contained key matches a trusted jwk
-            _, candidate_key = self_contained_claims_key_pair
-            if hasattr(candidate_key, "thumbprint"):
-                if verifying_key := find_jwk_by_thumbprint(
-                    available_keys, candidate_key.thumbprint
-                ):
-                    return verifying_key
-                else:
-                    logger.error(
-                        f"Candidate key {candidate_key} does not have a thumbprint attribute."
-                    )
-                    raise ValueError("Invalid key: missing thumbprint.")
+        index = self._select_verifying_key_index(header)
+        return None if index is None else dict(self.key_set.dicts[index])
 
-        # case 3: if only one key and there is no header claim that can identitfy any key, than that MUST
-        # be the only valid CANDIDATE key for signature verification
-        if len(self.jwks) == 1:
-            return self.jwks[0].to_dict()
-        return None
+    def _select_verifying_key_index(self, header: dict) -> int | None:
+        return select_verifying_key_index(self.key_set, header)
 
     def is_sd_jwt(self, token: str) -> bool:
         """
@@ -0,0 +1,147 @@
+import json
+import logging
+import threading
+from typing import Optional
+
+from cryptojwt.jwk.jwk import key_from_jwk_dict
+from cryptojwt.jws.jws import SIGNER_ALGS
+
+from pyeudiw.jwk import JWK
+from pyeudiw.jwk.parse import parse_b64der
+from pyeudiw.jwt.exceptions import JWSSigningError
+from pyeudiw.jwt.jws_helper import DEFAULT_SIG_KTY_MAP
+from pyeudiw.jwt.utils import base64_urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class _SigningKey:
+    """
+    A private key parsed once, with its signing algorithm.
+    """
+
+    __slots__ = ("kid", "alg", "thumbprint", "private_key", "signer")
+
+    def __init__(self, jwk: dict) -> None:
+        if jwk.get("kty") == "oct":
+            raise JWSSigningError(f"Key {jwk.get('kid')} is a symmetric key")
+
+        key = key_from_jwk_dict(jwk)
+        if not key.priv_key:
+            raise JWSSigningError(f"Key {key.kid} is not a private key")
+
+        self.kid: str = jwk.get("kid", "")
+        self.alg: str = DEFAULT_SIG_KTY_MAP[jwk["kty"]]
+        self.thumbprint: str = JWK(jwk).thumbprint
+        self.private_key = key.private_key()
+        self.signer = SIGNER_ALGS[self.alg]
+
+
+class JWSSigner:
+    """
+    Signs compact JWS with keys prepared once.
+
+    The private keys are parsed when the signer is created and the key
+    certified by a x5c header is looked up once per certificate, so that
+    each signature only serializes the header and the claims and signs
+    them. The tokens are the same produced by JWSHelper.sign with the
+    same key: the 'alg' of the key type and its 'kid' are set in the
+    header, after the static header parameters and the given ones.
+    """
+
+    def __init__(self, jwks: list[dict], protected: Optional[dict] = None) -> None:
+        """
+        Creates an instance of JWSSigner.
+
+        :param jwks: the private keys, the first one is used by default
+        :type jwks: list[dict]
+        :param protected: the static header parameters of every token
+        :type protected: Optional[dict]
+
+        :raises JWSSigningError: if a key is not an asymmetric private key
+        """
+        if not jwks:
+            raise JWSSigningError("signing error: no key available for signature")
+
+        self.keys = [_SigningKey(jwk) for jwk in jwks]
+        self.protected = dict(protected or {})
+
+        self._index_by_thumbprint: dict[str, int] = {}
+        for index, key in enumerate(self.keys):
+            self._index_by_thumbprint.setdefault(key.thumbprint, index)
+
+        # the position of the key certified by each x5c leaf certificate
+        self._index_by_x5c: dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+    def key_index_by_x5c(self, x5c: list[str]) -> Optional[int]:
+        """
+        Returns the position of the key certified by the leaf
+        certificate of a x5c chain.
+
+        :param x5c: the certificate chain, base64 DER encoded
+        :type x5c: list[str]
+
+        :returns: the position of the key, None if no key matches
+        :rtype: Optional[int]
+        """
+        leaf = x5c[0]
+        try:
+            return self._index_by_x5c[leaf]
+        except KeyError:
+            pass
+
+        try:
+            thumbprint = parse_b64der(leaf).thumbprint
+        except Exception as e:
+            logger.warning(f"Cannot parse the x5c leaf certificate: {e}")
+            return None
+
+        index = self._index_by_thumbprint.get(thumbprint)
+        with self._lock:
+            self._index_by_x5c[leaf] = index
+        return index
+
+    def sign(
+        self, payload: dict, protected: Optional[dict] = None, key_index: int = 0
+    ) -> str:
+        """
+        Signs the claims in compact serialization.
+
+        :param payload: the claims
+        :type payload: dict
+        :param protected: the header parameters of this token
+        :type protected: Optional[dict]
+        :param key_index: the position of the signing key
+        :type key_index: int
+
+        :raises JWSSigningError: if the header kid does not match the signing key
+            or the signature fails
+
+        :returns: the signed token
+        :rtype: str
+        """
+        key = self.keys[key_index]
+
+        header = {**self.protected, **(protected or {})}
+        header_kid = header.get("kid")
+        if header_kid and key.kid and header_kid != key.kid:
+            raise JWSSigningError(
+                f"token header contains a kid {header_kid} that does not match the signing key kid {key.kid}"
+            )
+
+        header["alg"] = key.alg
+        header.setdefault("typ", "JWT")
+        if key.kid:
+            header["kid"] = key.kid
+
+        signing_input = (
+            f"{base64_urlencode(json.dumps(header, separators=(',', ':')).encode())}."
+            f"{base64_urlencode(json.dumps(payload).encode())}"
+        )
+        try:
+            signature = key.signer.sign(signing_input.encode(), key.private_key)
+        except Exception as e:
+            raise JWSSigningError("Signing error: error in step", e)
+
+        return f"{signing_input}.{base64_urlencode(signature)}"
@@ -2,7 +2,8 @@ import base64
 import json
 from dataclasses import dataclass
 
-from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload, is_jwt_format
+from pyeudiw.jwt.exceptions import JWTDecodeError
+from pyeudiw.jwt.utils import decode_segment, is_jwt_format
 
 @dataclass(frozen=True)
 class DecodedJwt:
@@ -49,8 +50,12 @@ def unsafe_parse_jws(token: str) -> DecodedJwt:
     if not is_jwt_format(token):
         raise ValueError(f"unable to parse {token}: not a jwt")
 
-    head = decode_jwt_header(token)
-    payload = decode_jwt_payload(token)
-    signature = token.split(".")[2]
+    segments = token.split(".")
+    try:
+        head = decode_segment(segments[0])
+        payload = decode_segment(segments[1])
+    except Exception as e:
+        raise JWTDecodeError(f"Unable to decode JWT element: {e}")
+    signature = segments[2]
 
     return DecodedJwt(token, head, payload, signature=signature)
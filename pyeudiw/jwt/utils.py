@@ -1,12 +1,74 @@
 import base64
 import json
+import os
 import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
 
 from pyeudiw.jwt.exceptions import JWTDecodeError, JWTInvalidElementPosition
 
 # jwt regexp pattern is non terminating, hence it match jwt, sd-jwt and sd-jwt with kb
 JWT_REGEXP = r"^[_\w\-]+\.[_\w\-]+\.[_\w\-]+"
 
+JWT_DECODING_SCOPE_MAXSIZE = int(os.getenv("PYEUDIW_JWT_DECODING_SCOPE_MAXSIZE", 128))
+
+# the segments decoded in the current scope, keyed by their base64url form
+_decoded_segments: ContextVar[Optional[OrderedDict]] = ContextVar(
+    "pyeudiw_decoded_jwt_segments", default=None
+)
+
+
+@contextmanager
+def jwt_decoding_scope() -> Iterator[None]:
+    """
+    Memoizes the decoded JWT segments for the duration of the block, such
+    as the processing of a request.
+
+    Inside the scope each header and payload is base64url and JSON decoded
+    once, however many times it is asked for, and the same dict is returned
+    to every caller: the decoded segments must be treated as read only.
+    The segments are keyed by their encoded form, so an SD-JWT and its issuer
+    JWT share them. Nested scopes share the outermost one; outside of any
+    scope nothing is memoized.
+    """
+    if _decoded_segments.get() is not None:
+        yield
+        return
+
+    token = _decoded_segments.set(OrderedDict())
+    try:
+        yield
+    finally:
+        _decoded_segments.reset(token)
+
+
+def decode_segment(segment: str) -> dict:
+    """
+    Decodes a base64url encoded JSON segment of a JWT, memoized in the
+    current jwt_decoding_scope if any.
+
+    :param segment: the encoded segment
+    :type segment: str
+
+    :returns: the decoded segment
+    :rtype: dict
+    """
+    memo = _decoded_segments.get()
+    if memo is None:
+        return json.loads(base64_urldecode(segment))
+
+    data = memo.get(segment)
+    if data is None:
+        data = json.loads(base64_urldecode(segment))
+        memo[segment] = data
+        if len(memo) > JWT_DECODING_SCOPE_MAXSIZE:
+            memo.popitem(last=False)
+    else:
+        memo.move_to_end(segment)
+    return data
+
 
 def decode_jwt_element(jwt: str, position: int) -> dict:
     """
@@ -31,18 +93,16 @@ def decode_jwt_element(jwt: str, position: int) -> dict:
             f"Cannot accept position greater than 2 {position}"
         )
 
-    splitted_jwt = jwt.split(".")
+    if isinstance(jwt, bytes):
+        jwt = jwt.decode()
+
+    splitted_jwt = jwt.split(".", position + 1)
 
     if (len(splitted_jwt) - 1) < position:
         raise JWTInvalidElementPosition(f"JWT has no element in position {position}")
 
     try:
-        if isinstance(jwt, bytes):
-            jwt = jwt.decode()
-
-        b64_data = jwt.split(".")[position]
-        data = json.loads(base64_urldecode(b64_data))
-        return data
+        return decode_segment(splitted_jwt[position])
     except Exception as e:
         raise JWTDecodeError(f"Unable to decode JWT element: {e}")
 
@@ -1,7 +1,29 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
 from cryptojwt.jwk import JWK
+from cryptojwt.jwk.asym import AsymmetricKey
+from cryptojwt.jws.jws import SIGNER_ALGS
+
+from pyeudiw.jwk.jwks import KeySet, get_key_set
+from pyeudiw.jwt.exceptions import JWSVerificationError, LifetimeException
+from pyeudiw.jwt.helper import validate_jwt_timestamps_claims
+from pyeudiw.jwt.jws_helper import (
+    DEFAULT_TOKEN_TIME_TOLERANCE,
+    JWSHelper,
+    select_verifying_key_index,
+)
+from pyeudiw.jwt.utils import base64_urldecode
+from pyeudiw.tools.cache import ProcessWide
 
-from pyeudiw.jwt.exceptions import JWSVerificationError
-from pyeudiw.jwt.jws_helper import JWSHelper
+JWS_BATCH_VERIFY_WORKERS = int(os.getenv("PYEUDIW_JWS_BATCH_VERIFY_WORKERS", 4))
+# batches smaller than this are verified in the calling thread
+JWS_BATCH_VERIFY_MIN_PARALLEL = int(
+    os.getenv("PYEUDIW_JWS_BATCH_VERIFY_MIN_PARALLEL", 4)
+)
 
 
 def verify_jws_with_key(jws: str, key: JWK) -> None:
@@ -13,3 +35,191 @@ def verify_jws_with_key(jws: str, key: JWK) -> None:
         verifier.verify(jws)
     except Exception as e:
         raise JWSVerificationError(f"error during signature verification: {e}", e)
+
+
+@dataclass
+class JWSVerificationResult:
+    """
+    The outcome of the verification of a JWS in a batch.
+
+    :param jws: the token in compact serialization
+    :param header: the decoded header, None if the token cannot be decoded
+    :param payload: the verified payload, None if the verification failed
+    :param error: the reason of the failure, None if the token is valid; the key
+        selection errors are reported as JWSHelper.verify raises them
+    :param key_index: the position of the verifying key in the candidate key set
+    """
+
+    jws: str
+    header: Optional[dict] = None
+    payload: Optional[dict] = None
+    error: Optional[Exception] = None
+    key_index: Optional[int] = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> dict:
+        """
+        Returns the verified payload.
+
+        :raises JWSVerificationError: if the signature or the claims are not valid
+        :raises KidNotFoundError: if the header kid is not among the candidate keys
+
+        :returns: the payload
+        :rtype: dict
+        """
+        if self.error is not None:
+            raise self.error
+        return self.payload
+
+
+class _DecodedJWS:
+    """
+    The segments of a compact JWS, decoded once.
+    """
+
+    __slots__ = ("signing_input", "signature", "header", "payload")
+
+    def __init__(self, jws: str) -> None:
+        segments = jws.split(".")
+        if len(segments) != 3:
+            raise JWSVerificationError(
+                f"Not a valid JWS format: {len(segments)} segments"
+            )
+        try:
+            self.header: dict = json.loads(base64_urldecode(segments[0]))
+            self.payload = json.loads(base64_urldecode(segments[1]))
+            self.signature: bytes = base64_urldecode(segments[2])
+        except Exception as e:
+            raise JWSVerificationError(
+                f"Not a valid JWS format for the following reason: {e}"
+            )
+        self.signing_input: bytes = f"{segments[0]}.{segments[1]}".encode()
+
+
+def _select_key(decoded: _DecodedJWS, key_set: KeySet) -> int:
+    index = select_verifying_key_index(key_set, decoded.header)
+    if index is None:
+        raise JWSVerificationError(
+            "Verification error: unable to find matching public key "
+            f"for header {decoded.header}"
+        )
+
+    # sanity check: kid must match if present
+    expected_kid = decoded.header.get("kid")
+    obtained_kid = key_set.keys[index].kid
+    if expected_kid and obtained_kid and obtained_kid != expected_kid:
+        raise JWSVerificationError(
+            f"Verification error: verifying key kid {obtained_kid} "
+            f"does not match token header kid {expected_kid}"
+        )
+    return index
+
+
+def _verify_signature(
+    decoded: _DecodedJWS, key: AsymmetricKey, tolerance_s: int
+) -> dict:
+    alg = decoded.header.get("alg")
+    if not alg or alg.lower() == "none" or alg not in SIGNER_ALGS:
+        raise JWSVerificationError(f"Unsupported signing algorithm: {alg}")
+
+    _key = key.public_key() if isinstance(key, AsymmetricKey) else key.key
+    try:
+        SIGNER_ALGS[alg].verify(decoded.signing_input, decoded.signature, _key)
+    except Exception as e:
+        raise JWSVerificationError(f"Error during signature verification: {e}")
+
+    if not isinstance(decoded.payload, dict):
+        raise JWSVerificationError("The JWS payload is not a JSON object")
+
+    try:
+        validate_jwt_timestamps_claims(decoded.payload, tolerance_s)
+    except LifetimeException as e:
+        raise JWSVerificationError(f"Invalid JWT claims: {e}")
+
+    return decoded.payload
+
+
+def _verify_group(
+    work: list[tuple[JWSVerificationResult, _DecodedJWS, AsymmetricKey]],
+    tolerance_s: int,
+) -> None:
+    for result, decoded, key in work:
+        try:
+            result.payload = _verify_signature(decoded, key, tolerance_s)
+        except JWSVerificationError as e:
+            result.error = e
+
+
+_executor = ProcessWide(
+    lambda: ThreadPoolExecutor(
+        max_workers=JWS_BATCH_VERIFY_WORKERS,
+        thread_name_prefix="pyeudiw-jws-verify",
+    )
+)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    return _executor.get()
+
+
+def verify_jws_batch(
+    items: Sequence[tuple[str, Union[KeySet, dict, list[dict]]]],
+    tolerance_s: int = DEFAULT_TOKEN_TIME_TOLERANCE,
+) -> list[JWSVerificationResult]:
+    """
+    Verifies many compact JWS, each with its own candidate keys, with the
+    same checks of JWSHelper.verify.
+
+    Each token is decoded once and its verifying key is selected from the
+    candidates; the tokens are then grouped by key and the groups verified
+    concurrently on a shared thread pool, since the signature checks release
+    the GIL. Small batches are verified in the calling thread.
+
+    :param items: the tokens with their candidate keys
+    :type items: Sequence[tuple[str, Union[KeySet, dict, list[dict]]]]
+    :param tolerance_s: tolerance window, in seconds, for the lifetime claims
+    :type tolerance_s: int
+
+    :returns: a result for each token, in the same order
+    :rtype: list[JWSVerificationResult]
+    """
+    results = []
+    groups: dict[bytes, list] = {}
+
+    for jws, keys in items:
+        result = JWSVerificationResult(jws)
+        results.append(result)
+        try:
+            decoded = _DecodedJWS(jws)
+            result.header = decoded.header
+            key_set = get_key_set(keys)
+            result.key_index = _select_key(decoded, key_set)
+        except Exception as e:
+            result.error = e
+            continue
+
+        groups.setdefault(key_set.thumbprints[result.key_index], []).append(
+            (result, decoded, key_set.keys[result.key_index])
+        )
+
+    work = sum(len(group) for group in groups.values())
+    if work < JWS_BATCH_VERIFY_MIN_PARALLEL or JWS_BATCH_VERIFY_WORKERS <= 1:
+        for group in groups.values():
+            _verify_group(group, tolerance_s)
+        return results
+
+    # the groups of a single key are split, so that every worker gets some work
+    chunk_size = -(-work // JWS_BATCH_VERIFY_WORKERS)
+    executor = _get_executor()
+    futures = [
+        executor.submit(_verify_group, group[i : i + chunk_size], tolerance_s)
+        for group in groups.values()
+        for i in range(0, len(group), chunk_size)
+    ]
+    for future in futures:
+        future.result()
+
+    return results
@@ -3,7 +3,7 @@ from typing import TypeVar
 import cryptojwt.jwe.exception
 import satosa.context
 from pyeudiw.jwt.exceptions import JWEDecryptionError
-from pyeudiw.jwt.jwe_helper import JWEHelper
+from pyeudiw.jwt.jwe_helper import JWEDecrypter, JWEHelper
 from pyeudiw.openid4vp.exceptions import (
     AuthRespParsingException,
     AuthRespValidationException,
@@ -124,7 +124,7 @@ class DirectPostJwtJweParser(AuthorizationResponseParser):
 
     def __init__(
             self, 
-            jwe_decryptor: JWEHelper, 
+            jwe_decryptor: JWEHelper | JWEDecrypter, 
             enc_alg_supported: list[str] = [], 
             enc_enc_supported: list[str] = []
         ) -> None:
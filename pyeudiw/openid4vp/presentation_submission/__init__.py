@@ -5,7 +5,10 @@ from typing import Any
 import logging
 
 from pyeudiw.trust.dynamic import CombinedTrustEvaluator
-from pyeudiw.openid4vp.presentation_submission.base_vp_parser import BaseVPParser
+from pyeudiw.openid4vp.presentation_submission.base_vp_parser import (
+    BaseVPParser,
+    VerifiedCredential,
+)
 from pyeudiw.openid4vp.presentation_submission.schemas import PresentationSubmissionSchema
 from pyeudiw.openid4vp.presentation_submission.exceptions import (
     MissingHandler, 
@@ -148,22 +151,25 @@ class PresentationSubmissionHandler:
 
         return parsed_tokens
     
-    def validate(
-        self, 
-        submission: dict[str, Any], 
+    def _match_handlers(
+        self,
+        submission: dict[str, Any],
         vp_tokens: list[str],
-        verifier_id: str, 
-        verifier_nonce: str
-    ) -> None:
+    ) -> list[tuple[int, BaseVPParser]]:
         """
-        Validate the presentation submission data using the appropriate handler.
+        Validate the submission and match each descriptor with its handler.
 
         :param submission: The presentation submission data.
         :type submission: dict[str, Any]
+        :param vp_tokens: The VP tokens.
+        :type vp_tokens: list[str]
 
+        :raises SubmissionValidationError: If the submission data is invalid or two descriptors refer to the same token.
         :raises MissingHandler: If the handler for the format is not found.
         :raises VPTokenDescriptorMapMismatch: If the number of VP tokens does not match the number of descriptors.
-        :raises ParseError: If parsing fails.
+
+        :return: The position of the token and the handler, for each descriptor.
+        :rtype: list[tuple[int, BaseVPParser]]
         """
         try:
             validated_submission = self._validate_submission(submission)
@@ -176,16 +182,88 @@ class PresentationSubmissionHandler:
             raise VPTokenDescriptorMapMismatch(
                 f"Number of VP tokens ({len(vp_tokens)}) does not match the number of descriptors ({descriptor_map_len})."
             )
-        
+
+        matched_handlers = []
+        positions = set()
         for descriptor in validated_submission.descriptor_map:
             handler = self.handlers.get(descriptor.format)
 
             if not handler:
                 raise MissingHandler(f"Handler for format '{descriptor.format}' not found.")
-            
+
             position = self._extract_position(descriptor.path)
 
+            if position in positions:
+                raise SubmissionValidationError(
+                    f"Submission validation failed: more than one descriptor for the token at position {position}."
+                )
+            positions.add(position)
+
+            matched_handlers.append((position, handler))
+
+        return matched_handlers
+
+    def validate(
+        self, 
+        submission: dict[str, Any], 
+        vp_tokens: list[str],
+        verifier_id: str, 
+        verifier_nonce: str
+    ) -> None:
+        """
+        Validate the presentation submission data using the appropriate handler.
+
+        :param submission: The presentation submission data.
+        :type submission: dict[str, Any]
+
+        :raises MissingHandler: If the handler for the format is not found.
+        :raises VPTokenDescriptorMapMismatch: If the number of VP tokens does not match the number of descriptors.
+        :raises ParseError: If parsing fails.
+        """
+        for position, handler in self._match_handlers(submission, vp_tokens):
             try:
                 handler.validate(vp_tokens[position], verifier_id, verifier_nonce)
             except Exception as e:
-                raise ValidationError(f"Error parsing token at position {position}: {e}")
\ No newline at end of file
+                raise ValidationError(f"Error parsing token at position {position}: {e}")
+
+    def verify(
+        self,
+        submission: dict[str, Any],
+        vp_tokens: list[str],
+        verifier_id: str,
+        verifier_nonce: str
+    ) -> list[VerifiedCredential]:
+        """
+        Validate the presentation submission data and extract the claims of
+        each token in a single pass, so that every token is decoded and its
+        signatures are verified once.
+
+        :param submission: The presentation submission data.
+        :type submission: dict[str, Any]
+        :param vp_tokens: The VP tokens.
+        :type vp_tokens: list[str]
+        :param verifier_id: The identifier of the verifier.
+        :type verifier_id: str
+        :param verifier_nonce: The nonce of the verifier.
+        :type verifier_nonce: str
+
+        :raises SubmissionValidationError: If the submission data is invalid.
+        :raises MissingHandler: If the handler for the format is not found.
+        :raises VPTokenDescriptorMapMismatch: If the number of VP tokens does not match the number of descriptors.
+        :raises ValidationError: If the validation of a token fails.
+
+        :return: The verified credentials, in the order of the VP tokens.
+        :rtype: list[VerifiedCredential]
+        """
+        matched_handlers = self._match_handlers(submission, vp_tokens)
+        verified_credentials = [None] * len(matched_handlers)
+
+        for position, handler in matched_handlers:
+            try:
+                verified_credentials[position] = handler.verify(
+                    vp_tokens[position], verifier_id, verifier_nonce
+                )
+            except Exception as e:
+                raise ValidationError(f"Error verifying token at position {position}: {e}")
+
+        return verified_credentials
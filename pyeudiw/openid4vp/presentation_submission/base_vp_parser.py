@@ -1,9 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 from cryptojwt.jwk.ec import ECKey
 from cryptojwt.jwk.rsa import RSAKey
+from pyeudiw.status_list.verifier import StatusListTokenVerifier
 from pyeudiw.trust.dynamic import CombinedTrustEvaluator
 
+@dataclass(frozen=True)
+class VerifiedCredential:
+    """
+    The claims of a Verifiable Presentation, extracted once it is validated.
+
+    :param claims: the disclosed claims
+    :param issuer: the issuer of the credential, if known
+    """
+
+    claims: Dict[str, Any]
+    issuer: Optional[str] = None
+
+
 class BaseVPParser(ABC):
     """
     Standard interface for parsing Verifiable Presentations (VP).
@@ -11,6 +26,8 @@ class BaseVPParser(ABC):
     """
     def __init__(self, trust_evaluator: CombinedTrustEvaluator, **kwargs):
         self.trust_evaluator = trust_evaluator
+        # the status list tokens are verified once, when cached
+        self.status_list_verifier = StatusListTokenVerifier(trust_evaluator)
 
     @abstractmethod
     def parse(self) -> Dict[str, Any]:
@@ -25,4 +42,29 @@ class BaseVPParser(ABC):
         verifier_nonce: str
     ) -> bool:
         """Validates the content of a Verifiable Presentation."""
-        pass
\ No newline at end of file
+        pass
+
+    def verify(
+        self,
+        token: str,
+        verifier_id: str,
+        verifier_nonce: str
+    ) -> VerifiedCredential:
+        """
+        Validates a Verifiable Presentation and extracts its claims.
+
+        Parsers should override it to decode the token and verify its
+        signatures once, this default validates and then parses it.
+
+        :param token: the Verifiable Presentation token
+        :type token: str
+        :param verifier_id: the identifier of the verifier
+        :type verifier_id: str
+        :param verifier_nonce: the nonce of the verifier
+        :type verifier_nonce: str
+
+        :returns: the verified credential
+        :rtype: VerifiedCredential
+        """
+        self.validate(token, verifier_id, verifier_nonce)
+        return VerifiedCredential(self.parse(token))
@@ -2,9 +2,12 @@ from datetime import datetime, timezone
 from pymdoccbor.mdoc.verifier import MdocCbor
 from cryptography.hazmat.primitives import serialization
 from pyeudiw.x509.verify import get_issuer_from_x5c
-from pyeudiw.status_list.helper import StatusListTokenHelper
+from pyeudiw.status_list.manager import get_status_list_manager
 from pyeudiw.openid4vp.exceptions import MdocCborValidationError, VPRevoked
-from pyeudiw.openid4vp.presentation_submission.base_vp_parser import BaseVPParser
+from pyeudiw.openid4vp.presentation_submission.base_vp_parser import (
+    BaseVPParser,
+    VerifiedCredential,
+)
 
 class VpMDocCbor(BaseVPParser):
     def _is_expired(self, mdoc: MdocCbor) -> bool:
@@ -17,18 +20,21 @@ class VpMDocCbor(BaseVPParser):
         return False
     
 
-    def validate(
-            self, 
-            token: str, 
-            verifier_id: str, 
-            verifier_nonce: str
-        ) -> None:
+    def _verify(self, token: str) -> tuple[MdocCbor, str]:
+        """
+        Decodes the token and verifies its signatures once: the verification
+        also extracts the disclosed claims in the disclosure map of the mdoc.
+
+        :returns: the verified mdoc and its issuer
+        :rtype: tuple[MdocCbor, str]
+        """
         mdoc = MdocCbor()
         mdoc.loads(data=token)
 
         if mdoc.verify() == False:
             raise MdocCborValidationError("Signature is invalid")
         
+        issuer = None
         try:
             for document in mdoc.documents:
                 x5c = [
@@ -36,8 +42,9 @@ class VpMDocCbor(BaseVPParser):
                     for cert in document.issuersigned.issuer_auth.x509_certificates
                 ]
 
+                issuer = get_issuer_from_x5c(x5c)
                 self.trust_evaluator.get_public_keys(
-                    get_issuer_from_x5c(x5c),
+                    issuer,
                     {"x5c": x5c}
                 )
         except Exception as e:
@@ -47,16 +54,38 @@ class VpMDocCbor(BaseVPParser):
             raise MdocCborValidationError("Credential is expired")
         
         if mdoc.status:
-            status_list = StatusListTokenHelper.from_status(mdoc.status)
+            status_list = get_status_list_manager().from_status(
+                mdoc.status, self.status_list_verifier, issuer
+            )
             if status_list.is_expired() or \
                status_list.get_status(mdoc.status["status_list"]["idx"]) > 0:
                 raise VPRevoked(
                     "Status list indicates that the token is revoked"
                 )
+
+        return mdoc, issuer
+
+    def validate(
+            self, 
+            token: str, 
+            verifier_id: str, 
+            verifier_nonce: str
+        ) -> None:
+        self._verify(token)
+
+    def verify(
+            self,
+            token: str,
+            verifier_id: str,
+            verifier_nonce: str
+        ) -> VerifiedCredential:
+        mdoc, issuer = self._verify(token)
+
+        return VerifiedCredential(mdoc.disclosure_map, issuer)
         
     def parse(self, token: str) -> None:
         mdoc = MdocCbor()
         mdoc.loads(data=token)
         mdoc.verify()
 
-        return mdoc.disclosure_map
\ No newline at end of file
+        return mdoc.disclosure_map
@@ -1,13 +1,15 @@
 import logging
-from pyeudiw.jwt.helper import is_jwt_expired
+from pyeudiw.jwt.helper import is_payload_expired
 from pyeudiw.sd_jwt.schema import VerifierChallenge
 from pyeudiw.sd_jwt.sd_jwt import SdJwt
 from pyeudiw.openid4vp.exceptions import MissingIssuer, VPRevoked, VPExpired
-from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload
 from pyeudiw.sd_jwt.schema import is_sd_jwt_kb_format
-from pyeudiw.openid4vp.presentation_submission.base_vp_parser import BaseVPParser
+from pyeudiw.openid4vp.presentation_submission.base_vp_parser import (
+    BaseVPParser,
+    VerifiedCredential,
+)
 from pyeudiw.trust.dynamic import CombinedTrustEvaluator
-from pyeudiw.status_list.helper import StatusListTokenHelper
+from pyeudiw.status_list.manager import get_status_list_manager
 
 class VpVcSdJwtParserVerifier(BaseVPParser):
 
@@ -46,20 +48,20 @@ class VpVcSdJwtParserVerifier(BaseVPParser):
         # TODO: implement revocation check
         return False
     
-    def validate(
-        self, 
-        token: str, 
-        verifier_id: str, 
-        verifier_nonce: str, 
-    ) -> None:
-        # precomputed values
-        if not is_sd_jwt_kb_format(token):
-            raise ValueError("Token is not in the expected format")
-
-        sdjwt = SdJwt(token)
+    def _verify(
+        self,
+        sdjwt: SdJwt,
+        verifier_id: str,
+        verifier_nonce: str,
+    ) -> str:
+        """
+        Verifies an already decoded token, so that its signatures are checked once.
 
+        :returns: the issuer of the token
+        :rtype: str
+        """
         static_trust_materials = {}
-        header = decode_jwt_header(token)
+        header = sdjwt.issuer_jwt.header
 
         alg = header.get("alg", None)
         if alg not in self.sig_alg_supported:
@@ -71,8 +73,9 @@ class VpVcSdJwtParserVerifier(BaseVPParser):
         if "trust_chain" in header:
             static_trust_materials["trust_chain"] = header["trust_chain"]
         
+        issuer = self._get_issuer_name(sdjwt)
         public_keys = self.trust_evaluator.get_public_keys(
-            self._get_issuer_name(sdjwt),
+            issuer,
             static_trust_materials
         )
 
@@ -84,15 +87,44 @@ class VpVcSdJwtParserVerifier(BaseVPParser):
 
         sdjwt.verify_holder_kb_jwt(challenge)
 
-        if is_jwt_expired(sdjwt.issuer_jwt.jwt):
+        payload = sdjwt.issuer_jwt.payload
+
+        if is_payload_expired(payload):
             raise VPExpired("VP is expired")
-        
-        payload = decode_jwt_payload(token)
 
         if "status" in payload and "status_list" in payload["status"]:
-            status_list = StatusListTokenHelper.from_status(payload["status"])
+            status_list = get_status_list_manager().from_status(
+                payload["status"], self.status_list_verifier, issuer
+            )
             if status_list.is_expired() or \
                status_list.get_status(payload["status"]["status_list"]["idx"]) > 0:
                 raise VPRevoked(
                     "Status list indicates that the token is revoked"
-                )
\ No newline at end of file
+                )
+
+        return issuer
+
+    def validate(
+        self, 
+        token: str, 
+        verifier_id: str, 
+        verifier_nonce: str, 
+    ) -> None:
+        if not is_sd_jwt_kb_format(token):
+            raise ValueError("Token is not in the expected format")
+
+        self._verify(SdJwt(token), verifier_id, verifier_nonce)
+
+    def verify(
+        self,
+        token: str,
+        verifier_id: str,
+        verifier_nonce: str,
+    ) -> VerifiedCredential:
+        if not is_sd_jwt_kb_format(token):
+            raise ValueError("Token is not in the expected format")
+
+        sdjwt = SdJwt(token)
+        issuer = self._verify(sdjwt, verifier_id, verifier_nonce)
+
+        return VerifiedCredential(sdjwt.get_disclosed_claims(), issuer)
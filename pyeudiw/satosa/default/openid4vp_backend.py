@@ -7,19 +7,27 @@ from satosa.context import Context
 from satosa.internal import InternalData
 from satosa.response import Redirect, Response
 
+from pyeudiw.federation.statement_store import FederationStatementStore
+from pyeudiw.federation.trust_chain_store import TrustChainStore
 from pyeudiw.jwk import JWK
+from pyeudiw.jwt.jwe_helper import JWEDecrypter
+from pyeudiw.jwt.jws_signer import JWSSigner
 from pyeudiw.openid4vp.authorization_request import build_authorization_request_url
 from pyeudiw.openid4vp.schemas.flow import RemoteFlowType
 from pyeudiw.openid4vp.utils import detect_flow_typ
 from pyeudiw.tools.base_logger import BaseLogger
+from pyeudiw.satosa.default.request_handler import RequestHandler
 from pyeudiw.satosa.schemas.config import PyeudiwBackendConfig
 from pyeudiw.satosa.utils.html_template import Jinja2TemplateHandler
 from pyeudiw.satosa.utils.respcode import ResponseCodeSource
 from pyeudiw.satosa.utils.response import JsonResponse
 from pyeudiw.storage.db_engine import DBEngine
+from pyeudiw.storage.supervisor import ConnectionSupervisor
 from pyeudiw.tools.utils import iat_now
 from pyeudiw.trust.dynamic import CombinedTrustEvaluator
 from pyeudiw.trust.anchors_loader import AnchorsLoader
+from pyeudiw.trust.refresh import TrustRefreshScheduler
+from pyeudiw.trust.handler.federation import FederationHandler
 from pyeudiw.trust.handler.interface import TrustHandlerInterface
 from pyeudiw.satosa.interfaces.openid4vp_backend import OpenID4VPBackendInterface
 from pyeudiw.openid4vp.presentation_submission import PresentationSubmissionHandler
@@ -53,7 +61,7 @@ class OpenID4VPBackend(OpenID4VPBackendInterface, BaseLogger):
         super().__init__(auth_callback_func, internal_attributes, base_url, name)
 
         # to be inizialized by .db_engine() property
-        self._db_engine = None
+        self._db_supervisor = None
 
         self.config = config
 
@@ -78,6 +86,26 @@ class OpenID4VPBackend(OpenID4VPBackendInterface, BaseLogger):
             "keys": [JWK(i).public_key for i in self.config["metadata_jwks"]]
         }
 
+        # the request objects are signed with the metadata signature keys, parsed once
+        signing_jwks = []
+        for key in self.metadata_jwks_by_kids.values():
+            if key.get("use") == "enc":
+                continue
+            if key.get("kty") == "oct" or "d" not in key:
+                self._log_warning(
+                    "OpenID4VPBackend",
+                    f"metadata key {key.get('kid')} cannot sign the request objects",
+                )
+                continue
+            signing_jwks.append(key)
+
+        self.request_object_signer = JWSSigner(
+            signing_jwks,
+            protected={"typ": RequestHandler._REQUEST_OBJECT_TYP},
+        )
+        # the direct_post.jwt responses are decrypted with the current metadata keys
+        self.jwe_decrypter = JWEDecrypter(lambda: self.config["metadata_jwks"])
+
         # HTML template loader
         self.template = Jinja2TemplateHandler(self.config["ui"])
 
@@ -113,6 +141,23 @@ class OpenID4VPBackend(OpenID4VPBackendInterface, BaseLogger):
             trust_configuration, self.db_engine, default_client_id = self.client_id, mode = trust_caching_mode
         )
 
+        # the federation statements fetched and the trust chains resolved
+        # by any worker are shared through the storage of this backend
+        self.federation_statement_store = FederationStatementStore(self.db_engine)
+        self.trust_chain_store = TrustChainStore(self.db_engine)
+        for handler in self.trust_evaluator.handlers:
+            if isinstance(handler, FederationHandler):
+                handler.statement_store = self.federation_statement_store
+                handler.trust_chain_store = self.trust_chain_store
+
+        # when configured the trust material is refreshed in background and the request path only reads it
+        self.trust_refresh_scheduler = None
+        if (trust_refresh_configuration := self.config.get("trust_refresh_scheduler")) is not None:
+            self.trust_refresh_scheduler = TrustRefreshScheduler(
+                self.trust_evaluator, **trust_refresh_configuration
+            )
+            self.trust_refresh_scheduler.start()
+
         credential_presentation_handlers_configuration = self.config.get("credential_presentation_handlers", {})
         self.vp_token_parser = PresentationSubmissionHandler(
             credential_presentation_handlers_configuration,
@@ -413,22 +458,26 @@ class OpenID4VPBackend(OpenID4VPBackendInterface, BaseLogger):
     @property
     def db_engine(self) -> DBEngine:
         """
-        Returns the DBEngine instance used by the class
+        Returns the DBEngine instance used by the class.
+        Its connections are supervised in background, see db_supervisor:
+        every call runs on the current engine, so that the objects keeping
+        it are not left with a replaced one.
         """
-        if not self._db_engine:
-            self._db_engine = DBEngine(self.config["storage"])
+        return self.db_supervisor.supervised_engine
 
-        try:
-            self._db_engine.is_connected
-        except Exception as e:
-            if getattr(self, "_db_engine", None):
-                self._log_debug(
-                    "OpenID4VP db storage handling",
-                    f"connection check silently fails and get restored: {e}",
-                )
-            self._db_engine = DBEngine(self.config["storage"])
+    @property
+    def db_supervisor(self) -> ConnectionSupervisor:
+        """
+        Returns the supervisor of the DBEngine connections, that exposes
+        the healthy flag and the reconnection metrics.
+        """
+        if not self._db_supervisor:
+            self._db_supervisor = ConnectionSupervisor(
+                lambda: DBEngine(self.config["storage"])
+            )
+            self._db_supervisor.start()
 
-        return self._db_engine
+        return self._db_supervisor
 
     @property
     def default_metadata_private_jwk(self) -> tuple:
@@ -1,12 +1,9 @@
 from satosa.context import Context
 
-from pyeudiw.jwt.jws_helper import JWSHelper
 from pyeudiw.openid4vp.authorization_request import build_authorization_request_claims
 from pyeudiw.satosa.interfaces.request_handler import RequestHandlerInterface
 from pyeudiw.satosa.utils.response import Response
 from pyeudiw.tools.base_logger import BaseLogger
-from pyeudiw.jwk.parse import parse_b64der
-from pyeudiw.jwk import JWK
 
 
 class RequestHandler(RequestHandlerInterface, BaseLogger):
@@ -63,40 +60,27 @@ class RequestHandler(RequestHandlerInterface, BaseLogger):
                 e500,
             )
 
-        _protected_jwt_headers = {
-            "typ": RequestHandler._REQUEST_OBJECT_TYP,
-        }
-
         # load all the trust handlers request jwt header parameters, if any
-        trust_params = self.trust_evaluator.get_jwt_header_trust_parameters(issuer=self.client_id)
-        _protected_jwt_headers.update(trust_params)
+        _protected_jwt_headers = self.trust_evaluator.get_jwt_header_trust_parameters(issuer=self.client_id)
 
-        metadata_key = None
+        # the default metadata key, unless the request object carries a certificate
+        key_index = 0
 
         if "x5c" in _protected_jwt_headers:
-            # TODO: move this logic in the JWS signer...
-            jwk = parse_b64der(_protected_jwt_headers["x5c"][0])
+            key_index = self.request_object_signer.key_index_by_x5c(_protected_jwt_headers["x5c"])
 
-            for key in self.config["metadata_jwks"]:
-                if JWK(key).thumbprint == jwk.thumbprint:
-                    metadata_key = key
-                    break
-            
-            if not metadata_key:
+            if key_index is None:
                 return self._handle_500(
                     context,
                     "internal error: unable to find the key in the metadata",
                     ValueError("unable to find the key in the metadata"),
                 )
-        else:
-            metadata_key = self.default_metadata_private_jwk
-
-        helper = JWSHelper(metadata_key)
 
         try:
-            request_object_jwt = helper.sign(
+            request_object_jwt = self.request_object_signer.sign(
                 data,
                 protected=_protected_jwt_headers,
+                key_index=key_index,
             )
             self._log_debug(context, f"created request object {request_object_jwt}")
             return Response(
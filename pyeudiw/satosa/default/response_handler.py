@@ -11,7 +11,7 @@ from satosa.context import Context
 from satosa.internal import AuthenticationInformation, InternalData
 from satosa.response import Redirect
 
-from pyeudiw.jwt.jwe_helper import JWEHelper
+from pyeudiw.jwt.utils import jwt_decoding_scope
 from pyeudiw.openid4vp.authorization_response import (
     AuthorizeResponsePayload,
     DirectPostJwtJweParser,
@@ -40,7 +40,6 @@ from pyeudiw.openid4vp.presentation_submission.exceptions import (
     MissingHandler, 
     SubmissionValidationError, 
     VPTokenDescriptorMapMismatch,
-    ParseError,
     ValidationError
 )
 
@@ -111,6 +110,13 @@ class ResponseHandler(ResponseHandlerInterface):
 
     def response_endpoint(
         self, context: Context, *args: tuple
+    ) -> Redirect | JsonResponse:
+        # the tokens of the response are decoded once while it is processed
+        with jwt_decoding_scope():
+            return self._response_endpoint(context, *args)
+
+    def _response_endpoint(
+        self, context: Context, *args: tuple
     ) -> Redirect | JsonResponse:
         self._log_function_debug("response_endpoint", context, "args", args)
 
@@ -170,7 +176,8 @@ class ResponseHandler(ResponseHandlerInterface):
 
         try:
             challenge = self._get_verifier_challenge(request_session)
-            self.vp_token_parser.validate(
+            # the tokens are decoded and verified once, along with the claims extraction
+            credentials = self.vp_token_parser.verify(
                 presentation_submission,
                 encoded_vps,
                 challenge["aud"],
@@ -206,25 +213,11 @@ class ResponseHandler(ResponseHandlerInterface):
                 "invalid presentation submission: unknown error",
                 e500
             )
-        
-        try:
-            extracted_attributes = self.vp_token_parser.parse(
-                presentation_submission, 
-                encoded_vps
-            )
-        except ParseError as e400:
-            return self._handle_400(
-                context, 
-                "invalid presentation submission: parsing error",
-                e400
-            )
-        except Exception as e500:
-            return self._handle_500(
-                context, 
-                "invalid presentation submission: unknown error",
-                e500
-            )
-        
+
+        extracted_attributes = [credential.claims for credential in credentials]
+        credential_issuers = [
+            credential.issuer for credential in credentials if credential.issuer
+        ]
         all_attributes = self._extract_all_user_attributes(extracted_attributes)
         iss_list_serialized = ";".join(credential_issuers)  # marshaling is whatever
         internal_resp = self._translate_response(
@@ -340,9 +333,8 @@ class ResponseHandler(ResponseHandlerInterface):
                 parser = DirectPostParser()
                 return parser.parse_and_validate(context)
             case ResponseMode.direct_post_jwt:
-                jwe_decrypter = JWEHelper(self.config["metadata_jwks"])
                 parser = DirectPostJwtJweParser(
-                    jwe_decrypter, 
+                    self.jwe_decrypter, 
                     self.config["jwt"].get("enc_alg_supported", []), 
                     self.config["jwt"].get("enc_enc_supported", [])
                 )
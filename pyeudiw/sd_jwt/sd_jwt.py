@@ -329,7 +329,7 @@ def _extract_claims_from_payload(
     _, hash_to_dec_disclosure = _disclosures_to_hash_mappings(
         disclosures, sd_alg
     )
-    return _unpack_claims(payload, hash_to_dec_disclosure, sd_alg, [])
+    return _unpack_claims(payload, hash_to_dec_disclosure, sd_alg, set())
 
 
 def _is_element_leaf(element: Any) -> bool:
@@ -350,133 +350,101 @@ def _is_element_leaf(element: Any) -> bool:
     )
 
 
-def _unpack_json_array(
-    claims: list,
-    decoded_disclosures_by_digest: dict[str, Any],
-    sd_alg: Callable[[str], str],
-    processed_digests: list[str],
-) -> list:
-    """
-    Unpack the disclosed claims in the payload
-
-    :param claims: the claims to unpack
-    :type claims: list
-    :param decoded_disclosures_by_digest: a map of digests to decoded disclosures
-    :type decoded_disclosures_by_digest: dict[str, Any]
-    :param sd_alg: the function to use to hash the disclosures
-    :type sd_alg: Callable[[str], str]
-    :param processed_digests: a list of processed digests
-    :type processed_digests: list[str]
-
-    :raises ValueError: if there are duplicate digests
-
-    :returns: the unpacked claims
-    :rtype: list
-    """
-
-    result = []
-    for element in claims:
-        if _is_element_leaf(element):
-            digest: str = element[SD_LIST_PREFIX]
-            if digest in decoded_disclosures_by_digest:
-                _, value = decoded_disclosures_by_digest[digest]
-                result.append(
-                    _unpack_claims(
-                        value, decoded_disclosures_by_digest, sd_alg, processed_digests
-                    )
-                )
-        else:
-            result.append(
-                _unpack_claims(
-                    element, decoded_disclosures_by_digest, sd_alg, processed_digests
-                )
-            )
-    return result
-
-
-def _unpack_json_dict(
-    claims: dict,
-    decoded_disclosures_by_digest: dict[str, Any],
-    sd_alg: Callable[[str], str],
-    proceessed_digests: list[str],
-) -> dict:
+def _check_digest(digest: str, processed_digests: set[str]) -> None:
     """
-    Unpack the disclosed claims in the payload
+    Record a digest found in the payload, or in a disclosure
 
-    :param claims: the claims to unpack
-    :type claims: dict
-    :param decoded_disclosures_by_digest: a map of digests to decoded disclosures
-    :type decoded_disclosures_by_digest: dict[str, Any]
-    :param sd_alg: the function to use to hash the disclosures
-    :type sd_alg: Callable[[str], str]
-    :param proceessed_digests: a list of processed digests
-    :type proceessed_digests: list[str]
-
-    :raises ValueError: if there are duplicate digests
+    :param digest: the digest
+    :type digest: str
+    :param processed_digests: the digests found so far
+    :type processed_digests: set[str]
 
-    :returns: the unpacked claims
-    :rtype: dict
+    :raises ValueError: if the digest was already found
     """
-
-    # First, try to figure out if there are any claims to be
-    # disclosed in this dict. If so, replace them by their
-    # disclosed values.
-    filtered_unpacked_claims = {}
-    for k, v in claims.items():
-        if k != SD_DIGESTS_KEY and k != DIGEST_ALG_KEY:
-            filtered_unpacked_claims[k] = _unpack_claims(
-                v, decoded_disclosures_by_digest, sd_alg, proceessed_digests
-            )
-
-    for disclosed_digests in claims.get(SD_DIGESTS_KEY, []):
-        if disclosed_digests in proceessed_digests:
-            raise ValueError(f"duplicate hash found in SD-JWT: {disclosed_digests}")
-        proceessed_digests.append(disclosed_digests)
-
-        if disclosed_digests in decoded_disclosures_by_digest:
-            _, key, value = decoded_disclosures_by_digest[disclosed_digests]
-            if key in filtered_unpacked_claims:
-                raise ValueError(
-                    f"duplicate key found when unpacking disclosed claim: '{key}' in {filtered_unpacked_claims}; this is not allowed."
-                )
-            unpacked_value = _unpack_claims(
-                value, decoded_disclosures_by_digest, sd_alg, proceessed_digests
-            )
-            filtered_unpacked_claims[key] = unpacked_value
-    return filtered_unpacked_claims
+    if digest in processed_digests:
+        raise ValueError(f"duplicate hash found in SD-JWT: {digest}")
+    processed_digests.add(digest)
 
 
 def _unpack_claims(
     claims: _JsonTypes_T,
     decoded_disclosures_by_digest: dict[str, Any],
     sd_alg: Callable[[str], str],
-    proceessed_digests: list[str],
+    processed_digests: set[str],
 ) -> _JsonTypes_T:
     """
     Unpack the disclosed claims in the payload
 
+    The json tree is walked once, with an explicit stack instead of
+    recursion, so that each element and each digest, decoys included,
+    is visited a single time whatever the depth of the tree. Every
+    digest may appear once, either in an _sd array or in an array
+    element; this also rejects disclosures that refer to themselves.
+
     :param claims: the claims to unpack
     :type claims: _JsonTypes_T
     :param decoded_disclosures_by_digest: a map of digests to decoded disclosures
     :type decoded_disclosures_by_digest: dict[str, Any]
     :param sd_alg: the function to use to hash the disclosures
     :type sd_alg: Callable[[str], str]
-    :param proceessed_digests: a list of processed digests
-    :type proceessed_digests: list[str]
+    :param processed_digests: the digests found so far, updated in place
+    :type processed_digests: set[str]
 
-    :raises ValueError: if there are duplicate digests
+    :raises ValueError: if there are duplicate digests or duplicate keys
 
     :returns: the unpacked claims
     :rtype: _JsonTypes_T
     """
 
-    if type(claims) is list:
-        return _unpack_json_array(
-            claims, decoded_disclosures_by_digest, sd_alg, proceessed_digests
-        )
-    elif type(claims) is dict:
-        return _unpack_json_dict(
-            claims, decoded_disclosures_by_digest, sd_alg, proceessed_digests
+    root: list = [claims]
+    # each item is a container to unpack, with the slot of its parent to fill
+    stack: list[tuple[Any, Any, Any]] = [(claims, root, 0)]
+
+    while stack:
+        element, parent, slot = stack.pop()
+
+        if type(element) is dict:
+            unpacked = {}
+            children = []
+            for key, value in element.items():
+                if key != SD_DIGESTS_KEY and key != DIGEST_ALG_KEY:
+                    unpacked[key] = value
+                    children.append((value, unpacked, key))
+
+            for digest in element.get(SD_DIGESTS_KEY, []):
+                _check_digest(digest, processed_digests)
+
+                if digest in decoded_disclosures_by_digest:
+                    _, key, value = decoded_disclosures_by_digest[digest]
+                    if key in unpacked:
+                        raise ValueError(
+                            f"duplicate key found when unpacking disclosed claim: '{key}' in {unpacked}; this is not allowed."
+                        )
+                    unpacked[key] = value
+                    children.append((value, unpacked, key))
+
+        elif type(element) is list:
+            unpacked = []
+            children = []
+            for item in element:
+                if _is_element_leaf(item):
+                    digest: str = item[SD_LIST_PREFIX]
+                    _check_digest(digest, processed_digests)
+
+                    if digest not in decoded_disclosures_by_digest:
+                        continue
+                    _, item = decoded_disclosures_by_digest[digest]
+
+                children.append((item, unpacked, len(unpacked)))
+                unpacked.append(item)
+
+        else:
+            continue
+
+        parent[slot] = unpacked
+        # the scalars are already in place, only the containers are unpacked
+        stack.extend(
+            child for child in reversed(children) if type(child[0]) in (dict, list)
         )
-    else:
-        return claims
+
+    return root[0]
@@ -9,13 +9,12 @@ from pyeudiw.jwt.helper import validate_jwt_timestamps_claims
 from pyeudiw.jwt.jws_helper import JWSHelper
 from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload
 from pyeudiw.sd_jwt.common import SDJWTCommon
+from pyeudiw.sd_jwt.sd_jwt import _unpack_claims
 
 from . import (
     DEFAULT_SIGNING_ALG,
     DIGEST_ALG_KEY,
     KB_DIGEST_KEY,
-    SD_DIGESTS_KEY,
-    SD_LIST_PREFIX,
 )
 
 logger = logging.getLogger(__name__)
@@ -197,57 +196,13 @@ class SDJWTVerifier(SDJWTCommon):
                 # TODO: Support other hash algorithms
                 raise ValueError("Invalid hash algorithm")
 
-        self._duplicate_hash_check = []
+        self._duplicate_hash_check = set()
         return self._unpack_disclosed_claims(self._sd_jwt_payload)
 
     def _unpack_disclosed_claims(self, sd_jwt_claims):
-        # In a list, unpack each element individually
-        if type(sd_jwt_claims) is list:
-            output = []
-            for element in sd_jwt_claims:
-                if (
-                    type(element) is dict
-                    and len(element) == 1
-                    and SD_LIST_PREFIX in element
-                    and type(element[SD_LIST_PREFIX]) is str
-                ):
-                    digest_to_check = element[SD_LIST_PREFIX]
-                    if digest_to_check in self._hash_to_decoded_disclosure:
-                        _, value = self._hash_to_decoded_disclosure[digest_to_check]
-                        output.append(self._unpack_disclosed_claims(value))
-                else:
-                    output.append(self._unpack_disclosed_claims(element))
-            return output
-
-        elif type(sd_jwt_claims) is dict:
-            # First, try to figure out if there are any claims to be
-            # disclosed in this dict. If so, replace them by their
-            # disclosed values.
-
-            pre_output = {
-                k: self._unpack_disclosed_claims(v)
-                for k, v in sd_jwt_claims.items()
-                if k != SD_DIGESTS_KEY and k != DIGEST_ALG_KEY
-            }
-
-            for digest in sd_jwt_claims.get(SD_DIGESTS_KEY, []):
-                if digest in self._duplicate_hash_check:
-                    raise ValueError(f"Duplicate hash found in SD-JWT: {digest}")
-                self._duplicate_hash_check.append(digest)
-
-                if digest in self._hash_to_decoded_disclosure:
-                    _, key, value = self._hash_to_decoded_disclosure[digest]
-                    if key in pre_output:
-                        raise ValueError(
-                            "Duplicate key found when unpacking disclosed claim: "
-                            f"'{key}' in {pre_output}. This is not allowed."
-                        )
-                    unpacked_value = self._unpack_disclosed_claims(value)
-                    pre_output[key] = unpacked_value
-
-            # Now, go through the dict and unpack any nested dicts.
-
-            return pre_output
-
-        else:
-            return sd_jwt_claims
+        return _unpack_claims(
+            sd_jwt_claims,
+            self._hash_to_decoded_disclosure,
+            self.HASH_ALG["fn"],
+            self._duplicate_hash_check,
+        )
@@ -1,18 +1,81 @@
+import mmap
+import tempfile
 import zlib
 import cbor2
 from binascii import unhexlify
-from typing import Literal, Union, Optional
+from typing import TYPE_CHECKING, Literal, Optional, Sequence, Union
 from pyeudiw.jwt.utils import base64_urldecode, base64_urlencode
 from pyeudiw.jwt.utils import decode_jwt_header, decode_jwt_payload
+from pyeudiw.status_list.exceptions import PositionOutOfRangeError
+
+if TYPE_CHECKING:
+    import numpy
 
 StatusListFormat = Literal["jwt", "cwt"]
 
-def decode_jwt_status_list_token(token: str) -> tuple[bool, dict, dict, int, bytes]:
+# the size of the chunks decompressed at once
+_DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+
+
+def decompress_status_list(
+        compressed_data: bytes,
+        mmap_threshold: Optional[int] = None
+    ) -> Union[bytes, mmap.mmap]:
+    """
+    Decompress a status list.
+
+    When the decompressed status list is larger than mmap_threshold it is
+    decompressed by chunks in an anonymous temporary file and returned
+    memory-mapped read only, so that it is kept out of the process heap.
+
+    :param compressed_data: The zlib compressed status list.
+    :type compressed_data: bytes
+    :param mmap_threshold: The size, in bytes, above which the status list is memory-mapped.
+    :type mmap_threshold: Optional[int]
+
+    :return: The status list.
+    :rtype: Union[bytes, mmap.mmap]
+    """
+    if mmap_threshold is None:
+        return zlib.decompress(compressed_data)
+
+    decompressor = zlib.decompressobj()
+    chunks = []
+    size = 0
+    data = compressed_data
+
+    while data and size <= mmap_threshold:
+        chunk = decompressor.decompress(data, _DECOMPRESS_CHUNK_SIZE)
+        chunks.append(chunk)
+        size += len(chunk)
+        data = decompressor.unconsumed_tail
+
+    if size <= mmap_threshold:
+        chunks.append(decompressor.flush())
+        return b"".join(chunks)
+
+    with tempfile.TemporaryFile() as buffer:
+        buffer.writelines(chunks)
+        while data:
+            buffer.write(decompressor.decompress(data, _DECOMPRESS_CHUNK_SIZE))
+            data = decompressor.unconsumed_tail
+        buffer.write(decompressor.flush())
+        buffer.flush()
+        # the mapping outlives the file, that is removed once closed
+        return mmap.mmap(buffer.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def decode_jwt_status_list_token(
+        token: str,
+        mmap_threshold: Optional[int] = None
+    ) -> tuple[bool, dict, dict, int, bytes]:
     """
     Decode a JWT status list token.
 
     :param token: The JWT status list token.
     :type token: str
+    :param mmap_threshold: The size, in bytes, above which the status list is memory-mapped.
+    :type mmap_threshold: Optional[int]
 
     :return: A tuple containing the parsing status, the header, payload, bits, and status list.
     :rtype: tuple[dict, dict, int, bytes]
@@ -31,18 +94,23 @@ def decode_jwt_status_list_token(token: str) -> tuple[bool, dict, dict, int, byt
         bits = decoded_status_list["bits"]
 
         compressed_data = base64_urldecode(decoded_status_list["lst"])
-        status_list = zlib.decompress(compressed_data)
+        status_list = decompress_status_list(compressed_data, mmap_threshold)
 
         return True, header, payload, bits, status_list
     except Exception:
         return False, {}, {}, 0, b""
 
-def decode_cwt_status_list_token(token: bytes) -> tuple[bool, dict, dict, int, bytes]:
+def decode_cwt_status_list_token(
+        token: bytes,
+        mmap_threshold: Optional[int] = None
+    ) -> tuple[bool, dict, dict, int, bytes]:
     """
     Decode a CWT status list token.
 
     :param token: The CWT status list token.
     :type token: bytes
+    :param mmap_threshold: The size, in bytes, above which the status list is memory-mapped.
+    :type mmap_threshold: Optional[int]
 
     :return: A tuple containing the parsing status, the header, payload, bits, and status list.
     :rtype: tuple[dict, dict, int, bytes]
@@ -60,12 +128,63 @@ def decode_cwt_status_list_token(token: bytes) -> tuple[bool, dict, dict, int, b
         decoded_status_list = payload[65533]
 
         bits = decoded_status_list["bits"]
-        status_list = zlib.decompress(decoded_status_list["lst"])
+        status_list = decompress_status_list(decoded_status_list["lst"], mmap_threshold)
 
         return True, header, payload, bits, status_list
     except Exception:
         return False, {}, {}, 0, b""
     
+STATUS_LIST_BITS = (1, 2, 4, 8)
+
+
+def unpack_statuses(
+        status_list: Union[bytes, bytearray, mmap.mmap],
+        bits: int,
+        positions: Optional[Sequence[int]] = None
+    ) -> "numpy.ndarray":
+    """
+    Unpack the statuses of a status list at once, with NumPy.
+
+    Requires the status_list extra (numpy).
+
+    :param status_list: The decompressed status list.
+    :type status_list: Union[bytes, bytearray, mmap.mmap]
+    :param bits: The number of bits of each status, one of 1, 2, 4 and 8.
+    :type bits: int
+    :param positions: The positions of the statuses, all the statuses if not given.
+    :type positions: Optional[Sequence[int]]
+
+    :raises ValueError: If bits is not supported.
+    :raises PositionOutOfRangeError: If a position is out of range.
+
+    :return: The statuses, in the order of the positions.
+    :rtype: numpy.ndarray
+    """
+    import numpy
+
+    if bits not in STATUS_LIST_BITS:
+        raise ValueError(f"Unsupported status size: {bits} bits")
+
+    packed = numpy.frombuffer(status_list, dtype=numpy.uint8)
+    mask = numpy.uint8((1 << bits) - 1)
+
+    if positions is None:
+        if bits == 8:
+            return packed.copy()
+        shifts = numpy.arange(0, 8, bits, dtype=numpy.uint8)
+        return ((packed[:, None] >> shifts) & mask).reshape(-1)
+
+    positions = numpy.asarray(positions, dtype=numpy.int64)
+    if positions.size:
+        if positions.min() < 0:
+            raise PositionOutOfRangeError("Position cannot be negative")
+        if positions.max() >= (len(packed) * 8) // bits:
+            raise PositionOutOfRangeError("Position out of range")
+
+    jump = positions * bits
+    return (packed[jump >> 3] >> (jump & 7).astype(numpy.uint8)) & mask
+
+
 def _compress_bitstring(bitstring: bytes) -> bytes:
     """
     Compress a bitstring using zlib.
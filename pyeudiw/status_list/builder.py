@@ -0,0 +1,281 @@
+import threading
+import zlib
+from binascii import hexlify
+from typing import Optional
+
+import cbor2
+from cryptojwt.jwk.jwk import key_from_jwk_dict
+from cryptojwt.jws.jws import SIGNER_ALGS
+
+from pyeudiw.jwt.jws_helper import DEFAULT_SIG_KTY_MAP, JWSHelper
+from pyeudiw.jwt.utils import base64_urlencode
+from pyeudiw.status_list import STATUS_LIST_BITS
+from pyeudiw.status_list.exceptions import PositionOutOfRangeError
+from pyeudiw.tools.utils import iat_now
+
+# the bytes of the status list compressed independently of each other
+STATUS_LIST_BLOCK_SIZE = 64 * 1024
+
+# deflate with a 32 KiB window and the default compression level
+_ZLIB_HEADER = b"\x78\x9c"
+_DEFLATE_FINAL_BLOCK = zlib.compressobj(wbits=-zlib.MAX_WBITS).flush()
+
+# the COSE algorithm identifiers of the signing algorithms
+COSE_ALGS = {"ES256": -7, "ES384": -35, "ES512": -36, "RS256": -257}
+
+CWT_CLAIM_SUB = 2
+CWT_CLAIM_EXP = 4
+CWT_CLAIM_IAT = 6
+CWT_CLAIM_STATUS_LIST = 65533
+CWT_CLAIM_TTL = 65534
+
+
+def _deflate_block(block: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    # a full flush aligns the output and drops the history, so that the
+    # compressed blocks can be concatenated in a single deflate stream
+    return compressor.compress(block) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+
+class StatusListBuilder:
+    """
+    A mutable status list, for the issuance of status list tokens.
+
+    The statuses are kept packed as in the tokens, so that setting or
+    clearing a status is O(1). The packed list is compressed by blocks of
+    STATUS_LIST_BLOCK_SIZE bytes, each one in a deflate segment that is
+    independent of the others: when a token is emitted only the blocks
+    changed since the previous one are compressed again, and the segments
+    are joined in a single zlib stream.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        bits: int = 1,
+        aggregation_uri: Optional[str] = None,
+    ) -> None:
+        """
+        Creates an instance of StatusListBuilder, with all the statuses set to 0.
+
+        :param size: the number of statuses
+        :type size: int
+        :param bits: the number of bits of each status, one of 1, 2, 4 and 8
+        :type bits: int
+        :param aggregation_uri: the aggregation URI
+        :type aggregation_uri: Optional[str]
+
+        :raises ValueError: if bits is not supported
+        """
+        if bits not in STATUS_LIST_BITS:
+            raise ValueError(f"Unsupported status size: {bits} bits")
+
+        self.size = size
+        self.bits = bits
+        self.aggregation_uri = aggregation_uri
+
+        self._mask = (1 << bits) - 1
+        self._buffer = bytearray(-(-size * bits // 8))
+
+        blocks = -(-len(self._buffer) // STATUS_LIST_BLOCK_SIZE)
+        self._compressed_blocks: list[Optional[bytes]] = [None] * blocks
+        self._dirty_blocks: set[int] = set(range(blocks))
+        self._lock = threading.Lock()
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        if position < 0:
+            raise PositionOutOfRangeError("Position cannot be negative")
+        if position >= self.size:
+            raise PositionOutOfRangeError("Position out of range")
+
+        jump = self.bits * position
+        return jump >> 3, jump & 7
+
+    def get(self, position: int) -> int:
+        """
+        Returns the status at the given position.
+
+        :param position: the position of the status in the list
+        :type position: int
+
+        :raises PositionOutOfRangeError: if the position is out of range
+
+        :returns: the status
+        :rtype: int
+        """
+        index, shift = self._locate(position)
+        return (self._buffer[index] >> shift) & self._mask
+
+    def set(self, position: int, status: int = 1) -> None:
+        """
+        Sets the status at the given position.
+
+        :param position: the position of the status in the list
+        :type position: int
+        :param status: the status
+        :type status: int
+
+        :raises PositionOutOfRangeError: if the position is out of range
+        :raises ValueError: if the status does not fit in the bits of the list
+        """
+        if not 0 <= status <= self._mask:
+            raise ValueError(f"Status {status} does not fit in {self.bits} bits")
+
+        index, shift = self._locate(position)
+        with self._lock:
+            self._buffer[index] = (self._buffer[index] & ~(self._mask << shift)) | (
+                status << shift
+            )
+            self._dirty_blocks.add(index // STATUS_LIST_BLOCK_SIZE)
+
+    def clear(self, position: int) -> None:
+        """
+        Sets the status at the given position to 0.
+
+        :param position: the position of the status in the list
+        :type position: int
+
+        :raises PositionOutOfRangeError: if the position is out of range
+        """
+        self.set(position, 0)
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the packed status list.
+
+        :returns: the status list, not compressed
+        :rtype: bytes
+        """
+        with self._lock:
+            return bytes(self._buffer)
+
+    def compress(self) -> bytes:
+        """
+        Returns the status list compressed with zlib, compressing
+        again only the blocks changed since the last call.
+
+        :returns: the compressed status list
+        :rtype: bytes
+        """
+        with self._lock:
+            for block in self._dirty_blocks:
+                start = block * STATUS_LIST_BLOCK_SIZE
+                self._compressed_blocks[block] = _deflate_block(
+                    bytes(self._buffer[start : start + STATUS_LIST_BLOCK_SIZE])
+                )
+            self._dirty_blocks.clear()
+
+            checksum = zlib.adler32(self._buffer).to_bytes(4, "big")
+            return b"".join(
+                [_ZLIB_HEADER, *self._compressed_blocks, _DEFLATE_FINAL_BLOCK, checksum]
+            )
+
+    def status_list(self) -> dict:
+        """
+        Returns the status_list claim of a JWT status list token.
+
+        :returns: the status list claim
+        :rtype: dict
+        """
+        status_list = {"bits": self.bits, "lst": base64_urlencode(self.compress())}
+        if self.aggregation_uri:
+            status_list["aggregation_uri"] = self.aggregation_uri
+        return status_list
+
+    def to_jwt(
+        self,
+        jwk: dict,
+        sub: str,
+        iss: Optional[str] = None,
+        exp: Optional[int] = None,
+        ttl: Optional[int] = None,
+        iat: Optional[int] = None,
+        protected: Optional[dict] = None,
+    ) -> str:
+        """
+        Emits a JWT status list token.
+
+        :param jwk: the private key of the issuer
+        :type jwk: dict
+        :param sub: the URI of the status list
+        :type sub: str
+        :param iss: the issuer
+        :type iss: Optional[str]
+        :param exp: the expiration of the token
+        :type exp: Optional[int]
+        :param ttl: the seconds the token can be cached
+        :type ttl: Optional[int]
+        :param iat: the issuance time, now if not given
+        :type iat: Optional[int]
+        :param protected: additional header parameters, as x5c or trust_chain
+        :type protected: Optional[dict]
+
+        :returns: the signed token
+        :rtype: str
+        """
+        payload = {"sub": sub, "iat": iat or iat_now()}
+        if iss:
+            payload["iss"] = iss
+        if exp:
+            payload["exp"] = exp
+        if ttl:
+            payload["ttl"] = ttl
+        payload["status_list"] = self.status_list()
+
+        return JWSHelper(jwk).sign(
+            payload, protected={**(protected or {}), "typ": "statuslist+jwt"}
+        )
+
+    def to_cwt(
+        self,
+        jwk: dict,
+        sub: str,
+        exp: Optional[int] = None,
+        ttl: Optional[int] = None,
+        iat: Optional[int] = None,
+        unprotected: Optional[dict] = None,
+    ) -> bytes:
+        """
+        Emits a CWT status list token, a COSE_Sign1 in hex encoding.
+
+        :param jwk: the private key of the issuer
+        :type jwk: dict
+        :param sub: the URI of the status list
+        :type sub: str
+        :param exp: the expiration of the token
+        :type exp: Optional[int]
+        :param ttl: the seconds the token can be cached
+        :type ttl: Optional[int]
+        :param iat: the issuance time, now if not given
+        :type iat: Optional[int]
+        :param unprotected: additional unprotected header parameters, as the x5chain (33)
+        :type unprotected: Optional[dict]
+
+        :returns: the signed token
+        :rtype: bytes
+        """
+        status_list = {"bits": self.bits, "lst": self.compress()}
+        if self.aggregation_uri:
+            status_list["aggregation_uri"] = self.aggregation_uri
+
+        claims = {CWT_CLAIM_SUB: sub, CWT_CLAIM_IAT: iat or iat_now()}
+        if exp:
+            claims[CWT_CLAIM_EXP] = exp
+        if ttl:
+            claims[CWT_CLAIM_TTL] = ttl
+        claims[CWT_CLAIM_STATUS_LIST] = status_list
+
+        key = key_from_jwk_dict(jwk)
+        alg = DEFAULT_SIG_KTY_MAP[key.kty]
+        protected = cbor2.dumps({1: COSE_ALGS[alg], 16: "application/statuslist+cwt"})
+        unprotected = dict(unprotected or {})
+        if key.kid:
+            unprotected[4] = key.kid.encode()
+        payload = cbor2.dumps(claims)
+
+        to_be_signed = cbor2.dumps(["Signature1", protected, b"", payload])
+        signature = SIGNER_ALGS[alg].sign(to_be_signed, key.private_key())
+
+        return hexlify(
+            cbor2.dumps(cbor2.CBORTag(18, [protected, unprotected, payload, signature]))
+        )
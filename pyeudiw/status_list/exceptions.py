@@ -20,4 +20,10 @@ class StatusListRetrievalError(Exception):
     """
     Exception raised when there is an error retrieving the status list.
     """
-    pass
\ No newline at end of file
+    pass
+
+class StatusListVerificationError(Exception):
+    """
+    Exception raised when the signature of a status list token cannot be verified.
+    """
+    pass
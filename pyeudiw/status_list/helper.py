@@ -1,7 +1,12 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Sequence
 from pyeudiw.tools.utils import iat_now
 from pyeudiw.federation.http_client import http_get_sync
-from pyeudiw.status_list import decode_jwt_status_list_token, decode_cwt_status_list_token
+from pyeudiw.status_list import (
+    StatusListFormat,
+    decode_jwt_status_list_token,
+    decode_cwt_status_list_token,
+    unpack_statuses,
+)
 from pyeudiw.status_list.exceptions import (
     PositionOutOfRangeError,
     InvalidTokenFormatError,
@@ -9,6 +14,15 @@ from pyeudiw.status_list.exceptions import (
     StatusListRetrievalError
 )
 
+if TYPE_CHECKING:
+    import numpy
+
+DEFAULT_HTTPC_PARAMS = {
+    "connection": {"ssl": True},
+    "session": {"timeout": 4},
+}
+
+
 class StatusListTokenHelper:
     def __init__(
             self, 
@@ -16,7 +30,9 @@ class StatusListTokenHelper:
             payload: dict, 
             bits: int, 
             status_list: bytes,
-            aggregation_uri: Optional[str] = None
+            aggregation_uri: Optional[str] = None,
+            token: Optional[str | bytes] = None,
+            token_format: Optional[StatusListFormat] = None
     ) -> None:
         """
         Initializes the StatusListTokenHelper instance.
@@ -31,6 +47,10 @@ class StatusListTokenHelper:
         :type status_list: bytes
         :param aggregation_uri: The aggregation URI.
         :type aggregation_uri: Optional[str]
+        :param token: The encoded token, needed to verify its signature.
+        :type token: Optional[str | bytes]
+        :param token_format: The format of the token, jwt or cwt.
+        :type token_format: Optional[StatusListFormat]
         """
 
         self.header = header
@@ -38,6 +58,8 @@ class StatusListTokenHelper:
         self.bits = bits
         self.status_list = status_list
         self.aggregation_uri = aggregation_uri
+        self.token = token
+        self.token_format = token_format
 
     def is_expired(self) -> bool:
         """
@@ -84,6 +106,22 @@ class StatusListTokenHelper:
 
         return status
     
+    def get_statuses(self, positions: Optional[Sequence[int]] = None) -> "numpy.ndarray":
+        """
+        Returns the statuses at the given positions at once.
+
+        Requires the status_list extra (numpy).
+
+        :param positions: The positions of the statuses, all the statuses if not given.
+        :type positions: Optional[Sequence[int]]
+
+        :raises PositionOutOfRangeError: If a position is out of range.
+
+        :returns: The statuses, in the order of the positions.
+        :rtype: numpy.ndarray
+        """
+        return unpack_statuses(self.status_list, self.bits, positions)
+
     def get_aggregation_uri(self) -> Optional[str]:
         """
         Returns the aggregation URI.
@@ -114,7 +152,10 @@ class StatusListTokenHelper:
         :returns: The issuer of the token.
         :rtype: Optional[str]
         """
-        return self.payload.get("iss")
+        return self.payload.get(
+            "iss",
+            self.payload.get(1)
+        )
     
     @property
     def sub(self) -> Optional[str]:
@@ -143,33 +184,76 @@ class StatusListTokenHelper:
         )
     
     @staticmethod
-    def from_token(token: str | bytes) -> "StatusListTokenHelper":
+    def from_token(
+        token: str | bytes,
+        mmap_threshold: Optional[int] = None
+    ) -> "StatusListTokenHelper":
         """
         Create a StatusListTokenHelper instance from a status list token.
         :param token: The status list token.
         :type token: str | bytes
+        :param mmap_threshold: The size, in bytes, above which the status list is memory-mapped.
+        :type mmap_threshold: Optional[int]
 
         :raises InvalidTokenFormatError: If the token is not a valid JWT or CWT.
 
         :returns: A StatusListTokenHelper instance.
         :rtype: StatusListTokenHelper
         """
-        decoders = [decode_jwt_status_list_token, decode_cwt_status_list_token]
+        decoders = {
+            "jwt": decode_jwt_status_list_token,
+            "cwt": decode_cwt_status_list_token
+        }
 
-        for decoder in decoders:
-            status, header, payload, bits, status_list = decoder(token)
+        for token_format, decoder in decoders.items():
+            status, header, payload, bits, status_list = decoder(token, mmap_threshold)
 
             if status:
-                return StatusListTokenHelper(header, payload, bits, status_list)
+                return StatusListTokenHelper(
+                    header, payload, bits, status_list,
+                    token=token, token_format=token_format
+                )
 
         raise InvalidTokenFormatError(f"Token is not a valid JWT or CWT {token}")
-    
+
+    @staticmethod
+    def fetch(
+        uri: str,
+        httpc_params: Optional[dict] = None,
+        mmap_threshold: Optional[int] = None
+    ) -> "StatusListTokenHelper":
+        """
+        Create a StatusListTokenHelper instance from the status list token published at uri.
+        :param uri: The status list URI.
+        :type uri: str
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: Optional[dict]
+        :param mmap_threshold: The size, in bytes, above which the status list is memory-mapped.
+        :type mmap_threshold: Optional[int]
+
+        :raises StatusListRetrievalError: If there is an error retrieving the status list.
+        :raises InvalidTokenFormatError: If the retrieved token is invalid.
+
+        :returns: A StatusListTokenHelper instance.
+        :rtype: StatusListTokenHelper
+        """
+        try:
+            status_token = http_get_sync([uri], httpc_params or DEFAULT_HTTPC_PARAMS)
+        except Exception as e:
+            raise StatusListRetrievalError(f"Failed to retrieve status list token: {e}")
+
+        token = status_token[0].text
+
+        return StatusListTokenHelper.from_token(token, mmap_threshold)
+
     @staticmethod
     def from_status(status: dict, httpc_params: Optional[dict] = None) -> "StatusListTokenHelper":
         """
         Create a StatusListTokenHelper instance from a status dictionary.
         :param status: The status dictionary.
         :type status: dict
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: Optional[dict]
 
         :raises MissingStatusListUriError: If the status list URI is missing.
         :raises StatusListRetrievalError: If there is an error retrieving the status list.
@@ -184,14 +268,4 @@ class StatusListTokenHelper:
         if uri is None:
             raise MissingStatusListUriError("Status list URI is missing")
 
-        try:
-            status_token = http_get_sync([uri], {
-                "connection": {"ssl": True},
-                "session": {"timeout": 4},
-            })
-        except Exception as e:
-            raise StatusListRetrievalError(f"Failed to retrieve status list token: {e}")
-
-        token = status_token[0].text
-
-        return StatusListTokenHelper.from_token(token)
\ No newline at end of file
+        return StatusListTokenHelper.fetch(uri, httpc_params)
@@ -0,0 +1,376 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+
+from pyeudiw.status_list.exceptions import (
+    MissingStatusListUriError,
+    StatusListVerificationError,
+)
+from pyeudiw.status_list.helper import DEFAULT_HTTPC_PARAMS, StatusListTokenHelper
+from pyeudiw.tools.cache import BackgroundRefresher, LRUCache, ProcessWide
+from pyeudiw.tools.utils import iat_now
+
+if TYPE_CHECKING:
+    import numpy
+
+    from pyeudiw.status_list.verifier import StatusListTokenVerifier
+
+logger = logging.getLogger(__name__)
+
+STATUS_LIST_CACHE_MAXSIZE = int(os.getenv("PYEUDIW_STATUS_LIST_CACHE_MAXSIZE", 128))
+# used when the token has no ttl claim
+STATUS_LIST_DEFAULT_TTL = int(os.getenv("PYEUDIW_STATUS_LIST_DEFAULT_TTL", 300))
+# seconds before the ttl elapses when the token is fetched again in background
+STATUS_LIST_REFRESH_LEAD_TIME = int(
+    os.getenv("PYEUDIW_STATUS_LIST_REFRESH_LEAD_TIME", 60)
+)
+# decompressed status lists larger than this are memory-mapped
+STATUS_LIST_MMAP_THRESHOLD = int(
+    os.getenv("PYEUDIW_STATUS_LIST_MMAP_THRESHOLD", 16 * 1024 * 1024)
+)
+
+StatusListCacheInfo = NamedTuple(
+    "StatusListCacheInfo",
+    [
+        ("hits", int),
+        ("misses", int),
+        ("refreshes", int),
+        ("verifications", int),
+        ("currsize", int),
+    ],
+)
+
+
+@dataclass(frozen=True)
+class _CachedStatusList:
+    """
+    A status list token, decoded and decompressed once.
+
+    :param status_list: the decoded token
+    :param refresh_at: the unix timestamp when it is fetched again in background
+    :param expires_at: the unix timestamp when it cannot be used anymore,
+        that is when the ttl elapses or the token expires
+    :param verifications: the outcome of the signature verifications of the
+        token, None if valid, by verifier and credential issuer
+    """
+
+    status_list: StatusListTokenHelper
+    refresh_at: int
+    expires_at: int
+    verifications: dict[
+        tuple["StatusListTokenVerifier", Optional[str]], Optional[Exception]
+    ] = field(default_factory=dict)
+
+
+class StatusListManager:
+    """
+    The status list tokens, keyed by uri and shared by all the credentials
+    that refer to them.
+
+    Each token is fetched, decoded and decompressed once, and kept until
+    its ttl claim elapses or it expires. The decompressed status lists are
+    kept as read only buffers, memory-mapped when larger than mmap_threshold,
+    so the statuses are looked up without network nor decompression work.
+    A token is fetched again in background refresh_lead_time seconds before
+    its ttl elapses, while the current one is still served; only a token no
+    longer usable is fetched on the request path.
+
+    When a verifier is given, the signature of a token is verified the first
+    time it is looked up and the outcome is kept with the token until it is
+    replaced, so the following lookups trust the cached status list. The
+    tokens fetched in background are verified before they replace the
+    current ones.
+    """
+
+    def __init__(
+        self,
+        httpc_params: Optional[dict] = None,
+        maxsize: int = STATUS_LIST_CACHE_MAXSIZE,
+        default_ttl: int = STATUS_LIST_DEFAULT_TTL,
+        refresh_lead_time: int = STATUS_LIST_REFRESH_LEAD_TIME,
+        mmap_threshold: Optional[int] = STATUS_LIST_MMAP_THRESHOLD,
+    ) -> None:
+        """
+        Creates an instance of StatusListManager.
+
+        :param httpc_params: parameters to perform http requests
+        :type httpc_params: Optional[dict]
+        :param maxsize: the maximum number of status lists kept
+        :type maxsize: int
+        :param default_ttl: the seconds a token without ttl claim is kept
+        :type default_ttl: int
+        :param refresh_lead_time: seconds before the ttl elapses when the token is fetched again
+        :type refresh_lead_time: int
+        :param mmap_threshold: the size, in bytes, above which the status lists are memory-mapped
+        :type mmap_threshold: Optional[int]
+        """
+        self.httpc_params = httpc_params or DEFAULT_HTTPC_PARAMS
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.refresh_lead_time = refresh_lead_time
+        self.mmap_threshold = mmap_threshold
+
+        self._lock = threading.Lock()
+        self._entries: LRUCache[str, _CachedStatusList] = LRUCache(maxsize)
+        # a lock for each uri being fetched, so that it is fetched once
+        self._fetching: dict[str, threading.Lock] = {}
+        self._refresher = BackgroundRefresher("pyeudiw-status-list-refresh")
+
+        self._refreshes = 0
+        self._verifications = 0
+
+    def _fetch(self, uri: str) -> _CachedStatusList:
+        status_list = StatusListTokenHelper.fetch(
+            uri, self.httpc_params, self.mmap_threshold
+        )
+
+        # a valid token of the same issuer served at another uri is not trusted
+        if status_list.sub != uri:
+            raise StatusListVerificationError(
+                f"Status list token subject {status_list.sub} does not match its uri {uri}"
+            )
+
+        now = iat_now()
+        ttl = status_list.ttl or self.default_ttl
+        expires_at = now + ttl
+        if exp := status_list.payload.get("exp", status_list.payload.get(4)):
+            expires_at = min(expires_at, exp)
+        lead_time = min(self.refresh_lead_time, max(expires_at - now, 0) // 2)
+
+        return _CachedStatusList(status_list, expires_at - lead_time, expires_at)
+
+    def _put(self, uri: str, entry: _CachedStatusList) -> None:
+        self._entries.put(uri, entry, entry.expires_at)
+
+    def _verify(
+        self,
+        entry: _CachedStatusList,
+        verifier: "StatusListTokenVerifier",
+        issuer: Optional[str],
+    ) -> Optional[Exception]:
+        try:
+            return entry.verifications[(verifier, issuer)]
+        except KeyError:
+            pass
+
+        try:
+            verifier.verify(entry.status_list, issuer)
+            error = None
+        except StatusListVerificationError as e:
+            logger.warning(f"Invalid status list token {entry.status_list.sub}: {e}")
+            error = e
+
+        self._verifications += 1
+        entry.verifications[(verifier, issuer)] = error
+        return error
+
+    def refresh(self, uri: str) -> StatusListTokenHelper:
+        """
+        Fetches the status list token again, verifying it as the token it
+        replaces was verified.
+
+        :param uri: the status list uri
+        :type uri: str
+
+        :raises StatusListRetrievalError: if the token cannot be retrieved
+        :raises InvalidTokenFormatError: if the token is invalid
+        :raises StatusListVerificationError: if the signature of the token
+            cannot be verified or its subject is not the uri; the current
+            token is kept
+
+        :returns: the status list
+        :rtype: StatusListTokenHelper
+        """
+        previous = self._entries.peek(uri)
+        entry = self._fetch(uri)
+
+        for verifier, issuer in list(previous.verifications) if previous else ():
+            if error := self._verify(entry, verifier, issuer):
+                raise error
+
+        self._put(uri, entry)
+        return entry.status_list
+
+    def _background_refresh(self, uri: str) -> None:
+        self.refresh(uri)
+        self._refreshes += 1
+
+    def wait_refresh(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for the background refreshes in progress, if any.
+
+        :param timeout: the maximum seconds to wait for each refresh
+        :type timeout: Optional[float]
+        """
+        self._refresher.wait(timeout)
+
+    def get(
+        self,
+        uri: str,
+        verifier: Optional["StatusListTokenVerifier"] = None,
+        issuer: Optional[str] = None,
+    ) -> StatusListTokenHelper:
+        """
+        Returns the status list published at uri, fetching it only when
+        not cached or no longer usable.
+
+        :param uri: the status list uri
+        :type uri: str
+        :param verifier: the verifier of the token signature, the token is not verified if not given
+        :type verifier: Optional[StatusListTokenVerifier]
+        :param issuer: the issuer of the credential referring to the status list
+        :type issuer: Optional[str]
+
+        :raises StatusListRetrievalError: if the token cannot be retrieved
+        :raises InvalidTokenFormatError: if the token is invalid
+        :raises StatusListVerificationError: if the signature of the token cannot be verified
+            or its subject is not the uri
+
+        :returns: the status list
+        :rtype: StatusListTokenHelper
+        """
+        entry = self._entries.get(uri)
+
+        if entry is None:
+            entry = self._get_fetching(uri)
+        elif entry.refresh_at <= iat_now():
+            self._refresher.submit(uri, lambda: self._background_refresh(uri))
+
+        if verifier and (error := self._verify(entry, verifier, issuer)):
+            raise error
+        return entry.status_list
+
+    def _get_fetching(self, uri: str) -> _CachedStatusList:
+        with self._lock:
+            fetching = self._fetching.setdefault(uri, threading.Lock())
+        try:
+            with fetching:
+                # fetched by a concurrent request in the meantime
+                entry = self._entries.peek(uri)
+                if entry is not None:
+                    return entry
+
+                entry = self._fetch(uri)
+                self._put(uri, entry)
+                return entry
+        finally:
+            with self._lock:
+                if self._fetching.get(uri) is fetching:
+                    del self._fetching[uri]
+
+    def get_status(
+        self,
+        uri: str,
+        idx: int,
+        verifier: Optional["StatusListTokenVerifier"] = None,
+        issuer: Optional[str] = None,
+    ) -> int:
+        """
+        Returns the status at the given position of the status list published at uri.
+
+        :param uri: the status list uri
+        :type uri: str
+        :param idx: the position of the status in the list
+        :type idx: int
+        :param verifier: the verifier of the token signature
+        :type verifier: Optional[StatusListTokenVerifier]
+        :param issuer: the issuer of the credential referring to the status list
+        :type issuer: Optional[str]
+
+        :raises StatusListRetrievalError: if the token cannot be retrieved
+        :raises PositionOutOfRangeError: if the position is out of range
+
+        :returns: the status
+        :rtype: int
+        """
+        return self.get(uri, verifier, issuer).get_status(idx)
+
+    def get_statuses(
+        self,
+        uri: str,
+        positions: Sequence[int],
+        verifier: Optional["StatusListTokenVerifier"] = None,
+        issuer: Optional[str] = None,
+    ) -> "numpy.ndarray":
+        """
+        Returns the statuses at the given positions of the status list published at uri.
+
+        Requires the status_list extra (numpy).
+
+        :param uri: the status list uri
+        :type uri: str
+        :param positions: the positions of the statuses in the list
+        :type positions: Sequence[int]
+        :param verifier: the verifier of the token signature
+        :type verifier: Optional[StatusListTokenVerifier]
+        :param issuer: the issuer of the credential referring to the status list
+        :type issuer: Optional[str]
+
+        :raises StatusListRetrievalError: if the token cannot be retrieved
+        :raises PositionOutOfRangeError: if a position is out of range
+
+        :returns: the statuses, in the order of the positions
+        :rtype: numpy.ndarray
+        """
+        return self.get(uri, verifier, issuer).get_statuses(positions)
+
+    def from_status(
+        self,
+        status: dict,
+        verifier: Optional["StatusListTokenVerifier"] = None,
+        issuer: Optional[str] = None,
+    ) -> StatusListTokenHelper:
+        """
+        Returns the status list referenced by the status claim of a credential.
+
+        :param status: the status claim
+        :type status: dict
+        :param verifier: the verifier of the token signature
+        :type verifier: Optional[StatusListTokenVerifier]
+        :param issuer: the issuer of the credential
+        :type issuer: Optional[str]
+
+        :raises MissingStatusListUriError: if the status list uri is missing
+        :raises StatusListRetrievalError: if the token cannot be retrieved
+        :raises InvalidTokenFormatError: if the token is invalid
+        :raises StatusListVerificationError: if the signature of the token cannot be verified
+            or its subject is not the uri
+
+        :returns: the status list
+        :rtype: StatusListTokenHelper
+        """
+        uri = status.get("status_list", {}).get("uri")
+
+        if uri is None:
+            raise MissingStatusListUriError("Status list URI is missing")
+
+        return self.get(uri, verifier, issuer)
+
+    def cache_info(self) -> StatusListCacheInfo:
+        info = self._entries.cache_info()
+        return StatusListCacheInfo(
+            info.hits,
+            info.misses,
+            self._refreshes,
+            self._verifications,
+            info.currsize,
+        )
+
+    def cache_clear(self) -> None:
+        self._entries.cache_clear()
+        self._refreshes = self._verifications = 0
+
+
+_status_list_manager = ProcessWide(StatusListManager)
+
+
+def get_status_list_manager() -> StatusListManager:
+    """
+    Returns the process wide StatusListManager, creating it on first use.
+
+    :returns: the shared status list manager
+    :rtype: StatusListManager
+    """
+    return _status_list_manager.get()
@@ -0,0 +1,140 @@
+import base64
+import logging
+from binascii import unhexlify
+from typing import Optional
+
+import cbor2
+from cryptojwt.jwk.jwk import key_from_jwk_dict
+from cryptojwt.jws.jws import SIGNER_ALGS
+
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.status_list.builder import COSE_ALGS
+from pyeudiw.status_list.exceptions import StatusListVerificationError
+from pyeudiw.status_list.helper import StatusListTokenHelper
+from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+from pyeudiw.x509.verify import get_issuer_from_x5c
+
+logger = logging.getLogger(__name__)
+
+_COSE_ALG_NAMES = {value: name for name, value in COSE_ALGS.items()}
+
+COSE_HEADER_ALG = 1
+COSE_HEADER_KID = 4
+COSE_HEADER_X5CHAIN = 33
+
+
+def _cose_x5c(x5chain: bytes | list[bytes]) -> list[str]:
+    if isinstance(x5chain, bytes):
+        x5chain = [x5chain]
+    return [base64.b64encode(der).decode() for der in x5chain]
+
+
+class StatusListTokenVerifier:
+    """
+    Verifies the signature of the status list tokens, with the keys of
+    their issuer resolved by a CombinedTrustEvaluator.
+
+    The issuer is the iss claim of the token or, when the token has none,
+    the issuer of the credentials referring to it. The x5c and trust_chain
+    header parameters of a JWT, and the x5chain of a CWT, are evaluated as
+    static trust material; the verifying key is selected by kid, if any.
+    """
+
+    def __init__(self, trust_evaluator: CombinedTrustEvaluator) -> None:
+        """
+        Creates an instance of StatusListTokenVerifier.
+
+        :param trust_evaluator: the trust evaluator that resolves the issuer keys
+        :type trust_evaluator: CombinedTrustEvaluator
+        """
+        self.trust_evaluator = trust_evaluator
+
+    def _public_keys(
+        self, issuer: Optional[str], static_trust_materials: dict
+    ) -> list[dict]:
+        if not issuer and "x5c" in static_trust_materials:
+            issuer = get_issuer_from_x5c(static_trust_materials["x5c"])
+
+        if not issuer:
+            raise StatusListVerificationError("Status list token issuer is missing")
+
+        return self.trust_evaluator.get_public_keys(issuer, static_trust_materials)
+
+    def _verify_jwt(
+        self, status_list: StatusListTokenHelper, issuer: Optional[str]
+    ) -> None:
+        header = status_list.header
+        static_trust_materials = {
+            name: header[name] for name in ("x5c", "trust_chain") if name in header
+        }
+        public_keys = self._public_keys(
+            status_list.iss or issuer, static_trust_materials
+        )
+        JWSHelper(public_keys).verify(status_list.token)
+
+    def _verify_cwt(
+        self, status_list: StatusListTokenHelper, issuer: Optional[str]
+    ) -> None:
+        protected, unprotected, payload, signature = cbor2.loads(
+            unhexlify(status_list.token)
+        ).value
+        header = {**unprotected, **status_list.header}
+
+        static_trust_materials = {}
+        if COSE_HEADER_X5CHAIN in header:
+            static_trust_materials["x5c"] = _cose_x5c(header[COSE_HEADER_X5CHAIN])
+        public_keys = self._public_keys(
+            status_list.iss or issuer, static_trust_materials
+        )
+
+        alg = _COSE_ALG_NAMES.get(header.get(COSE_HEADER_ALG))
+        if alg is None:
+            raise StatusListVerificationError(
+                f"Unsupported signing algorithm: {header.get(COSE_HEADER_ALG)}"
+            )
+
+        if kid := header.get(COSE_HEADER_KID):
+            kid = kid.decode() if isinstance(kid, bytes) else kid
+            public_keys = [jwk for jwk in public_keys if jwk.get("kid") == kid]
+
+        to_be_signed = cbor2.dumps(["Signature1", protected, b"", payload])
+        for jwk in public_keys:
+            key = key_from_jwk_dict(jwk)
+            try:
+                if SIGNER_ALGS[alg].verify(to_be_signed, signature, key.public_key()):
+                    return
+            except Exception as e:
+                logger.debug(f"Status list token not verified with key {key.kid}: {e}")
+
+        raise StatusListVerificationError(
+            "No key of the issuer verifies the status list token"
+        )
+
+    def verify(
+        self, status_list: StatusListTokenHelper, issuer: Optional[str] = None
+    ) -> None:
+        """
+        Verifies the signature of a status list token.
+
+        :param status_list: the decoded token
+        :type status_list: StatusListTokenHelper
+        :param issuer: the issuer of the credentials referring to the status list,
+            used when the token has no iss claim
+        :type issuer: Optional[str]
+
+        :raises StatusListVerificationError: if the signature cannot be verified
+        """
+        if status_list.token is None:
+            raise StatusListVerificationError("Status list token is missing")
+
+        try:
+            if status_list.token_format == "cwt":
+                self._verify_cwt(status_list, issuer)
+            else:
+                self._verify_jwt(status_list, issuer)
+        except StatusListVerificationError:
+            raise
+        except Exception as e:
+            raise StatusListVerificationError(
+                f"Status list token signature verification failed: {e}"
+            )
@@ -257,6 +257,122 @@ class BaseStorage(BaseDB):
         """
         raise NotImplementedError()
 
+    def get_trust_sources(self) -> list[dict]:
+        """
+        Get all the trust sources.
+
+        :returns: the trust sources.
+        :rtype: list[dict]
+        """
+        raise NotImplementedError()
+
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        """
+        Acquire a lock shared by all the processes using the storage.
+        The lock is released automatically after ttl seconds.
+
+        :param name: the name of the lock.
+        :type name: str
+        :param owner: the identifier of the lock owner.
+        :type owner: str
+        :param ttl: the lifetime of the lock in seconds.
+        :type ttl: int
+
+        :returns: True if the lock was acquired, False if it is held by another owner.
+        :rtype: bool
+        """
+        raise NotImplementedError()
+
+    def release_lock(self, name: str, owner: str) -> None:
+        """
+        Release a lock, if held by owner.
+
+        :param name: the name of the lock.
+        :type name: str
+        :param owner: the identifier of the lock owner.
+        :type owner: str
+        """
+        raise NotImplementedError()
+
+    def add_federation_statement(self, statement: dict) -> dict:
+        """
+        Add or replace a federation entity statement, identified by its iss and sub.
+        The statement is removed once expired.
+
+        :param statement: the statement, with its iss, sub, exp and jwt.
+        :type statement: dict
+
+        :returns: the stored statement.
+        :rtype: dict
+        """
+        raise NotImplementedError()
+
+    def get_federation_statement(self, iss: str, sub: str) -> Union[dict, None]:
+        """
+        Get a federation entity statement not yet expired.
+
+        :param iss: the issuer of the statement.
+        :type iss: str
+        :param sub: the subject of the statement.
+        :type sub: str
+
+        :returns: the statement.
+        :rtype: Union[dict, None]
+        """
+        raise NotImplementedError()
+
+    def add_trust_chain(self, trust_chain: dict) -> dict:
+        """
+        Add or replace a resolved trust chain, identified by its subject and trust anchor.
+        The trust chain is removed once expired.
+
+        :param trust_chain: the resolved trust chain, with its subject, trust_anchor,
+            chain, metadata and exp.
+        :type trust_chain: dict
+
+        :returns: the stored trust chain.
+        :rtype: dict
+        """
+        raise NotImplementedError()
+
+    def get_trust_chain(self, subject: str, trust_anchor: str) -> Union[dict, None]:
+        """
+        Get a resolved trust chain not yet expired.
+
+        :param subject: the leaf of the trust chain.
+        :type subject: str
+        :param trust_anchor: the trust anchor of the trust chain.
+        :type trust_anchor: str
+
+        :returns: the trust chain.
+        :rtype: Union[dict, None]
+        """
+        raise NotImplementedError()
+
+    def get_trust_chains_by_subject(self, subject: str) -> list[dict]:
+        """
+        Get the resolved trust chains of a subject not yet expired, one for each trust anchor.
+
+        :param subject: the leaf of the trust chains.
+        :type subject: str
+
+        :returns: the trust chains.
+        :rtype: list[dict]
+        """
+        raise NotImplementedError()
+
+    def get_trust_chains_by_trust_anchor(self, trust_anchor: str) -> list[dict]:
+        """
+        Get the resolved trust chains not yet expired ending in a trust anchor.
+
+        :param trust_anchor: the trust anchor of the trust chains.
+        :type trust_anchor: str
+
+        :returns: the trust chains.
+        :rtype: list[dict]
+        """
+        raise NotImplementedError()
+
     def add_empty_trust_anchor(self, entity_id: str) -> str:
         """
         Add an empty trust anchor.
@@ -431,6 +547,54 @@ class BaseStorage(BaseDB):
         """
         raise NotImplementedError()
 
+    def _update_attestation_metadata(
+        self,
+        entity: dict,
+        attestation: list[str],
+        exp: datetime,
+        trust_type: TrustType,
+        jwks: list[dict],
+    ):
+        trust_name = trust_type_map[trust_type]
+        trust_field = trust_attestation_field_map.get(trust_type, None)
+
+        trust_entity = entity.get(trust_name, {})
+
+        if trust_field and attestation:
+            trust_entity[trust_field] = attestation
+        if exp:
+            trust_entity["exp"] = exp
+        if jwks:
+            trust_entity["jwks"] = jwks
+
+        entity[trust_name] = trust_entity
+
+        return entity
+
+    def _update_anchor_metadata(
+        self,
+        entity: dict,
+        attestation: list[str],
+        exp: datetime,
+        trust_type: TrustType,
+        entity_id: str,
+    ):
+        if entity.get("entity_id", None) is None:
+            entity["entity_id"] = entity_id
+
+        trust_name = trust_type_map[trust_type]
+        trust_field = trust_anchor_field_map.get(trust_type, None)
+
+        trust_entity = entity.get(trust_name, {})
+
+        if trust_field and attestation:
+            trust_entity[trust_field] = attestation
+        trust_entity["exp"] = exp
+
+        entity[trust_name] = trust_entity
+
+        return entity
+
     @property
     def is_connected(self) -> bool:
         """
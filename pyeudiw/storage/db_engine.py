@@ -1,4 +1,6 @@
+import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Callable, Tuple, Union
 
@@ -10,6 +12,9 @@ from pyeudiw.tools.utils import dynamic_class_loader
 from pyeudiw.storage.base_db import BaseDB
 
 
+WRITE_QUORUMS = ("any", "majority", "all")
+
+
 class DBEngine(BaseStorage, BaseCache, BaseLogger):
     """
     DB Engine class.
@@ -19,13 +24,38 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
         """
         Create a DB Engine instance.
 
+        The optional "replication" entry of the configuration tunes how the
+        replicas are used:
+            write_quorum: any, majority or all; when set the writes are sent
+                to all the replicas concurrently and return once the quorum
+                of them succeeded, the others complete in background.
+            write_timeout: seconds to wait for the write quorum (default 5).
+            read_hedge_delay: seconds after which a read not yet answered is
+                sent to the next replica too, the first answer wins.
+        Without it the replicas are written and read one after the other.
+
         :param config: the configuration of all the DBs.
         :type config: dict
+
+        :raises ValueError: if the write quorum is not supported.
         """
         self.caches: list[Tuple[str, BaseCache]] = []
         self.storages: list[Tuple[str, BaseStorage]] = []
 
+        replication = config.get("replication", {})
+        self.write_quorum: str | None = replication.get("write_quorum", None)
+        self.write_timeout: float = replication.get("write_timeout", 5)
+        self.read_hedge_delay: float | None = replication.get("read_hedge_delay", None)
+        self._executor: ThreadPoolExecutor | None = None
+
+        if self.write_quorum and self.write_quorum not in WRITE_QUORUMS:
+            raise ValueError(
+                f"Unsupported write quorum {self.write_quorum}, must be one of {WRITE_QUORUMS}"
+            )
+
         for db_name, db_conf in config.items():
+            if db_name == "replication":
+                continue
             storage_instance, cache_instance = self._handle_instance(db_conf)
 
             if storage_instance:
@@ -59,6 +89,29 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
     def close(self):
         self._close_list(self.storages)
         self._close_list(self.caches)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(4, 2 * len(self.storages)),
+                thread_name_prefix="pyeudiw-db-engine",
+            )
+        return self._executor
+
+    def _required_replicas(self) -> int:
+        """
+        Returns the number of successful replica writes required by the write quorum.
+
+        :returns: the number of replicas
+        :rtype: int
+        """
+        if self.write_quorum == "all":
+            return len(self.storages)
+        if self.write_quorum == "majority":
+            return len(self.storages) // 2 + 1
+        return 1
 
     def write(self, method: str, *args, **kwargs):
         """
@@ -77,6 +130,9 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
         :rtype: int
         """
 
+        if self.write_quorum:
+            return self._quorum_write(method, *args, **kwargs)
+
         replica_count = 0
         _err_msg = f"Cannot apply write method '{method}' with {args} {kwargs}"
         for db_name, storage in self.storages:
@@ -93,6 +149,74 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
 
         return replica_count
 
+    def _quorum_write(self, method: str, *args, **kwargs) -> int:
+        """
+        Perform a write operation on all the storages concurrently, returning
+        as soon as the write quorum is reached. The replicas that have not
+        completed yet keep writing in background.
+
+        :param method: the method to call.
+        :type method: str
+        :param args: the arguments to pass to the method.
+        :type args: Any
+        :param kwargs: the keyword arguments to pass to the method.
+        :type kwargs: Any
+
+        :raises StorageWriteError: if the quorum is not reached within the write timeout.
+
+        :returns: the number of replicas where the write operation is successful.
+        :rtype: int
+        """
+        _err_msg = f"Cannot apply write method '{method}' with {args} {kwargs}"
+        required = self._required_replicas()
+
+        executor = self._get_executor()
+        pending: dict[Future, str] = {}
+        for db_name, storage in self.storages:
+            future = executor.submit(getattr(storage, method), *args, **kwargs)
+            pending[future] = db_name
+
+        replica_count = 0
+        failures = 0
+        deadline = time.monotonic() + self.write_timeout
+        while pending and replica_count < required:
+            if len(self.storages) - failures < required:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                db_name = pending.pop(future)
+                e = future.exception()
+                if e is None:
+                    replica_count += 1
+                else:
+                    failures += 1
+                    self._log_critical(
+                        e.__class__.__name__, f"Error {_err_msg} on {db_name}: {e}"
+                    )
+
+        for future, db_name in pending.items():
+            future.add_done_callback(
+                lambda f, db_name=db_name: self._log_background_write(f, db_name, _err_msg)
+            )
+
+        if replica_count < required:
+            raise StorageWriteError(
+                f"{_err_msg}: write quorum '{self.write_quorum}' not reached, "
+                f"{replica_count}/{required} replicas written"
+            )
+
+        return replica_count
+
+    def _log_background_write(self, future: Future, db_name: str, err_msg: str) -> None:
+        e = future.exception()
+        if e is not None:
+            self._log_critical(
+                e.__class__.__name__, f"Error {err_msg} on {db_name} in background: {e}"
+            )
+
     def add_dpop_proof_and_attestation(
         self, document_id, dpop_proof: dict, attestation: dict
     ):
@@ -131,6 +255,9 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
         :rtype: Union[dict, None]
         """
 
+        if self.read_hedge_delay is not None and len(self.storages) > 1:
+            return self._hedged_get(method, *args, **kwargs)
+
         for db_name, storage in self.storages:
             try:
                 res = getattr(storage, method)(*args, **kwargs)
@@ -145,6 +272,61 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
 
         raise EntryNotFound(f"Cannot find any result by method {method}")
 
+    def _hedged_get(self, method: str, *args, **kwargs) -> Union[dict, None]:
+        """
+        Perform a get operation starting from the first storage and sending
+        the same read to the next one whenever no answer arrived within the
+        hedge delay, or the answer was empty. The first result found wins.
+
+        :param method: the method to call.
+        :type method: str
+        :param args: the arguments to pass to the method.
+        :type args: Any
+        :param kwargs: the keyword arguments to pass to the method.
+        :type kwargs: Any
+
+        :raises EntryNotFound: if the entry is not found on any storage.
+
+        :returns: the result of the first elment found on DBs.
+        :rtype: Union[dict, None]
+        """
+        executor = self._get_executor()
+        replicas = iter(self.storages)
+        pending: dict[Future, str] = {}
+
+        def _send_next() -> bool:
+            db_name, storage = next(replicas, (None, None))
+            if storage is None:
+                return False
+            pending[executor.submit(getattr(storage, method), *args, **kwargs)] = db_name
+            return True
+
+        _send_next()
+        while pending:
+            done, _ = wait(
+                pending, timeout=self.read_hedge_delay, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                _send_next()
+                continue
+
+            for future in done:
+                db_name = pending.pop(future)
+                try:
+                    res = future.result()
+                except EntryNotFound as e:
+                    self._log_debug(
+                        e.__class__.__name__,
+                        f"Cannot find result by method {method} on {db_name} with {args} {kwargs}: {str(e)}",
+                    )
+                    res = None
+                if res:
+                    return res
+
+            _send_next()
+
+        raise EntryNotFound(f"Cannot find any result by method {method}")
+
     def get_trust_attestation(self, entity_id: str) -> Union[dict, None]:
         return self.get("get_trust_attestation", entity_id)
 
@@ -185,6 +367,66 @@ class DBEngine(BaseStorage, BaseCache, BaseLogger):
     def get_trust_source(self, entity_id: str) -> dict:
         return self.get("get_trust_source", entity_id)
 
+    def add_federation_statement(self, statement: dict) -> dict:
+        return self.write("add_federation_statement", statement)
+
+    def get_federation_statement(self, iss: str, sub: str) -> dict:
+        return self.get("get_federation_statement", iss, sub)
+
+    def add_trust_chain(self, trust_chain: dict) -> dict:
+        return self.write("add_trust_chain", trust_chain)
+
+    def get_trust_chain(self, subject: str, trust_anchor: str) -> dict:
+        return self.get("get_trust_chain", subject, trust_anchor)
+
+    def get_trust_chains_by_subject(self, subject: str) -> list[dict]:
+        try:
+            return self.get("get_trust_chains_by_subject", subject)
+        except EntryNotFound:
+            return []
+
+    def get_trust_chains_by_trust_anchor(self, trust_anchor: str) -> list[dict]:
+        try:
+            return self.get("get_trust_chains_by_trust_anchor", trust_anchor)
+        except EntryNotFound:
+            return []
+
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        """
+        Acquires the lock on the first storage supporting it; when no storage
+        is available the lock is considered acquired, so that the callers
+        can go on without the cross-process coordination.
+        """
+        for db_name, storage in self.storages:
+            try:
+                return storage.acquire_lock(name, owner, ttl)
+            except NotImplementedError:
+                continue
+            except Exception as e:
+                self._log_critical(
+                    e.__class__.__name__,
+                    f"Cannot acquire the lock {name} on {db_name}: {e}",
+                )
+        return True
+
+    def release_lock(self, name: str, owner: str) -> None:
+        for db_name, storage in self.storages:
+            try:
+                return storage.release_lock(name, owner)
+            except NotImplementedError:
+                continue
+            except Exception as e:
+                self._log_critical(
+                    e.__class__.__name__,
+                    f"Cannot release the lock {name} on {db_name}: {e}",
+                )
+
+    def get_trust_sources(self) -> list[dict]:
+        try:
+            return self.get("get_trust_sources")
+        except EntryNotFound:
+            return []
+
     def add_empty_trust_anchor(self, entity_id: str) -> str:
         return self.write(
             "add_empty_trust_anchor", 
@@ -0,0 +1,265 @@
+import fnmatch
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+# deletes KEYS[1] only when it holds ARGV[1]
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# sets the fields given as ARGV pairs on the hash KEYS[1] only when it exists,
+# returns -1 otherwise
+UPDATE_SESSION_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call('hset', KEYS[1], unpack(ARGV))
+end
+return -1
+"""
+
+# sets finalized_at, unless already set, and finalized on the hash KEYS[1]
+# only when it exists, returns the hash fields and values or nil otherwise
+FINALIZE_SESSION_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('hsetnx', KEYS[1], 'finalized_at', ARGV[1])
+redis.call('hset', KEYS[1], 'finalized', ARGV[2])
+return redis.call('hgetall', KEYS[1])
+"""
+
+
+class FakeRedis:
+    """
+    In-process implementation of the subset of the redis-py client
+    used by RedisStorage and RedisCache.
+
+    It behaves like a client created with decode_responses=True and it is
+    meant for tests and single process deployments where a Redis server
+    is not available.
+    """
+
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {}
+        self._expire_at: dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def _alive(self, name: str) -> bool:
+        exp = self._expire_at.get(name)
+        if exp is not None and exp <= time.time():
+            self._data.pop(name, None)
+            self._expire_at.pop(name, None)
+        return name in self._data
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def flushall(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._expire_at.clear()
+        return True
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            return self._data.get(name) if self._alive(name) else None
+
+    def set(
+        self, name: str, value: str, ex: Optional[int] = None, nx: bool = False
+    ) -> Optional[bool]:
+        with self._lock:
+            if nx and self._alive(name):
+                return None
+            self._data[name] = str(value)
+            self._expire_at.pop(name, None)
+            if ex:
+                self._expire_at[name] = time.time() + ex
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            count = 0
+            for name in names:
+                if self._alive(name):
+                    count += 1
+                self._data.pop(name, None)
+                self._expire_at.pop(name, None)
+            return count
+
+    def exists(self, *names: str) -> int:
+        with self._lock:
+            return sum(1 for name in names if self._alive(name))
+
+    def scan_iter(self, match: str = "*") -> Iterator[str]:
+        with self._lock:
+            names = [
+                name for name in list(self._data)
+                if self._alive(name) and fnmatch.fnmatchcase(name, match)
+            ]
+        return iter(names)
+
+    def expire(self, name: str, time_s: int) -> bool:
+        with self._lock:
+            if not self._alive(name):
+                return False
+            self._expire_at[name] = time.time() + time_s
+            return True
+
+    def ttl(self, name: str) -> int:
+        with self._lock:
+            if not self._alive(name):
+                return -2
+            exp = self._expire_at.get(name)
+            if exp is None:
+                return -1
+            return max(int(exp - time.time()), 0)
+
+    def hset(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        value: Optional[str] = None,
+        mapping: Optional[dict] = None,
+    ) -> int:
+        with self._lock:
+            if not self._alive(name):
+                self._data[name] = {}
+            _hash = self._data[name]
+            items = dict(mapping or {})
+            if key is not None:
+                items[key] = value
+            added = sum(1 for k in items if k not in _hash)
+            _hash.update({k: str(v) for k, v in items.items()})
+            return added
+
+    def hsetnx(self, name: str, key: str, value: str) -> bool:
+        with self._lock:
+            if self._alive(name) and key in self._data[name]:
+                return False
+            self.hset(name, key, value)
+            return True
+
+    def hget(self, name: str, key: str) -> Optional[str]:
+        with self._lock:
+            return self._data[name].get(key) if self._alive(name) else None
+
+    def hmget(self, name: str, *keys: str) -> list[Optional[str]]:
+        with self._lock:
+            return [self.hget(name, key) for key in keys]
+
+    def hgetall(self, name: str) -> dict:
+        with self._lock:
+            return dict(self._data[name]) if self._alive(name) else {}
+
+    def sadd(self, name: str, *values: str) -> int:
+        with self._lock:
+            if not self._alive(name):
+                self._data[name] = set()
+            _set = self._data[name]
+            added = sum(1 for v in values if str(v) not in _set)
+            _set.update(map(str, values))
+            return added
+
+    def srem(self, name: str, *values: str) -> int:
+        with self._lock:
+            if not self._alive(name):
+                return 0
+            _set = self._data[name]
+            removed = sum(1 for v in values if str(v) in _set)
+            _set.difference_update(map(str, values))
+            if not _set:
+                self.delete(name)
+            return removed
+
+    def smembers(self, name: str) -> set:
+        with self._lock:
+            return set(self._data[name]) if self._alive(name) else set()
+
+    def eval(self, script: str, numkeys: int, *keys_and_args: str) -> Any:
+        """
+        Runs the python equivalent of the Lua scripts used by RedisStorage,
+        atomically as Redis does.
+
+        :raises NotImplementedError: if the script is not known
+        """
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        with self._lock:
+            if script == RELEASE_LOCK_SCRIPT:
+                return self.delete(keys[0]) if self.get(keys[0]) == args[0] else 0
+            if script == UPDATE_SESSION_SCRIPT:
+                if not self.exists(keys[0]):
+                    return -1
+                return self.hset(keys[0], mapping=dict(zip(args[::2], args[1::2])))
+            if script == FINALIZE_SESSION_SCRIPT:
+                if not self.exists(keys[0]):
+                    return None
+                self.hsetnx(keys[0], "finalized_at", args[0])
+                self.hset(keys[0], "finalized", args[1])
+                return [i for item in self.hgetall(keys[0]).items() for i in item]
+        raise NotImplementedError("Lua scripts are not supported by FakeRedis")
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """
+    Buffers the commands and runs them atomically on execute, like a
+    redis MULTI/EXEC transaction.
+    """
+
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __enter__(self) -> "FakePipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._commands = []
+
+    def __getattr__(self, name: str):
+        if not callable(getattr(self._client, name, None)) or name.startswith("_"):
+            raise AttributeError(name)
+
+        def _queue(*args, **kwargs) -> "FakePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list:
+        with self._client._lock:
+            results = [
+                getattr(self._client, name)(*args, **kwargs)
+                for name, args, kwargs in self._commands
+            ]
+        self._commands = []
+        return results
+
+
+_fake_instances: dict[str, FakeRedis] = {}
+_fake_instances_lock = threading.Lock()
+
+
+def get_fake_redis(url: str) -> FakeRedis:
+    """
+    Returns the FakeRedis instance bound to url, so that every storage
+    and cache configured with the same memory:// url shares the same data.
+
+    :param url: the memory:// url
+    :type url: str
+
+    :returns: the fake client
+    :rtype: FakeRedis
+    """
+    with _fake_instances_lock:
+        if url not in _fake_instances:
+            _fake_instances[url] = FakeRedis()
+        return _fake_instances[url]
@@ -36,8 +36,9 @@ class MongoCache(BaseCache):
         self.collection: Collection = None
 
     def close(self) -> None:
-        self._connect()
-        self.client.close()
+        if self.client:
+            self.client.close()
+            self.client = None
 
     def try_retrieve(
         self, object_name: str, on_not_found: Callable[[], str]
@@ -81,7 +82,7 @@ class MongoCache(BaseCache):
         return self.collection.insert_one(data)
 
     def _connect(self) -> None:
-        if not self.client or not self.client.server_info():
+        if not self.client:
             self.client = pymongo.MongoClient(self.url, **self.connection_params)
             self.db = getattr(self.client, self.storage_conf["db_name"])
             self.collection = getattr(self.db, "cache_storage")
@@ -3,16 +3,38 @@ from datetime import datetime
 from typing import Union
 
 import pymongo
+from pymongo import ReturnDocument, monitoring
+from pymongo.errors import DuplicateKeyError
 from pymongo.results import UpdateResult
 
-from pyeudiw.storage.base_storage import (
-    BaseStorage,
-    TrustType,
-    trust_anchor_field_map,
-    trust_attestation_field_map,
-    trust_type_map,
-)
+from pyeudiw.storage.base_storage import BaseStorage, TrustType
 from pyeudiw.storage.exceptions import ChainNotExist, StorageEntryUpdateFailed
+from pyeudiw.tools.utils import iat_now
+
+
+class _MongoMonitor(monitoring.CommandListener, monitoring.ServerHeartbeatListener):
+    """
+    Counts the commands sent to the server and keeps track of the server health
+    using the heartbeats that the driver already runs in background.
+    """
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.healthy = True
+
+    def started(self, event) -> None:
+        # both the command and the heartbeat listeners define started:
+        # only commands are round trips issued by the storage
+        if isinstance(event, monitoring.CommandStartedEvent):
+            self.round_trips += 1
+
+    def succeeded(self, event) -> None:
+        if isinstance(event, monitoring.ServerHeartbeatSucceededEvent):
+            self.healthy = True
+
+    def failed(self, event) -> None:
+        if isinstance(event, monitoring.ServerHeartbeatFailedEvent):
+            self.healthy = False
 
 
 class MongoStorage(BaseStorage):
@@ -24,23 +46,34 @@ class MongoStorage(BaseStorage):
 
         self.client = None
         self.db = None
+        self._monitor = _MongoMonitor()
 
         self.set_session_retention_ttl(conf.get("data_ttl", None))
 
     @property
     def is_connected(self) -> bool:
-        if not self.client:
-            return False
-        try:
-            self.client.server_info()
-        except pymongo.errors.InvalidOperation:
-            return False
+        """
+        Returns the server health as seen by the last driver heartbeat,
+        without any round trip to the server.
+        """
+        return self.client is not None and self._monitor.healthy
 
-        return True
+    @property
+    def round_trips(self) -> int:
+        """
+        Returns the number of commands sent to the server by this storage.
+        """
+        return self._monitor.round_trips
 
     def _connect(self):
-        if not self.is_connected:
-            self.client = pymongo.MongoClient(self.url, **self.connection_params)
+        if self.client is None:
+            connection_params = dict(self.connection_params)
+            connection_params["event_listeners"] = [
+                *connection_params.get("event_listeners", []),
+                self._monitor,
+            ]
+            self._monitor.healthy = True
+            self.client = pymongo.MongoClient(self.url, **connection_params)
             self.db = getattr(self.client, self.storage_conf["db_name"])
             self.sessions = getattr(
                 self.db, self.storage_conf["db_sessions_collection"]
@@ -54,10 +87,46 @@ class MongoStorage(BaseStorage):
             self.trust_sources = getattr(
                 self.db, self.storage_conf["db_trust_sources_collection"]
             )
+            self.locks = getattr(
+                self.db, self.storage_conf.get("db_locks_collection", "locks")
+            )
+            self.federation_statements = getattr(
+                self.db,
+                self.storage_conf.get(
+                    "db_federation_statements_collection", "federation_statements"
+                ),
+            )
+            self.trust_chains = getattr(
+                self.db,
+                self.storage_conf.get("db_trust_chains_collection", "trust_chains"),
+            )
+            self._create_indexes()
+
+    def _create_indexes(self) -> None:
+        self.sessions.create_index(
+            [("state", pymongo.ASCENDING), ("session_id", pymongo.ASCENDING)]
+        )
+        self.sessions.create_index(
+            [("nonce", pymongo.ASCENDING), ("state", pymongo.ASCENDING)]
+        )
+        self.sessions.create_index([("document_id", pymongo.ASCENDING)])
+        self.federation_statements.create_index(
+            [("iss", pymongo.ASCENDING), ("sub", pymongo.ASCENDING)], unique=True
+        )
+        # expired statements are removed by the server
+        self.federation_statements.create_index("expires_at", expireAfterSeconds=0)
+        self.trust_chains.create_index(
+            [("subject", pymongo.ASCENDING), ("trust_anchor", pymongo.ASCENDING)],
+            unique=True,
+        )
+        self.trust_chains.create_index([("trust_anchor", pymongo.ASCENDING)])
+        self.trust_chains.create_index("expires_at", expireAfterSeconds=0)
 
     def close(self):
-        self._connect()
-        self.client.close()
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        self._monitor.healthy = False
 
     def get_by_id(self, document_id: str) -> dict:
         self._connect()
@@ -163,11 +232,9 @@ class MongoStorage(BaseStorage):
 
         return update_result
 
-    def update_request_object(
-        self, document_id: str, request_object: dict
-    ) -> UpdateResult:
-        self.get_by_id(document_id)
-        documentStatus = self.sessions.update_one(
+    def update_request_object(self, document_id: str, request_object: dict) -> dict:
+        self._connect()
+        document = self.sessions.find_one_and_update(
             {"document_id": document_id},
             {
                 "$set": {
@@ -176,40 +243,46 @@ class MongoStorage(BaseStorage):
                     "state": request_object["state"],
                 }
             },
+            return_document=ReturnDocument.AFTER,
         )
-        if documentStatus.matched_count != 1 or documentStatus.modified_count != 1:
-            raise ValueError(f"Cannot update document {document_id}')")
-        return documentStatus
-
-    def set_finalized(self, document_id: str):
-        self.get_by_id(document_id)
+        if document is None:
+            raise ValueError(f"Document with id {document_id} not found")
+        return document
 
-        update_result: UpdateResult = self.sessions.update_one(
+    def set_finalized(self, document_id: str) -> dict:
+        self._connect()
+        document = self.sessions.find_one_and_update(
             {"document_id": document_id},
             {
                 "$set": {"finalized": True},
             },
+            return_document=ReturnDocument.AFTER,
         )
-        if update_result.matched_count != 1:  # or update_result.modified_count != 1:
-            raise ValueError(f"Cannot update document {document_id}'")
-        return update_result
+        if document is None:
+            raise ValueError(f"Document with id {document_id} not found")
+        return document
 
     def update_response_object(
         self, nonce: str, state: str, internal_response: dict, isError: bool = False
-    ) -> UpdateResult:
-        document = self.get_by_nonce_state(nonce, state)
-        document_id = document["_id"]
+    ) -> dict:
+        self._connect()
+        query = {"state": state, "nonce": nonce}
+        if not state:
+            query.pop("state")
 
         updated_data_label = "internal_response" if not isError else "error_response"
 
-        document_status = self.sessions.update_one(
-            {"_id": document_id},
+        document = self.sessions.find_one_and_update(
+            query,
             {
                 "$set": {updated_data_label: internal_response},
             },
+            return_document=ReturnDocument.AFTER,
         )
+        if document is None:
+            raise ValueError(f"Document with nonce {nonce} and state {state} not found")
 
-        return document_status
+        return document
 
     def _get_db_entity(self, collection: str, entity_id: str) -> dict | None:
         self._connect()
@@ -221,6 +294,10 @@ class MongoStorage(BaseStorage):
             self.storage_conf["db_trust_sources_collection"], entity_id
         )
 
+    def get_trust_sources(self) -> list[dict]:
+        self._connect()
+        return list(self.trust_sources.find({}, {"_id": False}))
+
     def get_trust_attestation(self, entity_id: str) -> dict | None:
         return self._get_db_entity(
             self.storage_conf["db_trust_attestations_collection"], entity_id
@@ -249,67 +326,97 @@ class MongoStorage(BaseStorage):
             self.storage_conf["db_trust_sources_collection"], entity_id
         )
 
-    def _upsert_entry(
-        self, key_label: str, collection: str, data: Union[str, dict]
-    ) -> tuple[str, dict]:
-        db_collection = getattr(self, collection)
-
-        document_status = db_collection.update_one(
-            {key_label: data[key_label]}, {"$set": data}, upsert=True
-        )
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        self._connect()
+        now = dt.datetime.now(tz=dt.timezone.utc)
 
-        if not document_status.acknowledged:
-            raise StorageEntryUpdateFailed("Trust Anchor matched count is ZERO")
+        # an expired lock is taken over, the unique _id makes the insertion atomic
+        self.locks.delete_one({"_id": name, "expires_at": {"$lte": now}})
+        try:
+            self.locks.insert_one(
+                {
+                    "_id": name,
+                    "owner": owner,
+                    "expires_at": now + dt.timedelta(seconds=ttl),
+                }
+            )
+        except DuplicateKeyError:
+            return False
+        return True
 
-        return document_status
+    def release_lock(self, name: str, owner: str) -> None:
+        self._connect()
+        self.locks.delete_one({"_id": name, "owner": owner})
 
-    def _update_attestation_metadata(
-        self,
-        entity: dict,
-        attestation: list[str],
-        exp: datetime,
-        trust_type: TrustType,
-        jwks: list[dict],
-    ):
-        trust_name = trust_type_map[trust_type]
-        trust_field = trust_attestation_field_map.get(trust_type, None)
+    def add_federation_statement(self, statement: dict) -> dict:
+        self._connect()
+        document = dict(
+            statement,
+            expires_at=datetime.fromtimestamp(statement["exp"], tz=dt.timezone.utc),
+        )
+        self.federation_statements.replace_one(
+            {"iss": statement["iss"], "sub": statement["sub"]}, document, upsert=True
+        )
+        return statement
 
-        trust_entity = entity.get(trust_name, {})
+    def get_federation_statement(self, iss: str, sub: str) -> dict | None:
+        self._connect()
+        return self.federation_statements.find_one(
+            {"iss": iss, "sub": sub, "exp": {"$gt": iat_now()}},
+            {"_id": False, "expires_at": False},
+        )
 
-        if trust_field and attestation:
-            trust_entity[trust_field] = attestation
-        if exp:
-            trust_entity["exp"] = exp
-        if jwks:
-            trust_entity["jwks"] = jwks
+    def add_trust_chain(self, trust_chain: dict) -> dict:
+        self._connect()
+        document = dict(
+            trust_chain,
+            expires_at=datetime.fromtimestamp(trust_chain["exp"], tz=dt.timezone.utc),
+        )
+        self.trust_chains.replace_one(
+            {
+                "subject": trust_chain["subject"],
+                "trust_anchor": trust_chain["trust_anchor"],
+            },
+            document,
+            upsert=True,
+        )
+        return trust_chain
 
-        entity[trust_name] = trust_entity
+    def _find_trust_chains(self, query: dict) -> list[dict]:
+        self._connect()
+        return list(
+            self.trust_chains.find(
+                dict(query, exp={"$gt": iat_now()}),
+                {"_id": False, "expires_at": False},
+            )
+        )
 
-        return entity
+    def get_trust_chain(self, subject: str, trust_anchor: str) -> dict | None:
+        self._connect()
+        return self.trust_chains.find_one(
+            {"subject": subject, "trust_anchor": trust_anchor, "exp": {"$gt": iat_now()}},
+            {"_id": False, "expires_at": False},
+        )
 
-    def _update_anchor_metadata(
-        self,
-        entity: dict,
-        attestation: list[str],
-        exp: datetime,
-        trust_type: TrustType,
-        entity_id: str,
-    ):
-        if entity.get("entity_id", None) is None:
-            entity["entity_id"] = entity_id
+    def get_trust_chains_by_subject(self, subject: str) -> list[dict]:
+        return self._find_trust_chains({"subject": subject})
 
-        trust_name = trust_type_map[trust_type]
-        trust_field = trust_anchor_field_map.get(trust_type, None)
+    def get_trust_chains_by_trust_anchor(self, trust_anchor: str) -> list[dict]:
+        return self._find_trust_chains({"trust_anchor": trust_anchor})
 
-        trust_entity = entity.get(trust_name, {})
+    def _upsert_entry(
+        self, key_label: str, collection: str, data: Union[str, dict]
+    ) -> tuple[str, dict]:
+        db_collection = getattr(self, collection)
 
-        if trust_field and attestation:
-            trust_entity[trust_field] = attestation
-        trust_entity["exp"] = exp
+        document_status = db_collection.update_one(
+            {key_label: data[key_label]}, {"$set": data}, upsert=True
+        )
 
-        entity[trust_name] = trust_entity
+        if not document_status.acknowledged:
+            raise StorageEntryUpdateFailed("Trust Anchor matched count is ZERO")
 
-        return entity
+        return document_status
 
     def add_trust_attestation(
         self,
@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import Callable
+
+from pyeudiw.storage.base_cache import BaseCache, RetrieveStatus
+from pyeudiw.storage.redis_storage import json_dumps, json_loads, redis_connect
+
+
+class RedisCache(BaseCache):
+    """
+    Redis cache implementation.
+    """
+
+    def __init__(self, conf: dict, url: str, connection_params: dict = {}) -> None:
+        """
+        Create a RedisCache istance.
+
+        :param conf: the configuration of the cache, data_ttl sets the expiration in seconds of the objects.
+        :type conf: dict
+        :param url: the url of the Redis server, or memory://<name> for the in-process fake.
+        :type url: str
+        :param connection_params: the connection parameters.
+        :type connection_params: dict, optional
+        """
+        super().__init__()
+
+        self.storage_conf = conf
+        self.url = url
+        self.connection_params = connection_params
+        self.ttl: int | None = conf.get("data_ttl", None)
+
+        self.client = None
+
+    def close(self) -> None:
+        if self.client:
+            self.client.close()
+
+    def _key(self, object_name: str) -> str:
+        return f"{self.storage_conf['db_name']}:cache_storage:{object_name}"
+
+    def try_retrieve(
+        self, object_name: str, on_not_found: Callable[[], str]
+    ) -> tuple[dict, RetrieveStatus]:
+        self._connect()
+
+        cache_object = self.client.get(self._key(object_name))
+        if cache_object is not None:
+            return json_loads(cache_object), RetrieveStatus.RETRIEVED
+
+        cache_object = self._gen_cache_object(object_name, on_not_found())
+        added = self.client.set(
+            self._key(object_name), json_dumps(cache_object), ex=self.ttl, nx=True
+        )
+        if not added:
+            # a concurrent writer won the race, its value is the one stored
+            return json_loads(self.client.get(self._key(object_name))), RetrieveStatus.RETRIEVED
+
+        return cache_object, RetrieveStatus.ADDED
+
+    def overwrite(self, object_name: str, value_gen_fn: Callable[[], str]) -> dict:
+        self._connect()
+
+        cache_object = self._gen_cache_object(object_name, value_gen_fn())
+        self.client.set(self._key(object_name), json_dumps(cache_object), ex=self.ttl)
+
+        return cache_object
+
+    def set(self, data: dict) -> dict:
+        self._connect()
+
+        self.client.set(self._key(data["object_name"]), json_dumps(data), ex=self.ttl)
+        return data
+
+    def _connect(self) -> None:
+        if not self.client:
+            self.client = redis_connect(self.url, self.connection_params)
+
+    def _gen_cache_object(self, object_name: str, data: str) -> dict:
+        """
+        Helper function to generate a cache object.
+
+        :param object_name: the name of the object.
+        :type object_name: str
+        :param data: the data to store.
+        :type data: str
+        """
+
+        return {
+            "object_name": object_name,
+            "data": data,
+            "creation_date": datetime.now().isoformat(),
+        }
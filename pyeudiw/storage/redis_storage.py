@@ -0,0 +1,554 @@
+import datetime as dt
+import json
+from datetime import datetime
+from typing import Any, Union
+
+from pyeudiw.storage.base_storage import BaseStorage, TrustType
+from pyeudiw.storage.exceptions import ChainNotExist
+from pyeudiw.storage.fake_redis import (
+    FINALIZE_SESSION_SCRIPT,
+    RELEASE_LOCK_SCRIPT,
+    UPDATE_SESSION_SCRIPT,
+    get_fake_redis,
+)
+from pyeudiw.tools.utils import iat_now
+
+FAKE_REDIS_SCHEME = "memory://"
+
+
+def redis_connect(url: str, connection_params: dict = {}) -> Any:
+    """
+    Creates a redis client for the given url.
+    Urls starting with memory:// are served by an in-process FakeRedis.
+
+    :param url: the url of the Redis server
+    :type url: str
+    :param connection_params: the connection parameters
+    :type connection_params: dict
+
+    :returns: the redis client
+    :rtype: redis.Redis | FakeRedis
+    """
+    if url.startswith(FAKE_REDIS_SCHEME):
+        return get_fake_redis(url)
+
+    import redis
+
+    return redis.Redis.from_url(url, decode_responses=True, **connection_params)
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return {"$date": obj.isoformat()}
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj: dict) -> Any:
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def json_dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def json_loads(value: str) -> Any:
+    return json.loads(value, object_hook=_json_object_hook)
+
+
+class RedisStorage(BaseStorage):
+    """
+    Redis storage implementation.
+
+    Each session is a hash whose fields hold JSON encoded values, with
+    lookup keys pointing to its document_id by state, nonce and session_id.
+    The session retention is obtained with the native Redis key expiration.
+    """
+
+    def __init__(self, conf: dict, url: str, connection_params: dict = {}) -> None:
+        """
+        Create a RedisStorage istance.
+
+        :param conf: the configuration of the storage, the same of MongoStorage.
+        :type conf: dict
+        :param url: the url of the Redis server, or memory://<name> for the in-process fake.
+        :type url: str
+        :param connection_params: the connection parameters.
+        :type connection_params: dict
+        """
+        super().__init__()
+        self.storage_conf = conf
+        self.url = url
+        self.connection_params = connection_params
+
+        self.client = None
+        self.session_ttl: int | None = None
+
+        self.set_session_retention_ttl(conf.get("data_ttl", None))
+
+    @property
+    def is_connected(self) -> bool:
+        if not self.client:
+            return False
+        try:
+            return bool(self.client.ping())
+        except Exception:
+            return False
+
+    def _connect(self) -> None:
+        if not self.client:
+            self.client = redis_connect(self.url, self.connection_params)
+
+    def close(self) -> None:
+        if self.client:
+            self.client.close()
+
+    def _key(self, collection: str, *parts: str) -> str:
+        return ":".join(
+            [self.storage_conf["db_name"], self.storage_conf[collection], *map(str, parts)]
+        )
+
+    def _session_key(self, document_id: str) -> str:
+        return self._key("db_sessions_collection", document_id)
+
+    def _index_key(self, field: str, value: str) -> str:
+        return self._key("db_sessions_collection", field, value)
+
+    def _set_index(self, pipe: Any, field: str, value: str, document_id: str) -> None:
+        if value:
+            pipe.set(self._index_key(field, value), document_id, ex=self.session_ttl)
+
+    def get_by_id(self, document_id: str) -> dict:
+        self._connect()
+        document = self.client.hgetall(self._session_key(document_id))
+
+        if not document:
+            raise ValueError(f"Document with id {document_id} not found")
+
+        return {k: json_loads(v) for k, v in document.items()}
+
+    def _get_by_index(self, field: str, value: str) -> dict | None:
+        self._connect()
+        document_id = self.client.get(self._index_key(field, value))
+        if document_id is None:
+            return None
+        try:
+            return self.get_by_id(document_id)
+        except ValueError:
+            return None
+
+    def get_by_nonce_state(self, nonce: str, state: str | None) -> dict:
+        document = self._get_by_index("nonce", nonce)
+
+        if document is None or (state and document.get("state") != state):
+            raise ValueError(f"Document with nonce {nonce} and state {state} not found")
+
+        return document
+
+    def get_by_session_id(self, session_id: str) -> Union[dict, None]:
+        document = self._get_by_index("session_id", session_id)
+
+        if document is None:
+            raise ValueError(f"Document with session id {session_id} not found.")
+
+        return document
+
+    def get_by_state_and_session_id(
+        self, state: str, session_id: str = ""
+    ) -> Union[dict, None]:
+        document = self._get_by_index("state", state)
+
+        if document is None or (session_id and document.get("session_id") != session_id):
+            raise ValueError(f"Document with state {state} not found.")
+
+        return document
+
+    def get_by_state(self, state: str) -> Union[dict, None]:
+        return self.get_by_state_and_session_id(state)
+
+    def exists_by_state_and_session_id(self, state: str, session_id: str = "") -> bool:
+        try:
+            self.get_by_state_and_session_id(state, session_id)
+        except ValueError:
+            return False
+        return True
+
+    def init_session(
+        self, document_id: str, session_id: str, state: str, remote_flow_typ: str
+    ) -> str:
+        entity = {
+            "document_id": document_id,
+            "creation_date": dt.datetime.now(tz=dt.timezone.utc),
+            "state": state,
+            "session_id": session_id,
+            "remote_flow_typ": remote_flow_typ,
+            "finalized": False,
+            "internal_response": None,
+        }
+
+        self._connect()
+        key = self._session_key(document_id)
+
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={k: json_dumps(v) for k, v in entity.items()})
+        if self.session_ttl:
+            pipe.expire(key, self.session_ttl)
+        self._set_index(pipe, "state", state, document_id)
+        self._set_index(pipe, "session_id", session_id, document_id)
+        pipe.execute()
+
+        return document_id
+
+    def set_session_retention_ttl(self, ttl: int) -> None:
+        self.session_ttl = ttl or None
+
+    def get_session_retention_ttl(self) -> int | None:
+        return self.session_ttl
+
+    def has_session_retention_ttl(self) -> bool:
+        return self.session_ttl is not None
+
+    def _update_session_args(self, data: dict) -> list[str]:
+        return [i for k, v in data.items() for i in (k, json_dumps(v))]
+
+    def _update_session(self, document_id: str, data: dict) -> dict:
+        """
+        Sets the given fields on an existing session document, atomically:
+        a session expired in the meantime is not recreated.
+
+        :raises ValueError: if the document does not exist.
+        """
+        self._connect()
+        key = self._session_key(document_id)
+        updated = self.client.eval(
+            UPDATE_SESSION_SCRIPT, 1, key, *self._update_session_args(data)
+        )
+        if updated == -1:
+            raise ValueError(f"Document with id {document_id} not found")
+
+        return data
+
+    def add_dpop_proof_and_attestation(
+        self, document_id: str, dpop_proof: dict, attestation: dict
+    ) -> dict:
+        return self._update_session(
+            document_id, {"dpop_proof": dpop_proof, "attestation": attestation}
+        )
+
+    def update_request_object(self, document_id: str, request_object: dict) -> dict:
+        self._connect()
+        key = self._session_key(document_id)
+
+        old_state, old_nonce = self.client.hmget(key, "state", "nonce")
+        if old_state is None:
+            raise ValueError(f"Document with id {document_id} not found")
+        old_state = json_loads(old_state)
+        old_nonce = json_loads(old_nonce) if old_nonce is not None else None
+
+        data = {
+            "request_object": request_object,
+            "nonce": request_object["nonce"],
+            "state": request_object["state"],
+        }
+
+        pipe = self.client.pipeline()
+        pipe.eval(UPDATE_SESSION_SCRIPT, 1, key, *self._update_session_args(data))
+        if old_state and old_state != data["state"]:
+            pipe.delete(self._index_key("state", old_state))
+        if old_nonce and old_nonce != data["nonce"]:
+            pipe.delete(self._index_key("nonce", old_nonce))
+        self._set_index(pipe, "state", data["state"], document_id)
+        self._set_index(pipe, "nonce", data["nonce"], document_id)
+        updated, *_ = pipe.execute()
+
+        if updated == -1:
+            raise ValueError(f"Document with id {document_id} not found")
+
+        return data
+
+    def set_finalized(self, document_id: str) -> dict:
+        """
+        Set the session as finalized, atomically.
+        As in MongoStorage, finalizing a session again is not an error:
+        the time of the first finalization is kept.
+
+        :raises ValueError: if the document does not exist.
+
+        :returns: the finalized session
+        :rtype: dict
+        """
+        self._connect()
+        key = self._session_key(document_id)
+        fields = self.client.eval(
+            FINALIZE_SESSION_SCRIPT, 1, key, json_dumps(iat_now()), json_dumps(True)
+        )
+        if not fields:
+            raise ValueError(f"Document with id {document_id} not found")
+
+        return {k: json_loads(v) for k, v in zip(fields[::2], fields[1::2])}
+
+    def update_response_object(
+        self, nonce: str, state: str, internal_response: dict, isError: bool = False
+    ) -> dict:
+        document = self.get_by_nonce_state(nonce, state)
+
+        updated_data_label = "internal_response" if not isError else "error_response"
+
+        return self._update_session(
+            document["document_id"], {updated_data_label: internal_response}
+        )
+
+    def _get_db_entity(self, collection: str, entity_id: str) -> dict | None:
+        self._connect()
+        value = self.client.get(self._key(collection, entity_id))
+        return json_loads(value) if value is not None else None
+
+    def get_trust_source(self, entity_id: str) -> dict | None:
+        return self._get_db_entity("db_trust_sources_collection", entity_id)
+
+    def get_trust_sources(self) -> list[dict]:
+        self._connect()
+        sources = []
+        for key in self.client.scan_iter(match=self._key("db_trust_sources_collection", "*")):
+            if (value := self.client.get(key)) is not None:
+                sources.append(json_loads(value))
+        return sources
+
+    def get_trust_attestation(self, entity_id: str) -> dict | None:
+        return self._get_db_entity("db_trust_attestations_collection", entity_id)
+
+    def get_trust_anchor(self, entity_id: str) -> dict | None:
+        return self._get_db_entity("db_trust_anchors_collection", entity_id)
+
+    def _has_db_entity(self, collection: str, entity_id: str) -> bool:
+        self._connect()
+        return bool(self.client.exists(self._key(collection, entity_id)))
+
+    def has_trust_attestation(self, entity_id: str) -> bool:
+        return self._has_db_entity("db_trust_attestations_collection", entity_id)
+
+    def has_trust_anchor(self, entity_id: str) -> bool:
+        return self._has_db_entity("db_trust_anchors_collection", entity_id)
+
+    def has_trust_source(self, entity_id: str) -> bool:
+        return self._has_db_entity("db_trust_sources_collection", entity_id)
+
+    def _lock_key(self, name: str) -> str:
+        return ":".join(
+            [self.storage_conf["db_name"], self.storage_conf.get("db_locks_collection", "locks"), name]
+        )
+
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        self._connect()
+        return bool(self.client.set(self._lock_key(name), owner, ex=ttl, nx=True))
+
+    def release_lock(self, name: str, owner: str) -> None:
+        self._connect()
+        # compare and delete in a single step, so that a lock expired and
+        # acquired by another owner in the meantime is not released
+        self.client.eval(RELEASE_LOCK_SCRIPT, 1, self._lock_key(name), owner)
+
+    def _federation_statement_key(self, iss: str, sub: str) -> str:
+        return ":".join(
+            [
+                self.storage_conf["db_name"],
+                self.storage_conf.get(
+                    "db_federation_statements_collection", "federation_statements"
+                ),
+                iss,
+                sub,
+            ]
+        )
+
+    def add_federation_statement(self, statement: dict) -> dict:
+        self._connect()
+        ttl = statement["exp"] - iat_now()
+        if ttl > 0:
+            self.client.set(
+                self._federation_statement_key(statement["iss"], statement["sub"]),
+                json_dumps(statement),
+                ex=ttl,
+            )
+        return statement
+
+    def get_federation_statement(self, iss: str, sub: str) -> dict | None:
+        self._connect()
+        value = self.client.get(self._federation_statement_key(iss, sub))
+        return json_loads(value) if value is not None else None
+
+    def _trust_chain_key(self, *parts: str) -> str:
+        return ":".join(
+            [
+                self.storage_conf["db_name"],
+                self.storage_conf.get("db_trust_chains_collection", "trust_chains"),
+                *parts,
+            ]
+        )
+
+    def add_trust_chain(self, trust_chain: dict) -> dict:
+        """
+        Stores the trust chain with the native key expiration, indexed
+        by subject and by trust anchor with a set of the other end.
+        """
+        self._connect()
+        subject = trust_chain["subject"]
+        trust_anchor = trust_chain["trust_anchor"]
+        ttl = trust_chain["exp"] - iat_now()
+        if ttl <= 0:
+            return trust_chain
+
+        with self.client.pipeline() as pipe:
+            pipe.set(
+                self._trust_chain_key("chain", subject, trust_anchor),
+                json_dumps(trust_chain),
+                ex=ttl,
+            )
+            pipe.sadd(self._trust_chain_key("subject", subject), trust_anchor)
+            pipe.sadd(self._trust_chain_key("trust_anchor", trust_anchor), subject)
+            pipe.execute()
+        return trust_chain
+
+    def get_trust_chain(self, subject: str, trust_anchor: str) -> dict | None:
+        self._connect()
+        value = self.client.get(self._trust_chain_key("chain", subject, trust_anchor))
+        return json_loads(value) if value is not None else None
+
+    def _get_trust_chains_by_index(self, field: str, value: str) -> list[dict]:
+        self._connect()
+        index = self._trust_chain_key(field, value)
+        trust_chains = []
+        for other in sorted(self.client.smembers(index)):
+            pair = (value, other) if field == "subject" else (other, value)
+            if (trust_chain := self.get_trust_chain(*pair)) is not None:
+                trust_chains.append(trust_chain)
+            else:
+                # the trust chain expired
+                self.client.srem(index, other)
+        return trust_chains
+
+    def get_trust_chains_by_subject(self, subject: str) -> list[dict]:
+        return self._get_trust_chains_by_index("subject", subject)
+
+    def get_trust_chains_by_trust_anchor(self, trust_anchor: str) -> list[dict]:
+        return self._get_trust_chains_by_index("trust_anchor", trust_anchor)
+
+    def _upsert_entry(self, key_label: str, collection: str, data: dict) -> dict:
+        """
+        Merges data in the entity identified by data[key_label], like a Mongo $set upsert.
+        """
+        entity = self._get_db_entity(collection, data[key_label]) or {}
+        entity.update(data)
+        self.client.set(self._key(collection, data[key_label]), json_dumps(entity))
+        return entity
+
+    def add_trust_attestation(
+        self,
+        entity_id: str,
+        attestation: list[str],
+        exp: datetime,
+        trust_type: TrustType,
+        jwks: list[dict],
+    ) -> str:
+        entity = {
+            "entity_id": entity_id,
+            "federation": {},
+            "x509": {},
+            "direct_trust_sd_jwt_vc": {},
+            "metadata": {},
+        }
+
+        updated_entity = self._update_attestation_metadata(
+            entity, attestation, exp, trust_type, jwks
+        )
+
+        self._upsert_entry(
+            "entity_id", "db_trust_attestations_collection", updated_entity
+        )
+
+        return entity_id
+
+    def add_trust_source(self, trust_source: dict) -> dict:
+        return self._upsert_entry(
+            "entity_id", "db_trust_sources_collection", trust_source
+        )
+
+    def add_trust_attestation_metadata(
+        self, entity_id: str, metadata_type: str, metadata: dict
+    ) -> dict:
+        entity = self._get_db_entity("db_trust_attestations_collection", entity_id)
+
+        if entity is None:
+            raise ValueError(f"Document with entity_id {entity_id} not found.")
+
+        entity.setdefault("metadata", {})[metadata_type] = metadata
+
+        return self._upsert_entry(
+            "entity_id", "db_trust_attestations_collection", entity
+        )
+
+    def add_empty_trust_anchor(self, entity_id: str) -> str:
+        entity = {"entity_id": entity_id, "federation": {}, "x509": {}}
+
+        self._upsert_entry("entity_id", "db_trust_anchors_collection", entity)
+
+        return entity_id
+
+    def add_trust_anchor(
+        self,
+        entity_id: str,
+        entity_configuration: str,
+        exp: datetime,
+        trust_type: TrustType,
+    ) -> str:
+        entity = {"entity_id": entity_id, "federation": {}, "x509": {}}
+
+        updated_entity = self._update_anchor_metadata(
+            entity, entity_configuration, exp, trust_type, entity_id
+        )
+
+        self._upsert_entry("entity_id", "db_trust_anchors_collection", updated_entity)
+
+        return entity_id
+
+    def update_trust_attestation(
+        self,
+        entity_id: str,
+        attestation: list[str],
+        exp: datetime,
+        trust_type: TrustType,
+        jwks: list[dict],
+    ) -> dict:
+        old_entity = (
+            self._get_db_entity("db_trust_attestations_collection", entity_id)
+            or {"entity_id": entity_id}
+        )
+        upd_entity = self._update_attestation_metadata(
+            old_entity, attestation, exp, trust_type, jwks
+        )
+
+        return self._upsert_entry(
+            "entity_id", "db_trust_attestations_collection", upd_entity
+        )
+
+    def update_trust_anchor(
+        self,
+        entity_id: str,
+        entity_configuration: str,
+        exp: datetime,
+        trust_type: TrustType,
+    ) -> dict:
+        old_entity = self._get_db_entity("db_trust_anchors_collection", entity_id)
+
+        if old_entity is None:
+            raise ChainNotExist(f"Chain with entity id {entity_id} not exist")
+
+        upd_entity = self._update_anchor_metadata(
+            old_entity, entity_configuration, exp, trust_type, entity_id
+        )
+
+        return self._upsert_entry(
+            "entity_id", "db_trust_anchors_collection", upd_entity
+        )
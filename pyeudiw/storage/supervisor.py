@@ -0,0 +1,257 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from pyeudiw.storage.db_engine import DBEngine
+from pyeudiw.tools.base_logger import BaseLogger
+
+DB_HEARTBEAT_INTERVAL = float(os.getenv("PYEUDIW_DB_HEARTBEAT_INTERVAL", 10))
+DB_RECONNECT_MAX_BACKOFF = float(os.getenv("PYEUDIW_DB_RECONNECT_MAX_BACKOFF", 300))
+DB_DRAIN_TIMEOUT = float(os.getenv("PYEUDIW_DB_DRAIN_TIMEOUT", 60))
+
+
+class ConnectionSupervisor(BaseLogger):
+    """
+    Keeps a DBEngine alive out of the request path.
+
+    A background heartbeat checks the health of every storage of the engine;
+    when one of them is not available a new engine is built, retrying with
+    an exponential backoff until it succeeds. The request path only reads
+    the current engine and the healthy flag, never probing the storages.
+
+    A replaced engine is closed by the heartbeat once the calls leased on it
+    are over, or at the latest after drain_timeout seconds.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], DBEngine],
+        heartbeat_interval: float = DB_HEARTBEAT_INTERVAL,
+        max_backoff: float = DB_RECONNECT_MAX_BACKOFF,
+        drain_timeout: float = DB_DRAIN_TIMEOUT,
+    ) -> None:
+        """
+        Creates a ConnectionSupervisor, building the first engine.
+
+        :param engine_factory: the callable that builds a new DBEngine
+        :type engine_factory: Callable[[], DBEngine]
+        :param heartbeat_interval: seconds between two health checks
+        :type heartbeat_interval: float
+        :param max_backoff: maximum seconds between two reconnection attempts
+        :type max_backoff: float
+        :param drain_timeout: maximum seconds a replaced engine is kept open for the calls leased on it
+        :type drain_timeout: float
+        """
+        self.engine_factory = engine_factory
+        self.heartbeat_interval = heartbeat_interval
+        self.max_backoff = max_backoff
+        self.drain_timeout = drain_timeout
+
+        self._engine: DBEngine = engine_factory()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._lock = threading.Lock()
+        # the calls in flight on each engine
+        self._leases: dict[DBEngine, int] = {}
+        # the replaced engines not yet closed, with the time of their replacement
+        self._retired: list[tuple[DBEngine, float]] = []
+        self.supervised_engine = SupervisedEngine(self)
+
+        self.backends_health: dict[str, bool] = {}
+        self.healthy: bool = False
+        self.reconnects = 0
+        self.reconnect_failures = 0
+        self.last_reconnect: Optional[float] = None
+
+        self.check()
+
+    @property
+    def engine(self) -> DBEngine:
+        """
+        Returns the current engine, without any liveness probe.
+
+        :returns: the engine
+        :rtype: DBEngine
+        """
+        return self._engine
+
+    @contextmanager
+    def lease(self) -> Iterator[DBEngine]:
+        """
+        Returns the current engine, kept open until the lease is over
+        even if it is replaced in the meantime.
+
+        :returns: the engine
+        :rtype: Iterator[DBEngine]
+        """
+        with self._lock:
+            engine = self._engine
+            self._leases[engine] = self._leases.get(engine, 0) + 1
+        try:
+            yield engine
+        finally:
+            with self._lock:
+                self._leases[engine] -= 1
+                if not self._leases[engine]:
+                    del self._leases[engine]
+
+    def _close_drained(self) -> None:
+        """
+        Closes the replaced engines without calls in flight or retired
+        for longer than drain_timeout.
+        """
+        now = time.time()
+        with self._lock:
+            drained = [
+                engine
+                for engine, retired_at in self._retired
+                if engine not in self._leases or retired_at + self.drain_timeout <= now
+            ]
+            self._retired = [
+                (engine, retired_at)
+                for engine, retired_at in self._retired
+                if engine not in drained
+            ]
+
+        for engine in drained:
+            try:
+                engine.close()
+            except Exception as e:
+                self._log_debug(
+                    "DB connection supervisor", f"cannot close the previous engine: {e}"
+                )
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Returns the reconnection metrics.
+
+        :returns: the metrics
+        :rtype: dict
+        """
+        return {
+            "healthy": self.healthy,
+            "backends_health": dict(self.backends_health),
+            "reconnects": self.reconnects,
+            "reconnect_failures": self.reconnect_failures,
+            "last_reconnect": self.last_reconnect,
+            "draining_engines": len(self._retired),
+        }
+
+    def check(self) -> bool:
+        """
+        Updates the health of every storage of the current engine.
+
+        :returns: True if all the storages are available
+        :rtype: bool
+        """
+        health = {}
+        for db_name, storage in self._engine.storages:
+            try:
+                # the storages connect lazily, one not used yet would look unavailable
+                storage._connect()
+                health[db_name] = bool(storage.is_connected)
+            except Exception as e:
+                self._log_debug(
+                    "DB connection supervisor",
+                    f"health check on {db_name} failed: {e}",
+                )
+                health[db_name] = False
+
+        self.backends_health = health
+        self.healthy = all(health.values())
+        return self.healthy
+
+    def reconnect(self) -> bool:
+        """
+        Replaces the current engine with a new one.
+
+        :returns: True if the new engine is healthy
+        :rtype: bool
+        """
+        try:
+            engine = self.engine_factory()
+        except Exception as e:
+            self.reconnect_failures += 1
+            self._log_warning(
+                "DB connection supervisor", f"reconnection failed: {e}"
+            )
+            return False
+
+        with self._lock:
+            old_engine, self._engine = self._engine, engine
+            self._retired.append((old_engine, time.time()))
+        self.reconnects += 1
+        self.last_reconnect = time.time()
+
+        if not self.check():
+            self.reconnect_failures += 1
+            return False
+        return True
+
+    def _run(self) -> None:
+        delay = self.heartbeat_interval
+        while not self._stop.wait(delay):
+            # the replaced engines are closed here, never on the request path
+            if self._retired:
+                self._close_drained()
+            if self.check() or self.reconnect():
+                delay = self.heartbeat_interval
+            else:
+                delay = min(delay * 2, self.max_backoff)
+
+    def start(self) -> None:
+        """
+        Starts the background heartbeat.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pyeudiw-db-supervisor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background heartbeat.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+class SupervisedEngine:
+    """
+    A view of the current engine of a ConnectionSupervisor, to be used
+    in place of a DBEngine by the objects that keep it.
+
+    Every method call runs on the engine current at the time of the call,
+    with a lease that keeps it open until the call is over.
+    """
+
+    def __init__(self, supervisor: ConnectionSupervisor) -> None:
+        """
+        Creates a SupervisedEngine.
+
+        :param supervisor: the supervisor of the engine
+        :type supervisor: ConnectionSupervisor
+        """
+        self._supervisor = supervisor
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._supervisor.engine, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            with self._supervisor.lease() as engine:
+                return getattr(engine, name)(*args, **kwargs)
+
+        return call
@@ -0,0 +1,40 @@
+import os
+import statistics
+import time
+from typing import Callable
+
+import pytest
+
+benchmark = pytest.mark.skipif(
+    not os.getenv("PYEUDIW_BENCHMARK"),
+    reason="benchmarks run only when PYEUDIW_BENCHMARK is set",
+)
+
+
+def measure(fn: Callable[[], object], rounds: int) -> list[float]:
+    """
+    Runs fn rounds times and returns the elapsed time of each run, in milliseconds.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentiles(timings: list[float]) -> dict[str, float]:
+    """
+    Returns the p50 and p99 of the given timings.
+    """
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {"p50": cuts[49], "p99": cuts[98]}
+
+
+def report(name: str, timings: list[float]) -> None:
+    stats = percentiles(timings)
+    print(
+        f"\n[benchmark] {name}: runs={len(timings)} "
+        f"p50={stats['p50']:.3f}ms p99={stats['p99']:.3f}ms "
+        f"throughput={1000 / statistics.mean(timings):.0f}/s"
+    )
@@ -0,0 +1,30 @@
+import os
+
+from pyeudiw.tests.trust.handler.test_federation import _context, _handler
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 500))
+
+
+@benchmark
+def test_benchmark_entity_configuration_endpoint():
+    handler = _handler()
+    artifact = handler.signed_entity_configuration
+
+    report(
+        "entity configuration endpoint, signed per request",
+        measure(
+            lambda: artifact.sign(handler.entity_configuration_as_dict), ROUNDS
+        ),
+    )
+    report(
+        "entity configuration endpoint, pre-signed",
+        measure(lambda: handler.entity_configuration_endpoint(_context()), ROUNDS),
+    )
+    report(
+        "entity configuration endpoint, pre-signed, format=json",
+        measure(
+            lambda: handler.entity_configuration_endpoint(_context("json")), ROUNDS
+        ),
+    )
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from cryptojwt import JWS
+from cryptojwt.jwk.jwk import key_from_jwk_dict
+
+from pyeudiw.jwk import JWK
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.jwt.verification import verify_jws_batch
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 500))
+
+
+def _per_call_parse_verify(jwks: list[dict], token: str, kid: str) -> dict:
+    """
+    The verification as performed before the keys were parsed once:
+    every key is serialized and the verifying one is parsed again.
+    """
+    available_keys = [key_from_jwk_dict(jwk).to_dict() for jwk in jwks]
+    verifying_key = next(jwk for jwk in available_keys if jwk.get("kid") == kid)
+    return JWS(alg="ES256").verify_compact(token, [key_from_jwk_dict(verifying_key)])
+
+
+@benchmark
+@pytest.mark.parametrize("size", [1, 10, 100])
+def test_benchmark_verify(size):
+    keys = [JWK(key_type="EC").as_dict() for _ in range(size)]
+    signer = keys[-1]
+    token = JWSHelper(signer).sign({"iss": "https://issuer.example.org"})
+    public_keys = [key_from_jwk_dict(jwk).serialize(private=False) for jwk in keys]
+
+    report(
+        f"jws verify, {size} keys, parsed per call",
+        measure(lambda: _per_call_parse_verify(public_keys, token, signer["kid"]), ROUNDS),
+    )
+    report(
+        f"jws verify, {size} keys, new helper per call",
+        measure(lambda: JWSHelper(public_keys).verify(token), ROUNDS),
+    )
+    helper = JWSHelper(public_keys)
+    report(
+        f"jws verify, {size} keys, shared helper",
+        measure(lambda: helper.verify(token), ROUNDS),
+    )
+
+
+@benchmark
+def test_benchmark_verify_batch():
+    keys = [JWK(key_type="EC").as_dict() for _ in range(4)]
+    public_keys = [key_from_jwk_dict(jwk).serialize(private=False) for jwk in keys]
+    # the statements of a trust chain, with their issuer keys
+    items = [
+        (JWSHelper(keys[i % 4]).sign({"iss": f"https://{i}.example.org"}), public_keys)
+        for i in range(32)
+    ]
+
+    report(
+        "jws verify, 32 tokens, one by one",
+        measure(lambda: [JWSHelper(keys).verify(jws) for jws, keys in items], ROUNDS // 10),
+    )
+    report(
+        "jws verify, 32 tokens, batch",
+        measure(lambda: verify_jws_batch(items), ROUNDS // 10),
+    )
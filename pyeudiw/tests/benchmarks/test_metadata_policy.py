@@ -0,0 +1,125 @@
+import os
+
+from cryptojwt.jwk.ec import new_ec_key
+from cryptojwt.jws.jws import JWS
+
+from pyeudiw.federation.policy import (
+    MetadataPolicyPlan,
+    MetadataPolicyPlanCache,
+    TrustChainPolicy,
+)
+from pyeudiw.jwt.utils import decode_jwt_payload
+from pyeudiw.tools.utils import exp_from_now, iat_now
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 2000))
+
+ALGS = ["ES256", "ES384", "ES512", "RS256", "RS384", "RS512"]
+ENC_ALGS = ["RSA-OAEP", "RSA-OAEP-256", "ECDH-ES", "ECDH-ES+A128KW", "ECDH-ES+A256KW"]
+
+# the policies of a trust anchor and of an intermediate of the italian federation
+TA_POLICY = {
+    entity_type: {
+        "scope": {"subset_of": ["openid", "offline_access", "profile", "email"]},
+        "grant_types": {"subset_of": ["authorization_code", "refresh_token"]},
+        "response_types": {"one_of": ["code", "vp_token"]},
+        "id_token_signed_response_alg": {"one_of": ALGS, "default": "ES256"},
+        "authorization_signed_response_alg": {"one_of": ALGS},
+        "authorization_encrypted_response_alg": {"one_of": ENC_ALGS},
+        "authorization_encrypted_response_enc": {"one_of": ["A128GCM", "A256GCM"]},
+        "contacts": {"add": ["ops@trust-anchor.example.it"]},
+        "client_registration_types": {"value": ["automatic"]},
+        "jwks": {"essential": True},
+        "policy_uri": {"essential": True},
+    }
+    for entity_type in (
+        "openid_relying_party",
+        "wallet_relying_party",
+        "openid_credential_verifier",
+    )
+}
+
+INTERMEDIATE_POLICY = {
+    entity_type: {
+        "scope": {"subset_of": ["openid", "profile", "email"]},
+        "grant_types": {"subset_of": ["authorization_code"]},
+        "id_token_signed_response_alg": {"one_of": ["ES256", "ES384", "RS256"]},
+        "contacts": {"add": ["ops@intermediate.example.it"]},
+        "logo_uri": {"default": "https://intermediate.example.it/logo.svg"},
+    }
+    for entity_type in TA_POLICY
+}
+
+LEAF_METADATA = {
+    entity_type: {
+        "client_id": "https://rp.example.it",
+        "client_name": "Relying Party",
+        "redirect_uris": ["https://rp.example.it/callback"],
+        "scope": ["openid", "profile", "email", "address"],
+        "grant_types": ["authorization_code", "refresh_token", "implicit"],
+        "response_types": ["code"],
+        "id_token_signed_response_alg": "ES256",
+        "authorization_signed_response_alg": "ES256",
+        "authorization_encrypted_response_alg": "ECDH-ES",
+        "authorization_encrypted_response_enc": "A256GCM",
+        "contacts": ["ops@rp.example.it"],
+        "policy_uri": "https://rp.example.it/policy",
+        "jwks": {"keys": []},
+    }
+    for entity_type in TA_POLICY
+}
+
+
+def _statements() -> list[str]:
+    key = new_ec_key("P-256")
+    return [
+        JWS(
+            {
+                "iss": iss,
+                "sub": sub,
+                "iat": iat_now(),
+                "exp": exp_from_now(60),
+                "metadata_policy": policy,
+            },
+            alg="ES256",
+        ).sign_compact([key])
+        for iss, sub, policy in (
+            (
+                "https://trust-anchor.example.it",
+                "https://intermediate.example.it",
+                TA_POLICY,
+            ),
+            (
+                "https://intermediate.example.it",
+                "https://rp.example.it",
+                INTERMEDIATE_POLICY,
+            ),
+        )
+    ]
+
+
+@benchmark
+def test_benchmark_metadata_policy():
+    statements = _statements()
+    cache = MetadataPolicyPlanCache()
+
+    def per_call():
+        payloads = [decode_jwt_payload(jws) for jws in statements]
+        return {
+            md_type: MetadataPolicyPlan(
+                TrustChainPolicy().gather_policies(payloads, md_type)
+            ).apply(md)
+            for md_type, md in LEAF_METADATA.items()
+        }
+
+    def cached():
+        return {
+            md_type: cache.get_plan(statements, md_type).apply(md)
+            for md_type, md in LEAF_METADATA.items()
+        }
+
+    assert per_call() == cached()
+
+    report("metadata policy, combined per call", measure(per_call, ROUNDS))
+    report("metadata policy, compiled plan cached", measure(cached, ROUNDS))
@@ -0,0 +1,60 @@
+import base64
+import os
+
+from cryptojwt.jwk.ec import ECKey, new_ec_key
+
+from pyeudiw.jwk import JWK
+from pyeudiw.jwk.parse import parse_b64der
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.jwt.jws_signer import JWSSigner
+from pyeudiw.tests.x509.test_x509 import gen_chain
+from pyeudiw.tools.utils import exp_from_now, iat_now
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 2000))
+
+TYP = "oauth-authz-req+jwt"
+
+
+def _claims() -> dict:
+    return {
+        "client_id": "https://rp.example.org/OpenID4VP",
+        "response_uri": "https://rp.example.org/OpenID4VP/response-uri",
+        "response_type": "vp_token",
+        "response_mode": "direct_post.jwt",
+        "nonce": "1f3c8a3e-2c9e-4f43-8a7b-3d2f6c0a9b11",
+        "state": "3f5a7c1e-8b9d-4e2f-a6c4-1d0b9e8f7a65",
+        "scope": "pid-sd-jwt:unique_id+given_name+family_name",
+        "iat": iat_now(),
+        "exp": exp_from_now(5),
+    }
+
+
+@benchmark
+def test_benchmark_request_object():
+    leaf = new_ec_key("P-256", kid="leaf")
+    metadata_jwks = [
+        new_ec_key("P-256", kid="default").serialize(private=True),
+        ECKey(priv_key=leaf.priv_key, kid="leaf").serialize(private=True),
+    ]
+    x5c = [base64.b64encode(der).decode() for der in gen_chain(leaf_private_key=leaf.priv_key)]
+
+    def per_request():
+        header = {"typ": TYP, "x5c": x5c}
+        jwk = parse_b64der(header["x5c"][0])
+        metadata_key = next(
+            key for key in metadata_jwks if JWK(key).thumbprint == jwk.thumbprint
+        )
+        return JWSHelper(metadata_key).sign(_claims(), protected=header)
+
+    signer = JWSSigner(metadata_jwks, protected={"typ": TYP})
+
+    def prepared():
+        header = {"x5c": x5c}
+        return signer.sign(
+            _claims(), protected=header, key_index=signer.key_index_by_x5c(x5c)
+        )
+
+    report("request object, x5c key resolved per request", measure(per_request, ROUNDS))
+    report("request object, prepared signer", measure(prepared, ROUNDS))
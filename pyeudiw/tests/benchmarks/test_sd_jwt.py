@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from pyeudiw.sd_jwt.common import SDObj
+from pyeudiw.sd_jwt.issuer import SDJWTIssuer
+from pyeudiw.sd_jwt.sd_jwt import SdJwt
+from pyeudiw.tests.settings import DEFAULT_X509_LEAF_JWK
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 50))
+
+
+def _claims(disclosures: int) -> dict:
+    """
+    Returns claims with about the given number of disclosures: flat claims and
+    an array of objects, as the entries of a diploma or of a health card.
+    """
+    entries = disclosures // 4
+    claims = {"iss": "https://issuer.example.com"}
+    for i in range(disclosures - 3 * entries):
+        claims[SDObj(f"claim_{i}")] = f"value_{i}"
+    claims["entries"] = [
+        SDObj({SDObj("title"): f"title_{i}", SDObj("year"): 2000 + i % 25})
+        for i in range(entries)
+    ]
+    return claims
+
+
+@benchmark
+@pytest.mark.parametrize("disclosures", [10, 100, 1000, 5000])
+def test_benchmark_sd_jwt_unpacking(disclosures):
+    SDJWTIssuer.unsafe_randomness = True
+    issuer = SDJWTIssuer(
+        _claims(disclosures), DEFAULT_X509_LEAF_JWK, add_decoy_claims=True
+    )
+    token = issuer.sd_jwt_issuance
+    assert len(issuer.ii_disclosures) == disclosures
+
+    sdjwt = SdJwt(token)
+    report(
+        f"sd-jwt with {disclosures} disclosures, claims unpacked",
+        measure(sdjwt.get_disclosed_claims, ROUNDS),
+    )
+    report(
+        f"sd-jwt with {disclosures} disclosures, parsed and unpacked",
+        measure(lambda: SdJwt(token).get_disclosed_claims(), ROUNDS),
+    )
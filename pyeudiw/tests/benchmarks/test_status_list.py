@@ -0,0 +1,59 @@
+import os
+import random
+import zlib
+
+import pytest
+
+from pyeudiw.status_list.builder import StatusListBuilder
+from pyeudiw.status_list.helper import StatusListTokenHelper
+from pyeudiw.tests.settings import DEFAULT_X509_LEAF_JWK
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 20))
+LOOKUPS = 10_000
+
+URI = "https://example.com/statuslists/1"
+
+
+@benchmark
+@pytest.mark.parametrize("size", [10**6, 10**7])
+def test_benchmark_status_list(size):
+    rnd = random.Random(size)
+    builder = StatusListBuilder(size, 2)
+    for position in rnd.sample(range(size), size // 100):
+        builder.set(position, rnd.randrange(1, 4))
+
+    helper = StatusListTokenHelper.from_token(builder.to_jwt(DEFAULT_X509_LEAF_JWK, URI))
+    positions = [rnd.randrange(size) for _ in range(LOOKUPS)]
+
+    report(
+        f"status list of {size}, {LOOKUPS} lookups one by one",
+        measure(lambda: [helper.get_status(i) for i in positions], ROUNDS),
+    )
+    report(
+        f"status list of {size}, {LOOKUPS} lookups in bulk",
+        measure(lambda: helper.get_statuses(positions), ROUNDS),
+    )
+    report(
+        f"status list of {size}, all statuses unpacked",
+        measure(lambda: helper.get_statuses(), ROUNDS),
+    )
+
+    def update():
+        for i in positions:
+            builder.set(i, 3)
+
+    report(f"status list of {size}, {LOOKUPS} statuses set", measure(update, ROUNDS))
+
+    def update_one():
+        builder.set(rnd.randrange(size), 1)
+
+    report(
+        f"status list of {size}, full compression",
+        measure(lambda: zlib.compress(builder.to_bytes()), ROUNDS),
+    )
+    report(
+        f"status list of {size}, incremental compression after a change",
+        measure(lambda: (update_one(), builder.compress()), ROUNDS),
+    )
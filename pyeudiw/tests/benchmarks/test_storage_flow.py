@@ -0,0 +1,64 @@
+import os
+import uuid
+
+import pytest
+
+from pyeudiw.storage.mongo_storage import MongoStorage
+from pyeudiw.storage.redis_storage import RedisStorage
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 500))
+
+storage_conf = {
+    "db_name": "test-eudiw",
+    "db_sessions_collection": "sessions",
+    "db_trust_attestations_collection": "trust_attestations",
+    "db_trust_anchors_collection": "trust_anchors",
+    "db_trust_sources_collection": "trust_source",
+    "data_ttl": 600,
+}
+
+
+def _same_device_flow(storage) -> None:
+    """
+    The storage calls performed by the backend for a same device flow,
+    from the pre-request to the get-response endpoint.
+    """
+    document_id = str(uuid.uuid4())
+    session_id = str(uuid.uuid4())
+    state = str(uuid.uuid4())
+    nonce = str(uuid.uuid4())
+
+    storage.init_session(document_id, session_id=session_id, state=state, remote_flow_typ="same_device")
+    storage.get_by_state_and_session_id(state, session_id)
+    storage.get_by_state_and_session_id(state)
+    storage.update_request_object(document_id, {"nonce": nonce, "state": state})
+    storage.get_by_state_and_session_id(state)
+    storage.update_response_object(nonce, state, {"response": "test"})
+    storage.set_finalized(document_id)
+    storage.get_by_state_and_session_id(state, session_id)
+
+
+def _redis_storage():
+    url = os.getenv("PYEUDIW_BENCHMARK_REDIS_URL", "memory://benchmark")
+    return RedisStorage(storage_conf, url, {})
+
+
+def _mongo_storage():
+    try:
+        return MongoStorage(
+            storage_conf,
+            f"mongodb://{os.getenv('PYEUDIW_MONGO_TEST_AUTH_INLINE', '')}localhost:27017/?timeoutMS=2000",
+            {},
+        )
+    except Exception as e:
+        pytest.skip(f"MongoDB is not available: {e}")
+
+
+@benchmark
+@pytest.mark.parametrize("factory", [_redis_storage, _mongo_storage], ids=["redis", "mongo"])
+def test_same_device_flow_latency(factory):
+    storage = factory()
+    timings = measure(lambda: _same_device_flow(storage), ROUNDS)
+    report(f"{storage.__class__.__name__} same device flow", timings)
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from pyeudiw.federation.statement_store import FederationStatementStore
+from pyeudiw.tests.federation.mock_federation import MockFederation
+from pyeudiw.tests.federation.test_parallel_discovery import build_trust_chain
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 20))
+LATENCY = float(os.getenv("PYEUDIW_BENCHMARK_LATENCY", 0.02))
+
+
+@benchmark
+@pytest.mark.parametrize("fan_out", [1, 4, 8])
+def test_benchmark_trust_chain_discovery(fan_out):
+    federation = MockFederation(fan_out, latency=LATENCY)
+    store = FederationStatementStore()
+    build_trust_chain(federation, statement_store=store)
+
+    def cold(parallel_discovery: bool):
+        return build_trust_chain(federation, parallel_discovery=parallel_discovery)
+
+    for parallel_discovery in (False, True):
+        report(
+            f"trust chain discovery, fan-out {fan_out}, {LATENCY * 1000:.0f}ms latency, "
+            f"parallel={parallel_discovery}",
+            measure(lambda: cold(parallel_discovery), ROUNDS),
+        )
+
+    report(
+        f"trust chain discovery, fan-out {fan_out}, {LATENCY * 1000:.0f}ms latency, "
+        "statements in the federation statement store",
+        measure(lambda: build_trust_chain(federation, statement_store=store), ROUNDS),
+    )
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from pyeudiw.federation.statement_cache import VerifiedStatementCache
+from pyeudiw.federation.trust_chain_validator import StaticTrustChainValidator
+from pyeudiw.tests.federation.base import ta_jwk, trust_chain_wallet
+from pyeudiw.tests.settings import httpc_params
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 500))
+
+
+@benchmark
+@pytest.mark.parametrize("maxsize", [0, 1024], ids=["without-cache", "with-cache"])
+def test_benchmark_static_trust_chain_validation(maxsize):
+    cache = VerifiedStatementCache(maxsize=maxsize)
+    trust_anchor_jwks = [ta_jwk.serialize()]
+
+    def validate():
+        assert StaticTrustChainValidator(
+            trust_chain_wallet, trust_anchor_jwks, httpc_params, statement_cache=cache
+        ).is_valid
+
+    report(
+        f"static trust chain validation, depth {len(trust_chain_wallet)}, maxsize={maxsize}",
+        measure(validate, ROUNDS),
+    )
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from cryptojwt.jwk.ec import new_ec_key
+
+from pyeudiw.openid4vp.vp_sd_jwt_vc import VpVcSdJwtParserVerifier
+from pyeudiw.sd_jwt.common import SDObj
+from pyeudiw.sd_jwt.holder import SDJWTHolder
+from pyeudiw.sd_jwt.issuer import SDJWTIssuer
+from pyeudiw.tests.trust.mock_trust_handler import MockTrustHandler, mock_jwk_private
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+from pyeudiw.tools.utils import exp_from_now, iat_now
+from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+
+from .base import benchmark, measure, report
+
+ROUNDS = int(os.getenv("PYEUDIW_BENCHMARK_ROUNDS", 50))
+
+AUD = "https://verifier.example.com"
+NONCE = "1234567890"
+
+
+def _presentation(disclosures: int) -> str:
+    holder_jwk = new_ec_key("P-256").serialize(private=True)
+    claims = {
+        "iss": "https://issuer.example.com",
+        "iat": iat_now(),
+        "exp": exp_from_now(3600),
+    }
+    for i in range(disclosures):
+        claims[SDObj(f"claim_{i}")] = f"value_{i}"
+
+    issuer = SDJWTIssuer(claims, mock_jwk_private, holder_key=holder_jwk)
+    holder = SDJWTHolder(issuer.sd_jwt_issuance, serialization_format="compact")
+    holder.create_presentation(
+        {f"claim_{i}": True for i in range(disclosures)},
+        NONCE,
+        AUD,
+        holder_key=holder_jwk,
+        sign_alg="ES256",
+    )
+    return holder.sd_jwt_presentation
+
+
+@benchmark
+@pytest.mark.parametrize("disclosures", [10, 100, 1000])
+def test_benchmark_vp_sd_jwt_verification(disclosures):
+    parser = VpVcSdJwtParserVerifier(
+        CombinedTrustEvaluator([MockTrustHandler()], _db_engine(), mode="cache_first"),
+        sig_alg_supported=["ES256"],
+    )
+    token = _presentation(disclosures)
+
+    def validate_and_parse():
+        parser.validate(token, AUD, NONCE)
+        return parser.parse(token)
+
+    assert parser.verify(token, AUD, NONCE).claims == validate_and_parse()
+
+    report(
+        f"sd-jwt vp with {disclosures} disclosures, validated and parsed",
+        measure(validate_and_parse, ROUNDS),
+    )
+    report(
+        f"sd-jwt vp with {disclosures} disclosures, verified in one pass",
+        measure(lambda: parser.verify(token, AUD, NONCE), ROUNDS),
+    )
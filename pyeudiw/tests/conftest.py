@@ -0,0 +1,13 @@
+import pytest
+
+from pyeudiw.status_list.manager import get_status_list_manager
+
+
+@pytest.fixture(autouse=True)
+def status_list_manager():
+    # the tests publish different status lists at the same uri
+    manager = get_status_list_manager()
+    manager.cache_clear()
+    yield manager
+    manager.wait_refresh()
+    manager.cache_clear()
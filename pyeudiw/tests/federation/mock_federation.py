@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from cryptojwt.jwk.ec import new_ec_key
+from cryptojwt.jws.jws import JWS
+
+from pyeudiw.federation.exceptions import HttpError
+from pyeudiw.federation.statements import get_entity_configuration_url
+from pyeudiw.tools.utils import exp_from_now, iat_now
+
+TRUST_ANCHOR = "https://trust-anchor.example.org"
+LEAF = "https://wallet-provider.example.org"
+
+
+def _federation_entity(entity_id: str) -> dict:
+    return {
+        "federation_entity": {
+            "federation_fetch_endpoint": f"{entity_id}/fetch",
+            "organization_name": entity_id,
+        }
+    }
+
+
+class Response:
+    def __init__(self, content: str):
+        self.content = content
+        self.status_code = 200
+
+
+def _sign(payload: dict, key) -> str:
+    return JWS(payload, alg="ES256", typ="entity-statement+jwt").sign_compact([key])
+
+
+class MockFederation:
+    """
+    A federation where the leaf has an authority hint for each of the
+    fan_out intermediates, subordinates of the trust anchor. Each
+    intermediate has its own host, unless shared_host is set.
+    Every request lasts latency seconds.
+    """
+
+    def __init__(
+        self,
+        fan_out: int,
+        latency: float = 0.0,
+        unreachable: tuple = (),
+        shared_host: bool = False,
+    ):
+        self.latency = latency
+        self.unreachable = set(unreachable)
+        self.intermediates = [
+            f"https://intermediates.example.org/{i}"
+            if shared_host
+            else f"https://intermediate-{i}.example.org"
+            for i in range(fan_out)
+        ]
+        self.keys = {
+            entity_id: new_ec_key("P-256", alg="ES256")
+            for entity_id in [TRUST_ANCHOR, LEAF, *self.intermediates]
+        }
+
+        self.responses: dict[str, str] = {}
+        self.requests = Counter()
+        self.running = Counter()
+        self.max_running = Counter()
+        self.max_running_total = 0
+        self._lock = threading.Lock()
+
+        self._add_configuration(
+            TRUST_ANCHOR,
+            metadata=_federation_entity(TRUST_ANCHOR),
+            constraints={"max_path_length": 1},
+        )
+        self._add_configuration(
+            LEAF,
+            metadata={
+                "wallet_provider": {"jwks": {"keys": [self._public(LEAF)]}},
+                "federation_entity": {"organization_name": "wallet provider"},
+            },
+            authority_hints=self.intermediates,
+        )
+        for intermediate in self.intermediates:
+            self._add_configuration(
+                intermediate,
+                metadata=_federation_entity(intermediate),
+                authority_hints=[TRUST_ANCHOR],
+            )
+            self._add_statement(TRUST_ANCHOR, intermediate)
+            self._add_statement(intermediate, LEAF)
+
+    def _public(self, entity_id: str) -> dict:
+        return self.keys[entity_id].serialize()
+
+    def _add_configuration(self, entity_id: str, **claims) -> None:
+        payload = {
+            "exp": exp_from_now(5000),
+            "iat": iat_now(),
+            "iss": entity_id,
+            "sub": entity_id,
+            "jwks": {"keys": [self._public(entity_id)]},
+            **claims,
+        }
+        self.responses[get_entity_configuration_url(entity_id)] = _sign(
+            payload, self.keys[entity_id]
+        )
+
+    def _add_statement(self, issuer: str, subject: str) -> None:
+        payload = {
+            "exp": exp_from_now(5000),
+            "iat": iat_now(),
+            "iss": issuer,
+            "sub": subject,
+            "jwks": {"keys": [self._public(subject)]},
+        }
+        self.responses[f"{issuer}/fetch?sub={subject}"] = _sign(
+            payload, self.keys[issuer]
+        )
+
+    @property
+    def trust_anchor_configuration(self) -> str:
+        return self.responses[get_entity_configuration_url(TRUST_ANCHOR)]
+
+    def _response(self, url: str) -> str:
+        if url not in self.responses or any(
+            url.startswith(f"{entity_id}/") for entity_id in self.unreachable
+        ):
+            raise HttpError(f"HTTP error: 404 -- {url}")
+        return self.responses[url]
+
+    def _enter(self, url: str) -> str:
+        host = urlparse(url).netloc
+        with self._lock:
+            self.requests[url] += 1
+            self.running[host] += 1
+            self.max_running[host] = max(self.max_running[host], self.running[host])
+            self.max_running_total = max(
+                self.max_running_total, sum(self.running.values())
+            )
+        return host
+
+    def _exit(self, host: str) -> None:
+        with self._lock:
+            self.running[host] -= 1
+
+    def get_http_url(self, urls: list[str] | str, httpc_params: dict, http_async: bool = True) -> list:
+        """
+        Drop-in replacement of pyeudiw.tools.utils.get_http_url.
+        """
+        urls = urls if isinstance(urls, list) else [urls]
+        responses = []
+        for url in urls:
+            host = self._enter(url)
+            try:
+                time.sleep(self.latency)
+                responses.append(Response(self._response(url)))
+            finally:
+                self._exit(host)
+        return responses
+
+    async def http_get_async(self, urls: list[str], httpc_params: dict) -> list:
+        """
+        Drop-in replacement of pyeudiw.federation.http_client.http_get_async.
+        """
+        return await asyncio.gather(*(self._get_async(url) for url in urls))
+
+    async def _get_async(self, url: str) -> Response:
+        host = self._enter(url)
+        try:
+            await asyncio.sleep(self.latency)
+            return Response(self._response(url))
+        finally:
+            self._exit(host)
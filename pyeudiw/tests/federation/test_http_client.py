@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from pyeudiw.federation.exceptions import HttpError
+from pyeudiw.federation.http_client import (
+    HttpClient,
+    get_http_client,
+    http_get_async,
+    http_get_sync,
+)
+
+httpc_params = {
+    "connection": {"ssl": False},
+    "session": {"timeout": 2},
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        status = 404 if self.path == "/missing" else 200
+        body = f"hello {self.path}".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(limit=10, limit_per_host=2)
+    yield client
+    client.close()
+
+
+def test_async_get_returns_requests_response(server, client):
+    res = client.get([f"{server}/a", f"{server}/b"], httpc_params)
+
+    assert all(isinstance(r, requests.Response) for r in res)
+    assert [r.status_code for r in res] == [200, 200]
+    assert res[0].content == b"hello /a"
+    assert res[1].text == "hello /b"
+
+
+def test_async_get_reuses_connections(server, client):
+    for _ in range(5):
+        client.get([f"{server}/a"], httpc_params)
+
+    assert len(_Handler.connections) == 1
+
+
+def test_sync_get_reuses_connections(server, client):
+    for _ in range(5):
+        res = client.get([f"{server}/a"], httpc_params, http_async=False)
+        assert res[0].content == b"hello /a"
+
+    assert len(_Handler.connections) == 1
+
+
+def test_get_non_200(server, client):
+    with pytest.raises(HttpError):
+        client.get([f"{server}/missing"], httpc_params)
+
+    with pytest.raises(HttpError):
+        client.get([f"{server}/missing"], httpc_params, http_async=False)
+
+
+def test_get_connection_error(client):
+    with pytest.raises(HttpError):
+        client.get(["http://127.0.0.1:1/"], httpc_params)
+
+    with pytest.raises(HttpError):
+        client.get(["http://127.0.0.1:1/"], httpc_params, http_async=False)
+
+
+def test_module_helpers_share_client(server):
+    assert get_http_client() is get_http_client()
+
+    res = http_get_sync([f"{server}/sync"], httpc_params)
+    assert res[0].content == b"hello /sync"
+
+    res = asyncio.run(http_get_async([f"{server}/async"], httpc_params))
+    assert res[0].content == b"hello /async"
@@ -1,7 +1,20 @@
+import datetime
+from copy import deepcopy
+
 import pytest
+from cryptojwt.jwk.ec import new_ec_key
+from cryptojwt.jws.jws import JWS
+from freezegun import freeze_time
 
 from pyeudiw.federation.exceptions import PolicyError
-from pyeudiw.federation.policy import TrustChainPolicy, combine, combine_claim_policy
+from pyeudiw.federation.policy import (
+    MetadataPolicyPlan,
+    MetadataPolicyPlanCache,
+    TrustChainPolicy,
+    combine,
+    combine_claim_policy,
+)
+from pyeudiw.tools.utils import exp_from_now, iat_now
 
 __author__ = "Roland Hedberg"
 __license__ = "Apache 2.0"
@@ -402,3 +415,100 @@ def test_set_equality():
 
     assert set(res["scopes"]) == {"openid", "eduperson"}
     assert set(res["response_types"]) == {"code", "code id_token"}
+
+
+OPENID_RP = "openid_relying_party"
+
+TA_STATEMENT = {
+    "iss": "https://trust-anchor.example.org",
+    "sub": "https://intermediate.example.org",
+    "metadata_policy": {
+        OPENID_RP: {
+            "scopes": {"subset_of": ["openid", "eduperson", "email"]},
+            "grant_types": {"one_of": ["authorization_code", "refresh_token"]},
+            "contacts": {"add": ["ta@example.org"]},
+            "jwks": {"essential": True},
+        }
+    },
+}
+
+INTERMEDIATE_STATEMENT = {
+    "iss": "https://intermediate.example.org",
+    "sub": "https://rp.example.org",
+    "metadata_policy": {
+        OPENID_RP: {
+            "scopes": {"subset_of": ["openid", "eduperson"]},
+            "client_registration_types": {"value": ["automatic"]},
+        }
+    },
+}
+
+
+def _statements(exp: int) -> list[str]:
+    key = new_ec_key("P-256")
+    return [
+        JWS({**payload, "iat": iat_now(), "exp": exp}, alg="ES256").sign_compact(
+            [key]
+        )
+        for payload in (TA_STATEMENT, INTERMEDIATE_STATEMENT)
+    ]
+
+
+def test_metadata_policy_plan():
+    plan = MetadataPolicyPlan(
+        TrustChainPolicy().gather_policies(
+            [TA_STATEMENT, INTERMEDIATE_STATEMENT], OPENID_RP
+        )
+    )
+    metadata = {
+        "scopes": ["openid", "email", "address"],
+        "grant_types": ["implicit", "refresh_token"],
+        "contacts": ["rp@example.org"],
+        "jwks": {"keys": []},
+    }
+    original = deepcopy(metadata)
+
+    res = plan.apply(metadata)
+
+    assert metadata == original
+    assert res["scopes"] == ["openid"]
+    assert res["grant_types"] == "refresh_token"
+    assert res["contacts"] == ["rp@example.org", "ta@example.org"]
+    assert res["client_registration_types"] == ["automatic"]
+
+    with pytest.raises(PolicyError):
+        plan.apply({**metadata, "grant_types": ["implicit"]})
+
+    del metadata["jwks"]
+    with pytest.raises(PolicyError):
+        plan.apply(metadata)
+
+
+def test_metadata_policy_plan_cache():
+    cache = MetadataPolicyPlanCache()
+    exp = exp_from_now(10)
+    statements = _statements(exp)
+
+    plan = cache.get_plan(statements, OPENID_RP)
+    assert cache.get_plan(statements, OPENID_RP) is plan
+    assert cache.get_plan(statements, "federation_entity") is not plan
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().currsize == 2
+
+    # the plan expires with the first statement of the chain
+    with freeze_time(datetime.datetime.fromtimestamp(exp, datetime.timezone.utc)):
+        assert cache.get_plan(statements, OPENID_RP) is not plan
+
+    assert cache.cache_info().misses == 3
+
+
+def test_metadata_policy_plan_cache_is_bounded():
+    cache = MetadataPolicyPlanCache(maxsize=1)
+    first, second = _statements(exp_from_now(10)), _statements(exp_from_now(10))
+
+    cache.get_plan(first, OPENID_RP)
+    cache.get_plan(second, OPENID_RP)
+    cache.get_plan(first, OPENID_RP)
+
+    assert cache.cache_info().currsize == 1
+    assert cache.cache_info().evictions == 2
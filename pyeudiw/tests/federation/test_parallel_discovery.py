@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+import pytest
+
+from pyeudiw.federation.exceptions import TrustChainDiscoveryTimeout
+from pyeudiw.federation.statement_store import FederationStatementStore
+from pyeudiw.federation.statements import EntityStatement
+from pyeudiw.federation.trust_chain_builder import TrustChainBuilder
+from pyeudiw.tests.settings import httpc_params
+
+from .mock_federation import LEAF, TRUST_ANCHOR, MockFederation
+
+
+def build_trust_chain(federation: MockFederation, **kwargs) -> TrustChainBuilder:
+    trust_anchor_ec = EntityStatement(
+        federation.trust_anchor_configuration, httpc_params=httpc_params
+    )
+    trust_anchor_ec.validate_by_itself()
+
+    trust_chain = TrustChainBuilder(
+        subject=LEAF,
+        trust_anchor=TRUST_ANCHOR,
+        trust_anchor_configuration=trust_anchor_ec,
+        httpc_params=httpc_params,
+        **kwargs,
+    )
+    with patch(
+        "pyeudiw.federation.statements.get_http_url", federation.get_http_url
+    ), patch(
+        "pyeudiw.federation.discovery.http_get_async", federation.http_get_async
+    ):
+        trust_chain.start()
+    return trust_chain
+
+
+@pytest.mark.parametrize("fan_out", [1, 4])
+def test_same_trust_chain_as_sequential_discovery(fan_out):
+    federation = MockFederation(fan_out)
+
+    sequential = build_trust_chain(federation, parallel_discovery=False)
+    parallel = build_trust_chain(federation, parallel_discovery=True)
+
+    assert sequential.is_valid and parallel.is_valid
+    assert [ec.sub for ec in parallel.trust_path] == [
+        ec.sub for ec in sequential.trust_path
+    ]
+    assert parallel.final_metadata == sequential.final_metadata
+    assert parallel.get_trust_chain() == sequential.get_trust_chain()
+    assert parallel.exp == sequential.exp
+    assert {
+        level: [ec.sub for ec in ecs] for level, ecs in parallel.tree_of_trust.items()
+    } == {
+        level: [ec.sub for ec in ecs] for level, ecs in sequential.tree_of_trust.items()
+    }
+
+
+def test_fetches_are_concurrent_within_host_limits():
+    federation = MockFederation(6, latency=0.05, shared_host=True)
+
+    trust_chain = build_trust_chain(
+        federation, parallel_discovery=True, discovery_limit_per_host=2
+    )
+
+    assert trust_chain.is_valid
+    # every intermediate is asked once for its configuration and once for the leaf statement
+    assert all(count == 1 for count in federation.requests.values())
+    assert federation.max_running["intermediates.example.org"] == 2
+
+    # another federation, with the same entity ids
+    federation = MockFederation(6, latency=0.05)
+    assert build_trust_chain(federation, parallel_discovery=True).is_valid
+    # the intermediates on different hosts are fetched all together
+    assert federation.max_running_total == 6
+
+
+@pytest.mark.parametrize("parallel_discovery", [False, True])
+def test_statements_are_fetched_through_the_store(parallel_discovery):
+    federation = MockFederation(2)
+    store = FederationStatementStore()
+
+    first = build_trust_chain(
+        federation, parallel_discovery=parallel_discovery, statement_store=store
+    )
+    requests = dict(federation.requests)
+    second = build_trust_chain(
+        federation, parallel_discovery=parallel_discovery, statement_store=store
+    )
+
+    assert first.is_valid and second.is_valid
+    assert federation.requests == requests
+    assert store.cache_info().hits > 0
+
+
+def test_unreachable_superior_is_skipped():
+    federation = MockFederation(3, unreachable=("https://intermediate-0.example.org",))
+
+    trust_chain = build_trust_chain(federation, parallel_discovery=True)
+
+    assert trust_chain.is_valid
+    assert "https://intermediate-0.example.org" not in [
+        ec.sub for ec in trust_chain.tree_of_trust[1]
+    ]
+
+
+def test_discovery_deadline():
+    federation = MockFederation(2, latency=0.5)
+
+    with pytest.raises(TrustChainDiscoveryTimeout):
+        build_trust_chain(federation, parallel_discovery=True, discovery_timeout=0.2)
@@ -0,0 +1,192 @@
+import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from freezegun import freeze_time
+
+from pyeudiw.federation.statement_store import (
+    FederationStatement,
+    FederationStatementStore,
+)
+from pyeudiw.federation.statements import (
+    get_entity_configuration_url,
+    get_entity_configurations,
+)
+from pyeudiw.tests.settings import httpc_params
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+from pyeudiw.tools.utils import exp_from_now
+
+from .mock_federation import LEAF, TRUST_ANCHOR, MockFederation, Response
+
+
+def test_statements_are_keyed_by_iss_and_sub():
+    federation = MockFederation(1)
+    store = FederationStatementStore()
+
+    statement = store.put(
+        federation.trust_anchor_configuration, TRUST_ANCHOR, TRUST_ANCHOR
+    )
+
+    assert store.get(TRUST_ANCHOR, TRUST_ANCHOR) is statement
+    assert statement.payload["sub"] == TRUST_ANCHOR
+    assert statement.header["alg"] == "ES256"
+    assert store.get(TRUST_ANCHOR, LEAF) is None
+    assert store.cache_info().hits == 1
+    assert store.cache_info().misses == 1
+
+    with pytest.raises(ValueError):
+        store.put("not a jwt", TRUST_ANCHOR, TRUST_ANCHOR)
+
+
+def test_statements_expire_with_exp():
+    federation = MockFederation(1)
+    store = FederationStatementStore()
+    store.put(federation.trust_anchor_configuration, TRUST_ANCHOR, TRUST_ANCHOR)
+
+    expired = exp_from_now(5001)
+    with freeze_time(datetime.datetime.fromtimestamp(expired, datetime.timezone.utc)):
+        assert store.get(TRUST_ANCHOR, TRUST_ANCHOR) is None
+
+    assert store.cache_info().currsize == 0
+
+
+def test_storage_is_the_second_tier():
+    federation = MockFederation(1)
+    db_engine = _db_engine()
+    FederationStatementStore(db_engine).put(
+        federation.trust_anchor_configuration,
+        TRUST_ANCHOR,
+        TRUST_ANCHOR,
+        url="https://ta/",
+        etag='"v1"',
+    )
+
+    # another process, sharing the storage
+    store = FederationStatementStore(db_engine)
+    statement = store.get(TRUST_ANCHOR, TRUST_ANCHOR)
+
+    assert statement.jwt == federation.trust_anchor_configuration
+    assert statement.etag == '"v1"'
+    assert store.cache_info().storage_hits == 1
+
+    store.get(TRUST_ANCHOR, TRUST_ANCHOR)
+    assert store.cache_info().hits == 1
+
+    # an invalidated statement is not loaded from the storage again
+    store.invalidate(TRUST_ANCHOR, TRUST_ANCHOR)
+    assert store.get(TRUST_ANCHOR, TRUST_ANCHOR) is None
+
+
+def test_entity_configurations_are_fetched_once():
+    federation = MockFederation(2)
+    store = FederationStatementStore()
+
+    with patch("pyeudiw.federation.statements.get_http_url", federation.get_http_url):
+        for _ in range(3):
+            jwts = get_entity_configurations(
+                [TRUST_ANCHOR, LEAF], httpc_params, statement_store=store
+            )
+            assert jwts == [
+                federation.responses[get_entity_configuration_url(TRUST_ANCHOR)],
+                federation.responses[get_entity_configuration_url(LEAF)],
+            ]
+
+    assert federation.requests[get_entity_configuration_url(TRUST_ANCHOR)] == 1
+    assert federation.requests[get_entity_configuration_url(LEAF)] == 1
+    assert store.cache_info().hits == 4
+
+
+def test_statements_are_revalidated_conditionally():
+    federation = MockFederation(1)
+    store = FederationStatementStore(refresh_ttl=0)
+    url = get_entity_configuration_url(TRUST_ANCHOR)
+    statement = store.put(
+        federation.trust_anchor_configuration, TRUST_ANCHOR, TRUST_ANCHOR, url, '"v1"'
+    )
+    checked_at = statement.checked_at
+
+    not_modified = Mock(status_code=304)
+    with patch(
+        "pyeudiw.federation.statement_store.get_http_client"
+    ) as get_http_client:
+        get_http_client().get_one.return_value = not_modified
+        assert store.lookup(TRUST_ANCHOR, TRUST_ANCHOR, httpc_params) is statement
+
+    get_http_client().get_one.assert_called_with(
+        url, httpc_params, {"If-None-Match": '"v1"'}, http_async=False
+    )
+    assert statement.checked_at >= checked_at
+
+    # the trust anchor published a new configuration
+    renewed = MockFederation(1).trust_anchor_configuration
+    modified = Response(renewed)
+    modified.headers = {"ETag": '"v2"'}
+    with patch(
+        "pyeudiw.federation.statement_store.get_http_client"
+    ) as get_http_client:
+        get_http_client().get_one.return_value = modified
+        fresh = store.lookup(TRUST_ANCHOR, TRUST_ANCHOR, httpc_params)
+
+    assert fresh.jwt == renewed
+    assert fresh.etag == '"v2"'
+    assert store.get(TRUST_ANCHOR, TRUST_ANCHOR) is fresh
+    assert store.cache_info().revalidations == 2
+
+
+def test_stale_statement_is_served_when_revalidation_fails():
+    federation = MockFederation(1)
+    store = FederationStatementStore(refresh_ttl=0)
+    statement = store.put(
+        federation.trust_anchor_configuration,
+        TRUST_ANCHOR,
+        TRUST_ANCHOR,
+        get_entity_configuration_url(TRUST_ANCHOR),
+    )
+
+    with patch(
+        "pyeudiw.federation.statement_store.get_http_client"
+    ) as get_http_client:
+        get_http_client().get_one.side_effect = ConnectionError("unreachable")
+        assert store.lookup(TRUST_ANCHOR, TRUST_ANCHOR, httpc_params) is statement
+
+
+def test_serialization():
+    federation = MockFederation(1)
+    statement = FederationStatement.from_jwt(
+        federation.trust_anchor_configuration.encode(), "https://ta/", '"v1"'
+    )
+
+    assert FederationStatement.from_dict(statement.serialize()) == statement
+
+
+def test_memory_is_bounded():
+    federation = MockFederation(3)
+    store = FederationStatementStore(maxsize=2)
+
+    for jwt in federation.responses.values():
+        statement = FederationStatement.from_jwt(jwt)
+        store.put(jwt, statement.iss, statement.sub)
+
+    assert store.cache_info().currsize == 2
+    assert store.cache_info().evictions == len(federation.responses) - 2
+
+
+def test_statement_of_another_entity_is_not_stored():
+    federation = MockFederation(1)
+    store = FederationStatementStore()
+    evil = "https://evil.example"
+
+    with pytest.raises(ValueError):
+        store.put(federation.trust_anchor_configuration, evil, evil)
+
+    # an entity configuration claiming to be the one of the trust anchor
+    with patch(
+        "pyeudiw.federation.statements.get_http_url",
+        Mock(return_value=[Response(federation.trust_anchor_configuration)]),
+    ):
+        jwts = get_entity_configurations([evil], httpc_params, statement_store=store)
+
+    assert jwts == [federation.trust_anchor_configuration]
+    assert store.get(TRUST_ANCHOR, TRUST_ANCHOR) is None
+    assert store.get(evil, evil) is None
+    assert store.cache_info().currsize == 0
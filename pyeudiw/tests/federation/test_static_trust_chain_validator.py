@@ -1,11 +1,19 @@
 import copy
+import datetime
 import unittest.mock as mock
 import uuid
 from unittest.mock import Mock
 
+import pytest
+from freezegun import freeze_time
+
 import pyeudiw.federation.trust_chain_validator as tcv
 from pyeudiw.federation.exceptions import HttpError
+from pyeudiw.federation.statement_cache import VerifiedStatementCache
 from pyeudiw.federation.trust_chain_validator import StaticTrustChainValidator
+from pyeudiw.jwk.exceptions import KidNotFoundError
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.jwt.utils import decode_jwt_payload
 from pyeudiw.tests.settings import httpc_params
 
 from .base import (
@@ -165,3 +173,61 @@ def test_update_st_es_case_no_source_endpoint():
                 invalid_trust_chain, [ta_jwk.serialize()], httpc_params=httpc_params
             )
             assert _t._update_st(ta_es_signed) == leaf_wallet_signed
+
+
+def test_cached_chain_is_validated_without_signature_checks():
+    cache = VerifiedStatementCache()
+
+    assert StaticTrustChainValidator(
+        trust_chain_wallet, [ta_jwk.serialize()], httpc_params=httpc_params,
+        statement_cache=cache,
+    ).is_valid
+    assert cache.cache_info().currsize == len(trust_chain_wallet)
+
+    with mock.patch.object(JWSHelper, "verify", autospec=True, side_effect=JWSHelper.verify) as verify:
+        validator = StaticTrustChainValidator(
+            trust_chain_wallet, [ta_jwk.serialize()], httpc_params=httpc_params,
+            statement_cache=cache,
+        )
+        assert validator.is_valid
+        assert validator.exp == EXP
+        assert verify.call_count == 0
+
+    assert cache.cache_info().hits == len(trust_chain_wallet)
+
+
+def test_statement_cache_is_keyed_by_verifying_key():
+    cache = VerifiedStatementCache()
+    cache.verify(ta_es_signed, ta_jwk.serialize())
+
+    thumbprint = ta_jwk.thumbprint("SHA-256")
+    assert cache.get(ta_es_signed, thumbprint) is not None
+    assert cache.get(ta_es_signed, intermediate_jwk.thumbprint("SHA-256")) is None
+    assert cache.get(leaf_wallet_signed, thumbprint) is None
+
+    # a statement is not accepted with another key just because it is cached
+    with pytest.raises(KidNotFoundError):
+        cache.verify(ta_es_signed, intermediate_jwk.serialize())
+
+
+def test_statement_cache_entry_expires_with_statement():
+    cache = VerifiedStatementCache()
+    cache.verify(ta_es_signed, ta_jwk.serialize())
+
+    with freeze_time(datetime.datetime.fromtimestamp(EXP, datetime.timezone.utc)):
+        assert cache.get(ta_es_signed, ta_jwk.thumbprint("SHA-256")) is None
+    assert cache.cache_info().currsize == 0
+
+
+def test_statement_cache_is_bounded():
+    cache = VerifiedStatementCache(maxsize=2)
+    for statement in trust_chain_wallet:
+        cache.put(statement, b"thumbprint", decode_jwt_payload(statement))
+
+    assert cache.cache_info().evictions == 1
+    assert cache.get(trust_chain_wallet[0], b"thumbprint") is None
+    assert cache.get(trust_chain_wallet[-1], b"thumbprint") is not None
+
+    disabled = VerifiedStatementCache(maxsize=0)
+    disabled.verify(ta_es_signed, ta_jwk.serialize())
+    assert disabled.cache_info().currsize == 0
@@ -8,7 +8,7 @@ from .base import leaf_wallet, ta_ec
 from .mocked_response import EntityResponseWithIntermediate
 
 
-@patch("requests.get", return_value=EntityResponseWithIntermediate())
+@patch("requests.Session.get", return_value=EntityResponseWithIntermediate())
 def test_trust_chain_valid_with_intermediaries(self, mocker):
 
     jwt = get_entity_configurations([ta_ec["sub"]], httpc_params=httpc_params)[0]
@@ -0,0 +1,89 @@
+import datetime
+
+import pytest
+from freezegun import freeze_time
+
+from pyeudiw.federation.exceptions import InvalidRequiredTrustMark
+from pyeudiw.federation.trust_chain_store import ResolvedTrustChain, TrustChainStore
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+
+from .mock_federation import LEAF, TRUST_ANCHOR, MockFederation
+from .test_parallel_discovery import build_trust_chain
+
+
+def test_resolved_trust_chains_are_indexed():
+    federation = MockFederation(1)
+    trust_chain_store = TrustChainStore(_db_engine())
+
+    built = build_trust_chain(
+        federation, parallel_discovery=True, trust_chain_store=trust_chain_store
+    )
+    resolved = built.get_resolved_trust_chain()
+
+    assert resolved.subject == LEAF
+    assert resolved.trust_anchor == TRUST_ANCHOR
+    assert resolved.chain[0] == built.subject_configuration.jwt
+    assert resolved.chain[-1] == federation.trust_anchor_configuration
+    assert len(resolved.chain) == 4
+    assert resolved.metadata == built.final_metadata
+
+    assert trust_chain_store.get(LEAF, TRUST_ANCHOR) == resolved
+    assert trust_chain_store.get_by_subject(LEAF) == [resolved]
+    assert trust_chain_store.get_by_trust_anchor(TRUST_ANCHOR) == [resolved]
+
+    with freeze_time(
+        datetime.datetime.fromtimestamp(resolved.exp, datetime.timezone.utc)
+    ):
+        assert trust_chain_store.get(LEAF, TRUST_ANCHOR) is None
+
+
+def test_resolved_trust_chain_is_not_discovered_again():
+    federation = MockFederation(2)
+    db_engine = _db_engine()
+
+    first = build_trust_chain(
+        federation, parallel_discovery=True, trust_chain_store=TrustChainStore(db_engine)
+    )
+    requests = sum(federation.requests.values())
+
+    # another worker, sharing the storage
+    second = build_trust_chain(
+        federation, parallel_discovery=True, trust_chain_store=TrustChainStore(db_engine)
+    )
+
+    assert sum(federation.requests.values()) == requests
+    assert second.is_valid
+    assert second.final_metadata == first.final_metadata
+    assert second.exp == first.get_resolved_trust_chain().exp
+    assert second.get_trust_chain() == first.get_resolved_trust_chain().chain
+    assert second.apply_metadata_policy() == first.final_metadata
+
+
+def test_required_trust_marks_are_checked_on_resolved_trust_chains():
+    federation = MockFederation(1)
+    trust_chain_store = TrustChainStore(_db_engine())
+
+    assert build_trust_chain(
+        federation, parallel_discovery=True, trust_chain_store=trust_chain_store
+    ).is_valid
+
+    # the stored chain was resolved without checking any trust mark
+    with pytest.raises(InvalidRequiredTrustMark):
+        build_trust_chain(
+            federation,
+            parallel_discovery=True,
+            trust_chain_store=trust_chain_store,
+            required_trust_marks=[{"id": "https://trust-anchor.example.org/marks/1"}],
+        )
+
+
+def test_nothing_is_kept_without_storage():
+    federation = MockFederation(1)
+    store = TrustChainStore()
+    trust_chain = ResolvedTrustChain.from_chain(
+        [federation.trust_anchor_configuration], {}
+    )
+
+    assert store.put(trust_chain) is trust_chain
+    assert store.get(TRUST_ANCHOR, TRUST_ANCHOR) is None
+    assert store.get_by_subject(TRUST_ANCHOR) == []
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 from pyeudiw.jwk import JWK
-from pyeudiw.jwk.jwks import find_jwk_by_kid, find_jwk_by_thumbprint
+from pyeudiw.jwk.jwks import KeySet, find_jwk_by_kid, find_jwk_by_thumbprint, get_key_set
 
 raw_key_2 = {
     "crv": "P-256",
@@ -162,3 +162,53 @@ def test_find_jwk_by_thumbprint():
     for i, case in enumerate(test_cases):
         obt = find_jwk_by_thumbprint(case.jwks, case.thumbrpint)
         assert obt == case.expected, f"failed case {i}, testcase: {case.expected}"
+
+
+def test_key_set_index():
+    key_set = KeySet([raw_key_2, raw_key_no_kid])
+
+    assert len(key_set) == 2
+    assert key_set.get_by_kid(raw_key_2["kid"]).kid == raw_key_2["kid"]
+    assert key_set.get_by_kid("unknown") is None
+    assert key_set.index_by_thumbprint(JWK(raw_key_no_kid).thumbprint) == 1
+    assert key_set.get_by_thumbprint(b"unknown") is None
+    # private parts are never exposed by the public view
+    assert all("d" not in jwk for jwk in key_set.public_jwks)
+
+
+def test_key_set_first_key_wins():
+    other_key = JWK().as_dict()
+    other_key["kid"] = raw_key_2["kid"]
+
+    key_set = KeySet([other_key, raw_key_2])
+
+    assert key_set.index_by_kid(raw_key_2["kid"]) == 0
+    assert find_jwk_by_kid(key_set, raw_key_2["kid"]) == find_jwk_by_kid(
+        [other_key, raw_key_2], raw_key_2["kid"]
+    )
+
+
+def test_find_jwk_in_key_set():
+    key_set = get_key_set([raw_key_2, raw_key_no_kid])
+
+    assert find_jwk_by_kid(key_set, raw_key_2["kid"]) == raw_key_2
+    assert find_jwk_by_thumbprint(key_set, JWK(raw_key_no_kid).thumbprint) == raw_key_no_kid
+    assert find_jwk_by_thumbprint(key_set, b"unknown") is None
+
+    try:
+        find_jwk_by_kid(key_set, "unknown")
+    except Exception as e:
+        assert str(e) == "Key with Kid unknown not found"
+
+    # the returned keys are copies
+    find_jwk_by_kid(key_set, raw_key_2["kid"])["kid"] = "changed"
+    assert key_set.get_by_kid(raw_key_2["kid"]) is not None
+
+
+def test_get_key_set_is_memoized():
+    key_set = get_key_set([raw_key_2, raw_key_no_kid])
+
+    assert get_key_set([dict(raw_key_2), dict(raw_key_no_kid)]) is key_set
+    assert get_key_set(key_set) is key_set
+    assert get_key_set(raw_key_2) is get_key_set([raw_key_2])
+    assert get_key_set([raw_key_no_kid, raw_key_2]) is not key_set
@@ -0,0 +1,66 @@
+import base64
+from unittest.mock import patch
+
+import pytest
+from cryptojwt.jwk.ec import ECKey, new_ec_key
+from cryptojwt.jwk.rsa import new_rsa_key
+
+from pyeudiw.jwt import jws_signer
+from pyeudiw.jwt.exceptions import JWSSigningError
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.jwt.jws_signer import JWSSigner
+from pyeudiw.jwt.utils import decode_jwt_header
+from pyeudiw.tests.x509.test_x509 import gen_chain
+from pyeudiw.tools.utils import iat_now
+
+TYP = "oauth-authz-req+jwt"
+
+
+def _private(key) -> dict:
+    return key.serialize(private=True)
+
+
+def test_sign():
+    keys = [_private(new_ec_key("P-256", kid="ec")), _private(new_rsa_key(kid="rsa"))]
+    signer = JWSSigner(keys, protected={"typ": TYP})
+    payload = {"iss": "https://rp.example.org", "exp": iat_now() + 60}
+
+    for key_index, key in enumerate(keys):
+        token = signer.sign(payload, protected={"trust_chain": ["a", "b"]}, key_index=key_index)
+
+        assert decode_jwt_header(token) == {
+            "typ": TYP,
+            "trust_chain": ["a", "b"],
+            "alg": "ES256" if key["kty"] == "EC" else "RS256",
+            "kid": key["kid"],
+        }
+        assert JWSHelper(key).verify(token) == payload
+
+
+def test_sign_errors():
+    key = new_ec_key("P-256", kid="ec")
+
+    with pytest.raises(JWSSigningError):
+        JWSSigner([key.serialize(private=False)])
+    with pytest.raises(JWSSigningError):
+        JWSSigner([{"kty": "oct", "k": "c2VjcmV0", "kid": "oct"}])
+    with pytest.raises(JWSSigningError):
+        JWSSigner([_private(key)]).sign({}, protected={"kid": "another"})
+
+
+def test_key_index_by_x5c():
+    leaf = new_ec_key("P-256")
+    keys = [_private(new_ec_key("P-256")), _private(ECKey(priv_key=leaf.priv_key))]
+    signer = JWSSigner(keys)
+
+    x5c = [base64.b64encode(der).decode() for der in gen_chain(leaf_private_key=leaf.priv_key)]
+    unknown = [base64.b64encode(der).decode() for der in gen_chain()]
+
+    with patch.object(jws_signer, "parse_b64der", wraps=jws_signer.parse_b64der) as parse:
+        assert signer.key_index_by_x5c(x5c) == 1
+        assert signer.key_index_by_x5c(x5c) == 1
+        assert signer.key_index_by_x5c(unknown) is None
+        assert signer.key_index_by_x5c(unknown) is None
+
+    # each certificate is parsed once
+    assert parse.call_count == 2
@@ -1,10 +1,15 @@
+from unittest.mock import patch
+
+from pyeudiw.jwt import utils
 from pyeudiw.jwt.exceptions import JWTDecodeError, JWTInvalidElementPosition
+from pyeudiw.jwt.parse import unsafe_parse_jws
 from pyeudiw.jwt.utils import (
     decode_jwt_element,
     decode_jwt_header,
     decode_jwt_payload,
     is_jwe_format,
     is_jwt_format,
+    jwt_decoding_scope,
 )
 from pyeudiw.tests.jwt import VALID_JWE, VALID_TC_JWT
 
@@ -73,3 +78,35 @@ def test_is_jwe_format():
 
 def test_is_not_jwt_format_jwe():
     assert not is_jwe_format(VALID_TC_JWT)
+
+
+def test_jwt_decoding_scope():
+    sd_jwt = f"{VALID_TC_JWT}~WyJzYWx0IiwgImNsYWltIiwgInZhbHVlIl0~"
+
+    assert decode_jwt_payload(VALID_TC_JWT) is not decode_jwt_payload(VALID_TC_JWT)
+
+    with patch.object(utils, "base64_urldecode", wraps=utils.base64_urldecode) as decode:
+        with jwt_decoding_scope():
+            payload = decode_jwt_payload(VALID_TC_JWT)
+            with jwt_decoding_scope():
+                assert decode_jwt_payload(sd_jwt) is payload
+            parsed = unsafe_parse_jws(VALID_TC_JWT)
+            assert parsed.payload is payload
+            assert parsed.header is decode_jwt_header(sd_jwt)
+
+        assert decode.call_count == 2
+        assert decode_jwt_payload(VALID_TC_JWT) is not payload
+
+
+def test_jwt_decoding_scope_is_bounded():
+    with patch.object(utils, "JWT_DECODING_SCOPE_MAXSIZE", 1):
+        with jwt_decoding_scope():
+            header = decode_jwt_header(VALID_TC_JWT)
+            decode_jwt_payload(VALID_TC_JWT)
+            assert decode_jwt_header(VALID_TC_JWT) is not header
+
+            try:
+                decode_jwt_element(VALID_TC_JWT, 2)
+                assert False
+            except JWTDecodeError:
+                assert True
@@ -1,8 +1,14 @@
+from unittest.mock import patch
+
+import pytest
 from cryptojwt.jwk.ec import new_ec_key
 
+from pyeudiw.jwk.exceptions import KidNotFoundError
+from pyeudiw.jwt import verification
+from pyeudiw.jwt.exceptions import JWSVerificationError
 from pyeudiw.jwt.helper import is_jwt_expired
 from pyeudiw.jwt.jws_helper import JWSHelper
-from pyeudiw.jwt.verification import verify_jws_with_key
+from pyeudiw.jwt.verification import verify_jws_batch, verify_jws_with_key
 from pyeudiw.tools.utils import iat_now
 
 
@@ -34,3 +40,65 @@ def test_verify_jws_with_key():
     jws = helper.sign(payload)
 
     assert verify_jws_with_key(jws, jwk) == None
+
+
+def _public(jwk) -> dict:
+    return jwk.serialize(private=False)
+
+
+def test_verify_jws_batch():
+    jwks = [new_ec_key("P-256") for _ in range(2)]
+    public_keys = [_public(jwk) for jwk in jwks]
+    tokens = [
+        JWSHelper(jwks[i % 2]).sign({"n": i, "exp": iat_now() + 5000}) for i in range(3)
+    ]
+
+    results = verify_jws_batch([(jws, public_keys) for jws in tokens])
+
+    assert [result.is_valid for result in results] == [True] * 3
+    assert [result.unwrap()["n"] for result in results] == [0, 1, 2]
+    assert [result.key_index for result in results] == [0, 1, 0]
+    assert results[1].header["kid"] == jwks[1].kid
+
+
+def test_verify_jws_batch_isolates_errors():
+    jwk = new_ec_key("P-256")
+    other = new_ec_key("P-256")
+    valid = JWSHelper(jwk).sign({"exp": iat_now() + 5000})
+    expired = JWSHelper(jwk).sign({"exp": iat_now() - 5000})
+    tampered = valid[:-4] + ("AAAA" if not valid.endswith("AAAA") else "BBBB")
+
+    results = verify_jws_batch(
+        [
+            (valid, _public(jwk)),
+            (expired, _public(jwk)),
+            (tampered, _public(jwk)),
+            ("not.a.jws.at.all", _public(jwk)),
+            (valid, _public(other)),
+        ]
+    )
+
+    assert results[0].is_valid
+    for result in results[1:4]:
+        assert isinstance(result.error, JWSVerificationError)
+        with pytest.raises(JWSVerificationError):
+            result.unwrap()
+    # the kid is not among the candidates, as raised by JWSHelper.verify
+    assert isinstance(results[4].error, KidNotFoundError)
+
+
+def test_verify_jws_batch_in_parallel():
+    jwks = [new_ec_key("P-256") for _ in range(3)]
+    items = [
+        (JWSHelper(jwks[i % 3]).sign({"n": i, "exp": iat_now() + 5000}), _public(jwks[i % 3]))
+        for i in range(12)
+    ]
+    items[5] = (items[5][0], _public(jwks[0]))
+
+    with patch.object(verification, "JWS_BATCH_VERIFY_MIN_PARALLEL", 2):
+        results = verify_jws_batch(items)
+
+    assert [result.payload["n"] for result in results if result.is_valid] == [
+        i for i in range(12) if i != 5
+    ]
+    assert not results[5].is_valid
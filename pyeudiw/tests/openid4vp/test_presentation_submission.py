@@ -1,6 +1,7 @@
 from pyeudiw.openid4vp.presentation_submission import PresentationSubmissionHandler
 from pyeudiw.tests.openid4vp.mock_parser_handlers import MockLdpVpHandler, MockJwtVpJsonHandler, MockFailingParser
-from pyeudiw.openid4vp.presentation_submission.exceptions import SubmissionValidationError
+from pyeudiw.openid4vp.presentation_submission.base_vp_parser import VerifiedCredential
+from pyeudiw.openid4vp.presentation_submission.exceptions import SubmissionValidationError, ValidationError
 from pyeudiw.trust.dynamic import CombinedTrustEvaluator
 from pyeudiw.storage.db_engine import DBEngine
 from pyeudiw.tests.settings import CONFIG
@@ -70,6 +71,20 @@ def test_handler_correct_parsing():
     assert parsed_tokens[0] == {"parsed": "vp_token_1"}, "Token 1 was not parsed correctly."
     assert parsed_tokens[1] == {"parsed": "vp_token_2"}, "Token 2 was not parsed correctly."
 
+def test_handler_correct_verification():
+    ps = PresentationSubmissionHandler(
+        trust_evaluator=trust_ev, 
+        config=mock_format_config,
+        sig_alg_supported=["ES256", "ES384", "ES512"]
+    )
+
+    credentials = ps.verify(valid_submission, ["vp_token_1", "vp_token_2"], "verifier_id", "verifier_nonce")
+
+    assert credentials == [
+        VerifiedCredential({"parsed": "vp_token_1"}),
+        VerifiedCredential({"parsed": "vp_token_2"}),
+    ], "Tokens were not verified correctly."
+
 def test_handler_missing_handler():
     ps = PresentationSubmissionHandler(
         trust_evaluator=trust_ev, 
@@ -171,4 +186,48 @@ def test_handler_parser_failure():
     try:
         ps.parse(invalid_submission, ["vp_token_1", "vp_token_2"])
     except Exception as e:
-        assert str(e) == "Error parsing token at position 0: This parser is meant to fail."
\ No newline at end of file
+        assert str(e) == "Error parsing token at position 0: This parser is meant to fail."
+
+def test_handler_verification_failure():
+    ps = PresentationSubmissionHandler(
+        trust_evaluator=trust_ev, 
+        config=mock_format_config,
+        sig_alg_supported=["ES256", "ES384", "ES512"]
+    )
+
+    invalid_submission = {
+        "id": "submission_id",
+        "definition_id": "definition_id",
+        "descriptor_map": [
+            {"id": "descriptor_1", "format": "fail_parser", "path": "$[0]"},
+            {"id": "descriptor_2", "format": "jwt_vp_json", "path": "$[1]"}
+        ]
+    }
+
+    try:
+        ps.verify(invalid_submission, ["vp_token_1", "vp_token_2"], "verifier_id", "verifier_nonce")
+        assert False, "Verification should have failed."
+    except ValidationError as e:
+        assert str(e) == "Error verifying token at position 0: This parser is meant to fail."
+
+def test_handler_duplicate_positions():
+    ps = PresentationSubmissionHandler(
+        trust_evaluator=trust_ev, 
+        config=mock_format_config,
+        sig_alg_supported=["ES256", "ES384", "ES512"]
+    )
+
+    invalid_submission = {
+        "id": "submission_id",
+        "definition_id": "definition_id",
+        "descriptor_map": [
+            {"id": "descriptor_1", "format": "ldp_vp", "path": "$[0]"},
+            {"id": "descriptor_2", "format": "jwt_vp_json", "path": "$[0]"}
+        ]
+    }
+
+    try:
+        ps.verify(invalid_submission, ["vp_token_1", "vp_token_2"], "verifier_id", "verifier_nonce")
+        assert False, "Verification should have failed."
+    except SubmissionValidationError as e:
+        assert "more than one descriptor for the token at position 0" in str(e)
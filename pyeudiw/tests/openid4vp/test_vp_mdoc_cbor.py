@@ -1,10 +1,14 @@
 from ssl import DER_cert_to_PEM_cert
 from pyeudiw.trust.dynamic import CombinedTrustEvaluator
 from pymdoccbor.mdoc.issuer import MdocCborIssuer
+from pymdoccbor.mdoc.verifier import MdocCbor
 from pyeudiw.storage.db_engine import DBEngine
 from requests import Response
 from unittest.mock import patch
 from pyeudiw.openid4vp.vp_mdoc_cbor import VpMDocCbor
+from pyeudiw.status_list.builder import StatusListBuilder
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptojwt.jwk.ec import ECKey
 from pyeudiw.tests.settings import (
     CONFIG,
     BASE_URL,
@@ -58,10 +62,29 @@ trust_ev = CombinedTrustEvaluator.from_config(
     default_client_id="default-client-id",
 )
 
+PKEY = {
+    'KTY': 'EC2',
+    'CURVE': 'P_256',
+    'ALG': 'ES256',
+    'D': b"<\xe5\xbc;\x08\xadF\x1d\xc5\x0czR'T&\xbb\x91\xac\x84\xdc\x9ce\xbf\x0b,\x00\xcb\xdd\xbf\xec\xa2\xa5",
+    'KID': b"demo-kid"
+}
+
 resp = Response()
 resp.status_code = 200
 resp.headers.update({"Content-Type": "application/statuslist+cwt"})
-resp._content = b"d2845820a2012610781a6170706c69636174696f6e2f7374617475736c6973742b637774a1044231325850a502782168747470733a2f2f6578616d706c652e636f6d2f7374617475736c697374732f31061a648c5bea041a8898dfea19fffe19a8c019fffda2646269747301636c73744a78dadbb918000217015d584027d5535dfe0a33291cc9bfb41053ad2493c49d1ee4635e12548a79bac92916845fee76799c42762f928441c5c344e3612381e0cf88f2f160b3e1f97728ec8403"
+# the status list token is signed by the credential issuer
+status_list_builder = StatusListBuilder(16)
+status_list_builder.set(0)
+resp._content = status_list_builder.to_cwt(
+    ECKey(
+        priv_key=ec.derive_private_key(
+            int.from_bytes(PKEY["D"], "big"), ec.SECP256R1()
+        )
+    ).serialize(private=True),
+    "https://example.com/statuslists/1",
+    ttl=43200,
+)
 
 mock_staus_list_endpoint = patch(
     "pyeudiw.status_list.helper.http_get_sync",
@@ -71,14 +94,6 @@ mock_staus_list_endpoint = patch(
 )
 
 def issue_mdoc_cbor(status_list: bool = False, idx: int = 1):
-    PKEY = {
-        'KTY': 'EC2',
-        'CURVE': 'P_256',
-        'ALG': 'ES256',
-        'D': b"<\xe5\xbc;\x08\xadF\x1d\xc5\x0czR'T&\xbb\x91\xac\x84\xdc\x9ce\xbf\x0b,\x00\xcb\xdd\xbf\xec\xa2\xa5",
-        'KID': b"demo-kid"
-    }
-
     PID_DATA = {
         "eu.europa.ec.eudiw.pid.1": {
             "family_name": "Raffaello",
@@ -160,6 +175,27 @@ def test_handler_correct_validation():
         "1234567890"
     )
 
+def test_handler_correct_verification():
+    ps = VpMDocCbor(
+        trust_evaluator=trust_ev, 
+    )
+
+    vp_token = issue_mdoc_cbor()
+
+    with patch.object(
+        MdocCbor, "verify", autospec=True, side_effect=MdocCbor.verify
+    ) as verify:
+        credential = ps.verify(
+            vp_token, 
+            "https://example.com/", 
+            "1234567890"
+        )
+
+    # the signatures are verified once for the validation and the claims extraction
+    assert verify.call_count == 1
+    assert credential.claims == ps.parse(vp_token)
+    assert credential.issuer
+
 def test_handler_correct_validation_with_status_list():
     ps = VpMDocCbor(
         trust_evaluator=trust_ev, 
@@ -275,6 +275,27 @@ class TestOpenID4VPBackend:
     def test_backend_init(self):
         assert self.backend.name == "name"
 
+    def test_request_object_signer_uses_signature_keys(self):
+        signing_kids = [key.kid for key in self.backend.request_object_signer.keys]
+
+        assert signing_kids == [
+            key["kid"] for key in CONFIG["metadata_jwks"] if key.get("use") != "enc"
+        ]
+
+        config = copy.deepcopy(CONFIG)
+        # a key without its private part cannot sign
+        config["metadata_jwks"].append(
+            {**JWK(key=CONFIG["metadata_jwks"][0]).public_key, "kid": "public-only"}
+        )
+        backend = OpenID4VPBackend(
+            Mock(side_effect=_mock_auth_callback_function),
+            INTERNAL_ATTRIBUTES,
+            config,
+            BASE_URL,
+            "name"
+        )
+        assert [key.kid for key in backend.request_object_signer.keys] == signing_kids
+
     # TODO: Move to trust evaluation handlers tests
     def test_entity_configuration(self, context):
         context.qs_params = {}
@@ -0,0 +1,76 @@
+import json
+import sys
+
+import pytest
+
+from pyeudiw.jwt.utils import base64_urlencode
+from pyeudiw.sd_jwt.common import SDObj
+from pyeudiw.sd_jwt.issuer import SDJWTIssuer
+from pyeudiw.sd_jwt.sd_jwt import (
+    SUPPORTED_SD_ALG_FN,
+    SdJwt,
+    _extract_claims_from_payload,
+)
+from pyeudiw.tests.settings import DEFAULT_X509_LEAF_JWK
+
+sd_alg = SUPPORTED_SD_ALG_FN["sha-256"]
+
+
+def _disclosure(*content) -> tuple[str, str]:
+    disclosure = base64_urlencode(json.dumps(["salt", *content]).encode())
+    return disclosure, sd_alg(disclosure)
+
+
+def test_nested_disclosures_are_unpacked():
+    claims = {
+        "iss": "https://issuer.example.com",
+        SDObj("given_name"): "Mario",
+        "diplomas": [
+            SDObj({SDObj("title"): "MSc", "year": 2020}),
+            {SDObj("title"): "PhD", "year": 2024},
+        ],
+    }
+    issuer = SDJWTIssuer(claims, DEFAULT_X509_LEAF_JWK, add_decoy_claims=True)
+
+    disclosed = SdJwt(issuer.sd_jwt_issuance).get_disclosed_claims()
+
+    assert list(disclosed) == ["iss", "diplomas", "given_name"]
+    assert disclosed["given_name"] == "Mario"
+    assert disclosed["diplomas"] == [
+        {"year": 2020, "title": "MSc"},
+        {"year": 2024, "title": "PhD"},
+    ]
+
+
+def test_deep_claims_are_unpacked_without_recursion():
+    depth = sys.getrecursionlimit() * 2
+    value, digest = _disclosure("leaf", 1)
+    claims = {"_sd": [digest]}
+    for _ in range(depth):
+        claims = {"nested": [claims]}
+
+    unpacked = _extract_claims_from_payload(claims, [value], sd_alg)
+
+    for _ in range(depth):
+        unpacked = unpacked["nested"][0]
+    assert unpacked == {"leaf": 1}
+
+
+def test_duplicate_digests_are_rejected():
+    value, digest = _disclosure("name", "Mario")
+    item, item_digest = _disclosure("Rome")
+
+    with pytest.raises(ValueError, match="duplicate hash"):
+        _extract_claims_from_payload({"_sd": [digest, digest]}, [value], sd_alg)
+    with pytest.raises(ValueError, match="duplicate hash"):
+        _extract_claims_from_payload(
+            {"_sd": [digest], "nested": {"_sd": [digest]}}, [value], sd_alg
+        )
+    with pytest.raises(ValueError, match="duplicate hash"):
+        _extract_claims_from_payload(
+            {"places": [{"...": item_digest}, {"...": item_digest}]}, [item], sd_alg
+        )
+    with pytest.raises(ValueError, match="duplicate key"):
+        _extract_claims_from_payload({"name": "Luigi", "_sd": [digest]}, [value], sd_alg)
+    with pytest.raises(ValueError, match="duplicate disclosure"):
+        _extract_claims_from_payload({"_sd": [digest]}, [value, value], sd_alg)
@@ -0,0 +1,110 @@
+import importlib.util
+import random
+import zlib
+
+import pytest
+
+from pyeudiw.status_list import unpack_statuses
+from pyeudiw.status_list.builder import STATUS_LIST_BLOCK_SIZE, StatusListBuilder
+from pyeudiw.status_list.exceptions import PositionOutOfRangeError
+from pyeudiw.status_list.helper import StatusListTokenHelper
+from pyeudiw.tests.settings import DEFAULT_X509_LEAF_JWK
+
+URI = "https://example.com/statuslists/1"
+
+# the bulk lookups require the status_list extra
+requires_numpy = pytest.mark.skipif(
+    importlib.util.find_spec("numpy") is None,
+    reason="numpy is not installed",
+)
+
+
+def _random_builder(size: int, bits: int) -> StatusListBuilder:
+    rnd = random.Random(bits)
+    builder = StatusListBuilder(size, bits)
+    for position in rnd.sample(range(size), size // 10):
+        builder.set(position, rnd.randrange(1, 2**bits))
+    return builder
+
+
+@requires_numpy
+@pytest.mark.parametrize("bits", [1, 2, 4, 8])
+def test_bulk_lookup_matches_single_lookups(bits):
+    size = 1000
+    builder = _random_builder(size, bits)
+    helper = StatusListTokenHelper.from_token(builder.to_jwt(DEFAULT_X509_LEAF_JWK, URI))
+
+    expected = [helper.get_status(i) for i in range(size)]
+    assert expected == [builder.get(i) for i in range(size)]
+    assert helper.get_statuses().tolist()[:size] == expected
+
+    positions = [999, 0, 17, 17, 512]
+    assert helper.get_statuses(positions).tolist() == [expected[i] for i in positions]
+
+
+@requires_numpy
+def test_bulk_lookup_out_of_range():
+    status_list = bytes([0b10111001])
+
+    assert unpack_statuses(status_list, 2, [3]).tolist() == [2]
+    with pytest.raises(PositionOutOfRangeError):
+        unpack_statuses(status_list, 2, [0, 4])
+    with pytest.raises(PositionOutOfRangeError):
+        unpack_statuses(status_list, 2, [-1])
+    with pytest.raises(ValueError):
+        unpack_statuses(status_list, 3)
+
+
+def test_builder_set_and_clear():
+    builder = StatusListBuilder(16, 2)
+
+    builder.set(5, 3)
+    builder.set(6)
+    assert [builder.get(i) for i in (4, 5, 6, 7)] == [0, 3, 1, 0]
+
+    builder.clear(5)
+    assert builder.get(5) == 0
+    assert builder.get(6) == 1
+
+    with pytest.raises(ValueError):
+        builder.set(0, 4)
+    with pytest.raises(PositionOutOfRangeError):
+        builder.set(16, 1)
+    with pytest.raises(PositionOutOfRangeError):
+        builder.get(-1)
+    with pytest.raises(ValueError):
+        StatusListBuilder(16, 3)
+
+
+def test_builder_compresses_incrementally():
+    builder = _random_builder(4 * STATUS_LIST_BLOCK_SIZE * 8 + 3, 1)
+
+    assert zlib.decompress(builder.compress()) == builder.to_bytes()
+
+    builder.set(STATUS_LIST_BLOCK_SIZE * 8 + 1)
+    builder.clear(builder.size - 1)
+    assert builder._dirty_blocks == {1, 4}
+    assert zlib.decompress(builder.compress()) == builder.to_bytes()
+    assert not builder._dirty_blocks
+
+
+@pytest.mark.parametrize("bits", [1, 8])
+def test_builder_tokens_round_trip(bits):
+    builder = _random_builder(2048, bits)
+    builder.aggregation_uri = "https://example.com/statuslists"
+
+    jwt = StatusListTokenHelper.from_token(
+        builder.to_jwt(DEFAULT_X509_LEAF_JWK, URI, iss="https://example.com", ttl=600)
+    )
+    cwt = StatusListTokenHelper.from_token(
+        builder.to_cwt(DEFAULT_X509_LEAF_JWK, URI, ttl=600)
+    )
+
+    for helper in (jwt, cwt):
+        assert helper.sub == URI
+        assert helper.ttl == 600
+        assert helper.is_expired() is False
+        assert [helper.get_status(i) for i in range(2048)] == [
+            builder.get(i) for i in range(2048)
+        ]
+    assert jwt.iss == "https://example.com"
@@ -0,0 +1,126 @@
+import datetime
+import mmap
+import zlib
+from unittest.mock import patch
+
+import pytest
+from freezegun import freeze_time
+from requests import Response
+
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.jwt.utils import base64_urlencode
+from pyeudiw.status_list.exceptions import (
+    MissingStatusListUriError,
+    StatusListRetrievalError,
+)
+from pyeudiw.status_list.manager import StatusListManager
+from pyeudiw.tests.settings import DEFAULT_X509_LEAF_JWK
+from pyeudiw.tools.utils import iat_now
+
+URI = "https://example.com/statuslists/1"
+
+
+def _status_list_response(bitstring: bytes, ttl: int = 600, exp: int = None) -> Response:
+    token = JWSHelper(DEFAULT_X509_LEAF_JWK).sign(
+        plain_dict={
+            "exp": exp or iat_now() + 3600,
+            "iat": iat_now(),
+            "iss": "https://example.com",
+            "status_list": {
+                "bits": 1,
+                "lst": base64_urlencode(zlib.compress(bitstring)),
+            },
+            "sub": URI,
+            "ttl": ttl,
+        },
+        protected={"typ": "statuslist+jwt"},
+    )
+    resp = Response()
+    resp.status_code = 200
+    resp.headers.update({"Content-Type": "application/statuslist+jwt"})
+    resp._content = token.encode()
+    return resp
+
+
+def _at(ts: int) -> freeze_time:
+    return freeze_time(datetime.datetime.fromtimestamp(ts, datetime.timezone.utc))
+
+
+def test_status_list_is_fetched_once():
+    manager = StatusListManager()
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_status_list_response(b"\x01")],
+    ) as http_get:
+        assert manager.get_status(URI, 0) == 1
+        assert manager.get_status(URI, 1) == 0
+        assert manager.from_status({"status_list": {"idx": 0, "uri": URI}}).get_status(0) == 1
+
+    assert http_get.call_count == 1
+    assert manager.cache_info().misses == 1
+    assert manager.cache_info().hits == 2
+
+    with pytest.raises(MissingStatusListUriError):
+        manager.from_status({"status_list": {"idx": 0}})
+
+
+def test_status_list_is_refreshed_by_ttl():
+    manager = StatusListManager(refresh_lead_time=60)
+    now = iat_now()
+
+    with _at(now), patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_status_list_response(b"\x00", ttl=600)],
+    ):
+        assert manager.get_status(URI, 0) == 0
+
+    # the current list is served while the new one is fetched in background
+    with _at(now + 550), patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_status_list_response(b"\x01", ttl=600)],
+    ) as http_get:
+        assert manager.get_status(URI, 0) == 0
+        manager.wait_refresh()
+        assert manager.get_status(URI, 0) == 1
+
+    assert http_get.call_count == 1
+    assert manager.cache_info().refreshes == 1
+
+    # once the ttl elapsed, the list is not served anymore
+    with _at(now + 550 + 600), patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        side_effect=ConnectionError("unreachable"),
+    ):
+        with pytest.raises(StatusListRetrievalError):
+            manager.get_status(URI, 0)
+
+
+def test_status_list_expires_with_the_token():
+    manager = StatusListManager()
+    now = iat_now()
+
+    with _at(now), patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_status_list_response(b"\x00", ttl=3600, exp=now + 100)],
+    ) as http_get:
+        manager.get_status(URI, 0)
+        with _at(now + 100):
+            manager.get_status(URI, 0)
+
+    assert http_get.call_count == 2
+
+
+def test_large_status_list_is_memory_mapped():
+    manager = StatusListManager(mmap_threshold=1024)
+    bitstring = bytes(4096) + b"\x80"
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_status_list_response(bitstring)],
+    ):
+        status_list = manager.get(URI)
+
+    assert isinstance(status_list.status_list, mmap.mmap)
+    assert manager.get_status(URI, 4096 * 8 + 7) == 1
+    assert manager.get_status(URI, 4096 * 8 + 6) == 0
@@ -0,0 +1,150 @@
+from unittest.mock import patch
+
+import pytest
+from requests import Response
+
+from pyeudiw.status_list.builder import StatusListBuilder
+from pyeudiw.status_list.exceptions import StatusListVerificationError
+from pyeudiw.status_list.helper import StatusListTokenHelper
+from pyeudiw.status_list.manager import StatusListManager
+from pyeudiw.status_list.verifier import StatusListTokenVerifier
+from pyeudiw.tests.settings import DEFAULT_X509_LEAF_JWK
+from pyeudiw.tests.trust.mock_trust_handler import MockTrustHandler, mock_jwk_private
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+
+ISSUER = "https://issuer.example.com"
+URI = "https://issuer.example.com/statuslists/1"
+
+
+def _verifier() -> StatusListTokenVerifier:
+    return StatusListTokenVerifier(
+        CombinedTrustEvaluator([MockTrustHandler()], _db_engine(), mode="cache_first")
+    )
+
+
+def _builder() -> StatusListBuilder:
+    builder = StatusListBuilder(16)
+    builder.set(0)
+    return builder
+
+
+def _response(token: str | bytes) -> Response:
+    resp = Response()
+    resp.status_code = 200
+    resp._content = token if isinstance(token, bytes) else token.encode()
+    return resp
+
+
+def test_status_list_tokens_are_verified():
+    verifier = _verifier()
+    builder = _builder()
+
+    verifier.verify(
+        StatusListTokenHelper.from_token(
+            builder.to_jwt(mock_jwk_private, URI, iss=ISSUER)
+        )
+    )
+    # the cwt has no issuer claim, the issuer of the credential is used
+    verifier.verify(
+        StatusListTokenHelper.from_token(builder.to_cwt(mock_jwk_private, URI)),
+        ISSUER,
+    )
+
+    with pytest.raises(StatusListVerificationError):
+        verifier.verify(
+            StatusListTokenHelper.from_token(
+                builder.to_jwt(DEFAULT_X509_LEAF_JWK, URI, iss=ISSUER)
+            )
+        )
+    with pytest.raises(StatusListVerificationError):
+        verifier.verify(
+            StatusListTokenHelper.from_token(
+                builder.to_cwt(DEFAULT_X509_LEAF_JWK, URI)
+            ),
+            ISSUER,
+        )
+    with pytest.raises(StatusListVerificationError):
+        verifier.verify(
+            StatusListTokenHelper.from_token(builder.to_cwt(mock_jwk_private, URI))
+        )
+
+
+def test_status_list_token_is_verified_once():
+    manager = StatusListManager()
+    verifier = _verifier()
+    token = _builder().to_jwt(mock_jwk_private, URI, iss=ISSUER)
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync", return_value=[_response(token)]
+    ), patch.object(verifier, "verify", wraps=verifier.verify) as verify:
+        for _ in range(3):
+            assert manager.get_status(URI, 0, verifier, ISSUER) == 1
+            assert manager.get_status(URI, 1, verifier, ISSUER) == 0
+
+    assert verify.call_count == 1
+    assert manager.cache_info().verifications == 1
+
+
+def test_invalid_status_list_token_is_rejected_once():
+    manager = StatusListManager()
+    verifier = _verifier()
+    token = _builder().to_jwt(DEFAULT_X509_LEAF_JWK, URI, iss=ISSUER)
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync", return_value=[_response(token)]
+    ), patch.object(verifier, "verify", wraps=verifier.verify) as verify:
+        for _ in range(3):
+            with pytest.raises(StatusListVerificationError):
+                manager.get_status(URI, 0, verifier, ISSUER)
+
+    assert verify.call_count == 1
+
+
+def test_refreshed_status_list_token_is_verified_before_use():
+    manager = StatusListManager()
+    verifier = _verifier()
+    builder = _builder()
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_response(builder.to_jwt(mock_jwk_private, URI, iss=ISSUER))],
+    ):
+        assert manager.get_status(URI, 0, verifier, ISSUER) == 1
+
+    builder.clear(0)
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_response(builder.to_jwt(DEFAULT_X509_LEAF_JWK, URI, iss=ISSUER))],
+    ):
+        with pytest.raises(StatusListVerificationError):
+            manager.refresh(URI)
+
+    # the token with an invalid signature did not replace the valid one
+    assert manager.get_status(URI, 0, verifier, ISSUER) == 1
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync",
+        return_value=[_response(builder.to_jwt(mock_jwk_private, URI, iss=ISSUER))],
+    ):
+        manager.refresh(URI)
+
+    assert manager.get_status(URI, 0, verifier, ISSUER) == 0
+    assert manager.cache_info().verifications == 3
+
+
+def test_status_list_token_of_another_uri_is_rejected():
+    manager = StatusListManager()
+    verifier = _verifier()
+    # validly signed by the issuer, but for another status list
+    token = _builder().to_jwt(
+        mock_jwk_private, "https://issuer.example.com/statuslists/2", iss=ISSUER
+    )
+
+    with patch(
+        "pyeudiw.status_list.helper.http_get_sync", return_value=[_response(token)]
+    ):
+        with pytest.raises(StatusListVerificationError, match="does not match"):
+            manager.get_status(URI, 0, verifier, ISSUER)
+
+    assert manager.cache_info().currsize == 0
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from pyeudiw.storage.base_storage import BaseStorage
+from pyeudiw.storage.db_engine import DBEngine
+from pyeudiw.storage.exceptions import EntryNotFound, StorageWriteError
+
+
+class FakeReplica(BaseStorage):
+    def __init__(self, delay: float = 0, fail: bool = False, document: dict | None = None):
+        self.delay = delay
+        self.fail = fail
+        self.document = document
+        self.finalized = threading.Event()
+        self.reads = 0
+
+    def set_finalized(self, document_id: str):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("replica down")
+        self.finalized.set()
+
+    def get_trust_source(self, entity_id: str):
+        self.reads += 1
+        time.sleep(self.delay)
+        if self.document is None:
+            raise EntryNotFound(entity_id)
+        return self.document
+
+
+def _engine(replicas: list[FakeReplica], **replication) -> DBEngine:
+    engine = DBEngine({"replication": replication})
+    engine.storages = [(f"replica-{i}", r) for i, r in enumerate(replicas)]
+    return engine
+
+
+def test_invalid_quorum():
+    with pytest.raises(ValueError):
+        DBEngine({"replication": {"write_quorum": "some"}})
+
+
+def test_quorum_any_does_not_wait_slow_replica():
+    slow = FakeReplica(delay=0.5)
+    engine = _engine([FakeReplica(), slow], write_quorum="any")
+
+    start = time.monotonic()
+    assert engine.set_finalized("doc") == 1
+    assert time.monotonic() - start < 0.4
+
+    # the slow replica completes in background
+    assert slow.finalized.wait(2)
+
+
+def test_quorum_majority():
+    engine = _engine(
+        [FakeReplica(), FakeReplica(fail=True), FakeReplica(delay=0.05)],
+        write_quorum="majority",
+    )
+    assert engine.set_finalized("doc") == 2
+
+
+def test_quorum_all_fails_on_failing_replica():
+    engine = _engine([FakeReplica(), FakeReplica(fail=True)], write_quorum="all")
+    with pytest.raises(StorageWriteError):
+        engine.set_finalized("doc")
+
+
+def test_quorum_write_timeout():
+    engine = _engine(
+        [FakeReplica(delay=0.5), FakeReplica(delay=0.5)],
+        write_quorum="any",
+        write_timeout=0.1,
+    )
+    start = time.monotonic()
+    with pytest.raises(StorageWriteError):
+        engine.set_finalized("doc")
+    assert time.monotonic() - start < 0.4
+
+
+def test_hedged_read_uses_fastest_replica():
+    slow = FakeReplica(delay=0.5, document={"entity_id": "slow"})
+    fast = FakeReplica(document={"entity_id": "fast"})
+    engine = _engine([slow, fast], read_hedge_delay=0.05)
+
+    start = time.monotonic()
+    assert engine.get_trust_source("id") == {"entity_id": "fast"}
+    assert time.monotonic() - start < 0.4
+
+
+def test_hedged_read_does_not_hedge_fast_replica():
+    first = FakeReplica(document={"entity_id": "first"})
+    second = FakeReplica(document={"entity_id": "second"})
+    engine = _engine([first, second], read_hedge_delay=0.2)
+
+    assert engine.get_trust_source("id") == {"entity_id": "first"}
+    assert second.reads == 0
+
+
+def test_hedged_read_falls_back_when_not_found():
+    engine = _engine(
+        [FakeReplica(), FakeReplica(document={"entity_id": "second"})],
+        read_hedge_delay=0.2,
+    )
+    assert engine.get_trust_source("id") == {"entity_id": "second"}
+
+    engine = _engine([FakeReplica(), FakeReplica()], read_hedge_delay=0.2)
+    with pytest.raises(EntryNotFound):
+        engine.get_trust_source("id")
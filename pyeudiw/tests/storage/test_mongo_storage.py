@@ -117,6 +117,67 @@ class TestMongoStorage:
         assert document["request_object"] == request_object
         assert document["internal_response"] == {"response": "test"}
 
+    def test_session_indexes(self):
+        self.storage._connect()
+        indexes = [
+            tuple(k for k, _ in index["key"])
+            for index in self.storage.sessions.index_information().values()
+        ]
+
+        assert ("state", "session_id") in indexes
+        assert ("nonce", "state") in indexes
+        assert ("document_id",) in indexes
+
+    def test_session_updates_round_trips(self):
+        state = str(uuid.uuid4())
+        nonce = str(uuid.uuid4())
+
+        document_id = self.storage.init_session(
+            str(uuid.uuid4()), session_id=str(uuid.uuid4()), state=state, remote_flow_typ=""
+        )
+
+        round_trips = self.storage.round_trips
+        self.storage.update_request_object(document_id, {"nonce": nonce, "state": state})
+        self.storage.update_response_object(nonce, state, {"response": "test"})
+        self.storage.set_finalized(document_id)
+
+        # a single find_one_and_update for each update, no connection probes
+        assert self.storage.round_trips - round_trips == 3
+        assert self.storage.is_connected
+
+        document = self.storage.get_by_id(document_id)
+        assert document["finalized"] is True
+        assert document["internal_response"] == {"response": "test"}
+
+    def test_update_unexistent_document(self):
+        with pytest.raises(ValueError):
+            self.storage.update_request_object(
+                str(uuid.uuid4()), {"nonce": "nonce", "state": "state"}
+            )
+        with pytest.raises(ValueError):
+            self.storage.set_finalized(str(uuid.uuid4()))
+        with pytest.raises(ValueError):
+            self.storage.update_response_object(
+                str(uuid.uuid4()), str(uuid.uuid4()), {"response": "test"}
+            )
+
+    def test_lock(self):
+        name = str(uuid.uuid4())
+
+        assert self.storage.acquire_lock(name, "worker-1", 10)
+        assert not self.storage.acquire_lock(name, "worker-2", 10)
+
+        # only the owner releases the lock
+        self.storage.release_lock(name, "worker-2")
+        assert not self.storage.acquire_lock(name, "worker-2", 10)
+        self.storage.release_lock(name, "worker-1")
+        assert self.storage.acquire_lock(name, "worker-2", 10)
+
+        # an expired lock is acquired by others
+        expired = str(uuid.uuid4())
+        assert self.storage.acquire_lock(expired, "worker-1", 0)
+        assert self.storage.acquire_lock(expired, "worker-2", 10)
+
     #  def test_retention_ttl(self):
     #  """
     #  MongoDB does not garantee that the document will be deleted at the exact time
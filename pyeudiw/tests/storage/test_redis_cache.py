@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+
+from pyeudiw.storage.base_cache import RetrieveStatus
+from pyeudiw.storage.redis_cache import RedisCache
+
+
+class TestRedisCache:
+    @pytest.fixture(autouse=True)
+    def create_storage_instance(self):
+        self.cache = RedisCache({"db_name": "eudiw"}, "memory://test-redis-cache", {})
+
+    def test_try_retrieve(self):
+        object_name = str(uuid.uuid4())
+        data = str(uuid.uuid4())
+
+        obj, status = self.cache.try_retrieve(object_name, lambda: data)
+
+        assert status == RetrieveStatus.ADDED
+        assert obj["object_name"] == object_name
+        assert obj["data"] == data
+        assert obj["creation_date"]
+
+        cache_object, status = self.cache.try_retrieve(object_name, lambda: "other")
+
+        assert status == RetrieveStatus.RETRIEVED
+        assert obj == cache_object
+
+    def test_overwrite(self):
+        object_name = str(uuid.uuid4())
+        data = str(uuid.uuid4())
+
+        obj, _ = self.cache.try_retrieve(object_name, lambda: data)
+
+        data_updated = str(uuid.uuid4())
+
+        updated_obj = self.cache.overwrite(object_name, lambda: data_updated)
+
+        assert obj["data"] != updated_obj["data"]
+
+        cache_object, _ = self.cache.try_retrieve(object_name, lambda: "other")
+
+        assert cache_object["data"] == updated_obj["data"]
+        assert cache_object["creation_date"] == updated_obj["creation_date"]
+
+    def test_set(self):
+        object_name = str(uuid.uuid4())
+        self.cache.set({"object_name": object_name, "data": "data", "creation_date": "now"})
+
+        cache_object, status = self.cache.try_retrieve(object_name, lambda: "other")
+
+        assert status == RetrieveStatus.RETRIEVED
+        assert cache_object["data"] == "data"
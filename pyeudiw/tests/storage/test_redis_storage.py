@@ -0,0 +1,315 @@
+import datetime
+import uuid
+
+import freezegun
+import pytest
+
+from pyeudiw.storage.base_storage import TrustType
+from pyeudiw.storage.db_engine import DBEngine
+from pyeudiw.storage.redis_storage import RedisStorage
+
+storage_conf = {
+    "db_name": "test-eudiw",
+    "db_sessions_collection": "sessions",
+    "db_trust_attestations_collection": "trust_attestations",
+    "db_trust_anchors_collection": "trust_anchors",
+    "db_trust_sources_collection": "trust_source",
+}
+
+
+class TestRedisStorage:
+    @pytest.fixture(autouse=True)
+    def create_storage_instance(self):
+        self.storage = RedisStorage(storage_conf, "memory://test-redis-storage", {})
+
+    def _init_session(self) -> tuple[str, str, str]:
+        state = str(uuid.uuid4())
+        session_id = str(uuid.uuid4())
+        document_id = self.storage.init_session(
+            str(uuid.uuid4()), session_id=session_id, state=state, remote_flow_typ=""
+        )
+        return document_id, state, session_id
+
+    def test_redis_connection(self):
+        assert not self.storage.is_connected
+        self.storage._connect()
+        assert self.storage.is_connected
+
+    def test_entity_initialization(self):
+        document_id, state, session_id = self._init_session()
+
+        assert document_id
+
+        self.storage.add_dpop_proof_and_attestation(
+            document_id, dpop_proof={"dpop": "test"}, attestation={"attestation": "test"}
+        )
+
+        document = self.storage.get_by_id(document_id)
+
+        assert document["dpop_proof"] == {"dpop": "test"}
+        assert document["attestation"] == {"attestation": "test"}
+        assert document["finalized"] is False
+        assert isinstance(document["creation_date"], datetime.datetime)
+
+        assert self.storage.get_by_state(state)["document_id"] == document_id
+        assert self.storage.get_by_session_id(session_id)["document_id"] == document_id
+        assert self.storage.get_by_state_and_session_id(state, session_id)
+        assert self.storage.exists_by_state_and_session_id(state, session_id)
+        assert not self.storage.exists_by_state_and_session_id(state, "other")
+
+    def test_update_response_object(self):
+        document_id, old_state, _ = self._init_session()
+
+        nonce = str(uuid.uuid4())
+        state = str(uuid.uuid4())
+
+        request_object = {"nonce": nonce, "state": state}
+        self.storage.update_request_object(document_id, request_object)
+        assert self.storage.update_response_object(nonce, state, {"response": "test"})
+
+        document = self.storage.get_by_id(document_id)
+
+        assert document["state"] == state
+        assert document["nonce"] == nonce
+        assert document["request_object"] == request_object
+        assert document["internal_response"] == {"response": "test"}
+
+        assert self.storage.get_by_nonce_state(nonce, state)["document_id"] == document_id
+        assert self.storage.get_by_nonce_state(nonce, None)["document_id"] == document_id
+        with pytest.raises(ValueError):
+            self.storage.get_by_nonce_state(nonce, old_state)
+        with pytest.raises(ValueError):
+            self.storage.get_by_state(old_state)
+
+    def test_update_request_object_replaces_the_nonce(self):
+        document_id, state, _ = self._init_session()
+
+        self.storage.update_request_object(document_id, {"nonce": "n1", "state": state})
+        self.storage.update_request_object(document_id, {"nonce": "n2", "state": state})
+
+        assert self.storage.get_by_nonce_state("n2", state)["document_id"] == document_id
+        with pytest.raises(ValueError):
+            self.storage.get_by_nonce_state("n1", None)
+        assert not self.storage.client.exists(self.storage._index_key("nonce", "n1"))
+
+    def test_expired_session_is_not_recreated(self):
+        storage = RedisStorage(
+            {**storage_conf, "data_ttl": 5}, "memory://test-redis-storage", {}
+        )
+
+        with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+            document_id = storage.init_session(
+                str(uuid.uuid4()), session_id="sid", state="state", remote_flow_typ=""
+            )
+            storage.add_dpop_proof_and_attestation(document_id, {}, {})
+            key = storage._session_key(document_id)
+            assert 0 < storage.client.ttl(key) <= 5
+
+            frozen.tick(6)
+            with pytest.raises(ValueError):
+                storage.add_dpop_proof_and_attestation(document_id, {}, {})
+            with pytest.raises(ValueError):
+                storage.set_finalized(document_id)
+            assert not storage.client.exists(key)
+
+    def test_missing_document(self):
+        with pytest.raises(ValueError):
+            self.storage.get_by_id(str(uuid.uuid4()))
+        with pytest.raises(ValueError):
+            self.storage.update_request_object(
+                str(uuid.uuid4()), {"nonce": "n", "state": "s"}
+            )
+        with pytest.raises(ValueError):
+            self.storage.set_finalized(str(uuid.uuid4()))
+
+    def test_set_finalized_keeps_first_finalization(self):
+        document_id, state, _ = self._init_session()
+
+        with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+            document = self.storage.set_finalized(document_id)
+            assert document["finalized"] is True
+            assert self.storage.get_by_state(state)["finalized"] is True
+
+            # as in MongoStorage, finalizing again is not an error
+            frozen.tick(10)
+            assert self.storage.set_finalized(document_id)["finalized_at"] == (
+                document["finalized_at"]
+            )
+
+    def test_retention_ttl(self):
+        storage = RedisStorage(
+            {**storage_conf, "data_ttl": 5}, "memory://test-redis-storage", {}
+        )
+        assert storage.has_session_retention_ttl()
+
+        with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+            state = str(uuid.uuid4())
+            document_id = storage.init_session(
+                str(uuid.uuid4()), session_id="sid", state=state, remote_flow_typ=""
+            )
+            assert storage.get_by_id(document_id)
+
+            frozen.tick(6)
+            with pytest.raises(ValueError):
+                storage.get_by_id(document_id)
+            with pytest.raises(ValueError):
+                storage.get_by_state(state)
+
+    def test_trust_attestation(self):
+        entity_id = str(uuid.uuid4())
+        exp = datetime.datetime(2030, 1, 1)
+
+        self.storage.add_trust_attestation(
+            entity_id, ["chain"], exp, TrustType.FEDERATION, [{"kid": "k"}]
+        )
+        assert self.storage.has_trust_attestation(entity_id)
+
+        attestation = self.storage.get_trust_attestation(entity_id)
+        assert attestation["federation"] == {
+            "chain": ["chain"],
+            "exp": exp,
+            "jwks": [{"kid": "k"}],
+        }
+
+        self.storage.update_trust_attestation(
+            entity_id, ["x5c"], exp, TrustType.X509, [{"kid": "k"}]
+        )
+        self.storage.add_trust_attestation_metadata(entity_id, "openid_relying_party", {"a": 1})
+        attestation = self.storage.get_trust_attestation(entity_id)
+        assert attestation["x509"]["x5c"] == ["x5c"]
+        assert attestation["federation"]["chain"] == ["chain"]
+        assert attestation["metadata"] == {"openid_relying_party": {"a": 1}}
+
+    def test_trust_anchor_and_source(self):
+        entity_id = str(uuid.uuid4())
+        exp = datetime.datetime(2030, 1, 1)
+
+        self.storage.add_trust_anchor(entity_id, "ec", exp, TrustType.FEDERATION)
+        self.storage.update_trust_anchor(entity_id, "pem", exp, TrustType.X509)
+        anchor = self.storage.get_trust_anchor(entity_id)
+        assert anchor["federation"]["entity_configuration"] == "ec"
+        assert anchor["x509"]["pem"] == "pem"
+
+        self.storage.add_trust_source({"entity_id": entity_id, "policies": {}})
+        self.storage.add_trust_source({"entity_id": entity_id, "revoked": True})
+        assert self.storage.get_trust_source(entity_id) == {
+            "entity_id": entity_id,
+            "policies": {},
+            "revoked": True,
+        }
+        assert self.storage.get_trust_source("missing") is None
+
+    def test_lock(self):
+        name = str(uuid.uuid4())
+
+        with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+            assert self.storage.acquire_lock(name, "worker-1", 10)
+            assert not self.storage.acquire_lock(name, "worker-2", 10)
+
+            # only the owner releases the lock
+            self.storage.release_lock(name, "worker-2")
+            assert not self.storage.acquire_lock(name, "worker-2", 10)
+            self.storage.release_lock(name, "worker-1")
+            assert self.storage.acquire_lock(name, "worker-2", 10)
+
+            # an expired lock is acquired by others
+            frozen.tick(11)
+            assert self.storage.acquire_lock(name, "worker-1", 10)
+
+            # the previous owner of an expired lock does not release it
+            frozen.tick(11)
+            assert self.storage.acquire_lock(name, "worker-2", 10)
+            self.storage.release_lock(name, "worker-1")
+            assert not self.storage.acquire_lock(name, "worker-3", 10)
+
+    def test_federation_statement(self):
+        sub = f"https://{uuid.uuid4()}.example.org"
+
+        with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+            statement = {
+                "iss": "https://ta.example.org",
+                "sub": sub,
+                "exp": int(frozen().timestamp()) + 10,
+                "jwt": "a.b.c",
+            }
+            self.storage.add_federation_statement(statement)
+            assert self.storage.get_federation_statement(statement["iss"], sub) == statement
+            assert self.storage.get_federation_statement(sub, sub) is None
+
+            # the statement is replaced by the one with the same iss and sub
+            self.storage.add_federation_statement(dict(statement, jwt="d.e.f"))
+            assert self.storage.get_federation_statement(statement["iss"], sub)["jwt"] == "d.e.f"
+
+            frozen.tick(11)
+            assert self.storage.get_federation_statement(statement["iss"], sub) is None
+
+    def test_trust_chain(self):
+        sub = f"https://{uuid.uuid4()}.example.org"
+        ta = f"https://{uuid.uuid4()}.ta.example.org"
+        other_ta = f"https://{uuid.uuid4()}.ta.example.org"
+
+        with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+            trust_chain = {
+                "subject": sub,
+                "trust_anchor": ta,
+                "chain": ["a.b.c", "d.e.f"],
+                "metadata": {"openid_credential_verifier": {"client_id": sub}},
+                "exp": int(frozen().timestamp()) + 10,
+            }
+            self.storage.add_trust_chain(trust_chain)
+            self.storage.add_trust_chain(
+                dict(trust_chain, trust_anchor=other_ta, exp=trust_chain["exp"] + 10)
+            )
+
+            assert self.storage.get_trust_chain(sub, ta) == trust_chain
+            assert self.storage.get_trust_chain(ta, sub) is None
+            assert [
+                i["trust_anchor"] for i in self.storage.get_trust_chains_by_subject(sub)
+            ] == sorted([ta, other_ta])
+            assert self.storage.get_trust_chains_by_trust_anchor(ta) == [trust_chain]
+
+            frozen.tick(11)
+            assert self.storage.get_trust_chain(sub, ta) is None
+            assert self.storage.get_trust_chains_by_trust_anchor(ta) == []
+            assert [
+                i["trust_anchor"] for i in self.storage.get_trust_chains_by_subject(sub)
+            ] == [other_ta]
+
+
+def test_db_engine_with_redis_storage():
+    engine = DBEngine(
+        {
+            "redis": {
+                "cache": {
+                    "module": "pyeudiw.storage.redis_cache",
+                    "class": "RedisCache",
+                    "init_params": {
+                        "url": "memory://test-redis-engine",
+                        "conf": {"db_name": "eudiw"},
+                    },
+                },
+                "storage": {
+                    "module": "pyeudiw.storage.redis_storage",
+                    "class": "RedisStorage",
+                    "init_params": {
+                        "url": "memory://test-redis-engine",
+                        "conf": {**storage_conf, "data_ttl": 60},
+                    },
+                },
+            }
+        }
+    )
+
+    state = str(uuid.uuid4())
+    document_id = engine.init_session("session-id", state, "same_device")
+    document = engine.get_by_state(state)
+    assert document["document_id"] == document_id
+
+    engine.update_request_object(document_id, {"nonce": "nonce", "state": state})
+    engine.update_response_object("nonce", state, {"response": "test"})
+    engine.set_finalized(document_id)
+    engine.set_finalized(document_id)
+
+    document = engine.get_by_state_and_session_id(state, "session-id")
+    assert document["finalized"] is True
+    assert document["internal_response"] == {"response": "test"}
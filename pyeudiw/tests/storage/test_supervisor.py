@@ -0,0 +1,173 @@
+import time
+from unittest.mock import Mock, patch
+
+from pyeudiw.storage.base_storage import BaseStorage
+from pyeudiw.storage.db_engine import DBEngine
+from pyeudiw.storage.supervisor import ConnectionSupervisor
+from pyeudiw.tests.storage.test_redis_storage import storage_conf
+
+
+class FlakyStorage(BaseStorage):
+    def __init__(self):
+        self.available = True
+        self.probes = 0
+
+    @property
+    def is_connected(self) -> bool:
+        self.probes += 1
+        return self.available
+
+    def _connect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class EngineFactory:
+    def __init__(self, failures: int = 0):
+        self.calls = 0
+        self.failures = failures
+        self.storages: list[FlakyStorage] = []
+
+    def __call__(self) -> DBEngine:
+        self.calls += 1
+        # the first engine is always built, then the reconnections fail
+        if 1 < self.calls <= 1 + self.failures:
+            raise ConnectionError("storage down")
+        storage = FlakyStorage()
+        self.storages.append(storage)
+        engine = DBEngine({})
+        engine.storages = [("flaky", storage)]
+        return engine
+
+
+def test_engine_access_does_not_probe():
+    factory = EngineFactory()
+    supervisor = ConnectionSupervisor(factory, heartbeat_interval=60)
+
+    probes = factory.storages[0].probes
+    for _ in range(10):
+        assert supervisor.engine
+        assert supervisor.healthy
+
+    assert factory.storages[0].probes == probes
+
+
+def test_reconnect_with_backoff():
+    factory = EngineFactory(failures=4)
+    supervisor = ConnectionSupervisor(factory, heartbeat_interval=0.02, max_backoff=0.08)
+    first_engine = supervisor.engine
+    supervisor.start()
+
+    factory.storages[0].available = False
+    time.sleep(0.2)
+    assert not supervisor.healthy
+    assert supervisor.backends_health == {"flaky": False}
+    assert supervisor.reconnect_failures > 0
+
+    for _ in range(50):
+        if supervisor.healthy:
+            break
+        time.sleep(0.05)
+    supervisor.stop()
+
+    assert supervisor.healthy
+    assert supervisor.engine is not first_engine
+    metrics = supervisor.metrics
+    assert metrics["reconnects"] == 1
+    assert metrics["reconnect_failures"] == 4
+    assert metrics["last_reconnect"]
+
+
+def test_backoff_limits_reconnection_attempts():
+    factory = EngineFactory(failures=1000)
+    supervisor = ConnectionSupervisor(factory, heartbeat_interval=0.01, max_backoff=0.16)
+    factory.storages[0].available = False
+    supervisor.start()
+    time.sleep(0.5)
+    supervisor.stop()
+
+    # 0.01 + 0.02 + 0.04 + 0.08 + 0.16 + 0.16 ... instead of 50 attempts
+    assert factory.calls - 1 <= 8
+
+
+def test_replaced_engine_is_closed_once_drained():
+    factory = EngineFactory()
+    supervisor = ConnectionSupervisor(factory, heartbeat_interval=0.01)
+    first_engine = supervisor.engine
+    first_engine.close = Mock()
+
+    with supervisor.lease() as engine:
+        assert supervisor.reconnect()
+        supervisor.start()
+        time.sleep(0.1)
+        # the call in flight still runs on the previous engine
+        assert engine is first_engine
+        first_engine.close.assert_not_called()
+        assert supervisor.metrics["draining_engines"] == 1
+
+    # the engine is closed by the next heartbeat
+    time.sleep(0.1)
+    supervisor.stop()
+
+    first_engine.close.assert_called_once()
+    assert supervisor.metrics["draining_engines"] == 0
+
+
+def test_replaced_engine_is_closed_after_drain_timeout():
+    factory = EngineFactory()
+    supervisor = ConnectionSupervisor(factory, heartbeat_interval=0.01, drain_timeout=0.05)
+    first_engine = supervisor.engine
+    first_engine.close = Mock()
+
+    with supervisor.lease():
+        supervisor.reconnect()
+        supervisor.start()
+        time.sleep(0.2)
+        supervisor.stop()
+        # a call that never ends does not keep the engine open
+        first_engine.close.assert_called_once()
+
+
+def test_supervised_engine_follows_the_reconnections():
+    factory = EngineFactory()
+    supervisor = ConnectionSupervisor(factory, heartbeat_interval=60)
+    db_engine = supervisor.supervised_engine
+
+    assert db_engine.storages == [("flaky", factory.storages[0])]
+    supervisor.reconnect()
+    assert db_engine.storages == [("flaky", factory.storages[1])]
+
+    with patch.object(DBEngine, "get_trust_source", autospec=True) as get_trust_source:
+        db_engine.get_trust_source("https://issuer.example.org")
+    assert get_trust_source.call_args.args[0] is supervisor.engine
+
+
+def test_idle_redis_storage_is_healthy():
+    def engine_factory():
+        return DBEngine(
+            {
+                "redis": {
+                    "storage": {
+                        "module": "pyeudiw.storage.redis_storage",
+                        "class": "RedisStorage",
+                        "init_params": {
+                            "url": "memory://test-supervisor",
+                            "conf": storage_conf,
+                        },
+                    },
+                }
+            }
+        )
+
+    supervisor = ConnectionSupervisor(engine_factory, heartbeat_interval=0.02)
+    first_engine = supervisor.engine
+    supervisor.start()
+    # no traffic: the storage never connected by itself
+    time.sleep(0.2)
+    supervisor.stop()
+
+    assert supervisor.metrics["healthy"]
+    assert supervisor.metrics["reconnects"] == 0
+    assert supervisor.engine is first_engine
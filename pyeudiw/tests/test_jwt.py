@@ -1,8 +1,9 @@
 import pytest
+from cryptojwt.jwe.exception import DecryptionFailed
 from cryptojwt.jwk.ec import new_ec_key
 from cryptojwt.jwk.rsa import new_rsa_key
 
-from pyeudiw.jwt.jwe_helper import JWEHelper
+from pyeudiw.jwt.jwe_helper import JWEDecrypter, JWEHelper
 from pyeudiw.jwt.jws_helper import DEFAULT_ENC_ALG_MAP, DEFAULT_ENC_ENC_MAP, JWSHelper
 from pyeudiw.jwt.utils import decode_jwt_header, is_jwe_format
 
@@ -62,6 +63,53 @@ def test_jwe_helper_decrypt_fail(jwk, payload):
         helper.decrypt(jwe)
 
 
+def test_jwe_decrypter_selects_key_by_kid():
+    jwks = [new_ec_key("P-256", kid="ec"), new_rsa_key(kid="rsa")]
+    decrypter = JWEDecrypter([jwk.serialize(private=True) for jwk in jwks])
+
+    for jwk in jwks:
+        jwe = JWEHelper(jwk).encrypt({"kid": jwk.kid})
+        assert decrypter.decrypt(jwe) == {"kid": jwk.kid}
+
+    with pytest.raises(DecryptionFailed):
+        decrypter.decrypt(JWEHelper(new_ec_key("P-256", kid="unknown")).encrypt({}))
+
+
+def test_jwe_decrypter_without_kid():
+    jwks = [new_rsa_key(), new_ec_key("P-256")]
+    decrypter = JWEDecrypter([jwk.serialize(private=True) for jwk in jwks])
+
+    for jwk in jwks:
+        public = jwk.serialize(private=False)
+        public.pop("kid", None)
+        jwe = JWEHelper(public).encrypt({"key": "value"})
+        assert not decode_jwt_header(jwe).get("kid")
+        assert decrypter.decrypt(jwe) == {"key": "value"}
+
+    with pytest.raises(DecryptionFailed):
+        decrypter.decrypt(JWEHelper(new_ec_key("P-256")).encrypt({}))
+
+
+def test_jwe_decrypter_reloads_rotated_keys():
+    old, new = new_ec_key("P-256", kid="old"), new_ec_key("P-256", kid="new")
+    config = {"metadata_jwks": [old.serialize(private=True)]}
+    decrypter = JWEDecrypter(lambda: config["metadata_jwks"])
+
+    assert decrypter.decrypt(JWEHelper(old).encrypt({"n": 1})) == {"n": 1}
+    helper = decrypter._get_helper()
+    assert decrypter._get_helper() is helper
+
+    config["metadata_jwks"] = [new.serialize(private=True)]
+    assert decrypter.decrypt(JWEHelper(new).encrypt({"n": 2})) == {"n": 2}
+    with pytest.raises(DecryptionFailed):
+        decrypter.decrypt(JWEHelper(old).encrypt({"n": 1}))
+
+    # keys changed in place are loaded on reload
+    config["metadata_jwks"].append(old.serialize(private=True))
+    decrypter.reload()
+    assert decrypter.decrypt(JWEHelper(old).encrypt({"n": 1})) == {"n": 1}
+
+
 @pytest.mark.parametrize("jwk, payload", JWKs)
 def test_jws_helper_sign(jwk, payload):
     helper = JWSHelper(jwk)
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from freezegun import freeze_time
+
+from pyeudiw.tools.cache import BackgroundRefresher, LRUCache, ProcessWide
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize, info.maxsize) == (
+        3,
+        1,
+        1,
+        2,
+        2,
+    )
+    assert info.hit_rate == 0.75
+
+
+def test_entries_expire():
+    cache = LRUCache(2)
+    with freeze_time("2024-01-01 00:00:00") as frozen:
+        cache.put("a", 1, time.time() + 10)
+        cache.put("b", 2)
+
+        frozen.tick(10)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+
+def test_peek_is_not_counted():
+    cache = LRUCache(1)
+    cache.put("a", 1)
+
+    assert cache.peek("a") == 1
+    assert cache.peek("b") is None
+    assert cache.cache_info().hits == cache.cache_info().misses == 0
+
+    cache.record(hit=False)
+    assert cache.cache_info().misses == 1
+
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 0, 0, 1)
+
+
+def test_disabled_cache():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.cache_info().evictions == 0
+
+
+def test_one_refresh_at_a_time_for_each_key():
+    refresher = BackgroundRefresher("test-refresher")
+    release = threading.Event()
+    calls = []
+
+    def refresh(key):
+        calls.append(key)
+        release.wait(5)
+
+    assert refresher.submit("a", lambda: refresh("a"))
+    assert not refresher.submit("a", lambda: refresh("a"))
+    assert refresher.submit("b", lambda: refresh("b"))
+
+    release.set()
+    refresher.wait(5)
+    assert sorted(calls) == ["a", "b"]
+
+    # a failed refresh does not prevent the next ones
+    assert refresher.submit("a", lambda: 1 / 0)
+    refresher.wait(5)
+    assert refresher.submit("a", lambda: refresh("a"))
+    refresher.wait(5)
+    assert calls.count("a") == 2
+
+
+def test_process_wide_instance_is_created_once():
+    created = []
+    shared = ProcessWide(lambda: created.append(object()) or created[-1])
+
+    threads = [threading.Thread(target=shared.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert shared.get() is created[0]
@@ -0,0 +1,247 @@
+import threading
+import time
+
+import freezegun
+import pytest
+import requests
+
+from pyeudiw.federation.exceptions import HttpError
+from pyeudiw.tools.http_cache import HttpCache
+
+httpc_params = {
+    "connection": {"ssl": False},
+    "session": {"timeout": 1},
+}
+
+URL = "http://location.example"
+
+
+def _response(status_code: int = 200, content: bytes = b"ok", headers: dict = {}) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers.update(headers)
+    resp._content = content
+    return resp
+
+
+class FakeFetcher:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls: list[dict] = []
+
+    def __call__(self, url, httpc_params, headers, http_async):
+        self.calls.append(dict(headers))
+        resp = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+def test_fresh_response_is_cached():
+    fetcher = FakeFetcher(_response())
+    cache = HttpCache(fetcher=fetcher)
+
+    for _ in range(5):
+        assert cache.get(URL, httpc_params, cache_ttl=60).content == b"ok"
+
+    assert len(fetcher.calls) == 1
+    info = cache.cache_info()
+    assert info.hits == 4
+    assert info.misses == 1
+
+
+def test_max_age_shortens_cache_ttl():
+    fetcher = FakeFetcher(_response(headers={"Cache-Control": "max-age=10"}))
+    cache = HttpCache(fetcher=fetcher, stale_ttl=0)
+
+    with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+        cache.get(URL, httpc_params, cache_ttl=3600)
+        frozen.tick(5)
+        cache.get(URL, httpc_params, cache_ttl=3600)
+        assert len(fetcher.calls) == 1
+        frozen.tick(6)
+        cache.get(URL, httpc_params, cache_ttl=3600)
+        assert len(fetcher.calls) == 2
+
+
+def test_expires_header():
+    fetcher = FakeFetcher(
+        _response(headers={"Expires": "Mon, 01 Jan 2024 00:00:10 GMT"})
+    )
+    cache = HttpCache(fetcher=fetcher, stale_ttl=0)
+
+    with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+        cache.get(URL, httpc_params, cache_ttl=3600)
+        frozen.tick(9)
+        cache.get(URL, httpc_params, cache_ttl=3600)
+        assert len(fetcher.calls) == 1
+        frozen.tick(2)
+        cache.get(URL, httpc_params, cache_ttl=3600)
+        assert len(fetcher.calls) == 2
+
+
+def test_etag_revalidation():
+    fetcher = FakeFetcher(
+        _response(content=b"body", headers={"Cache-Control": "no-cache", "ETag": '"v1"'}),
+        _response(status_code=304, content=b"", headers={"Cache-Control": "no-cache"}),
+    )
+    cache = HttpCache(fetcher=fetcher, stale_ttl=0)
+
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"body"
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"body"
+
+    assert fetcher.calls == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_no_store_is_not_cached():
+    fetcher = FakeFetcher(_response(headers={"Cache-Control": "no-store"}))
+    cache = HttpCache(fetcher=fetcher)
+
+    cache.get(URL, httpc_params, cache_ttl=60)
+    cache.get(URL, httpc_params, cache_ttl=60)
+
+    assert len(fetcher.calls) == 2
+    assert cache.cache_info().currsize == 0
+
+
+def test_negative_result_cached_per_key():
+    fetcher = FakeFetcher(_response(status_code=404))
+    ok_fetcher = FakeFetcher(_response())
+
+    def route(url, *args):
+        return (fetcher if url == URL else ok_fetcher)(url, *args)
+
+    cache = HttpCache(fetcher=route, negative_ttl=10)
+
+    with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+        cache.get("http://other.example", httpc_params, cache_ttl=60)
+        for _ in range(3):
+            with pytest.raises(HttpError):
+                cache.get(URL, httpc_params, cache_ttl=60)
+        assert len(fetcher.calls) == 1
+
+        # the failure does not wipe the other entries
+        cache.get("http://other.example", httpc_params, cache_ttl=60)
+        assert len(ok_fetcher.calls) == 1
+
+        frozen.tick(11)
+        with pytest.raises(HttpError):
+            cache.get(URL, httpc_params, cache_ttl=60)
+        assert len(fetcher.calls) == 2
+
+
+def test_connection_error_is_cached():
+    fetcher = FakeFetcher(HttpError("Connection error"))
+    cache = HttpCache(fetcher=fetcher)
+
+    for _ in range(3):
+        with pytest.raises(HttpError):
+            cache.get(URL, httpc_params, cache_ttl=60)
+
+    assert len(fetcher.calls) == 1
+
+
+def test_concurrent_requests_are_coalesced():
+    gate = threading.Event()
+    calls = []
+
+    def slow_fetcher(url, httpc_params, headers, http_async):
+        calls.append(url)
+        gate.wait(2)
+        return _response()
+
+    cache = HttpCache(fetcher=slow_fetcher)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(URL, httpc_params, 60)))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 10
+    assert all(r.content == b"ok" for r in results)
+
+
+def test_stale_while_revalidate():
+    fetcher = FakeFetcher(
+        _response(content=b"old", headers={"Cache-Control": "max-age=1, stale-while-revalidate=60"}),
+        _response(content=b"new", headers={"Cache-Control": "max-age=1, stale-while-revalidate=60"}),
+    )
+    cache = HttpCache(fetcher=fetcher)
+
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"old"
+    time.sleep(1.1)
+    # the stale response is served while refreshing in background
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"old"
+
+    for _ in range(50):
+        if len(fetcher.calls) == 2 and cache.get(URL, httpc_params, 60).content == b"new":
+            break
+        time.sleep(0.05)
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"new"
+
+
+def test_bounded_size_evicts_lru():
+    cache = HttpCache(maxsize=2, fetcher=FakeFetcher(_response()))
+
+    cache.get("http://a.example", httpc_params, 60)
+    cache.get("http://b.example", httpc_params, 60)
+    cache.get("http://a.example", httpc_params, 60)
+    cache.get("http://c.example", httpc_params, 60)
+
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+    # b was the least recently used
+    cache.get("http://a.example", httpc_params, 60)
+    assert cache.cache_info().hits == 2
+    cache.get("http://b.example", httpc_params, 60)
+    assert cache.cache_info().misses == 4
+
+
+@pytest.mark.parametrize(
+    "failure", [HttpError("Connection error"), _response(status_code=503)]
+)
+def test_stale_response_survives_failed_revalidation(failure):
+    fetcher = FakeFetcher(
+        _response(content=b"old", headers={"Cache-Control": "max-age=1, stale-while-revalidate=2"}),
+        failure,
+    )
+    cache = HttpCache(fetcher=fetcher, negative_ttl=10)
+
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"old"
+    time.sleep(1.1)
+    # the background revalidation fails
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"old"
+    cache._executor.shutdown(wait=True)
+    assert len(fetcher.calls) == 2
+
+    # the stale response is kept, and not revalidated again before negative_ttl
+    assert cache.get(URL, httpc_params, cache_ttl=60).content == b"old"
+    assert len(fetcher.calls) == 2
+
+    # until its stale window is over
+    time.sleep(2)
+    with pytest.raises(HttpError):
+        cache.get(URL, httpc_params, cache_ttl=60)
+
+
+@pytest.mark.parametrize(
+    "cache_control, cache_ttl", [("no-cache", 60), ("max-age=60", 0)]
+)
+def test_response_to_revalidate_is_not_served_stale(cache_control, cache_ttl):
+    fetcher = FakeFetcher(
+        _response(content=b"old", headers={"Cache-Control": cache_control}),
+        _response(content=b"new", headers={"Cache-Control": cache_control}),
+    )
+    cache = HttpCache(fetcher=fetcher, stale_ttl=30)
+
+    assert cache.get(URL, httpc_params, cache_ttl=cache_ttl).content == b"old"
+    assert cache.get(URL, httpc_params, cache_ttl=cache_ttl).content == b"new"
@@ -6,8 +6,8 @@ import freezegun
 import pytest
 import requests
 
+from pyeudiw.tools.http_cache import get_http_cache
 from pyeudiw.tools.utils import (
-    _lru_cached_get_http_url,
     cacheable_get_http_url,
     exp_from_now,
     iat_now,
@@ -114,7 +114,7 @@ def test_cacheable_get_http_url():
     ok_response.headers.update({"Content-Type": "text/plain"})
     ok_response._content = b"Hello automated test"
     mocked_endpoint = unittest.mock.patch(
-        "pyeudiw.tools.utils.get_http_url", return_value=[ok_response]
+        "pyeudiw.federation.http_client.HttpClient.get_one", return_value=ok_response
     )
 
     cache_ttl: int = 60 * 60 * 24 * 365  # 1 year
@@ -126,7 +126,7 @@ def test_cacheable_get_http_url():
     }
 
     # clear cache so that it is not polluted from prev tests
-    _lru_cached_get_http_url.cache_clear()
+    get_http_cache().cache_clear()
     mocked_endpoint.start()
     for _ in range(tries):
         resp = cacheable_get_http_url(
@@ -136,13 +136,13 @@ def test_cacheable_get_http_url():
         assert resp._content == b"Hello automated test"
     mocked_endpoint.stop()
 
-    cache_misses = _lru_cached_get_http_url.cache_info().misses
+    cache_misses = get_http_cache().cache_info().misses
     exp_cache_misses = 1
-    cache_hits = _lru_cached_get_http_url.cache_info().hits
+    cache_hits = get_http_cache().cache_info().hits
     exp_cache_hits = tries - 1
     assert (
         cache_misses == exp_cache_misses
-    ), f"cache missed more that {exp_cache_misses} time: {cache_misses}; {_lru_cached_get_http_url.cache_info()}"
+    ), f"cache missed more that {exp_cache_misses} time: {cache_misses}; {get_http_cache().cache_info()}"
     assert (
         cache_hits == exp_cache_hits
     ), f"cache hit less than {exp_cache_hits} times: {cache_hits}"
@@ -1 +1,183 @@
+import datetime
+import json
+from unittest.mock import patch
+
+from freezegun import freeze_time
+from satosa.context import Context
+from satosa.proxy_server import ToBytesMiddleware
+
+from pyeudiw.federation.statement_store import FederationStatementStore
+from pyeudiw.federation.trust_chain_store import TrustChainStore
+from pyeudiw.jwt.jws_helper import JWSHelper
+from pyeudiw.jwt.utils import decode_jwt_payload
+from pyeudiw.tests.federation.mock_federation import (
+    LEAF,
+    TRUST_ANCHOR,
+    MockFederation,
+)
+from pyeudiw.tests.federation.test_parallel_discovery import build_trust_chain
+from pyeudiw.tests.settings import CONFIG
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+from pyeudiw.tools.utils import iat_now
+from pyeudiw.trust.handler.federation import FederationHandler
+from pyeudiw.trust.model.trust_source import TrustSourceData
+
+
 # TODO: move legacy test about entity configurations and endpoints we still have in openid4vp backend tests
+
+
+def _handler() -> FederationHandler:
+    return FederationHandler(
+        client_id="https://rp.example.org",
+        **CONFIG["trust"]["federation"]["config"],
+    )
+
+
+def _context(format: str = "", if_none_match: str | None = None) -> Context:
+    context = Context()
+    context.qs_params = {"format": format} if format else {}
+    context.http_headers = (
+        {"HTTP_IF_NONE_MATCH": if_none_match} if if_none_match else {}
+    )
+    return context
+
+
+def test_entity_configuration_is_signed_once():
+    handler = _handler()
+
+    with patch.object(JWSHelper, "sign", autospec=True) as sign:
+        for _ in range(10):
+            response = handler.entity_configuration_endpoint(_context())
+            assert response.status == "200"
+            json_response = handler.entity_configuration_endpoint(_context("json"))
+            assert json_response.status == "200"
+
+    sign.assert_not_called()
+    assert response.message == handler.entity_configuration
+    assert json.loads(json_response.message) == decode_jwt_payload(response.message)
+    assert ("Content-Type", "application/entity-statement+jwt") in response.headers
+    assert ("Content-Type", "application/json") in json_response.headers
+
+
+def test_entity_configuration_cache_headers():
+    handler = _handler()
+    document = handler.signed_entity_configuration.get()
+
+    response = handler.entity_configuration_endpoint(_context())
+    headers = dict(response.headers)
+    assert headers["ETag"] == document.jwt_etag
+    max_age = int(headers["Cache-Control"].split("max-age=")[1])
+    assert 0 < max_age <= document.exp - iat_now()
+
+    # the json variant has its own ETag
+    json_headers = dict(handler.entity_configuration_endpoint(_context("json")).headers)
+    assert json_headers["ETag"] == document.json_etag != document.jwt_etag
+
+    not_modified = handler.entity_configuration_endpoint(
+        _context(if_none_match=document.jwt_etag)
+    )
+    assert not_modified.status == "304 Not Modified"
+    assert not not_modified.message
+
+
+def test_not_modified_entity_configuration_is_served_by_wsgi():
+    handler = _handler()
+    document = handler.signed_entity_configuration.get()
+    response = handler.entity_configuration_endpoint(
+        _context(if_none_match=document.jwt_etag)
+    )
+
+    started = []
+    body = ToBytesMiddleware(lambda environ, start_response: response(environ, start_response))(
+        {}, lambda status, headers: started.append((status, headers))
+    )
+
+    assert body == [b""]
+    assert started[0][0] == "304 Not Modified"
+    assert ("ETag", document.jwt_etag) in started[0][1]
+
+
+def test_entity_configuration_is_signed_again_before_expiry():
+    handler = _handler()
+    artifact = handler.signed_entity_configuration
+    document = artifact.get()
+
+    resign_at = datetime.datetime.fromtimestamp(document.resign_at, datetime.timezone.utc)
+    with freeze_time(resign_at):
+        # the current configuration is served while the next one is signed
+        assert artifact.get() is document
+        artifact.wait_refresh(5)
+
+        renewed = artifact.get()
+        assert renewed is not document
+        assert renewed.exp > document.exp
+        assert handler.entity_configuration == renewed.jwt
+
+    assert artifact.signatures == 2
+
+
+def test_expired_entity_configuration_is_never_served():
+    handler = _handler()
+    document = handler.signed_entity_configuration.get()
+
+    expired = datetime.datetime.fromtimestamp(document.exp, datetime.timezone.utc)
+    with freeze_time(expired):
+        assert decode_jwt_payload(handler.entity_configuration)["exp"] > document.exp
+
+
+def test_metadata_endpoint_serves_the_current_configuration():
+    handler = _handler()
+    [(path, metadata_response_fn)] = handler.build_metadata_endpoints(
+        "OpenID4VP", "https://rp.example.org/OpenID4VP"
+    )
+
+    assert path == "^OpenID4VP/.well-known/openid-federation$"
+    assert metadata_response_fn(_context()).message == handler.entity_configuration
+
+    expired = handler.signed_entity_configuration.get().exp
+    with freeze_time(datetime.datetime.fromtimestamp(expired, datetime.timezone.utc)):
+        assert metadata_response_fn(_context()).message == handler.entity_configuration
+        assert decode_jwt_payload(handler.entity_configuration)["exp"] > expired
+
+
+def test_resolved_trust_chain_is_not_validated_again():
+    federation = MockFederation(1)
+    trust_chain_store = TrustChainStore(_db_engine())
+    resolved = trust_chain_store.put(
+        build_trust_chain(federation, parallel_discovery=True).get_resolved_trust_chain()
+    )
+
+    handler = _handler()
+    handler.trust_chain_store = trust_chain_store
+    handler.trust_anchors = {TRUST_ANCHOR: []}
+
+    with patch(
+        "pyeudiw.trust.handler.federation.StaticTrustChainValidator"
+    ) as validator:
+        is_valid, trust_source = handler.validate_trust_material(
+            resolved.chain, TrustSourceData(LEAF)
+        )
+
+    validator.assert_not_called()
+    assert is_valid
+    assert handler.extract_jwt_header_trust_parameters(trust_source) == {
+        "trust_chain": resolved.chain
+    }
+
+
+def test_handlers_do_not_share_the_stores():
+    db_engine = _db_engine()
+    statement_store = FederationStatementStore(db_engine)
+    trust_chain_store = TrustChainStore(db_engine)
+
+    assert _handler().statement_store is not _handler().statement_store
+    assert _handler().trust_chain_store is not _handler().trust_chain_store
+
+    handler = FederationHandler(
+        client_id="https://rp.example.org",
+        statement_store=statement_store,
+        trust_chain_store=trust_chain_store,
+        **CONFIG["trust"]["federation"]["config"],
+    )
+    assert handler.statement_store is statement_store
+    assert handler.trust_chain_store is trust_chain_store
@@ -0,0 +1,177 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+import freezegun
+from cryptojwt.jwk.ec import new_ec_key
+
+from pyeudiw.storage.db_engine import DBEngine
+from pyeudiw.tests.trust.mock_trust_handler import MockTrustHandler, UpdateTrustHandler
+from pyeudiw.trust.cache import TrustSourceCache
+from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+from pyeudiw.trust.model.trust_source import TrustSourceData
+
+
+def _db_engine() -> DBEngine:
+    url = f"memory://{uuid4()}"
+    return DBEngine(
+        {
+            "redis": {
+                "cache": {
+                    "module": "pyeudiw.storage.redis_cache",
+                    "class": "RedisCache",
+                    "init_params": {"url": url, "conf": {"db_name": "eudiw"}},
+                },
+                "storage": {
+                    "module": "pyeudiw.storage.redis_storage",
+                    "class": "RedisStorage",
+                    "init_params": {
+                        "url": url,
+                        "conf": {
+                            "db_name": "eudiw",
+                            "db_sessions_collection": "sessions",
+                            "db_trust_attestations_collection": "trust_attestations",
+                            "db_trust_anchors_collection": "trust_anchors",
+                            "db_trust_sources_collection": "trust_sources",
+                        },
+                    },
+                },
+            }
+        }
+    )
+
+
+def _trust_evaluator(handler, mode: str) -> CombinedTrustEvaluator:
+    return CombinedTrustEvaluator([handler], _db_engine(), mode)
+
+
+def test_cache_first_serves_from_memory():
+    handler = MockTrustHandler(include_issued_jwt_header_param=True)
+    trust_ev = _trust_evaluator(handler, "cache_first")
+    issuer = f"http://{uuid4()}.issuer.it"
+
+    with patch.object(handler, "extract_and_update_trust_materials", wraps=handler.extract_and_update_trust_materials) as extract, \
+         patch.object(trust_ev.db_engine, "get_trust_source", wraps=trust_ev.db_engine.get_trust_source) as db_get, \
+         patch.object(trust_ev.db_engine, "add_trust_source", wraps=trust_ev.db_engine.add_trust_source) as db_add:
+        for _ in range(10):
+            trust_ev.get_public_keys(issuer)
+            trust_ev.get_jwt_header_trust_parameters(issuer)
+
+    assert extract.call_count == 1
+    assert db_get.call_count == 1
+    assert db_add.call_count == 1
+
+    info = trust_ev.cache_info()
+    assert info.hits == 19
+    assert info.misses == 1
+    assert info.hit_rate == 0.95
+
+
+def test_update_first_writes_only_changes():
+    handler = UpdateTrustHandler(include_issued_jwt_header_param=True)
+    trust_ev = _trust_evaluator(handler, "update_first")
+    issuer = f"http://{uuid4()}.issuer.it"
+
+    with freezegun.freeze_time("2024-01-01 00:00:00"), \
+         patch.object(trust_ev.db_engine, "get_trust_source", wraps=trust_ev.db_engine.get_trust_source) as db_get, \
+         patch.object(trust_ev.db_engine, "add_trust_source", wraps=trust_ev.db_engine.add_trust_source) as db_add:
+        assert trust_ev.get_jwt_header_trust_parameters(issuer) == {"trust_param_name": {"trust_param_key": "trust_param_value"}}
+        for _ in range(5):
+            assert trust_ev.get_jwt_header_trust_parameters(issuer) == {"trust_param_name": {"updated_trust_param_key": "updated_trust_param_value"}}
+
+    # the handlers always run, but the storage is read once and written only when the material changed
+    assert db_get.call_count == 1
+    assert db_add.call_count == 2
+
+    stored = trust_ev.db_engine.get_trust_source(issuer)
+    assert stored["test_trust_param"]["trust_param_name"] == {"updated_trust_param_key": "updated_trust_param_value"}
+
+
+def test_cache_entry_expires_with_trust_param():
+    handler = UpdateTrustHandler(include_issued_jwt_header_param=True, exp=10)
+    trust_ev = _trust_evaluator(handler, "cache_first")
+    issuer = f"http://{uuid4()}.issuer.it"
+
+    with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+        assert trust_ev.get_jwt_header_trust_parameters(issuer) == {"trust_param_name": {"trust_param_key": "trust_param_value"}}
+        frozen.tick(4 * 60)
+        assert trust_ev.get_jwt_header_trust_parameters(issuer) == {"trust_param_name": {"trust_param_key": "trust_param_value"}}
+        frozen.tick(7 * 60)
+        assert trust_ev.get_jwt_header_trust_parameters(issuer) == {"trust_param_name": {"updated_trust_param_key": "updated_trust_param_value"}}
+
+
+def test_revoke_invalidates_cache():
+    handler = MockTrustHandler(include_issued_jwt_header_param=True)
+    trust_ev = _trust_evaluator(handler, "cache_first")
+    issuer = f"http://{uuid4()}.issuer.it"
+
+    cached = trust_ev._get_trust_source(issuer)
+    assert not trust_ev.is_revoked(issuer)
+
+    trust_ev.revoke(issuer)
+
+    assert trust_ev.db_engine.get_trust_source(issuer)["revoked"] is True
+    # the previously returned instance is not modified
+    assert cached.revoked is False
+    assert trust_ev.is_revoked(issuer)
+
+
+def test_static_trust_material_does_not_alter_cached_source():
+    handler = MockTrustHandler()
+    trust_ev = _trust_evaluator(handler, "cache_first")
+    issuer = f"http://{uuid4()}.issuer.it"
+
+    cached = trust_ev._get_trust_source(issuer)
+
+    def validate_trust_material(trust_material, trust_source):
+        trust_source.metadata = {"changed": True}
+        return True, trust_source
+
+    handler.get_handled_trust_material_name = lambda: "x5c"
+    handler.validate_trust_material = validate_trust_material
+
+    assert trust_ev.get_public_keys(issuer, {"x5c": ["cert"]})
+    assert cached.metadata == {"json_key": "json_value"}
+    assert trust_ev.get_metadata(issuer) == {"changed": True}
+    assert trust_ev.db_engine.get_trust_source(issuer)["metadata"] == {"changed": True}
+
+
+def test_metadata_does_not_alter_cached_source():
+    trust_ev = _trust_evaluator(MockTrustHandler(), "cache_first")
+    issuer = f"http://{uuid4()}.issuer.it"
+    jwk = new_ec_key("P-256").serialize(private=True)
+
+    cached = trust_ev._get_trust_source(issuer)
+    cached.metadata = {"jwks": {"keys": [jwk]}}
+
+    metadata = trust_ev.get_metadata(issuer)
+    assert "d" not in metadata["jwks"]["keys"][0]
+    assert cached.metadata == {"jwks": {"keys": [jwk]}}
+    assert trust_ev._get_trust_source(issuer) is cached
+
+
+def test_cache_is_bounded():
+    cache = TrustSourceCache(maxsize=2, max_ttl=60)
+
+    for entity_id in ("a", "b", "c"):
+        trust_source = TrustSourceData.empty(entity_id)
+        cache.put(trust_source, trust_source.serialize())
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+
+def test_cache_max_ttl():
+    cache = TrustSourceCache(maxsize=2, max_ttl=60)
+
+    with freezegun.freeze_time("2024-01-01 00:00:00") as frozen:
+        trust_source = TrustSourceData.empty("a")
+        cache.put(trust_source, trust_source.serialize())
+        frozen.tick(59)
+        assert cache.get("a") is not None
+        frozen.tick(2)
+        assert cache.get("a") is None
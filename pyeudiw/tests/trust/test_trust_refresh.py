@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import wait
+from uuid import uuid4
+
+from pyeudiw.tests.trust.mock_trust_handler import MockTrustHandler
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+from pyeudiw.trust.model.trust_source import TrustSourceData
+from pyeudiw.trust.refresh import TrustRefreshScheduler
+
+
+class CountingTrustHandler(MockTrustHandler):
+    def __init__(self, delay: float = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.fetches = Counter()
+        self.delay = delay
+        self.failing = False
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self._lock = threading.Lock()
+
+    def extract_and_update_trust_materials(
+        self, issuer: str, trust_source: TrustSourceData
+    ) -> TrustSourceData:
+        with self._lock:
+            self.fetches[issuer] += 1
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            time.sleep(self.delay)
+            if self.failing:
+                raise ConnectionError("unreachable")
+            return super().extract_and_update_trust_materials(issuer, trust_source)
+        finally:
+            with self._lock:
+                self.concurrent -= 1
+
+
+def _issuers(n: int) -> list[str]:
+    return [f"http://{uuid4()}.issuer.it" for _ in range(n)]
+
+
+def test_stored_sources_are_scheduled_before_expiry():
+    handler = CountingTrustHandler(exp=10)
+    trust_ev = CombinedTrustEvaluator([handler], _db_engine(), "update_first")
+    issuers = _issuers(3)
+    for issuer in issuers:
+        trust_ev.get_metadata(issuer)
+
+    scheduler = TrustRefreshScheduler(trust_ev, lead_time=60, jitter=30)
+    scheduler.sync()
+
+    for issuer in issuers:
+        expiration_date = trust_ev._get_trust_source(issuer).get_expiration_date()
+        due = scheduler.next_refresh(issuer)
+        assert expiration_date - 90 <= due <= expiration_date - 60
+
+    assert scheduler.metrics["tracked"] == 3
+
+
+def test_due_sources_are_refreshed():
+    handler = CountingTrustHandler(exp=10)
+    trust_ev = CombinedTrustEvaluator([handler], _db_engine(), "cache_first")
+    issuer = _issuers(1)[0]
+    trust_ev.get_metadata(issuer)
+
+    scheduler = TrustRefreshScheduler(trust_ev, lead_time=60, jitter=0)
+    scheduler.sync()
+    due = scheduler.next_refresh(issuer)
+
+    # nothing is due yet
+    assert scheduler.run_pending(now=due - 1) == []
+
+    wait(scheduler.run_pending(now=due))
+
+    assert handler.fetches[issuer] == 2
+    assert scheduler.metrics["refreshes"] == 1
+    # the refreshed material moved the next refresh forward
+    assert scheduler.next_refresh(issuer) >= due
+
+
+def test_request_path_only_reads_while_running():
+    handler = CountingTrustHandler()
+    trust_ev = CombinedTrustEvaluator([handler], _db_engine(), "update_first")
+    issuer = _issuers(1)[0]
+
+    scheduler = TrustRefreshScheduler(trust_ev, tick=0.05)
+    scheduler.start()
+    try:
+        for _ in range(10):
+            trust_ev.get_public_keys(issuer)
+            trust_ev.get_jwt_header_trust_parameters(issuer)
+
+        # only the first lookup of an unknown issuer fetches its trust material
+        assert handler.fetches[issuer] == 1
+        assert scheduler.next_refresh(issuer) is not None
+    finally:
+        scheduler.stop()
+
+    assert trust_ev.refresh_scheduler is None
+    trust_ev.get_public_keys(issuer)
+    assert handler.fetches[issuer] == 2
+
+
+def test_failed_refresh_backs_off():
+    handler = CountingTrustHandler()
+    trust_ev = CombinedTrustEvaluator([handler], _db_engine(), "cache_first")
+    issuer = _issuers(1)[0]
+    trust_ev.get_metadata(issuer)
+
+    scheduler = TrustRefreshScheduler(trust_ev, min_backoff=5, max_backoff=12)
+    scheduler.sync()
+    handler.failing = True
+
+    delays = []
+    for _ in range(4):
+        due = scheduler.next_refresh(issuer)
+        start = time.time()
+        wait(scheduler.run_pending(now=due))
+        delays.append(round(scheduler.next_refresh(issuer) - start))
+
+    assert delays == [5, 10, 12, 12]
+    assert scheduler.metrics["refresh_failures"] == 4
+
+    handler.failing = False
+    wait(scheduler.run_pending(now=scheduler.next_refresh(issuer)))
+    assert scheduler.metrics["refreshes"] == 1
+    assert scheduler._failures == {}
+
+
+def test_refresh_concurrency_is_bounded():
+    handler = CountingTrustHandler(delay=0.1)
+    trust_ev = CombinedTrustEvaluator([handler], _db_engine(), "cache_first")
+    issuers = _issuers(10)
+    for issuer in issuers:
+        trust_ev.get_metadata(issuer)
+
+    scheduler = TrustRefreshScheduler(trust_ev, concurrency=2)
+    scheduler.sync()
+    handler.max_concurrent = 0
+    # the refreshed material expires after the simulated time of the refreshes
+    handler.exp = 120
+
+    futures = scheduler.run_pending(now=time.time() + 3600)
+    assert len(futures) == 2
+    # the running refreshes are not started twice
+    assert scheduler.run_pending(now=time.time() + 3600) == []
+    wait(futures)
+
+    while scheduler.metrics["refreshes"] < len(issuers):
+        wait(scheduler.run_pending(now=time.time() + 3600))
+
+    assert handler.max_concurrent == 2
+    assert all(handler.fetches[issuer] == 2 for issuer in issuers)
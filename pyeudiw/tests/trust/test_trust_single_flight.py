@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+from pyeudiw.tests.trust.mock_trust_handler import MockTrustHandler
+from pyeudiw.tests.trust.test_trust_cache import _db_engine
+from pyeudiw.tools.single_flight import SingleFlight
+from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+from pyeudiw.trust.model.trust_source import TrustSourceData
+
+ISSUERS = [f"http://{uuid4()}.issuer.it" for _ in range(5)]
+REQUESTS_PER_ISSUER = 20
+
+
+class SlowTrustHandler(MockTrustHandler):
+    """
+    Counts the trust material fetches, each one lasting some time
+    like a JWKS download would.
+    """
+
+    def __init__(self, fetches: Counter, delay: float = 0.3, **kwargs):
+        super().__init__(**kwargs)
+        self.fetches = fetches
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def extract_and_update_trust_materials(
+        self, issuer: str, trust_source: TrustSourceData
+    ) -> TrustSourceData:
+        with self._lock:
+            self.fetches[issuer] += 1
+        time.sleep(self.delay)
+        return super().extract_and_update_trust_materials(issuer, trust_source)
+
+
+def _load(trust_evaluators: list[CombinedTrustEvaluator]) -> list[list[dict]]:
+    calls = [
+        (trust_evaluators[i % len(trust_evaluators)], issuer)
+        for issuer in ISSUERS
+        for i in range(REQUESTS_PER_ISSUER)
+    ]
+    barrier = threading.Barrier(len(calls))
+
+    def request(trust_ev: CombinedTrustEvaluator, issuer: str) -> list[dict]:
+        barrier.wait()
+        return trust_ev.get_public_keys(issuer)
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        return list(executor.map(lambda c: request(*c), calls))
+
+
+@pytest.mark.parametrize("mode", ["update_first", "cache_first"])
+def test_one_fetch_per_issuer_within_a_worker(mode):
+    fetches = Counter()
+    trust_ev = CombinedTrustEvaluator(
+        [SlowTrustHandler(fetches)], _db_engine(), mode
+    )
+
+    results = _load([trust_ev])
+
+    assert len(results) == len(ISSUERS) * REQUESTS_PER_ISSUER
+    assert all(len(keys) == 2 for keys in results)
+    assert fetches == Counter({issuer: 1 for issuer in ISSUERS})
+    assert trust_ev._refreshes.executions == len(ISSUERS)
+
+
+def test_one_fetch_per_issuer_across_workers():
+    fetches = Counter()
+    db_engine = _db_engine()
+    # every evaluator has its own in-process state, like a separate worker
+    workers = [
+        CombinedTrustEvaluator(
+            [SlowTrustHandler(fetches)], db_engine, "cache_first", refresh_lock_ttl=5
+        )
+        for _ in range(4)
+    ]
+
+    results = _load(workers)
+
+    assert all(len(keys) == 2 for keys in results)
+    assert fetches == Counter({issuer: 1 for issuer in ISSUERS})
+
+
+def test_forced_update_does_not_join_a_refresh():
+    fetches = Counter()
+    trust_ev = CombinedTrustEvaluator(
+        [SlowTrustHandler(fetches)], _db_engine(), "cache_first"
+    )
+    issuer = ISSUERS[0]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        refresh = executor.submit(trust_ev.get_public_keys, issuer)
+        time.sleep(0.1)
+        forced = executor.submit(trust_ev.get_public_keys, issuer, force_update=True)
+        refresh.result()
+        forced.result()
+
+    assert fetches[issuer] == 2
+    assert trust_ev._refreshes.shared == 0
+
+
+def test_refresh_error_is_shared():
+    single_flight = SingleFlight()
+    gate = threading.Event()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        gate.wait(1)
+        raise ValueError("fetch failed")
+
+    errors = []
+
+    def call():
+        try:
+            single_flight.do("issuer", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(errors) == 5
+
+    # the failure is not remembered
+    assert single_flight.do("issuer", lambda: "ok") == "ok"
+
+
+def test_refresh_lock_is_released():
+    db_engine = _db_engine()
+    trust_ev = CombinedTrustEvaluator(
+        [MockTrustHandler()], db_engine, "cache_first", refresh_lock_ttl=5
+    )
+
+    trust_ev.get_metadata(ISSUERS[0])
+
+    assert db_engine.acquire_lock(f"trust_source:{ISSUERS[0]}", "other", 5)
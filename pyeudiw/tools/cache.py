@@ -0,0 +1,269 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the ratio between hits and lookups.
+
+        :returns: the hit rate, 0 if the cache was never queried
+        :rtype: float
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread safe mapping bounded by maxsize, the least recently used entries
+    are evicted first; a maxsize of 0 disables the cache.
+
+    An entry may be stored with an expiration, as unix timestamp, after
+    which it is dropped on the next lookup. The hits, misses and evictions
+    are counted.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Creates an instance of LRUCache.
+
+        :param maxsize: the maximum number of entries
+        :type maxsize: int
+        """
+        self.maxsize = maxsize
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[V, Optional[float]]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Returns the value of a key if present and not expired,
+        counting the lookup as hit or miss.
+
+        :param key: the key
+        :type key: K
+
+        :returns: the value or None
+        :rtype: Optional[V]
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """
+        Returns the value of a key if present and not expired,
+        without counting the lookup.
+
+        :param key: the key
+        :type key: K
+
+        :returns: the value or None
+        :rtype: Optional[V]
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def record(self, hit: bool) -> None:
+        """
+        Counts a lookup made with peek, for the caches that decide by
+        themselves whether an entry can be used.
+
+        :param hit: True if the entry was used
+        :type hit: bool
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _lookup(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        """
+        Stores the value of a key, replacing the previous one.
+
+        :param key: the key
+        :type key: K
+        :param value: the value
+        :type value: V
+        :param expires_at: the unix timestamp when the entry expires, never if None
+        :type expires_at: Optional[float]
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """
+        Removes a key.
+
+        :param key: the key
+        :type key: K
+
+        :returns: the removed value or None
+        :rtype: Optional[V]
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return None if entry is None else entry[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns the cache statistics.
+
+        :returns: hits, misses, evictions, current and maximum size
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._entries), self.maxsize
+            )
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the entries and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+class BackgroundRefresher:
+    """
+    Runs refreshes in background threads, at most one at a time for each key:
+    a refresh requested while the one of the same key is running is dropped.
+    The errors of the refreshes are logged.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Creates an instance of BackgroundRefresher.
+
+        :param name: the name of the threads, also used in the logs
+        :type name: str
+        """
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._running: dict[Hashable, threading.Thread] = {}
+
+    def _run(self, key: Hashable, refresh: Callable[[], Any]) -> None:
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning(f"{self.name}: cannot refresh {key}: {e}")
+        finally:
+            with self._lock:
+                self._running.pop(key, None)
+
+    def submit(self, key: Hashable, refresh: Callable[[], Any]) -> bool:
+        """
+        Starts the refresh of a key, unless one is already running.
+
+        :param key: what is refreshed
+        :type key: Hashable
+        :param refresh: the refresh to run
+        :type refresh: Callable[[], Any]
+
+        :returns: True if the refresh was started
+        :rtype: bool
+        """
+        with self._lock:
+            if key in self._running:
+                return False
+            self._running[key] = thread = threading.Thread(
+                target=self._run, args=(key, refresh), name=self.name, daemon=True
+            )
+            thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for the refreshes in progress, if any.
+
+        :param timeout: the maximum seconds to wait for each refresh
+        :type timeout: Optional[float]
+        """
+        with self._lock:
+            running = list(self._running.values())
+        for thread in running:
+            thread.join(timeout)
+
+
+class ProcessWide(Generic[T]):
+    """
+    An instance shared by the whole process, created on first use.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        """
+        Creates an instance of ProcessWide.
+
+        :param factory: creates the shared instance
+        :type factory: Callable[[], T]
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._instance: Optional[T] = None
+
+    def get(self) -> T:
+        """
+        Returns the shared instance, creating it on first use.
+
+        :returns: the shared instance
+        :rtype: T
+        """
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
@@ -0,0 +1,327 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+
+from pyeudiw.federation.exceptions import HttpError
+from pyeudiw.federation.http_client import get_http_client
+from pyeudiw.tools.cache import CacheInfo, LRUCache, ProcessWide
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_MAXSIZE = int(os.getenv("PYEUDIW_LRU_CACHE_MAXSIZE", 2048))
+HTTP_CACHE_NEGATIVE_TTL = int(os.getenv("PYEUDIW_HTTP_CACHE_NEGATIVE_TTL", 10))
+HTTP_CACHE_STALE_TTL = int(os.getenv("PYEUDIW_HTTP_CACHE_STALE_TTL", 30))
+
+HttpCacheInfo = CacheInfo
+
+
+@dataclass
+class _CacheEntry:
+    response: Optional[requests.Response]
+    error: Optional[HttpError]
+    etag: Optional[str]
+    expires_at: float
+    stale_until: float
+
+    def unwrap(self) -> requests.Response:
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+def _parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    """
+    Parses a Cache-Control header into a dictionary of directives.
+
+    :param value: the header value
+    :type value: str
+
+    :returns: the directives, with None as value when the directive has no argument
+    :rtype: dict[str, Optional[str]]
+    """
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _to_seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _default_fetcher(
+    url: str, httpc_params: dict, headers: dict, http_async: bool
+) -> requests.Response:
+    return get_http_client().get_one(url, httpc_params, headers, http_async)
+
+
+class HttpCache:
+    """
+    Response cache for HTTP GET calls following the HTTP caching semantics.
+
+    Freshness is taken from Cache-Control max-age or Expires, capped by the
+    caller provided ttl; stale entries carrying an ETag are revalidated with
+    If-None-Match. Failed fetches are cached per url for a short time;
+    when a stale response was cached, it is served in their place until
+    its stale-while-revalidate window is over.
+    Concurrent misses for the same url are coalesced into a single fetch and
+    stale entries may be served while a background revalidation is running.
+    The number of entries is bounded, the least recently used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = HTTP_CACHE_MAXSIZE,
+        negative_ttl: int = HTTP_CACHE_NEGATIVE_TTL,
+        stale_ttl: int = HTTP_CACHE_STALE_TTL,
+        fetcher: Callable[[str, dict, dict, bool], requests.Response] = _default_fetcher,
+    ) -> None:
+        """
+        Creates an instance of HttpCache.
+
+        :param maxsize: the maximum number of cached urls
+        :type maxsize: int
+        :param negative_ttl: seconds a failed fetch is cached
+        :type negative_ttl: int
+        :param stale_ttl: seconds an expired response may be served while revalidating,
+            used when the response does not define stale-while-revalidate
+        :type stale_ttl: int
+        :param fetcher: the callable performing the http call, it must return the
+            response whatever its status code and raise HttpError on connection errors
+        :type fetcher: Callable[[str, dict, dict, bool], requests.Response]
+        """
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._fetcher = fetcher
+
+        self._lock = threading.Lock()
+        # the expired entries are kept, their ETag is used to revalidate them
+        self._entries: LRUCache[tuple, _CacheEntry] = LRUCache(maxsize)
+        self._inflight: dict[tuple, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(
+        self, url: str, httpc_params: dict, cache_ttl: int, http_async: bool = True
+    ) -> requests.Response:
+        """
+        Returns the response for url, from the cache when possible.
+
+        :param url: the url where fetch the content
+        :type url: str
+        :param httpc_params: parameters to perform http requests.
+        :type httpc_params: dict
+        :param cache_ttl: the maximum time, in seconds, a response is considered fresh
+        :type cache_ttl: int
+        :param http_async: if True the http call is performed on the async transport
+        :type http_async: bool
+
+        :raises HttpError: if the response status code is not 200 or a connection error occurs
+
+        :returns: the response
+        :rtype: requests.Response
+        """
+        key = (url, httpc_params.get("connection", {}).get("ssl"))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.peek(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.record(hit=True)
+                return entry.unwrap()
+
+            if entry is not None and entry.error is None and now < entry.stale_until:
+                self._entries.record(hit=True)
+                if key not in self._inflight:
+                    future = self._inflight[key] = Future()
+                    self._get_executor().submit(
+                        self._refresh, key, url, httpc_params, cache_ttl, http_async, entry, future
+                    )
+                return entry.unwrap()
+
+            self._entries.record(hit=False)
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if owner:
+            self._refresh(key, url, httpc_params, cache_ttl, http_async, entry, future)
+        return future.result().unwrap()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="pyeudiw-http-cache"
+            )
+        return self._executor
+
+    def _refresh(
+        self,
+        key: tuple,
+        url: str,
+        httpc_params: dict,
+        cache_ttl: int,
+        http_async: bool,
+        previous: Optional[_CacheEntry],
+        future: Future,
+    ) -> None:
+        """
+        Fetches url, stores the outcome and resolves the in-flight future.
+        """
+        headers = {}
+        if previous is not None and previous.etag:
+            headers["If-None-Match"] = previous.etag
+
+        try:
+            try:
+                resp = self._fetcher(url, httpc_params, headers, http_async)
+            except HttpError as e:
+                entry, store = self._failed_entry(e, cache_ttl, previous), True
+            else:
+                if resp.status_code == 304 and previous is not None and previous.response:
+                    entry, store = self._positive_entry(previous.response, resp, cache_ttl)
+                elif resp.status_code == 200:
+                    entry, store = self._positive_entry(resp, resp, cache_ttl)
+                else:
+                    error = HttpError(f"HTTP error: {resp.status_code} -- {resp.reason}")
+                    entry, store = self._failed_entry(error, cache_ttl, previous), True
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if store:
+                self._entries.put(key, entry)
+            else:
+                self._entries.pop(key)
+        future.set_result(entry)
+
+    def _positive_entry(
+        self, response: requests.Response, validator: requests.Response, cache_ttl: int
+    ) -> tuple[_CacheEntry, bool]:
+        """
+        Builds the entry for a successful response.
+
+        :param response: the response to cache
+        :type response: requests.Response
+        :param validator: the response carrying the caching headers, it differs
+            from response when revalidation returned 304
+        :type validator: requests.Response
+        :param cache_ttl: the maximum freshness lifetime in seconds
+        :type cache_ttl: int
+
+        :returns: the entry and whether it may be stored
+        :rtype: tuple[_CacheEntry, bool]
+        """
+        now = time.time()
+        headers = validator.headers
+        directives = _parse_cache_control(headers.get("Cache-Control", ""))
+
+        ttl = _to_seconds(directives.get("max-age"))
+        if ttl is None and headers.get("Expires"):
+            try:
+                ttl = max(int(parsedate_to_datetime(headers["Expires"]).timestamp() - now), 0)
+            except (TypeError, ValueError):
+                ttl = 0
+        if ttl is None:
+            ttl = cache_ttl
+        ttl = min(ttl, cache_ttl)
+        if "no-cache" in directives:
+            ttl = 0
+
+        stale = _to_seconds(directives.get("stale-while-revalidate"))
+        if stale is None:
+            stale = self.stale_ttl
+        # a response that must be revalidated on every use is never served stale
+        if "no-cache" in directives or cache_ttl == 0:
+            stale = 0
+
+        entry = _CacheEntry(
+            response=response,
+            error=None,
+            etag=headers.get("ETag") or response.headers.get("ETag"),
+            expires_at=now + ttl,
+            stale_until=now + ttl + stale,
+        )
+        return entry, "no-store" not in directives
+
+    def _failed_entry(
+        self, error: HttpError, cache_ttl: int, previous: Optional[_CacheEntry]
+    ) -> _CacheEntry:
+        """
+        Builds the entry for a failed fetch: the previous response, if still
+        within its stale window, is kept in place of the error and retried
+        after negative_ttl.
+
+        :param error: the error of the fetch
+        :type error: HttpError
+        :param cache_ttl: the maximum freshness lifetime in seconds
+        :type cache_ttl: int
+        :param previous: the entry being refreshed, if any
+        :type previous: Optional[_CacheEntry]
+
+        :returns: the entry
+        :rtype: _CacheEntry
+        """
+        now = time.time()
+        if previous is not None and previous.error is None and now < previous.stale_until:
+            return replace(
+                previous,
+                expires_at=min(now + min(self.negative_ttl, cache_ttl), previous.stale_until),
+            )
+        return self._negative_entry(error, cache_ttl)
+
+    def _negative_entry(self, error: HttpError, cache_ttl: int) -> _CacheEntry:
+        now = time.time()
+        ttl = min(self.negative_ttl, cache_ttl)
+        return _CacheEntry(
+            response=None,
+            error=error,
+            etag=None,
+            expires_at=now + ttl,
+            stale_until=now + ttl,
+        )
+
+    def cache_info(self) -> HttpCacheInfo:
+        """
+        Returns the cache statistics.
+
+        :returns: hits, misses, evictions, current and maximum size
+        :rtype: HttpCacheInfo
+        """
+        return self._entries.cache_info()
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the entries and resets the statistics.
+        """
+        self._entries.cache_clear()
+
+
+_http_cache = ProcessWide(HttpCache)
+
+
+def get_http_cache() -> HttpCache:
+    """
+    Returns the process wide HttpCache, creating it on first use.
+
+    :returns: the shared http cache
+    :rtype: HttpCache
+    """
+    return _http_cache.get()
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from pyeudiw.tools.cache import BackgroundRefresher
+
+logger = logging.getLogger(__name__)
+
+SIGNED_ARTIFACT_RESIGN_LEAD_TIME = int(
+    os.getenv("PYEUDIW_SIGNED_ARTIFACT_RESIGN_LEAD_TIME", 60)
+)
+
+
+def _etag(content: str) -> str:
+    return f'"{hashlib.sha256(content.encode()).hexdigest()[:32]}"'
+
+
+@dataclass(frozen=True)
+class SignedDocument:
+    """
+    A signed document with its serializations, ready to be served.
+
+    :param payload: the signed payload
+    :param jwt: the payload signed in compact serialization
+    :param json_payload: the payload serialized in JSON
+    :param exp: the expiration of the signed payload
+    :param resign_at: the unix timestamp when the document is signed again
+    """
+
+    payload: dict
+    jwt: str
+    json_payload: str
+    exp: int
+    resign_at: float
+
+    @property
+    def jwt_etag(self) -> str:
+        return _etag(self.jwt)
+
+    @property
+    def json_etag(self) -> str:
+        return _etag(self.json_payload)
+
+    def cache_control(self, now: Optional[float] = None) -> str:
+        """
+        Returns the Cache-Control header value, so that the clients
+        do not keep the document beyond its re-signing.
+
+        :param now: the current unix timestamp
+        :type now: Optional[float]
+
+        :returns: the header value
+        :rtype: str
+        """
+        now = time.time() if now is None else now
+        return f"public, max-age={max(int(self.resign_at - now), 0)}"
+
+
+class SignedArtifact:
+    """
+    A document signed ahead of the requests.
+
+    The payload is built and signed once, then served until resign_lead_time
+    seconds before its exp claim, or half of its lifetime when shorter. The
+    first read after that moment signs it again in background, while the
+    current document is still served; only a document already expired is
+    signed again on the request path.
+    """
+
+    def __init__(
+        self,
+        build_payload: Callable[[], dict],
+        sign: Callable[[dict], str],
+        resign_lead_time: int = SIGNED_ARTIFACT_RESIGN_LEAD_TIME,
+    ) -> None:
+        """
+        Creates an instance of SignedArtifact.
+
+        :param build_payload: returns the payload to sign, with an exp claim
+        :type build_payload: Callable[[], dict]
+        :param sign: signs a payload returning the compact serialization
+        :type sign: Callable[[dict], str]
+        :param resign_lead_time: seconds before the expiration when the document is signed again
+        :type resign_lead_time: int
+        """
+        self.build_payload = build_payload
+        self.sign = sign
+        self.resign_lead_time = resign_lead_time
+
+        self._lock = threading.Lock()
+        self._document: Optional[SignedDocument] = None
+        self._refresher = BackgroundRefresher("pyeudiw-signed-artifact")
+
+        self.signatures = 0
+
+    def _sign(self) -> SignedDocument:
+        payload = self.build_payload()
+        jwt = self.sign(payload)
+
+        now = time.time()
+        exp = payload["exp"]
+        lead_time = min(self.resign_lead_time, max(exp - now, 0) / 2)
+
+        self.signatures += 1
+        return SignedDocument(
+            payload=payload,
+            jwt=jwt,
+            json_payload=json.dumps(payload),
+            exp=exp,
+            resign_at=exp - lead_time,
+        )
+
+    def refresh(self) -> SignedDocument:
+        """
+        Signs the document again.
+
+        :returns: the new document
+        :rtype: SignedDocument
+        """
+        document = self._sign()
+        self._document = document
+        return document
+
+    def wait_refresh(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for the background signature in progress, if any.
+
+        :param timeout: the maximum seconds to wait
+        :type timeout: Optional[float]
+        """
+        self._refresher.wait(timeout)
+
+    def get(self) -> SignedDocument:
+        """
+        Returns the current signed document.
+
+        :returns: the document
+        :rtype: SignedDocument
+        """
+        document = self._document
+        now = time.time()
+
+        if document is None or document.exp <= now:
+            with self._lock:
+                document = self._document
+                if document is None or document.exp <= now:
+                    document = self.refresh()
+        elif document.resign_at <= now:
+            self._refresher.submit("signed document", self.refresh)
+
+        return document
@@ -0,0 +1,109 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from pyeudiw.tools.cache import CacheInfo, LRUCache
+from pyeudiw.tools.utils import iat_now
+from pyeudiw.trust.model.trust_source import TrustSourceData
+
+TRUST_CACHE_MAXSIZE = int(os.getenv("PYEUDIW_TRUST_CACHE_MAXSIZE", 1024))
+TRUST_CACHE_MAX_TTL = int(os.getenv("PYEUDIW_TRUST_CACHE_MAX_TTL", 300))
+
+TrustCacheInfo = CacheInfo
+
+
+@dataclass
+class TrustCacheEntry:
+    trust_source: TrustSourceData
+    serialized: dict
+    expires_at: int
+
+
+class TrustSourceCache:
+    """
+    In-process cache of TrustSourceData keyed by entity id.
+
+    An entry expires together with the first expiring trust parameter of the
+    trust source, and never lives longer than max_ttl seconds so that changes
+    made by other workers on the storage are eventually picked up.
+    The number of entries is bounded, the least recently used ones are evicted.
+
+    The cached TrustSourceData instances are shared and must not be modified
+    by the callers.
+    """
+
+    def __init__(
+        self, maxsize: int = TRUST_CACHE_MAXSIZE, max_ttl: int = TRUST_CACHE_MAX_TTL
+    ) -> None:
+        """
+        Creates an instance of TrustSourceCache.
+
+        :param maxsize: the maximum number of cached trust sources
+        :type maxsize: int
+        :param max_ttl: the maximum lifetime in seconds of an entry
+        :type max_ttl: int
+        """
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+
+        self._entries: LRUCache[str, TrustCacheEntry] = LRUCache(maxsize)
+
+    def _expiration(self, trust_source: TrustSourceData) -> int:
+        expires_at = iat_now() + self.max_ttl
+        expiration_date = trust_source.get_expiration_date()
+        return expires_at if expiration_date is None else min(expires_at, expiration_date)
+
+    def get(self, entity_id: str) -> Optional[TrustCacheEntry]:
+        """
+        Returns the entry of an entity if present and not expired.
+
+        :param entity_id: the entity id
+        :type entity_id: str
+
+        :returns: the cache entry or None
+        :rtype: Optional[TrustCacheEntry]
+        """
+        return self._entries.get(entity_id)
+
+    def put(self, trust_source: TrustSourceData, serialized: dict) -> TrustCacheEntry:
+        """
+        Stores a trust source.
+
+        :param trust_source: the trust source
+        :type trust_source: TrustSourceData
+        :param serialized: the serialized form of the trust source
+        :type serialized: dict
+
+        :returns: the new cache entry
+        :rtype: TrustCacheEntry
+        """
+        entry = TrustCacheEntry(
+            trust_source, serialized, self._expiration(trust_source)
+        )
+
+        self._entries.put(trust_source.entity_id, entry, entry.expires_at)
+        return entry
+
+    def invalidate(self, entity_id: str) -> None:
+        """
+        Removes the entry of an entity.
+
+        :param entity_id: the entity id
+        :type entity_id: str
+        """
+        self._entries.pop(entity_id)
+
+    def cache_info(self) -> TrustCacheInfo:
+        """
+        Returns the cache statistics.
+
+        :returns: the statistics
+        :rtype: TrustCacheInfo
+        """
+        return self._entries.cache_info()
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the entries and resets the statistics.
+        """
+        self._entries.cache_clear()
@@ -1,5 +1,9 @@
+import copy
 import logging
-from typing import Any, Callable, Optional
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 import satosa.context
 from cryptojwt.jwk.jwk import key_from_jwk_dict
@@ -8,19 +12,27 @@ from typing import Union, Literal
 from pyeudiw.storage.db_engine import DBEngine
 from pyeudiw.storage.exceptions import EntryNotFound
 from pyeudiw.tools.base_logger import BaseLogger
+from pyeudiw.tools.single_flight import SingleFlight
 from pyeudiw.tools.utils import dynamic_class_loader
+from pyeudiw.trust.cache import TrustCacheEntry, TrustCacheInfo, TrustSourceCache
 from pyeudiw.trust.exceptions import NoCriptographicMaterial, TrustConfigurationError, NoMetadata
 from pyeudiw.trust.handler.direct_trust_jar import DirectTrustJar
 from pyeudiw.trust.handler.direct_trust_sd_jwt_vc import DirectTrustSdJwtVc
 from pyeudiw.trust.handler.interface import TrustHandlerInterface
 from pyeudiw.trust.model.trust_source import TrustSourceData
 
+if TYPE_CHECKING:
+    from pyeudiw.trust.refresh import TrustRefreshScheduler
+
 logger = logging.getLogger(__name__)
 
 UpsertMode = Union[Literal["update_first"], Literal["cache_first"]]
 
 INCLUDE_JWT_HEADER_CONFIG_NAME = "include_issued_jwt_header_param"
 
+TRUST_REFRESH_LOCK_TTL = int(os.getenv("PYEUDIW_TRUST_REFRESH_LOCK_TTL", 0))
+TRUST_REFRESH_LOCK_POLL_INTERVAL = 0.1
+
 
 class CombinedTrustEvaluator(BaseLogger):
     """
@@ -31,7 +43,9 @@ class CombinedTrustEvaluator(BaseLogger):
         self, 
         handlers: list[TrustHandlerInterface], 
         db_engine: DBEngine,
-        mode: UpsertMode = "update_first"
+        mode: UpsertMode = "update_first",
+        trust_cache: Optional[TrustSourceCache] = None,
+        refresh_lock_ttl: int = TRUST_REFRESH_LOCK_TTL
     ) -> None:
         """
         Initialize the CombinedTrustEvaluator.
@@ -40,11 +54,46 @@ class CombinedTrustEvaluator(BaseLogger):
         :type handlers: list[TrustHandlerInterface]
         :param db_engine: The database engine
         :type db_engine: DBEngine
+        :param mode: The upsert mode
+        :type mode: UpsertMode
+        :param trust_cache: The in-process cache of the trust sources, a new one is created if not provided
+        :type trust_cache: Optional[TrustSourceCache]
+        :param refresh_lock_ttl: If greater than 0, the refresh of the trust material of an issuer
+            is coordinated among the workers with a lock in the storage, held at most for this amount of seconds
+        :type refresh_lock_ttl: int
         """
         self.db_engine: DBEngine = db_engine
         self.handlers: list[TrustHandlerInterface] = handlers
         self.handlers_names: list[str] = [e.name for e in self.handlers]
         self.mode = mode
+        self.trust_cache = trust_cache or TrustSourceCache()
+        self.refresh_lock_ttl = refresh_lock_ttl
+        # set by a running TrustRefreshScheduler
+        self.refresh_scheduler: Optional["TrustRefreshScheduler"] = None
+
+        self._refreshes = SingleFlight()
+        self._lock_owner = str(uuid.uuid4())
+
+    def _retrieve_trust_source_document(self, issuer: str) -> Optional[dict]:
+        """
+        Retrieve the serialized trust source from the database.
+
+        :param issuer: The issuer
+        :type issuer: str
+
+        :returns: The serialized trust source
+        :rtype: Optional[dict]
+        """
+        try:
+            trust_source = self.db_engine.get_trust_source(issuer)
+        except EntryNotFound:
+            return None
+
+        if trust_source:
+            trust_source.pop("_id", None)
+            return trust_source
+
+        return None
 
     def _retrieve_trust_source(self, issuer: str) -> Optional[TrustSourceData]:
         """
@@ -56,16 +105,46 @@ class CombinedTrustEvaluator(BaseLogger):
         :returns: The trust source
         :rtype: Optional[TrustSourceData]
         """
-        try:
-            trust_source = self.db_engine.get_trust_source(issuer)
+        trust_source = self._retrieve_trust_source_document(issuer)
+        return TrustSourceData.from_dict(trust_source) if trust_source else None
 
-            if trust_source:
-                del trust_source["_id"]
-                return TrustSourceData.from_dict(trust_source)
+    def _requires_update(self, trust_source: TrustSourceData) -> bool:
+        """
+        Return whether any trust handler must refresh the trust material of the trust source.
 
-            return None
-        except EntryNotFound:
-            return None
+        :param trust_source: The trust source
+        :type trust_source: TrustSourceData
+
+        :returns: True if the trust source is revoked or any trust parameter is missing or expired
+        :rtype: bool
+        """
+        if trust_source.revoked:
+            return True
+
+        for handler in self.handlers:
+            trust_param = trust_source.get_trust_evaluation_type_by_handler_name(handler.__class__.__name__)
+            if not trust_param or trust_param.expired:
+                return True
+
+        return False
+
+    def _store_trust_source(self, trust_source: TrustSourceData, previous: Optional[dict]) -> None:
+        """
+        Cache the trust source and write it in the database if its trust material changed.
+
+        :param trust_source: The trust source
+        :type trust_source: TrustSourceData
+        :param previous: The serialized trust source as it was before the update, if any
+        :type previous: Optional[dict]
+        """
+        serialized = trust_source.serialize()
+        self.trust_cache.put(trust_source, serialized)
+
+        if self.refresh_scheduler:
+            self.refresh_scheduler.track(trust_source)
+
+        if serialized != previous:
+            self.db_engine.add_trust_source(copy.deepcopy(serialized))
         
     def _update_upsert_source_trust_materials(
         self, trust_source: Optional[TrustSourceData], issuer: Optional[str] = None
@@ -83,9 +162,7 @@ class CombinedTrustEvaluator(BaseLogger):
         for handler in self.handlers:
             trust_source = handler.extract_and_update_trust_materials(
                 issuer, trust_source
-            )   
-
-        self.db_engine.add_trust_source(trust_source.serialize())
+            )
 
         return trust_source
 
@@ -112,8 +189,6 @@ class CombinedTrustEvaluator(BaseLogger):
                     issuer, trust_source
                 )
 
-        self.db_engine.add_trust_source(trust_source.serialize())
-
         return trust_source
 
     def _upsert_source_trust_materials(
@@ -133,24 +208,132 @@ class CombinedTrustEvaluator(BaseLogger):
         if not trust_source:
             trust_source = TrustSourceData.empty(entity_id)
         
-        if self.mode == "update_first" or force_update:
+        # with the background refresh the request path only updates missing or expired trust material
+        if (self.mode == "update_first" and not self.refresh_scheduler) or force_update:
             return self._update_upsert_source_trust_materials(trust_source, entity_id)
         else:
             return self._cache_upsert_source_trust_materials(trust_source, entity_id)
     
     def _get_trust_source(self, entity_id: Optional[str], force_update: bool = False) -> TrustSourceData:
         """
-        Retrieve the trust source from the database or extract it from the trust handlers.
+        Retrieve the trust source from the cache, the database or extract it from the trust handlers.
+        In cache_first mode, or when a refresh scheduler is running, a cached trust source
+        with valid trust parameters is returned without touching neither the database nor the trust handlers.
 
         :param issuer: The issuer
         :type issuer: str
 
+        :returns: The trust source, that must not be modified by the caller
+        :rtype: TrustSourceData
+        """
+        entry = self.trust_cache.get(entity_id)
+
+        read_only = self.mode == "cache_first" or self.refresh_scheduler is not None
+
+        if entry and read_only and not force_update and not self._requires_update(entry.trust_source):
+            return entry.trust_source
+
+        # concurrent requests for the same issuer wait for a single refresh,
+        # a forced update does not join a refresh that is not forced
+        return self._refreshes.do(
+            (entity_id, force_update),
+            lambda: self._refresh_trust_source(entity_id, entry, force_update),
+        )
+
+    def _refresh_trust_source(
+        self, entity_id: Optional[str], entry: Optional[TrustCacheEntry], force_update: bool
+    ) -> TrustSourceData:
+        """
+        Update the trust source using the trust handlers and store it.
+        If the refresh lock is enabled and another worker is refreshing the same issuer,
+        its result is used when it provides valid trust parameters.
+
+        :param entity_id: The issuer
+        :type entity_id: str
+        :param entry: The cached trust source, if any
+        :type entry: Optional[TrustCacheEntry]
+        :param force_update: If the trust material must be updated even if still valid
+        :type force_update: bool
+
         :returns: The trust source
         :rtype: TrustSourceData
         """
-        trust_source = self._retrieve_trust_source(entity_id)            
+        lock_name = f"trust_source:{entity_id}"
+        locked = False
+        contended = False
 
-        return self._upsert_source_trust_materials(trust_source, entity_id, force_update)
+        if self.refresh_lock_ttl > 0:
+            locked = self.db_engine.acquire_lock(lock_name, self._lock_owner, self.refresh_lock_ttl)
+            if not locked:
+                contended = True
+                locked = self._wait_refresh_lock(lock_name)
+
+        try:
+            if contended:
+                # another worker refreshed the trust source meanwhile, reload it from the storage
+                entry = None
+                previous = self._retrieve_trust_source_document(entity_id)
+                if previous:
+                    trust_source = TrustSourceData.from_dict(copy.deepcopy(previous))
+                    if not self._requires_update(trust_source):
+                        self.trust_cache.put(trust_source, previous)
+                        return trust_source
+
+            previous = entry.serialized if entry else self._retrieve_trust_source_document(entity_id)
+
+            # the handlers update the trust source in place, the cached instance is kept untouched
+            trust_source = TrustSourceData.from_dict(copy.deepcopy(previous)) if previous else None
+            trust_source = self._upsert_source_trust_materials(trust_source, entity_id, force_update)
+
+            self._store_trust_source(trust_source, previous)
+        finally:
+            if locked:
+                self.db_engine.release_lock(lock_name, self._lock_owner)
+
+        return trust_source
+
+    def _wait_refresh_lock(self, lock_name: str) -> bool:
+        """
+        Wait until the refresh lock held by another worker is released, then acquire it.
+
+        :param lock_name: The name of the lock
+        :type lock_name: str
+
+        :returns: True if the lock was acquired within refresh_lock_ttl seconds
+        :rtype: bool
+        """
+        deadline = time.monotonic() + self.refresh_lock_ttl
+        while time.monotonic() < deadline:
+            time.sleep(TRUST_REFRESH_LOCK_POLL_INTERVAL)
+            if self.db_engine.acquire_lock(lock_name, self._lock_owner, self.refresh_lock_ttl):
+                return True
+
+        self._log_warning(
+            "trust refresh lock",
+            f"lock {lock_name} not released in {self.refresh_lock_ttl} seconds, refreshing anyway",
+        )
+        return False
+
+    def refresh(self, issuer: Optional[str]) -> TrustSourceData:
+        """
+        Update the trust material of the issuer from all the trust handlers.
+
+        :param issuer: The issuer
+        :type issuer: str
+
+        :returns: The updated trust source
+        :rtype: TrustSourceData
+        """
+        return self._get_trust_source(issuer, force_update=True)
+
+    def cache_info(self) -> TrustCacheInfo:
+        """
+        Return the statistics of the in-process trust source cache.
+
+        :returns: The cache statistics
+        :rtype: TrustCacheInfo
+        """
+        return self.trust_cache.cache_info()
 
     def get_public_keys(
             self, 
@@ -174,13 +357,16 @@ class CombinedTrustEvaluator(BaseLogger):
         :rtype: list[dict]
         """
         keys = []
-        thumbprints = []
+        thumbprints = set()
         used_handlers = []
 
         trust_source = self._get_trust_source(issuer, force_update)
 
         # try to derive the public key from static trust materials
         if static_trust_materials:
+            previous = trust_source.serialize()
+            trust_source = TrustSourceData.from_dict(copy.deepcopy(previous))
+
             for key, trust_material in static_trust_materials.items():
                 for handler in self.handlers:
                     if handler.get_handled_trust_material_name() == key:
@@ -190,9 +376,9 @@ class CombinedTrustEvaluator(BaseLogger):
                         )
 
                         if status:
-                            self.db_engine.add_trust_source(trust_source.serialize())
+                            self._store_trust_source(trust_source, previous)
                             evaluation_type = trust_source.get_trust_evaluation_type_by_handler_name(handler.__class__.__name__)
-                            return [key_from_jwk_dict(jwk).serialize(private=False) for jwk in evaluation_type.jwks]
+                            return [dict(jwk) for jwk in evaluation_type.get_key_set().public_jwks]
                         else:
                             used_handlers.append(handler.__class__.__name__)
 
@@ -203,12 +389,11 @@ class CombinedTrustEvaluator(BaseLogger):
 
         for handler in filetered_handlers:
             if (evaluation_type := trust_source.get_trust_evaluation_type_by_handler_name(handler.__class__.__name__)) is not None:
-                for jwk in evaluation_type.jwks:
-                    key = key_from_jwk_dict(jwk)
-                    thumbprint = key.thumbprint("SHA-256")
+                key_set = evaluation_type.get_key_set()
+                for thumbprint, jwk in zip(key_set.thumbprints, key_set.public_jwks):
                     if thumbprint not in thumbprints:
-                        thumbprints.append(thumbprint)
-                        keys.append(key.serialize(private=False))
+                        thumbprints.add(thumbprint)
+                        keys.append(dict(jwk))
 
         if not keys:
             raise NoCriptographicMaterial(
@@ -238,7 +423,8 @@ class CombinedTrustEvaluator(BaseLogger):
                 f"searched among: {self.handlers_names}"
             )
         
-        metadata = trust_source.metadata.copy()
+        # the trust source is shared through the cache, it must not be modified
+        metadata = copy.deepcopy(trust_source.metadata)
         
         if "jwks" in metadata and "keys" in metadata["jwks"]:
             metadata["jwks"]["keys"] = [key_from_jwk_dict(jwk).serialize(private=False) for jwk in metadata["jwks"]["keys"]]
@@ -266,9 +452,11 @@ class CombinedTrustEvaluator(BaseLogger):
         :param issuer: The issuer
         :type issuer: str
         """
-        trust_source = self._get_trust_source(issuer)
-        trust_source.revoked = True
-        self.db_engine.add_trust_source(trust_source.serialize())
+        trust_source = self._get_trust_source(issuer).serialize()
+        trust_source["revoked"] = True
+
+        self.trust_cache.invalidate(issuer)
+        self.db_engine.add_trust_source(trust_source)
 
     def get_policies(self, issuer: Optional[str] = None, force_update: bool = False) -> dict[str, any]:
         """
@@ -1,19 +1,20 @@
-import json
 import logging
 import satosa
-from typing import Any, Callable, List, Union
+from typing import Any, Callable, List, Optional, Union
 from satosa.response import Response
 
 from pyeudiw.federation.exceptions import TimeValidationError
 from pyeudiw.federation.policy import TrustChainPolicy
+from pyeudiw.federation.statement_store import FederationStatementStore
+from pyeudiw.federation.trust_chain_store import ResolvedTrustChain, TrustChainStore
 from pyeudiw.federation.trust_chain_validator import StaticTrustChainValidator
 from pyeudiw.jwk import JWK
 from pyeudiw.jwt.jws_helper import JWSHelper
-from pyeudiw.jwt.utils import decode_jwt_payload
-from pyeudiw.satosa.utils.response import JsonResponse
+from pyeudiw.jwt.utils import decode_jwt_payload, jwt_decoding_scope
 from pyeudiw.storage.db_engine import DBEngine
 from pyeudiw.storage.exceptions import EntryNotFound
 from pyeudiw.tools.base_logger import BaseLogger
+from pyeudiw.tools.signed_artifact import SignedArtifact
 from pyeudiw.tools.utils import exp_from_now, iat_now
 from pyeudiw.trust.exceptions import MissingProtocolSpecificJwks, UnknownTrustAnchor
 from pyeudiw.trust.handler.interface import TrustHandlerInterface
@@ -50,6 +51,8 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
         cache_ttl: int = 0,
         metadata_type: str = _ISSUER_METADATA_TYPE,
         include_issued_jwt_header_param: bool = False,
+        statement_store: Optional[FederationStatementStore] = None,
+        trust_chain_store: Optional[TrustChainStore] = None,
         **kwargs,
     ):
 
@@ -70,6 +73,15 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
         self.client_id: str = federation_entity_metadata
         self.entity_configuration_exp = entity_configuration_exp
         self.include_issued_jwt_header_param = include_issued_jwt_header_param
+        # the statements fetched by this handler, kept only in memory unless
+        # a store bound to a storage is given
+        self.statement_store = (
+            FederationStatementStore() if statement_store is None else statement_store
+        )
+        # as well as the trust chains it resolves
+        self.trust_chain_store = (
+            TrustChainStore() if trust_chain_store is None else trust_chain_store
+        )
 
         self.federation_public_jwks = [
             JWK(i).as_public_dict() for i in self.federation_jwks
@@ -84,6 +96,13 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
         ]}
         
         self.metadata_policy_resolver = TrustChainPolicy()
+
+        # the entity configuration is signed ahead of the requests
+        self.signed_entity_configuration = SignedArtifact(
+            lambda: self.entity_configuration_as_dict,
+            self._sign_entity_configuration,
+        )
+        self.signed_entity_configuration.get()
         
         for k, v in kwargs.items():
             if not hasattr(self, k):
@@ -97,10 +116,7 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
     def get_metadata(self, issuer, trust_source):
         return trust_source
 
-    @property
-    def entity_configuration(self) -> dict:
-        """Returns the entity configuration as a JWT."""
-        data = self.entity_configuration_as_dict
+    def _sign_entity_configuration(self, data: dict) -> str:
         _jwk = self.federation_jwks[0]
         jwshelper = JWSHelper(_jwk)
         return jwshelper.sign(
@@ -112,6 +128,11 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
             plain_dict=data,
         )
 
+    @property
+    def entity_configuration(self) -> str:
+        """Returns the current signed entity configuration as a JWT."""
+        return self.signed_entity_configuration.get().jwt
+
     @property
     def entity_configuration_as_dict(self) -> dict:
         """Returns the entity configuration as a dictionary."""
@@ -141,20 +162,26 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
         :return: The entity configuration
         :rtype: Response
         """
+        document = self.signed_entity_configuration.get()
 
-        if context.qs_params.get("format", "") == "json":
-            return Response(
-                json.dumps(self.entity_configuration_as_dict),
-                status="200",
-                content="application/json",
-            )
+        if (context.qs_params or {}).get("format", "") == "json":
+            message = document.json_payload
+            etag = document.json_etag
+            content = "application/json"
         else:
-            return satosa.response.Response(
-                self.entity_configuration,
-                status="200",
-                content="application/entity-statement+jwt",
+            message = document.jwt
+            etag = document.jwt_etag
+            content = "application/entity-statement+jwt"
+
+        headers = [("ETag", etag), ("Cache-Control", document.cache_control())]
+
+        if (context.http_headers or {}).get("HTTP_IF_NONE_MATCH") == etag:
+            return Response(
+                "", status="304 Not Modified", headers=headers, content=content
             )
 
+        return Response(message, status="200", headers=headers, content=content)
+
     def build_metadata_endpoints(
         self, backend_name: str, entity_uri: str
     ) -> list[
@@ -162,12 +189,11 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
     ]:
 
         metadata_path = f'^{backend_name.strip("/")}/.well-known/openid-federation$'
-        response = self.entity_configuration
 
         def metadata_response_fn(
             ctx: satosa.context.Context, *args
         ) -> satosa.response.Response:
-            return JsonResponse(message=response)
+            return self.entity_configuration_endpoint(ctx)
 
         return [(metadata_path, metadata_response_fn)]
     
@@ -194,6 +220,15 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
         :returns: If the trust chain is valid
         :rtype: bool
         """
+        # the statements are decoded once while the chain is validated
+        with jwt_decoding_scope():
+            return self._validate_trust_material(trust_chain, trust_source)
+
+    def _validate_trust_material(
+            self, 
+            trust_chain: list[str], 
+            trust_source: TrustSourceData,
+        ) -> dict[bool, TrustSourceData]:
         _first_statement = decode_jwt_payload(trust_chain[-1])
         trust_anchor_eid = _first_statement.get('iss', None)
 
@@ -209,14 +244,22 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
                 "a recognizable Trust Anchor."
             )
         
+        # a trust chain already resolved is not verified again until its expiration
+        subject = decode_jwt_payload(trust_chain[0]).get("sub")
+        resolved = self.trust_chain_store.get(subject, trust_anchor_eid)
+        if resolved is not None and resolved.chain == trust_chain:
+            self._add_trust_chain_param(trust_source, resolved.chain)
+            return True, trust_source
+
         if len(self.trust_anchors[trust_anchor_eid]) != 0:
             jwks = self.trust_anchors[trust_anchor_eid]
         else:
             try:
-                trust_anchor = get_entity_configurations(trust_anchor_eid, self.httpc_params, False)
-                decoded_ec = decode_jwt_payload(
-                    trust_anchor['federation']['entity_configuration']
+                # served by the federation statement store once fetched
+                trust_anchor = get_entity_configurations(
+                    trust_anchor_eid, self.httpc_params, False, self.statement_store
                 )
+                decoded_ec = decode_jwt_payload(trust_anchor[0])
                 jwks = decoded_ec.get('jwks', {}).get('keys', [])
             except Exception as e:
                 raise UnknownTrustAnchor(
@@ -229,7 +272,7 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
             )
 
         tc = StaticTrustChainValidator(
-            trust_chain, jwks, self.httpc_params
+            trust_chain, jwks, self.httpc_params, statement_store=self.statement_store
         )
 
         _is_valid = False
@@ -247,7 +290,9 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
         if not _is_valid:
             try:
                 db_chain = trust_source.federation.trust_chain
-                if StaticTrustChainValidator(db_chain, jwks, self.httpc_params).is_valid:
+                if StaticTrustChainValidator(
+                    db_chain, jwks, self.httpc_params, statement_store=self.statement_store
+                ).is_valid:
                     self.is_trusted = True
                     return self.is_trusted
 
@@ -256,6 +301,23 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
 
             _is_valid = tc.update()
 
+        if _is_valid:
+            try:
+                self.trust_chain_store.put(
+                    ResolvedTrustChain.from_chain(tc.trust_chain, tc.final_metadata)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Cannot resolve the metadata of Trust Chain {tc.entity_id}: {e}"
+                )
+
+        self._add_trust_chain_param(trust_source, trust_chain)
+
+        return _is_valid, trust_source
+
+    def _add_trust_chain_param(
+        self, trust_source: TrustSourceData, trust_chain: list[str]
+    ) -> None:
         leaf_jwks = decode_jwt_payload(trust_chain[0]).get('jwks', {}).get('keys', [])
 
         # the good trust chain is then stored
@@ -269,5 +331,3 @@ class FederationHandler(TrustHandlerInterface, BaseLogger):
                 trust_handler_name=str(self.__class__.__name__),
             )
         )
-        
-        return _is_valid, trust_source
@@ -4,6 +4,7 @@ from typing import Optional
 from cryptojwt.jwk.jwk import key_from_jwk_dict
 
 from pyeudiw.jwk import JWK
+from pyeudiw.jwk.jwks import KeySet, get_key_set
 from pyeudiw.tools.utils import iat_now
 
 @dataclass
@@ -56,7 +57,7 @@ class TrustEvaluationType:
         return {
             "attribute_name": self.attribute_name,
             "expiration_date": self.expiration_date,
-            "jwks": [key_from_jwk_dict(jwk).serialize(private=False) for jwk in self.jwks],
+            "jwks": [dict(jwk) for jwk in self.get_key_set().public_jwks],
             "trust_handler_name": self.trust_handler_name,
             self.attribute_name: getattr(self, self.attribute_name)
         }
@@ -74,6 +75,16 @@ class TrustEvaluationType:
     def get_jwks(self) -> list[dict]:
         return self.jwks
 
+    def get_key_set(self) -> KeySet:
+        """
+        Return the parsed and indexed keys of the trust parameter data.
+        Key sets are shared among trust parameters with the same jwks.
+
+        :returns: The key set
+        :rtype: KeySet
+        """
+        return get_key_set(self.jwks)
+
 @dataclass
 class TrustSourceData:
     """
@@ -162,6 +173,20 @@ class TrustSourceData:
                     return getattr(self, ttype)
         return None
 
+    def get_expiration_date(self) -> Optional[int]:
+        """
+        Return the expiration date of the first expiring trust parameter.
+
+        :returns: The expiration date in unix timestamp, None if there are no trust parameters
+        :rtype: Optional[int]
+        """
+        expiration_dates = [
+            getattr(self, ttype).expiration_date
+            for ttype in dir(self)
+            if isinstance(getattr(self, ttype), TrustEvaluationType)
+        ]
+        return min(expiration_dates) if expiration_dates else None
+
     def serialize(self) -> dict[str, any]:
         """
         Serialize the trust source data.
@@ -0,0 +1,258 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+from pyeudiw.tools.base_logger import BaseLogger
+from pyeudiw.trust.model.trust_source import TrustSourceData
+
+if TYPE_CHECKING:
+    from pyeudiw.trust.dynamic import CombinedTrustEvaluator
+
+TRUST_REFRESH_LEAD_TIME = int(os.getenv("PYEUDIW_TRUST_REFRESH_LEAD_TIME", 60))
+TRUST_REFRESH_JITTER = int(os.getenv("PYEUDIW_TRUST_REFRESH_JITTER", 30))
+TRUST_REFRESH_CONCURRENCY = int(os.getenv("PYEUDIW_TRUST_REFRESH_CONCURRENCY", 4))
+TRUST_REFRESH_MIN_BACKOFF = int(os.getenv("PYEUDIW_TRUST_REFRESH_MIN_BACKOFF", 5))
+TRUST_REFRESH_MAX_BACKOFF = int(os.getenv("PYEUDIW_TRUST_REFRESH_MAX_BACKOFF", 300))
+TRUST_REFRESH_SCAN_INTERVAL = int(os.getenv("PYEUDIW_TRUST_REFRESH_SCAN_INTERVAL", 300))
+
+
+class TrustRefreshScheduler(BaseLogger):
+    """
+    Refreshes the trust material of the known trust sources before it expires.
+
+    Every trust source found in the storage, or stored by the trust evaluator,
+    is scheduled for a refresh lead_time seconds before its first trust
+    parameter expires, anticipated by a random jitter so that the refreshes
+    of sources expiring together are spread over time. At most concurrency
+    refreshes run at the same time; a failed refresh is retried with an
+    exponential backoff.
+
+    While the scheduler is running the trust evaluator does not refresh
+    valid trust material on the request path anymore.
+    """
+
+    def __init__(
+        self,
+        trust_evaluator: "CombinedTrustEvaluator",
+        lead_time: int = TRUST_REFRESH_LEAD_TIME,
+        jitter: int = TRUST_REFRESH_JITTER,
+        concurrency: int = TRUST_REFRESH_CONCURRENCY,
+        min_backoff: int = TRUST_REFRESH_MIN_BACKOFF,
+        max_backoff: int = TRUST_REFRESH_MAX_BACKOFF,
+        scan_interval: int = TRUST_REFRESH_SCAN_INTERVAL,
+        tick: float = 1.0,
+    ) -> None:
+        """
+        Creates a TrustRefreshScheduler.
+
+        :param trust_evaluator: the trust evaluator whose trust sources are refreshed
+        :type trust_evaluator: CombinedTrustEvaluator
+        :param lead_time: seconds before the expiration when the refresh is due
+        :type lead_time: int
+        :param jitter: maximum random seconds the refresh is anticipated of
+        :type jitter: int
+        :param concurrency: maximum number of refreshes running at the same time
+        :type concurrency: int
+        :param min_backoff: seconds before retrying a failed refresh the first time
+        :type min_backoff: int
+        :param max_backoff: maximum seconds before retrying a failed refresh
+        :type max_backoff: int
+        :param scan_interval: seconds between two scans of the trust sources in the storage
+        :type scan_interval: int
+        :param tick: seconds between two checks of the due refreshes
+        :type tick: float
+        """
+        self.trust_evaluator = trust_evaluator
+        self.lead_time = lead_time
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.scan_interval = scan_interval
+        self.tick = tick
+
+        self._lock = threading.Lock()
+        self._due: dict[str, float] = {}
+        self._failures: dict[str, int] = {}
+        self._running: set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Returns the refresh metrics.
+
+        :returns: the metrics
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "tracked": len(self._due),
+                "running": len(self._running),
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+            }
+
+    def next_refresh(self, entity_id: str) -> Optional[float]:
+        """
+        Returns when the refresh of a trust source is due.
+
+        :param entity_id: the entity id of the trust source
+        :type entity_id: str
+
+        :returns: the unix timestamp of the refresh, None if the trust source is not tracked
+        :rtype: Optional[float]
+        """
+        with self._lock:
+            return self._due.get(entity_id)
+
+    def track(self, trust_source: TrustSourceData) -> None:
+        """
+        Schedules the refresh of a trust source according to its expiration date.
+
+        :param trust_source: the trust source
+        :type trust_source: TrustSourceData
+        """
+        expiration_date = trust_source.get_expiration_date()
+
+        if expiration_date is None:
+            # no trust handler provided material, look for it again later
+            due = time.time() + self.scan_interval
+        else:
+            due = expiration_date - self.lead_time - random.uniform(0, self.jitter)
+
+        with self._lock:
+            self._due[trust_source.entity_id] = due
+
+    def sync(self) -> None:
+        """
+        Schedules the refresh of all the trust sources found in the storage.
+        """
+        try:
+            trust_sources = self.trust_evaluator.db_engine.get_trust_sources()
+        except Exception as e:
+            self._log_warning(
+                "trust refresh scheduler", f"cannot load the trust sources: {e}"
+            )
+            return
+
+        for trust_source in trust_sources:
+            trust_source.pop("_id", None)
+            if self.next_refresh(trust_source["entity_id"]) is not None:
+                continue
+            try:
+                self.track(TrustSourceData.from_dict(trust_source))
+            except Exception as e:
+                self._log_warning(
+                    "trust refresh scheduler",
+                    f"invalid trust source {trust_source.get('entity_id')}: {e}",
+                )
+
+    def run_pending(self, now: Optional[float] = None) -> list[Future]:
+        """
+        Starts the due refreshes, within the concurrency limit.
+
+        :param now: the current unix timestamp
+        :type now: Optional[float]
+
+        :returns: the futures of the started refreshes
+        :rtype: list[Future]
+        """
+        now = time.time() if now is None else now
+
+        with self._lock:
+            slots = self.concurrency - len(self._running)
+            due = sorted(
+                (at, entity_id)
+                for entity_id, at in self._due.items()
+                if at <= now and entity_id not in self._running
+            )
+            entity_ids = [entity_id for _, entity_id in due[:max(slots, 0)]]
+            self._running.update(entity_ids)
+
+        executor = self._get_executor()
+        return [executor.submit(self._refresh, entity_id) for entity_id in entity_ids]
+
+    def _refresh(self, entity_id: str) -> None:
+        try:
+            self.track(self.trust_evaluator.refresh(entity_id))
+        except Exception as e:
+            self._backoff(entity_id, str(e))
+        else:
+            if self.next_refresh(entity_id) <= time.time():
+                # the handlers did not provide fresh trust material
+                self._backoff(entity_id, "trust material still expiring")
+            else:
+                with self._lock:
+                    self._failures.pop(entity_id, None)
+                    self.refreshes += 1
+        finally:
+            with self._lock:
+                self._running.discard(entity_id)
+
+    def _backoff(self, entity_id: str, reason: str) -> None:
+        with self._lock:
+            failures = self._failures.get(entity_id, 0) + 1
+            self._failures[entity_id] = failures
+            self._due[entity_id] = time.time() + min(
+                self.min_backoff * 2 ** (failures - 1), self.max_backoff
+            )
+            self.refresh_failures += 1
+
+        self._log_warning(
+            "trust refresh scheduler",
+            f"refresh of {entity_id} failed {failures} times: {reason}",
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="pyeudiw-trust-refresh"
+            )
+        return self._executor
+
+    def _run(self) -> None:
+        last_scan = time.monotonic()
+        while not self._stop.wait(self.tick):
+            if time.monotonic() - last_scan >= self.scan_interval:
+                self.sync()
+                last_scan = time.monotonic()
+            self.run_pending()
+
+    def start(self) -> None:
+        """
+        Loads the trust sources from the storage and starts refreshing them in
+        background, the request path of the trust evaluator becomes read only.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self.sync()
+        self.trust_evaluator.refresh_scheduler = self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pyeudiw-trust-refresh-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background refreshes, the trust evaluator refreshes the
+        trust material on the request path again.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.trust_evaluator.refresh_scheduler is self:
+            self.trust_evaluator.refresh_scheduler = None
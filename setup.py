@@ -57,6 +57,12 @@ setup(
         "federation": [
             "asyncio>=4,<4.1",
             "aiohttp>=3.8,<3.9"
+        ],
+        "redis": [
+            "redis>=5,<9"
+        ],
+        "status_list": [
+            "numpy>=1.24"
         ]
     }
 )